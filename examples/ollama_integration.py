@@ -1,9 +1,10 @@
 """Axonize + Ollama integration example.
 
-Shows how to trace Ollama API calls with streaming token tracking.
+Shows how to trace Ollama API calls, streamed or not, using the token
+counts and timings Ollama reports.
 
 Requirements:
-    pip install axonize requests
+    pip install axonize requests ollama
 
 Usage:
     # Start Ollama: ollama serve
@@ -16,6 +17,7 @@ from __future__ import annotations
 import json
 
 import axonize
+from axonize.integrations.ollama import instrument, trace_lines
 
 # Initialize Axonize
 axonize.init(
@@ -30,13 +32,15 @@ def chat_with_ollama(
     model: str = "llama3",
     base_url: str = "http://localhost:11434",
 ) -> str:
-    """Chat with Ollama and trace the interaction."""
-    import requests
+    """Chat with Ollama and trace the interaction.
 
-    with axonize.llm_span("ollama.chat", model=model) as s:
-        s.set_tokens_input(len(prompt.split()))  # Approximate
+    Token counts, prefill and decode times come from the counts and
+    durations Ollama reports in its final line; the streamed lines are
+    passed through without per-token work.
+    """
+    import requests
 
-        # Streaming request to Ollama
+    with axonize.llm_span("ollama.generate", model=model) as s:
         response = requests.post(
             f"{base_url}/api/generate",
             json={"model": model, "prompt": prompt, "stream": True},
@@ -46,22 +50,22 @@ def chat_with_ollama(
         response.raise_for_status()
 
         full_response = []
-        for line in response.iter_lines():
-            if not line:
-                continue
-            data = json.loads(line)
-            if "response" in data:
-                s.record_token()
-                full_response.append(data["response"])
-            if data.get("done", False):
-                # Ollama provides token counts
-                if "prompt_eval_count" in data:
-                    s.set_tokens_input(data["prompt_eval_count"])
-                break
+        for line in trace_lines(s, response.iter_lines()):
+            if line:
+                full_response.append(json.loads(line).get("response", ""))
 
         return "".join(full_response)
 
 
+def chat_with_client(prompt: str, model: str = "llama3") -> str:
+    """Same, with the ``ollama`` package: every client call gets a span."""
+    import ollama
+
+    client = instrument(ollama.Client())
+    response = client.chat(model=model, messages=[{"role": "user", "content": prompt}])
+    return str(response["message"]["content"])
+
+
 def multi_turn_conversation(messages: list[str], model: str = "llama3") -> None:
     """Trace a multi-turn conversation."""
     with axonize.span("conversation") as conv:
@@ -69,7 +73,7 @@ def multi_turn_conversation(messages: list[str], model: str = "llama3") -> None:
         conv.set_attribute("ai.model.name", model)
 
         for i, msg in enumerate(messages):
-            response = chat_with_ollama(msg, model=model)
+            response = chat_with_client(msg, model=model)
             print(f"  Turn {i+1}: {response[:80]}...")
 
 
@@ -1,7 +1,9 @@
 """Axonize + vLLM integration example.
 
-Shows how to instrument a vLLM inference server with Axonize for
-streaming token tracking, TTFT/TPOT metrics, and GPU attribution.
+Shows how to trace a vLLM engine with Axonize. The recorder reads vLLM's
+own request timing (queue, prefill, decode, TTFT, token counts) and batch
+occupancy, and builds spans on a background thread — no per-token Python
+callbacks in the serving loop.
 
 Requirements:
     pip install axonize vllm
@@ -10,7 +12,10 @@ Usage:
     python examples/vllm_integration.py
 """
 
+import asyncio
+
 import axonize
+from axonize.integrations.vllm import VLLMRecorder
 
 # Initialize Axonize with GPU profiling enabled
 axonize.init(
@@ -20,71 +25,46 @@ axonize.init(
     gpu_profiling=True,
 )
 
+recorder = VLLMRecorder()
 
-def generate_with_tracing(prompt: str, max_tokens: int = 256) -> str:
-    """Example: instrument a vLLM generate call."""
-    # In real code, you'd import and use vLLM:
-    #   from vllm import LLM, SamplingParams
-    #   llm = LLM(model="meta-llama/Llama-3-70B")
-
-    with axonize.llm_span("vllm.generate", model="llama-3-70b") as s:
-        s.set_tokens_input(len(prompt.split()))  # Approximate token count
-        s.set_gpus(["cuda:0", "cuda:1"])  # Multi-GPU inference
-
-        # Simulate streaming generation
-        # In real code: for output in llm.generate(prompt, params):
-        output_tokens = []
-        for i in range(max_tokens):
-            # Each token emission
-            s.record_token()
-            token = f"token_{i}"  # placeholder
-            output_tokens.append(token)
-
-            # Stop condition (simulated)
-            if i >= 20:
-                break
 
-        return " ".join(output_tokens)
+async def serve(prompts: list[str]) -> list[str]:
+    """Example: an AsyncLLM engine with the recorder as a stat logger."""
+    from vllm import SamplingParams
+    from vllm.engine.arg_utils import AsyncEngineArgs
+    from vllm.v1.engine.async_llm import AsyncLLM
 
+    engine = AsyncLLM.from_engine_args(
+        AsyncEngineArgs(model="meta-llama/Llama-3.1-8B-Instruct"),
+        stat_loggers=[recorder.stat_logger],
+    )
+    params = SamplingParams(max_tokens=256)
 
-def batch_inference_with_tracing(prompts: list[str]) -> list[str]:
-    """Example: trace a batch of inference requests."""
-    results = []
+    async def generate(i: int, prompt: str) -> str:
+        # The recorder builds the vllm.request span; this span covers the
+        # application's own handling around it.
+        with axonize.span("handle-request") as s:
+            s.set_attribute("request.index", i)
+            text = ""
+            async for output in engine.generate(prompt, params, request_id=str(i)):
+                text = output.outputs[0].text
+            return text
 
-    with axonize.span("batch-inference") as batch_span:
-        batch_span.set_attribute("batch_size", len(prompts))
-        batch_span.set_gpus(["cuda:0"])
-
-        for i, prompt in enumerate(prompts):
-            with axonize.llm_span(
-                f"generate-{i}",
-                model="llama-3-70b",
-            ) as s:
-                s.set_tokens_input(len(prompt.split()))
-                # Simulate token generation
-                for _ in range(15):
-                    s.record_token()
-                results.append(f"Response to: {prompt[:30]}...")
-
-    return results
+    try:
+        return await asyncio.gather(*(generate(i, p) for i, p in enumerate(prompts)))
+    finally:
+        engine.shutdown()
 
 
 if __name__ == "__main__":
-    # Single request
-    print("=== Single Generation ===")
-    result = generate_with_tracing("Explain quantum computing in simple terms")
-    print(f"Generated: {result[:50]}...")
-
-    # Batch request
-    print("\n=== Batch Generation ===")
     prompts = [
+        "Explain quantum computing in simple terms",
         "What is machine learning?",
         "Write a haiku about GPUs",
-        "Explain transformers architecture",
     ]
-    results = batch_inference_with_tracing(prompts)
-    for r in results:
-        print(f"  {r}")
+    for r in asyncio.run(serve(prompts)):
+        print(f"  {r[:60]}...")
 
+    recorder.stop()
     axonize.shutdown()
     print("\nDone! Check traces at http://localhost:3000/traces")
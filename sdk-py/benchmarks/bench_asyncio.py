@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Event-loop latency benchmark: thread processor vs. asyncio processor.
+
+An asyncio service creates spans at a fixed rate (default 5k spans/sec)
+while a probe coroutine measures how late its 1ms timers fire. Both export
+modes ship to a gRPC collector in a separate process:
+
+  thread   init() default — BackgroundProcessor thread + blocking gRPC
+  asyncio  init(mode="asyncio") — drain task + grpc.aio on the same loop
+
+Reports timer lag percentiles (loop responsiveness) and spans delivered.
+
+Usage:
+    cd sdk-py && uv run python benchmarks/bench_asyncio.py [--rate 5000] [--seconds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from concurrent import futures
+from typing import Any
+
+import axonize
+
+
+def _collector(port_queue: Any, stop: Any, counts: Any) -> None:
+    import grpc
+    from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+        ExportTraceServiceResponse,
+    )
+    from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
+        TraceServiceServicer,
+        add_TraceServiceServicer_to_server,
+    )
+
+    class Servicer(TraceServiceServicer):
+        def Export(self, request: Any, context: Any) -> Any:  # noqa: N802
+            n = sum(len(ss.spans) for rs in request.resource_spans for ss in rs.scope_spans)
+            with counts.get_lock():
+                counts.value += n
+            return ExportTraceServiceResponse()
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    add_TraceServiceServicer_to_server(Servicer(), server)
+    port_queue.put(server.add_insecure_port("localhost:0"))
+    server.start()
+    stop.wait()
+    server.stop(grace=1)
+
+
+async def _probe(lags: list[float], done: asyncio.Event) -> None:
+    interval = 0.001
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def _produce(rate: int, seconds: float, done: asyncio.Event) -> int:
+    tick = 0.01
+    per_tick = max(1, int(rate * tick))
+    produced = 0
+    deadline = time.perf_counter() + seconds
+    next_tick = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for _ in range(per_tick):
+            with axonize.llm_span("generate", model="llama-3-8b") as s:
+                s.set_tokens_input(128)
+                s.record_tokens(16)
+        produced += per_tick
+        next_tick += tick
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+    done.set()
+    return produced
+
+
+async def _run(mode: str, endpoint: str, rate: int, seconds: float) -> dict[str, float]:
+    axonize.init(
+        endpoint=endpoint,
+        service_name="bench-async",
+        mode=mode,
+        flush_interval_ms=100,
+        buffer_size=rate * 2,
+    )
+    lags: list[float] = []
+    done = asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, done))
+    cpu_start = time.process_time()
+    produced = await _produce(rate, seconds, done)
+    await probe
+    await axonize.shutdown_async()
+    cpu = time.process_time() - cpu_start
+
+    lags.sort()
+
+    def pct(q: float) -> float:
+        return lags[min(len(lags) - 1, int(q * len(lags)))]
+
+    return {
+        "produced": produced,
+        "cpu_s": cpu,
+        "lag_p50_ms": pct(0.50),
+        "lag_p99_ms": pct(0.99),
+        "lag_max_ms": lags[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=int, default=5000, help="spans per second")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Axonize Event-loop Latency Benchmark")
+    print(f"{args.rate} spans/sec for {args.seconds:.0f}s")
+    print("=" * 60)
+
+    ctx = multiprocessing.get_context("spawn")
+    results: dict[str, dict[str, float]] = {}
+    for mode in ("thread", "asyncio"):
+        port_queue = ctx.Queue()
+        stop = ctx.Event()
+        counts = ctx.Value("q", 0)
+        proc = ctx.Process(target=_collector, args=(port_queue, stop, counts))
+        proc.start()
+        endpoint = f"localhost:{port_queue.get(timeout=30)}"
+        results[mode] = asyncio.run(_run(mode, endpoint, args.rate, args.seconds))
+        time.sleep(0.2)
+        stop.set()
+        proc.join()
+        results[mode]["delivered"] = counts.value
+
+    rows = [
+        ("Timer lag p50 (ms)", "lag_p50_ms", "{:.3f}"),
+        ("Timer lag p99 (ms)", "lag_p99_ms", "{:.3f}"),
+        ("Timer lag max (ms)", "lag_max_ms", "{:.3f}"),
+        ("Process CPU (s)", "cpu_s", "{:.2f}"),
+        ("Spans produced", "produced", "{:.0f}"),
+        ("Spans delivered", "delivered", "{:.0f}"),
+    ]
+    print()
+    print(f"  {'':24s}  {'thread':>10s}  {'asyncio':>10s}")
+    for label, key, fmt in rows:
+        thread = fmt.format(results["thread"][key])
+        aio = fmt.format(results["asyncio"][key])
+        print(f"  {label:24s}  {thread:>10s}  {aio:>10s}")
+
+
+if __name__ == "__main__":
+    main()
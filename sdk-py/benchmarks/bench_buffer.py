@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Ring-buffer overflow-policy benchmark.
+
+Measures what each overflow policy costs on the inference thread:
+  1. enqueue() into a buffer with room
+  2. enqueue() into a full buffer (20% root spans, the rest children),
+     i.e. the cost of each drop decision
+  3. drain() of a full buffer, merging root and child spans in finish order
+  4. enqueue() from four threads into a buffer with room, i.e. the cost of
+     the producer lock under contention
+
+"block" runs with a zero timeout so that only the path cost is measured,
+not the wait. Each figure is the best of ``--repeats`` runs, in ns per span.
+
+Usage:
+    cd sdk-py && uv run python benchmarks/bench_buffer.py [--iterations 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from collections.abc import Callable
+
+from axonize._buffer import OVERFLOW_POLICIES, RingBuffer
+from axonize._types import SpanData, SpanKind, SpanStatus
+
+_CAPACITY = 8192
+_THREADS = 4
+
+
+def _spans(n: int) -> list[SpanData]:
+    return [
+        SpanData(
+            span_id=f"{i:016x}",
+            trace_id="0123456789abcdef0123456789abcdef",
+            name="op",
+            kind=SpanKind.INTERNAL,
+            status=SpanStatus.OK,
+            start_time_ns=i,
+            end_time_ns=i + 1,
+            duration_ms=0.0,
+            service_name="svc",
+            parent_span_id=None if i % 5 == 0 else "0000000000000001",
+        )
+        for i in range(n)
+    ]
+
+
+def _best(fn: Callable[[], float], repeats: int) -> float:
+    fn()  # warmup
+    return min(fn() for _ in range(repeats))
+
+
+def _filled(policy: str, fill: list[SpanData]) -> RingBuffer:
+    buf = RingBuffer(maxsize=len(fill), overflow=policy, block_timeout_s=0.0)
+    for s in fill:
+        buf.enqueue(s)
+    return buf
+
+
+def _with_room(policy: str, spans: list[SpanData]) -> float:
+    buf = RingBuffer(maxsize=len(spans) + 1, overflow=policy)
+    start = time.perf_counter_ns()
+    for s in spans:
+        buf.enqueue(s)
+    return (time.perf_counter_ns() - start) / len(spans)
+
+
+def _full(policy: str, spans: list[SpanData], fill: list[SpanData]) -> float:
+    buf = _filled(policy, fill)
+    start = time.perf_counter_ns()
+    for s in spans:
+        buf.enqueue(s)
+    return (time.perf_counter_ns() - start) / len(spans)
+
+
+def _threaded(policy: str, spans: list[SpanData]) -> float:
+    buf = RingBuffer(maxsize=len(spans) + 1, overflow=policy)
+    share = len(spans) // _THREADS
+    barrier = threading.Barrier(_THREADS + 1)
+
+    def producer(part: list[SpanData]) -> None:
+        barrier.wait()
+        for s in part:
+            buf.enqueue(s)
+
+    threads = [
+        threading.Thread(target=producer, args=(spans[i * share:(i + 1) * share],))
+        for i in range(_THREADS)
+    ]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter_ns()
+    for t in threads:
+        t.join()
+    return (time.perf_counter_ns() - start) / (share * _THREADS)
+
+
+def _drain(policy: str, fill: list[SpanData]) -> float:
+    buf = _filled(policy, fill)
+    start = time.perf_counter_ns()
+    buf.drain(len(fill))
+    return (time.perf_counter_ns() - start) / len(fill)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    spans = _spans(args.iterations)
+    fill = _spans(_CAPACITY)
+    r = args.repeats
+
+    print("=" * 60)
+    print("Axonize Ring-buffer Benchmark")
+    print("=" * 60)
+    print()
+    print(f"  {'policy':<14} {'room':>8} {'full':>8} {'drain':>8} {'threads':>8}  ns/span")
+    for policy in OVERFLOW_POLICIES:
+        room_ns = _best(lambda p=policy: _with_room(p, spans), r)
+        full_ns = _best(lambda p=policy: _full(p, spans, fill), r)
+        drain_ns = _best(lambda p=policy: _drain(p, fill), r)
+        threads_ns = _best(lambda p=policy: _threaded(p, spans), r)
+        print(f"  {policy:<14} {room_ns:>8.0f} {full_ns:>8.0f} {drain_ns:>8.0f} "
+              f"{threads_ns:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Export throughput benchmark: OTLP/gRPC vs. OTLP/HTTP.
+
+Sends batches of pre-built LLM spans to local collectors running in a
+separate process and reports exporter-side throughput and CPU per span:
+
+  grpc           OTLPExporter (blocking grpc stub)
+  http           OTLPHTTPExporter, protobuf body, no compression
+  http+gzip      OTLPHTTPExporter, protobuf body, gzip (the default)
+  http json      OTLPHTTPExporter, OTLP/JSON body, gzip
+
+Usage:
+    cd sdk-py && uv run python benchmarks/bench_exporters.py [--batches 40] [--batch-size 512]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import time
+from concurrent import futures
+from typing import Any
+
+from axonize._buffer import RingBuffer
+from axonize._exporter import OTLPExporter
+from axonize._http import OTLPHTTPExporter
+from axonize._llm import LLMSpan
+from axonize._types import SpanData
+
+
+def _collectors(ports: Any, stop: Any) -> None:
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    import grpc
+    from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+        ExportTraceServiceResponse,
+    )
+    from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
+        TraceServiceServicer,
+        add_TraceServiceServicer_to_server,
+    )
+
+    class Servicer(TraceServiceServicer):
+        def Export(self, request: Any, context: Any) -> Any:  # noqa: N802
+            return ExportTraceServiceResponse()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    add_TraceServiceServicer_to_server(Servicer(), grpc_server)
+    grpc_port = grpc_server.add_insecure_port("localhost:0")
+    grpc_server.start()
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    ports.put((grpc_port, http_server.server_address[1]))
+    stop.wait()
+    http_server.shutdown()
+    grpc_server.stop(grace=1)
+
+
+def _make_batch(size: int) -> list[SpanData]:
+    buf = RingBuffer(maxsize=size)
+    for _ in range(size):
+        with LLMSpan("generate", buffer=buf, model="llama-3-8b") as s:
+            s.set_tokens_input(128)
+            s.record_tokens(16)
+    return buf.drain(size)
+
+
+def _run(exporter: Any, batch: list[SpanData], batches: int) -> tuple[float, float]:
+    exporter.export(batch)  # warm up connection
+    if isinstance(exporter, OTLPHTTPExporter):
+        exporter.flush()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    for _ in range(batches):
+        exporter.export(batch)
+    if isinstance(exporter, OTLPHTTPExporter):
+        exporter.flush()
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    exporter.shutdown()
+    return wall, cpu
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=512)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    ports = ctx.Queue()
+    stop = ctx.Event()
+    proc = ctx.Process(target=_collectors, args=(ports, stop))
+    proc.start()
+    grpc_port, http_port = ports.get(timeout=30)
+    url = f"http://127.0.0.1:{http_port}"
+
+    print("=" * 60)
+    print("Axonize Exporter Throughput Benchmark")
+    print(f"{args.batches} batches x {args.batch_size} LLM spans")
+    print("=" * 60)
+
+    batch = _make_batch(args.batch_size)
+    total = args.batches * args.batch_size
+    cases: list[tuple[str, Any]] = [
+        ("grpc", lambda: OTLPExporter(f"localhost:{grpc_port}", "bench", "bench")),
+        ("http", lambda: OTLPHTTPExporter(url, "bench", "bench", compression=None)),
+        ("http+gzip", lambda: OTLPHTTPExporter(url, "bench", "bench")),
+        ("http json", lambda: OTLPHTTPExporter(url, "bench", "bench", encoding="json")),
+    ]
+    print()
+    print(f"  {'':12s}  {'spans/s':>10s}  {'CPU/span':>10s}")
+    try:
+        for name, factory in cases:
+            wall, cpu = _run(factory(), batch, args.batches)
+            print(f"  {name:12s}  {total / wall:10.0f}  {cpu / total * 1e6:8.1f}μs")
+    finally:
+        stop.set()
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark: what ``import axonize`` costs a fresh interpreter.
+
+Runs each scenario in new ``python -X importtime`` processes and reports the
+median cumulative import time of ``axonize``, the slowest modules it pulls
+in, and which heavy dependencies were loaded:
+
+  import   import axonize
+  span     import axonize + one Span and one LLMSpan without init()
+  init     import axonize + init() against an unreachable gRPC endpoint
+
+Exporters, protobufs, grpc, asyncio and GPU backends must not load before
+init(). With ``--check`` the script exits non-zero if one does, or if the
+``import`` scenario exceeds ``--budget-ms`` — the cold-start target.
+
+Usage:
+    cd sdk-py && uv run python benchmarks/bench_import.py [--runs 7] [--check]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Loaded only once init() (or an export) needs them
+LAZY_MODULES = (
+    "asyncio",
+    "google.protobuf",
+    "grpc",
+    "opentelemetry",
+    "axonize._exporter",
+    "axonize._gpu",
+    "axonize._http",
+    "axonize._processor",
+    "axonize._shm",
+)
+
+_REPORT = """
+import json, sys
+lazy = {lazy!r}
+loaded = sorted(m for m in lazy if m in sys.modules)
+print(json.dumps(loaded), file=sys.stderr)
+"""
+
+SCENARIOS = {
+    "import": "import axonize\n",
+    "span": (
+        "import axonize\n"
+        "with axonize.span('cold'):\n"
+        "    pass\n"
+        "with axonize.llm_span('cold', model='m') as s:\n"
+        "    s.record_tokens(1)\n"
+    ),
+    "init": (
+        "import axonize\n"
+        "axonize.init(endpoint='localhost:1', service_name='cold')\n"
+        "axonize.shutdown()\n"
+    ),
+}
+
+
+def _run_once(code: str) -> tuple[float, dict[str, int], list[str]]:
+    """Return (axonize cumulative μs, self μs per module, lazy modules loaded)."""
+    script = code + _REPORT.format(lazy=LAZY_MODULES)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = proc.stderr.strip().splitlines()
+    loaded: list[str] = json.loads(lines[-1])
+    cumulative = 0.0
+    self_us: dict[str, int] = {}
+    for line in lines[:-1]:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, total, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        self_us[module] = self_us.get(module, 0) + int(own)
+        if module == "axonize":
+            cumulative = float(total)
+    return cumulative, self_us, loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=75.0)
+    parser.add_argument("--check", action="store_true", help="fail on regressions")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Axonize Cold-start Benchmark")
+    print(f"{args.runs} fresh interpreters per scenario, -X importtime")
+    print("=" * 60)
+
+    failures: list[str] = []
+    for scenario, code in SCENARIOS.items():
+        totals: list[float] = []
+        self_runs: list[dict[str, int]] = []
+        loaded: set[str] = set()
+        for _ in range(args.runs):
+            total, self_us, lazy = _run_once(code)
+            totals.append(total / 1000)
+            self_runs.append(self_us)
+            loaded.update(lazy)
+        median = statistics.median(totals)
+        print(f"\n[{scenario}] axonize import: median {median:.1f}ms "
+              f"(min {min(totals):.1f}ms, max {max(totals):.1f}ms)")
+        print(f"  lazy modules loaded: {', '.join(sorted(loaded)) or 'none'}")
+
+        if scenario == "import":
+            modules = set().union(*self_runs)
+            medians = {
+                m: statistics.median(r.get(m, 0) for r in self_runs) / 1000 for m in modules
+            }
+            slowest = sorted(medians.items(), key=lambda kv: kv[1], reverse=True)
+            for module, ms in slowest[: args.top]:
+                print(f"    {ms:7.2f}ms  {module}")
+            if median > args.budget_ms:
+                failures.append(
+                    f"import axonize took {median:.1f}ms (budget {args.budget_ms:.0f}ms)"
+                )
+        if scenario != "init" and loaded:
+            failures.append(f"{scenario}: loaded {', '.join(sorted(loaded))} before init()")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Span-metrics hot-path benchmark.
+
+Measures what RED metrics add to each finished span on the inference thread:
+  1. SpanMetrics.record() / record_llm() alone
+  2. Span lifecycle, sampled and unsampled, with metrics off and on
+  3. LLMSpan lifecycle with 16 tokens, with metrics off and on
+
+Each figure is the best of ``--repeats`` runs, in ns per span.
+
+Usage:
+    cd sdk-py && uv run python benchmarks/bench_metrics.py [--iterations 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from axonize import _metrics
+from axonize._buffer import RingBuffer
+from axonize._llm import LLMSpan
+from axonize._metrics import SpanMetrics
+from axonize._span import Span
+
+
+def _best(fn: Callable[[int], None], iterations: int, repeats: int) -> float:
+    fn(min(iterations, 5000))  # warmup
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        fn(iterations)
+        best = min(best, (time.perf_counter_ns() - start) / iterations)
+    return best
+
+
+def _span_loop(sampling_rate: float) -> Callable[[int], None]:
+    def run(n: int) -> None:
+        buf = RingBuffer(maxsize=n + 1)
+        for _ in range(n):
+            with Span("bench", buffer=buf, sampling_rate=sampling_rate):
+                pass
+    return run
+
+
+def _llm_loop(n: int) -> None:
+    buf = RingBuffer(maxsize=n + 1)
+    for _ in range(n):
+        with LLMSpan("generate", buffer=buf, model="llama-3-8b") as s:
+            s.set_tokens_input(128)
+            s.record_tokens(16)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    n, r = args.iterations, args.repeats
+
+    metrics = SpanMetrics(lambda series, start, now: None)
+    key = ("generate", "llama-3-8b", "ok", "")
+
+    def record(count: int) -> None:
+        for _ in range(count):
+            metrics.record(key, 1_234_567)
+
+    def record_llm(count: int) -> None:
+        for _ in range(count):
+            metrics.record_llm(key, 1_234_567, 234_567, 128, 16)
+
+    print("=" * 60)
+    print("Axonize Span-metrics Benchmark")
+    print("=" * 60)
+    print()
+    print(f"  record()                     {_best(record, n, r):>8.0f} ns")
+    print(f"  record_llm()                 {_best(record_llm, n, r):>8.0f} ns")
+    print()
+    print(f"  {'':<28} {'off':>8} {'on':>8} {'added':>8}")
+    for label, fn in (
+        ("Span, sampled", _span_loop(1.0)),
+        ("Span, unsampled", _span_loop(0.0)),
+        ("LLMSpan, 16 tokens", _llm_loop),
+    ):
+        _metrics.active = None
+        off = _best(fn, n, r)
+        _metrics.active = metrics
+        on = _best(fn, n, r)
+        _metrics.active = None
+        print(f"  {label:<28} {off:>8.0f} {on:>8.0f} {on - off:>+8.0f}  ns/span")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Multi-process export benchmark: per-worker exporters vs. shared-memory aggregation.
+
+Runs N CPU-only worker processes that each finish M LLM spans, against an
+in-process gRPC collector, in two modes:
+
+  direct  every worker runs its own BackgroundProcessor + OTLPExporter
+          (one gRPC channel per worker)
+  shm     workers write encoded spans into a shared-memory ring; one
+          aggregator process batches across all workers
+
+Reports worker CPU time and peak RSS, aggregator CPU, and the number and
+size of export requests the collector received.
+
+Usage:
+    cd sdk-py && uv run python benchmarks/bench_multiprocess.py [--workers 4] [--spans 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import resource
+import threading
+import time
+from concurrent import futures
+from typing import Any
+
+import grpc
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+    ExportTraceServiceResponse,
+)
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
+    TraceServiceServicer,
+    add_TraceServiceServicer_to_server,
+)
+
+import axonize
+
+
+class _CountingCollector(TraceServiceServicer):
+    def __init__(self) -> None:
+        self.requests = 0
+        self.spans = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def Export(  # noqa: N802
+        self,
+        request: ExportTraceServiceRequest,
+        context: grpc.ServicerContext,
+    ) -> ExportTraceServiceResponse:
+        n = sum(len(ss.spans) for rs in request.resource_spans for ss in rs.scope_spans)
+        with self._lock:
+            self.requests += 1
+            self.spans += n
+            self.bytes += request.ByteSize()
+        return ExportTraceServiceResponse()
+
+
+def _worker(endpoint: str, ring: str | None, spans: int, results: Any) -> None:
+    axonize.init(
+        endpoint=endpoint,
+        service_name="bench-worker",
+        flush_interval_ms=100,
+        buffer_size=spans,
+        shm_ring=ring,
+    )
+    for _ in range(spans):
+        with axonize.llm_span("generate", model="llama-3-8b") as s:
+            s.set_tokens_input(128)
+            s.record_tokens(16)
+    axonize.shutdown()
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((time.process_time(), rss_kb))
+
+
+def _aggregator(endpoint: str, ring_name: str, stop: Any, results: Any) -> None:
+    from axonize._aggregator import SpanAggregator
+    from axonize._exporter import OTLPExporter
+    from axonize._shm import SharedSpanRing
+
+    ring = SharedSpanRing.attach(ring_name)
+    exporter = OTLPExporter(endpoint, service_name="", environment="")
+    aggregator = SpanAggregator(ring, exporter, flush_interval_ms=250)
+    aggregator.start()
+    stop.wait()
+    aggregator.stop()
+    exporter.shutdown()
+    results.put(time.process_time())
+
+
+def run(mode: str, workers: int, spans: int) -> dict[str, float]:
+    collector = _CountingCollector()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    add_TraceServiceServicer_to_server(collector, server)
+    endpoint = f"localhost:{server.add_insecure_port('localhost:0')}"
+    server.start()
+
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    ring = None
+    agg_proc = None
+    agg_results = ctx.Queue()
+    stop = ctx.Event()
+    if mode == "shm":
+        from axonize._shm import SharedSpanRing
+
+        ring = SharedSpanRing.create(lanes=max(workers, 1), slots=4096)
+        agg_proc = ctx.Process(target=_aggregator, args=(endpoint, ring.name, stop, agg_results))
+        agg_proc.start()
+
+    start = time.perf_counter()
+    procs = [
+        ctx.Process(target=_worker, args=(endpoint, ring.name if ring else None, spans, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    worker_stats = [results.get(timeout=600) for _ in procs]
+    for p in procs:
+        p.join()
+
+    agg_cpu = 0.0
+    if agg_proc is not None and ring is not None:
+        stop.set()
+        agg_cpu = agg_results.get(timeout=60)
+        agg_proc.join()
+        ring.close()
+        ring.unlink()
+    elapsed = time.perf_counter() - start
+    server.stop(grace=1)
+
+    return {
+        "elapsed_s": elapsed,
+        "worker_cpu_s": sum(cpu for cpu, _ in worker_stats) / workers,
+        "worker_rss_mb": max(rss for _, rss in worker_stats) / 1024,
+        "aggregator_cpu_s": agg_cpu,
+        "node_cpu_s": sum(cpu for cpu, _ in worker_stats) + agg_cpu,
+        "requests": collector.requests,
+        "spans": collector.spans,
+        "spans_per_request": collector.spans / max(collector.requests, 1),
+        "kb_per_request": collector.bytes / 1024 / max(collector.requests, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--spans", type=int, default=5000, help="spans per worker")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Axonize Multi-process Export Benchmark")
+    print(f"{args.workers} workers x {args.spans} LLM spans")
+    print("=" * 60)
+
+    results = {mode: run(mode, args.workers, args.spans) for mode in ("direct", "shm")}
+    rows = [
+        ("CPU per worker (s)", "worker_cpu_s", "{:.2f}"),
+        ("Peak RSS per worker (MB)", "worker_rss_mb", "{:.1f}"),
+        ("Aggregator CPU (s)", "aggregator_cpu_s", "{:.2f}"),
+        ("Node CPU total (s)", "node_cpu_s", "{:.2f}"),
+        ("Export requests", "requests", "{:.0f}"),
+        ("Spans received", "spans", "{:.0f}"),
+        ("Spans per request", "spans_per_request", "{:.0f}"),
+        ("KB per request", "kb_per_request", "{:.1f}"),
+        ("Wall time (s)", "elapsed_s", "{:.2f}"),
+    ]
+    print()
+    print(f"  {'':28s}  {'direct':>10s}  {'shm':>10s}")
+    for label, key, fmt in rows:
+        direct = fmt.format(results["direct"][key])
+        shm = fmt.format(results["shm"][key])
+        print(f"  {label:28s}  {direct:>10s}  {shm:>10s}")
+
+    expected = args.workers * args.spans
+    for mode, r in results.items():
+        if r["spans"] != expected:
+            print(f"\nWARNING: {mode} delivered {r['spans']:.0f}/{expected} spans")
+
+
+if __name__ == "__main__":
+    main()
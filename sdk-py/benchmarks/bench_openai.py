@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""OpenAI streaming instrumentation benchmark.
+
+Measures what instrument() adds per streamed chunk:
+  1. The stream wrapper alone, over in-memory chunks (no openai needed),
+     next to the previous per-chunk content inspection
+  2. End to end: OpenAI and AsyncOpenAI clients streaming chat completions
+     from a local fake server, plain vs. instrumented (requires openai)
+
+Each figure is the best of ``--repeats`` runs, in ns per chunk.
+
+Usage:
+    cd sdk-py && uv run python benchmarks/bench_openai.py [--chunks 256] [--streams 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any
+
+import axonize
+from axonize._buffer import RingBuffer
+from axonize._llm import LLMSpan
+from axonize.integrations.openai import _Stream, instrument
+
+
+def _best(fn: Callable[[], None], count: int, repeats: int) -> float:
+    fn()  # warmup
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        fn()
+        best = min(best, (time.perf_counter_ns() - start) / count)
+    return best
+
+
+def _chunks(n: int) -> list[Any]:
+    def chunk(content: str | None, finish: str | None = None) -> Any:
+        delta = SimpleNamespace(content=content, role=None, tool_calls=None)
+        choice = SimpleNamespace(delta=delta, index=0, finish_reason=finish)
+        return SimpleNamespace(choices=[choice], usage=None)
+
+    return [chunk("tok") for _ in range(n)] + [chunk(None, "stop")]
+
+
+def _bench_wrapper(n: int, repeats: int) -> None:
+    chunks = _chunks(n)
+    buf = RingBuffer(maxsize=1 << 20)
+
+    def plain() -> None:
+        for _ in chunks:
+            pass
+
+    def inspected() -> None:
+        # Per-chunk path before the rewrite: three getattr calls per chunk
+        with LLMSpan("bench", buffer=buf) as span:
+            for chunk in chunks:
+                choices = getattr(chunk, "choices", [])
+                if choices:
+                    delta = getattr(choices[0], "delta", None)
+                    content = getattr(delta, "content", None) if delta else None
+                    if content:
+                        span.record_token()
+
+    def wrapped() -> None:
+        span = LLMSpan("bench", buffer=buf)
+        span.__enter__()
+        for _ in _Stream(chunks, span):
+            pass
+
+    base = _best(plain, len(chunks), repeats)
+    print(f"  {'plain iteration':<32} {base:>8.0f} ns/chunk")
+    for label, fn in (("content inspection (previous)", inspected), ("stream wrapper", wrapped)):
+        cost = _best(fn, len(chunks), repeats)
+        print(f"  {label:<32} {cost:>8.0f} ns/chunk  ({cost - base:+.0f})")
+    buf.drain(1 << 20)
+
+
+def _serve(chunks: int) -> ThreadingHTTPServer:
+    def event(payload: dict[str, Any]) -> bytes:
+        return b"data: " + json.dumps(payload).encode() + b"\n\n"
+
+    def chunk(delta: dict[str, Any], finish: str | None = None) -> bytes:
+        return event({
+            "id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": 0,
+            "model": "bench", "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        })
+
+    body = (
+        chunk({"role": "assistant", "content": ""})
+        + b"".join(chunk({"content": "tok"}) for _ in range(chunks))
+        + chunk({}, "stop")
+        + b"data: [DONE]\n\n"
+    )
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _bench_end_to_end(chunks: int, streams: int, repeats: int) -> None:
+    try:
+        import openai
+    except ImportError:
+        print("  (openai not installed; skipping end-to-end)")
+        return
+
+    server = _serve(chunks)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    request: dict[str, Any] = {
+        "model": "bench", "messages": [{"role": "user", "content": "hi"}], "stream": True,
+    }
+    total = chunks * streams
+
+    def sync_run(client: Any) -> Callable[[], None]:
+        def run() -> None:
+            for _ in range(streams):
+                for _ in client.chat.completions.create(**request):
+                    pass
+        return run
+
+    def async_run(client: Any) -> Callable[[], None]:
+        async def streams_() -> None:
+            for _ in range(streams):
+                async for _ in await client.chat.completions.create(**request):
+                    pass
+
+        def run() -> None:
+            asyncio.run(streams_())
+        return run
+
+    for label, make, run in (
+        ("OpenAI", openai.OpenAI, sync_run),
+        ("AsyncOpenAI", openai.AsyncOpenAI, async_run),
+    ):
+        plain = _best(run(make(base_url=base_url, api_key="bench")), total, repeats)
+        instrumented = _best(
+            run(instrument(make(base_url=base_url, api_key="bench"))), total, repeats,
+        )
+        print(f"  {label:<14} plain {plain:>8.0f}  instrumented {instrumented:>8.0f}"
+              f"  ({instrumented - plain:+.0f}) ns/chunk")
+    server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=256)
+    parser.add_argument("--streams", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    # Spans are buffered but not exported during the run
+    axonize.init(
+        endpoint="localhost:4317", service_name="bench-openai",
+        buffer_size=1 << 20, flush_interval_ms=3_600_000,
+    )
+    print("=" * 60)
+    print("Axonize OpenAI Streaming Benchmark")
+    print("=" * 60)
+    print()
+    print("Stream wrapper, in-memory chunks:")
+    _bench_wrapper(args.chunks * args.streams, args.repeats)
+    print()
+    print(f"End to end, local fake server ({args.chunks} chunks/stream):")
+    _bench_end_to_end(args.chunks, args.streams, args.repeats)
+    axonize.shutdown()
+
+
+if __name__ == "__main__":
+    main()
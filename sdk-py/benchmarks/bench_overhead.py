@@ -6,6 +6,8 @@ Measures the hot-path cost of:
   2. span.set_gpus() (label → GPUAttribution resolution)
   3. span.__exit__   (end timing + buffer enqueue)
 
+Also reports per-span allocation counts (tracemalloc) for Span and LLMSpan.
+
 Target: < 1μs total overhead per inference call.
 
 Usage:
@@ -14,10 +16,13 @@ Usage:
 
 from __future__ import annotations
 
+import gc
 import time
+import tracemalloc
 
 from axonize._buffer import RingBuffer
 from axonize._gpu import MockGPUProfiler
+from axonize._llm import LLMSpan
 from axonize._span import Span
 from axonize._types import SpanKind
 
@@ -91,6 +96,81 @@ def bench_span_with_profiler(iterations: int = 200_000) -> float:
         sdk_mod._sdk_instance = original
 
 
+def bench_llm_span_adhoc_vs_template(iterations: int = 100_000) -> tuple[float, float]:
+    """Benchmark: axonize.llm_span(...) vs a prepared SpanTemplate, with mock profiler.
+
+    Returns (adhoc_ns, template_ns) per span lifecycle.
+    """
+    import axonize
+    import axonize._sdk as sdk_mod
+    from axonize._config import AxonizeConfig
+
+    config = AxonizeConfig(endpoint="localhost:4317", service_name="bench", gpu_profiling=True)
+    fake_sdk = sdk_mod._AxonizeSDK(config)
+    fake_sdk._buffer = RingBuffer(maxsize=2 * iterations + 4000)
+    fake_sdk._gpu_profiler = MockGPUProfiler(num_gpus=4)
+
+    original = sdk_mod._sdk_instance
+    sdk_mod._sdk_instance = fake_sdk
+    template = axonize.prepare_llm_span(
+        "generate", model="llama-3-70b", model_version="v1", gpus=["cuda:0", "cuda:1"]
+    )
+
+    def adhoc(n: int) -> None:
+        for _ in range(n):
+            with axonize.llm_span("generate", model="llama-3-70b", model_version="v1") as s:
+                s.set_gpus(["cuda:0", "cuda:1"])
+
+    def prepared(n: int) -> None:
+        for _ in range(n):
+            with template():
+                pass
+
+    try:
+        results: list[float] = []
+        for fn in (adhoc, prepared):
+            fn(1000)  # Warmup
+            fake_sdk._buffer.drain(fake_sdk._buffer._maxsize)
+            gc.collect()
+            gc.disable()  # Retained spans make collector passes dominate otherwise
+            start = time.perf_counter_ns()
+            fn(iterations)
+            results.append((time.perf_counter_ns() - start) / iterations)
+            gc.enable()
+            fake_sdk._buffer.drain(fake_sdk._buffer._maxsize)
+        return results[0], results[1]
+    finally:
+        gc.enable()
+        sdk_mod._sdk_instance = original
+
+
+def bench_record_token(iterations: int = 500_000, *, batch: int = 1) -> float:
+    """Benchmark: LLMSpan per-token cost (record_token, or record_tokens(batch) per step).
+
+    Returns ns per token, including inter-token histogram updates.
+    """
+    span = LLMSpan("bench", buffer=None, model="llama-3-70b")
+    span.__enter__()
+    try:
+        steps = iterations // batch
+        if batch == 1:
+            for _ in range(1000):  # Warmup (allocates the histogram)
+                span.record_token()
+            start = time.perf_counter_ns()
+            for _ in range(steps):
+                span.record_token()
+        else:
+            for _ in range(1000):
+                span.record_tokens(batch)
+            start = time.perf_counter_ns()
+            for _ in range(steps):
+                span.record_tokens(batch)
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        span.__exit__(None, None, None)
+    return elapsed / (steps * batch)
+
+
 def bench_enqueue_only(iterations: int = 500_000) -> float:
     """Benchmark: ring buffer enqueue cost only."""
     from axonize._types import SpanData, SpanStatus
@@ -121,6 +201,42 @@ def bench_enqueue_only(iterations: int = 500_000) -> float:
     return elapsed / iterations
 
 
+def bench_span_allocations(iterations: int = 20_000, *, llm: bool = False) -> tuple[float, float]:
+    """Benchmark: memory blocks and bytes allocated per finished span.
+
+    Finished spans stay in the buffer, so the traced delta is what each span
+    costs to create and keep until export. Returns (blocks, bytes) per span.
+    """
+    buf = RingBuffer(maxsize=iterations + 1000)
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            if llm:
+                with LLMSpan("bench", buffer=buf, model="llama-3-70b") as s:
+                    s.set_tokens_input(128)
+                    s.record_token()
+            else:
+                with Span("bench", buffer=buf) as s:
+                    s.set_attribute("batch_size", 32)
+
+    # Warmup (interns keys, fills caches)
+    run(1000)
+    buf.drain(buf._maxsize)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        run(iterations)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    blocks = sum(st.count_diff for st in stats)
+    size = sum(st.size_diff for st in stats)
+    return blocks / iterations, size / iterations
+
+
 def main() -> None:
     print("=" * 60)
     print("Axonize Inference Overhead Benchmark")
@@ -152,6 +268,21 @@ def main() -> None:
     status = "PASS" if ns < 10000 else "WARN" if ns < 20000 else "FAIL"
     results.append(("Span + set_gpus (mock profiler)", ns, f"{status} (target {target})"))
 
+    # 5. Per-token recording
+    ns = bench_record_token()
+    target = "< 300ns"
+    status = "PASS" if ns < 300 else "WARN" if ns < 1000 else "FAIL"
+    results.append(("LLMSpan.record_token (per token)", ns, f"{status} (target {target})"))
+    ns = bench_record_token(batch=8)
+    status = "PASS" if ns < 300 else "WARN" if ns < 1000 else "FAIL"
+    results.append(("LLMSpan.record_tokens(8) (per token)", ns, f"{status} (target {target})"))
+
+    # 6. Ad-hoc llm_span vs prepared template
+    adhoc_ns, template_ns = bench_llm_span_adhoc_vs_template()
+    results.append(("llm_span + set_gpus (ad-hoc)", adhoc_ns, "(reference)"))
+    speedup = adhoc_ns / template_ns if template_ns else 0.0
+    results.append(("llm_span via SpanTemplate", template_ns, f"({speedup:.2f}x vs ad-hoc)"))
+
     print()
     for name, ns_val, note in results:
         if ns_val >= 1000:
@@ -161,7 +292,13 @@ def main() -> None:
         print(f"  {name:40s}  {display:>10s}   {note}")
 
     print()
-    all_pass = all("PASS" in r[2] or "WARN" in r[2] for r in results)
+    print("  Allocations per finished span (tracemalloc):")
+    for label, llm in (("Span + 1 attribute", False), ("LLMSpan (model, tokens)", True)):
+        blocks, size = bench_span_allocations(llm=llm)
+        print(f"  {label:40s}  {blocks:6.1f} blocks  {size:8.0f} B")
+
+    print()
+    all_pass = all("FAIL" not in r[2] for r in results)
     if all_pass:
         print("All benchmarks within acceptable range.")
     else:
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Tail-sampling cost benchmark: CPU and memory held by the sampler.
+
+Replays a synthetic workload through ``TailSampler`` the way the processor
+drains it — one batch every ``--tick-ms`` of simulated time:
+
+  - ``--rate`` spans/sec in traces of one root and ``--fanout`` children
+  - trace durations spread up to 0.5s; 5% run 3s, past the 1s decision
+    window, so their children are decided by timeout
+  - 1% of traces contain an error span
+
+Reports sampler CPU per span, kept/dropped traces, the peak number of held
+spans, and peak memory (sampler structures measured with tracemalloc, held
+spans estimated from the measured size of a SpanData).
+
+Usage:
+    cd sdk-py && uv run python benchmarks/bench_tail_sampling.py [--rate 10000] [--seconds 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+import time
+import tracemalloc
+
+from axonize._config import TailSamplingPolicy
+from axonize._sampling import TailSampler
+from axonize._types import SpanData, SpanKind, SpanStatus
+
+
+def _make_span(trace_id: str, root: bool, end: float, error: bool) -> SpanData:
+    return SpanData(
+        span_id=f"{random.getrandbits(64):016x}",
+        trace_id=trace_id,
+        name="generate" if root else "decode",
+        kind=SpanKind.SERVER if root else SpanKind.INTERNAL,
+        status=SpanStatus.ERROR if error else SpanStatus.OK,
+        start_time_ns=0,
+        end_time_ns=int(end * 1e9),
+        duration_ms=end * 1000,
+        service_name="bench",
+        attributes={"ai.model.name": "llama-3-8b", "ai.tokens.output": 16},
+        parent_span_id=None if root else "00000000000000aa",
+    )
+
+
+def _workload(rate: int, seconds: float, fanout: int) -> list[tuple[float, SpanData]]:
+    """Spans with their (simulated) finish times, in finish order."""
+    traces = int(rate * seconds / (fanout + 1))
+    events: list[tuple[float, int, SpanData]] = []
+    seq = 0
+    for i in range(traces):
+        start = i * seconds / traces
+        duration = 3.0 if random.random() < 0.05 else random.uniform(0.02, 0.5)
+        trace_id = f"{random.getrandbits(128):032x}"
+        error_at = random.randrange(fanout + 1) if random.random() < 0.01 else -1
+        for c in range(fanout):
+            end = start + duration * (c + 1) / (fanout + 1)
+            events.append((end, seq, _make_span(trace_id, False, end - start, c == error_at)))
+            seq += 1
+        end = start + duration
+        events.append((end, seq, _make_span(trace_id, True, duration, error_at == fanout)))
+        seq += 1
+    heapq.heapify(events)
+    return [(t, sd) for t, _, sd in (heapq.heappop(events) for _ in range(len(events)))]
+
+
+def _span_bytes() -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    spans = [_make_span(f"{i:032x}", False, 0.1, False) for i in range(2000)]
+    size = (tracemalloc.get_traced_memory()[0] - before) / len(spans)
+    tracemalloc.stop()
+    return size
+
+
+def _replay(
+    events: list[tuple[float, SpanData]], args: argparse.Namespace,
+) -> tuple[TailSampler, int, int, float]:
+    """Feed spans as the processor would. Returns (sampler, kept, peak held, CPU s)."""
+    sampler = TailSampler(TailSamplingPolicy(decision_wait_ms=args.decision_wait_ms))
+    tick = args.tick_ms / 1000.0
+    kept = 0
+    peak_held = 0
+    cpu = 0.0
+    i = 0
+    now = 0.0
+    while i < len(events):
+        now += tick
+        batch: list[SpanData] = []
+        while i < len(events) and events[i][0] <= now:
+            batch.append(events[i][1])
+            i += 1
+        t0 = time.process_time()
+        kept += len(sampler.process(batch, now=now))
+        cpu += time.process_time() - t0
+        peak_held = max(peak_held, sampler.buffered_spans)
+    t0 = time.process_time()
+    kept += len(sampler.flush())
+    cpu += time.process_time() - t0
+    return sampler, kept, peak_held, cpu
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=int, default=10_000, help="spans per second")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fanout", type=int, default=4, help="child spans per trace")
+    parser.add_argument("--tick-ms", type=int, default=100, help="processor drain interval")
+    parser.add_argument("--decision-wait-ms", type=int, default=1000)
+    args = parser.parse_args()
+
+    random.seed(1)
+    events = _workload(args.rate, args.seconds, args.fanout)
+    span_bytes = _span_bytes()
+
+    print("=" * 60)
+    print("Axonize Tail-sampling Benchmark")
+    print(f"{args.rate} spans/sec for {args.seconds:.0f}s, "
+          f"{args.decision_wait_ms}ms decision window, {args.tick_ms}ms drain tick")
+    print("=" * 60)
+
+    # CPU is timed without tracemalloc, which slows every allocation.
+    sampler, kept, peak_held, cpu = _replay(events, args)
+    tracemalloc.start()
+    _replay(events, args)
+    _, peak_structures = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = len(events)
+    print()
+    print(f"  Spans processed             {total:>12d}")
+    print(f"  Spans kept                  {kept:>12d}  ({kept / total:.1%})")
+    print(f"  Traces kept / dropped       {sampler.kept_traces:>6d} / {sampler.dropped_traces}")
+    print(f"  Sampler CPU                 {cpu:>11.2f}s  ({cpu / total * 1e6:.2f}μs/span, "
+          f"{cpu / args.seconds:.1%} of one core)")
+    print(f"  Peak held spans             {peak_held:>12d}")
+    print(f"  Peak sampler structures     {peak_structures / 1e6:>10.1f}MB")
+    print(f"  Peak held span data (est.)  {peak_held * span_bytes / 1e6:>10.1f}MB  "
+          f"({span_bytes:.0f}B/span)")
+
+
+if __name__ == "__main__":
+    main()
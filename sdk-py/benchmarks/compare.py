@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Compare two pytest-benchmark runs of benchmarks/suite and flag regressions.
+
+For each benchmark in both runs, compares the per-operation median and p99
+and, where measured, the bytes each operation leaves allocated. A benchmark
+regresses when its median is slower by more than ``--threshold`` percent or
+its allocations grow by more than ``--memory-threshold`` percent. A median
+change smaller than the baseline's own spread (interquartile range over
+median) is never flagged.
+
+p99 changes are shown but only gate with ``--p99-threshold``: the p99 of a
+few hundred rounds is the second-slowest round or so, which mostly measures
+interrupts and preemption unless the CPU is pinned and otherwise idle. Even
+then, a p99 change smaller than the baseline's own tail (p99 over median)
+is not flagged.
+
+Runs are only comparable on the same machine under the same conditions; a
+differing CPU, Python version, CPU pinning, governor or turbo state is
+reported before the table.
+
+Exits 1 if any benchmark regressed, so CI can gate on it.
+
+Usage:
+    cd sdk-py && uv run pytest benchmarks/suite --benchmark-json=baseline.json
+    # ... change the SDK ...
+    cd sdk-py && uv run pytest benchmarks/suite --benchmark-json=current.json
+    cd sdk-py && uv run python benchmarks/compare.py baseline.json current.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any
+
+
+def _load(path: str) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    with open(path) as f:
+        data = json.load(f)
+    return data.get("machine_info", {}), {b["fullname"]: b for b in data["benchmarks"]}
+
+
+def _per_op(bench: dict[str, Any]) -> dict[str, float]:
+    """Per-operation nanoseconds, from the suite's extra_info or the raw round stats."""
+    extra = bench.get("extra_info", {})
+    if "per_op_ns" in extra:
+        return dict(extra["per_op_ns"])
+    ops = extra.get("ops", 1)
+    stats = bench["stats"]
+    return {"median": stats["median"] * 1e9 / ops, "p99": stats["max"] * 1e9 / ops}
+
+
+def _spread(bench: dict[str, Any]) -> float:
+    """Interquartile range relative to the median, in percent."""
+    stats = bench["stats"]
+    return 100.0 * stats["iqr"] / stats["median"] if stats["median"] else 0.0
+
+
+def _tail_spread(per_op: dict[str, float]) -> float:
+    """How far p99 sits above the median, in percent: the run-to-run noise of p99."""
+    return _change(per_op["median"], per_op["p99"])
+
+
+def _change(before: float, after: float) -> float:
+    return 100.0 * (after - before) / before if before else 0.0
+
+
+def _machine_differences(before: dict[str, Any], after: dict[str, Any]) -> list[str]:
+    differences = []
+    checks = [
+        ("CPU", before.get("cpu", {}).get("brand_raw"), after.get("cpu", {}).get("brand_raw")),
+        ("Python", before.get("python_version"), after.get("python_version")),
+    ]
+    env_before, env_after = before.get("axonize", {}), after.get("axonize", {})
+    for key in sorted(set(env_before) | set(env_after)):
+        checks.append((key, env_before.get(key), env_after.get(key)))
+    for name, a, b in checks:
+        if a != b:
+            differences.append(f"{name}: {a} -> {b}")
+    return differences
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("baseline", help="pytest-benchmark JSON of the reference run")
+    parser.add_argument("current", help="pytest-benchmark JSON of the run to check")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Median slowdown that counts as a regression, in percent")
+    parser.add_argument("--p99-threshold", type=float, default=None,
+                        help="Also gate on p99 slowdown above this, in percent (off by default)")
+    parser.add_argument("--memory-threshold", type=float, default=5.0,
+                        help="Growth in bytes allocated per op that counts, in percent")
+    args = parser.parse_args()
+
+    machine_before, baseline = _load(args.baseline)
+    machine_after, current = _load(args.current)
+
+    differences = _machine_differences(machine_before, machine_after)
+    if differences:
+        print("WARNING: runs are from different environments; timings may not compare:")
+        for difference in differences:
+            print(f"  {difference}")
+        print()
+
+    print(f"{'benchmark':<44} {'median ns/op':>21} {'change':>8} {'p99':>8} {'mem':>8}")
+    regressions: list[str] = []
+    for name in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[name], current[name]
+        op_before, op_after = _per_op(before), _per_op(after)
+        median = _change(op_before["median"], op_after["median"])
+        p99 = _change(op_before["p99"], op_after["p99"])
+
+        flags = []
+        if median > max(args.threshold, _spread(before)):
+            flags.append(f"median +{median:.1f}%")
+        if args.p99_threshold is not None and p99 > max(
+            args.p99_threshold, _tail_spread(op_before),
+        ):
+            flags.append(f"p99 +{p99:.1f}%")
+
+        mem_column = ""
+        mem_before = before.get("extra_info", {}).get("alloc_bytes_per_op")
+        mem_after = after.get("extra_info", {}).get("alloc_bytes_per_op")
+        if mem_before is not None and mem_after is not None:
+            mem = _change(mem_before, mem_after)
+            mem_column = f"{mem:+.1f}%"
+            if mem > args.memory_threshold:
+                flags.append(f"memory +{mem:.1f}% ({mem_before:.0f} -> {mem_after:.0f} B/op)")
+
+        short = name.split("::", 1)[-1]
+        print(f"{short:<44} {op_before['median']:>9.0f} -> {op_after['median']:<9.0f} "
+              f"{median:>+7.1f}% {p99:>+7.1f}% {mem_column:>8}{'  REGRESSED' if flags else ''}")
+        if flags:
+            regressions.append(f"{short}: {', '.join(flags)}")
+
+    for label, names in (("only in baseline", baseline.keys() - current.keys()),
+                         ("only in current", current.keys() - baseline.keys())):
+        if names:
+            print(f"\n{label}: {', '.join(sorted(n.split('::', 1)[-1] for n in names))}")
+
+    if regressions:
+        print()
+        for regression in regressions:
+            print(f"FAIL: {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
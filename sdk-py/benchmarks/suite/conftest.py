@@ -0,0 +1,197 @@
+"""Fixtures and reporting for the pytest-benchmark suite.
+
+Run from ``sdk-py``::
+
+    uv run pytest benchmarks/suite --benchmark-json=bench.json --bench-cpu=2
+    uv run python benchmarks/compare.py baseline.json bench.json
+
+Each benchmark times rounds of ``ops`` operations after warmup rounds, so
+even sub-microsecond paths are well above timer resolution. The JSON keeps
+pytest-benchmark's per-round statistics and adds, in ``extra_info``:
+
+- ``ops``: operations per round
+- ``per_op_ns``: min, median, mean, p90 and p99 of the rounds, per operation
+- ``alloc_bytes_per_op`` / ``alloc_blocks_per_op`` where memory is measured:
+  what each operation leaves allocated (tracemalloc), e.g. a buffered span
+
+``machine_info["axonize"]`` records the CPU affinity, frequency governor and
+turbo state, which ``compare.py`` checks before comparing two runs. Only the
+mock GPU profiler is used; no GPU or collector is needed.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import tracemalloc
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+
+import axonize._sdk as sdk_mod
+from axonize._buffer import RingBuffer
+from axonize._config import AxonizeConfig
+from axonize._gpu import MockGPUProfiler
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--bench-cpu", type=int, default=None,
+        help="Pin the benchmark process to this CPU (Linux)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    cpu = config.getoption("--bench-cpu", default=None)
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+
+
+def pytest_report_header(config: pytest.Config) -> list[str]:
+    env = _environment()
+    hints = []
+    affinity = env.get("cpu_affinity")
+    if affinity is not None and len(affinity) > 1:
+        hints.append("not pinned to a CPU: pass --bench-cpu=N (or run under taskset -c N)")
+    governor = env.get("cpu_governor")
+    if governor not in (None, "performance"):
+        hints.append(f"CPU governor is {governor!r}: 'performance' gives steadier numbers")
+    if env.get("turbo"):
+        hints.append("turbo boost is on: disable it to keep clock speed constant between runs")
+    return [f"benchmark hint: {hint}" for hint in hints]
+
+
+def pytest_benchmark_update_machine_info(
+    config: pytest.Config, machine_info: dict[str, Any],
+) -> None:
+    machine_info["axonize"] = _environment()
+
+
+def _environment() -> dict[str, Any]:
+    """What makes two runs comparable beyond the CPU model and Python version."""
+    env: dict[str, Any] = {}
+    if hasattr(os, "sched_getaffinity"):
+        affinity = sorted(os.sched_getaffinity(0))
+        env["cpu_affinity"] = affinity
+        env["cpu_governor"] = _read(
+            f"/sys/devices/system/cpu/cpu{affinity[0]}/cpufreq/scaling_governor"
+        )
+    no_turbo = _read("/sys/devices/system/cpu/intel_pstate/no_turbo")
+    boost = _read("/sys/devices/system/cpu/cpufreq/boost")
+    if no_turbo is not None:
+        env["turbo"] = no_turbo == "0"
+    elif boost is not None:
+        env["turbo"] = boost == "1"
+    return env
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class OpsBenchmark:
+    """Times rounds of ``ops`` operations and reports per-operation statistics."""
+
+    def __init__(self, benchmark: Any) -> None:
+        self._benchmark = benchmark
+
+    def __call__(
+        self,
+        run: Callable[[], object],
+        *,
+        ops: int,
+        rounds: int = 200,
+        warmup_rounds: int = 20,
+        setup: Callable[[], None] | None = None,
+    ) -> None:
+        """Benchmark ``run``, which performs ``ops`` operations per call.
+
+        ``setup`` runs untimed before every round, e.g. to drain a buffer.
+        """
+        benchmark = self._benchmark
+        benchmark.extra_info["ops"] = ops
+        benchmark.pedantic(run, setup=setup, rounds=rounds, warmup_rounds=warmup_rounds)
+        stats = getattr(benchmark.stats, "stats", None)
+        if stats is None:  # --benchmark-disable
+            return
+        per_op = [t * 1e9 / ops for t in stats.sorted_data]
+        benchmark.extra_info["per_op_ns"] = {
+            "min": round(per_op[0], 2),
+            "median": round(stats.median * 1e9 / ops, 2),
+            "mean": round(stats.mean * 1e9 / ops, 2),
+            "p90": round(_percentile(per_op, 90), 2),
+            "p99": round(_percentile(per_op, 99), 2),
+        }
+
+    def measure_memory(
+        self, run: Callable[[], object], *, ops: int, setup: Callable[[], None] | None = None,
+    ) -> None:
+        """Record what one call of ``run`` leaves allocated, per operation."""
+        if setup is not None:
+            setup()
+        run()  # warm caches and interned keys first
+        if setup is not None:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            run()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        diff = after.compare_to(before, "filename")
+        self._benchmark.extra_info["alloc_bytes_per_op"] = round(
+            sum(d.size_diff for d in diff) / ops, 1
+        )
+        self._benchmark.extra_info["alloc_blocks_per_op"] = round(
+            sum(d.count_diff for d in diff) / ops, 2
+        )
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@pytest.fixture
+def ops_benchmark(benchmark: Any) -> OpsBenchmark:
+    return OpsBenchmark(benchmark)
+
+
+@pytest.fixture
+def sdk() -> Iterator[sdk_mod._AxonizeSDK]:
+    """An SDK with a mock 4-GPU profiler and no processor, installed as the singleton.
+
+    Finished spans stay in ``sdk._buffer`` until a benchmark drains it.
+    """
+    config = AxonizeConfig(endpoint="localhost:4317", service_name="bench", gpu_profiling=True)
+    instance = sdk_mod._AxonizeSDK(config)
+    instance._buffer = RingBuffer(maxsize=1 << 16)
+    instance._gpu_profiler = MockGPUProfiler(num_gpus=4)
+    original = sdk_mod._sdk_instance
+    sdk_mod._sdk_instance = instance
+    yield instance
+    sdk_mod._sdk_instance = original
+
+
+@pytest.fixture
+def drain() -> Callable[[RingBuffer | None], Callable[[], None]]:
+    """``drain(buf)`` is a round setup that empties ``buf``, so rounds start alike."""
+
+    def make(buf: RingBuffer | None) -> Callable[[], None]:
+        assert buf is not None
+
+        def setup() -> None:
+            buf.drain(buf._maxsize)
+
+        return setup
+
+    return make
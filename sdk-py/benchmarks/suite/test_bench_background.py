@@ -0,0 +1,143 @@
+"""Background paths: draining, sampling and encoding a batch off the inference thread.
+
+An op is one span of a 512-span batch of LLM spans on two mock GPUs.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from conftest import OpsBenchmark
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize._buffer import RingBuffer
+from axonize._config import TailSamplingPolicy
+from axonize._exporter import _build_encoded_request, _build_export_request, _encode_span
+from axonize._gpu import MockGPUProfiler
+from axonize._http import _to_otlp_json
+from axonize._processor import BackgroundProcessor
+from axonize._sampling import TailSampler
+from axonize._types import SpanData
+from axonize.files import FileExporter
+
+BATCH = 512
+
+
+@pytest.fixture
+def batch(sdk: sdk_mod._AxonizeSDK) -> list[SpanData]:
+    """512 finished spans: 128 traces of a request span with three LLM children."""
+    for i in range(BATCH // 4):
+        with axonize.span("request") as root:
+            root.set_attribute("route", "/v1/chat")
+            for _ in range(3):
+                with axonize.llm_span("generate", model="llama-3-70b") as s:
+                    s.set_gpus(["cuda:0", "cuda:1"])
+                    s.set_tokens_input(128 + i)
+                    s.record_tokens(16)
+    assert sdk._buffer is not None
+    spans = sdk._buffer.drain(BATCH)
+    assert len(spans) == BATCH
+    return spans
+
+
+def test_build_export_request(batch: list[SpanData], ops_benchmark: OpsBenchmark) -> None:
+    """``OTLPExporter.export`` encoding: protobuf request built and serialized."""
+
+    def run() -> None:
+        _build_export_request(batch, "bench", "ci").SerializeToString()
+
+    ops_benchmark.measure_memory(run, ops=BATCH)
+    ops_benchmark(run, ops=BATCH, rounds=50, warmup_rounds=5)
+
+
+def test_encode_spans(batch: list[SpanData], ops_benchmark: OpsBenchmark) -> None:
+    """Per-span encoding plus framing, as the asynchronous exporter does it."""
+
+    def run() -> None:
+        _build_encoded_request({("bench", "ci"): [_encode_span(sd) for sd in batch]})
+
+    ops_benchmark(run, ops=BATCH, rounds=50, warmup_rounds=5)
+
+
+def test_otlp_json(batch: list[SpanData], ops_benchmark: OpsBenchmark) -> None:
+    """OTLP/HTTP JSON conversion of an encoded request."""
+    request = _build_export_request(batch, "bench", "ci").SerializeToString()
+
+    def run() -> None:
+        _to_otlp_json(request)
+
+    ops_benchmark(run, ops=BATCH, rounds=30, warmup_rounds=3)
+
+
+def _refill(buf: RingBuffer, spans: list[SpanData]) -> Callable[[], None]:
+    def setup() -> None:
+        buf.drain(buf._maxsize)
+        for sd in spans:
+            buf.enqueue(sd)
+
+    return setup
+
+
+def test_drain(batch: list[SpanData], ops_benchmark: OpsBenchmark) -> None:
+    buf = RingBuffer(maxsize=BATCH)
+
+    def run() -> None:
+        buf.drain(BATCH)
+
+    ops_benchmark(run, ops=BATCH, setup=_refill(buf, batch))
+
+
+def test_processor_flush(batch: list[SpanData], ops_benchmark: OpsBenchmark) -> None:
+    """One drain-loop iteration with a handler that discards the batch."""
+    buf = RingBuffer(maxsize=BATCH)
+    processor = BackgroundProcessor(buf, batch_size=BATCH)
+
+    def run() -> None:
+        processor._flush()
+
+    ops_benchmark(run, ops=BATCH, setup=_refill(buf, batch))
+
+
+def test_tail_sampler(batch: list[SpanData], ops_benchmark: OpsBenchmark) -> None:
+    """Grouping and deciding 128 complete traces, with a fresh sampler each round."""
+    samplers: list[TailSampler] = []
+
+    def setup() -> None:
+        samplers[:] = [TailSampler(TailSamplingPolicy())]
+
+    def run() -> None:
+        samplers[0].process(batch)
+
+    ops_benchmark(run, ops=BATCH, setup=setup, rounds=50, warmup_rounds=5)
+
+
+def test_file_export(
+    batch: list[SpanData], ops_benchmark: OpsBenchmark, tmp_path: Path,
+) -> None:
+    """``FileExporter`` NDJSON rows, gzip compressed, to a local file."""
+    exporter = FileExporter(tmp_path, rotate_spans=1 << 30)
+
+    def run() -> None:
+        exporter.export(batch)
+
+    try:
+        ops_benchmark(run, ops=BATCH, rounds=30, warmup_rounds=3)
+    finally:
+        exporter.shutdown()
+    assert exporter.stats.failed_spans == 0
+
+
+def test_resolve_gpus(ops_benchmark: OpsBenchmark) -> None:
+    """GPU attribution at span end for two labels, from cached snapshots."""
+    profiler = MockGPUProfiler(num_gpus=4)
+    labels = ["cuda:0", "cuda:1"]
+    ops = 1000
+
+    def run() -> None:
+        for _ in range(ops):
+            profiler.resolve_labels(labels)
+
+    ops_benchmark(run, ops=ops)
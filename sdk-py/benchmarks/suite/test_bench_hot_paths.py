@@ -0,0 +1,234 @@
+"""Inference-thread hot paths: what every request pays for tracing."""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+from collections.abc import Callable, Iterator
+
+import pytest
+from conftest import OpsBenchmark
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize import _metrics
+from axonize._buffer import RingBuffer
+from axonize._llm import LLMSpan
+from axonize._types import SpanData, SpanKind, SpanStatus
+
+OPS = 1000
+
+Drain = Callable[[RingBuffer | None], Callable[[], None]]
+
+
+def test_span(sdk: sdk_mod._AxonizeSDK, ops_benchmark: OpsBenchmark, drain: Drain) -> None:
+    def run() -> None:
+        for _ in range(OPS):
+            with axonize.span("bench") as s:
+                s.set_attribute("batch_size", 32)
+
+    ops_benchmark.measure_memory(run, ops=OPS, setup=drain(sdk._buffer))
+    ops_benchmark(run, ops=OPS, setup=drain(sdk._buffer))
+
+
+def test_span_set_gpus(
+    sdk: sdk_mod._AxonizeSDK, ops_benchmark: OpsBenchmark, drain: Drain,
+) -> None:
+    def run() -> None:
+        for _ in range(OPS):
+            with axonize.span("bench") as s:
+                s.set_gpus(["cuda:0", "cuda:1"])
+
+    ops_benchmark(run, ops=OPS, setup=drain(sdk._buffer))
+
+
+def test_nested_spans(
+    sdk: sdk_mod._AxonizeSDK, ops_benchmark: OpsBenchmark, drain: Drain,
+) -> None:
+    """One op is a request span with two children, one nested in the other."""
+
+    def run() -> None:
+        for _ in range(OPS):
+            with axonize.span("request"):
+                with axonize.span("preprocess"):
+                    pass
+                with axonize.span("forward"), axonize.span("attention"):
+                    pass
+
+    ops_benchmark(run, ops=OPS, setup=drain(sdk._buffer))
+
+
+def test_unsampled_span(
+    sdk: sdk_mod._AxonizeSDK, ops_benchmark: OpsBenchmark, drain: Drain,
+) -> None:
+    sdk.config = dataclasses.replace(sdk.config, sampling_rate=0.0)
+
+    def run() -> None:
+        for _ in range(OPS):
+            with axonize.span("bench") as s:
+                s.set_attribute("batch_size", 32)
+
+    ops_benchmark(run, ops=OPS, setup=drain(sdk._buffer))
+    assert sdk._buffer is not None and len(sdk._buffer) == 0
+
+
+def test_span_with_metrics(
+    sdk: sdk_mod._AxonizeSDK, ops_benchmark: OpsBenchmark, drain: Drain,
+) -> None:
+    """Span lifecycle with RED metrics on (``metrics=True``); recording only."""
+    metrics = _metrics.SpanMetrics(lambda series, start, now: None)
+    _metrics.active = metrics
+    try:
+        def run() -> None:
+            for _ in range(OPS):
+                with axonize.span("bench"):
+                    pass
+
+        ops_benchmark(run, ops=OPS, setup=drain(sdk._buffer))
+    finally:
+        _metrics.active = None
+
+
+def test_llm_span(sdk: sdk_mod._AxonizeSDK, ops_benchmark: OpsBenchmark, drain: Drain) -> None:
+    """One op is a generation: input tokens, 16 streamed steps, TTFT/TPOT on exit."""
+
+    def run() -> None:
+        for _ in range(OPS):
+            with axonize.llm_span("generate", model="llama-3-70b") as s:
+                s.set_tokens_input(128)
+                for _ in range(16):
+                    s.record_token()
+
+    ops_benchmark.measure_memory(run, ops=OPS, setup=drain(sdk._buffer))
+    ops_benchmark(run, ops=OPS, setup=drain(sdk._buffer))
+
+
+def test_llm_span_template(
+    sdk: sdk_mod._AxonizeSDK, ops_benchmark: OpsBenchmark, drain: Drain,
+) -> None:
+    template = axonize.prepare_llm_span(
+        "generate", model="llama-3-70b", model_version="v1", gpus=["cuda:0", "cuda:1"],
+    )
+
+    def run() -> None:
+        for _ in range(OPS):
+            with template():
+                pass
+
+    ops_benchmark(run, ops=OPS, setup=drain(sdk._buffer))
+
+
+@pytest.fixture
+def open_llm_span() -> Iterator[LLMSpan]:
+    span = LLMSpan("generate", buffer=RingBuffer(maxsize=8), model="llama-3-70b")
+    with span:
+        yield span
+
+
+@pytest.mark.parametrize("batch", [1, 8])
+def test_record_tokens(open_llm_span: LLMSpan, ops_benchmark: OpsBenchmark, batch: int) -> None:
+    """Per decode step: ``record_token()``, or ``record_tokens(8)`` for multi-token steps."""
+    span = open_llm_span
+
+    if batch == 1:
+        def run() -> None:
+            for _ in range(OPS):
+                span.record_token()
+    else:
+        def run() -> None:
+            for _ in range(OPS):
+                span.record_tokens(batch)
+
+    ops_benchmark(run, ops=OPS)
+
+
+def test_trace_decorator(
+    sdk: sdk_mod._AxonizeSDK, ops_benchmark: OpsBenchmark, drain: Drain,
+) -> None:
+    @axonize.trace
+    def handler(x: int) -> int:
+        return x + 1
+
+    def run() -> None:
+        for i in range(OPS):
+            handler(i)
+
+    ops_benchmark(run, ops=OPS, setup=drain(sdk._buffer))
+
+
+def _span_data() -> SpanData:
+    return SpanData(
+        span_id="00f067aa0ba902b7",
+        trace_id="4bf92f3577b34da6a3ce929d0e0e4736",
+        name="bench",
+        kind=SpanKind.INTERNAL,
+        status=SpanStatus.OK,
+        start_time_ns=1000,
+        end_time_ns=2000,
+        duration_ms=0.001,
+        service_name="bench",
+        parent_span_id="b7ad6b7169203331",
+    )
+
+
+def test_enqueue(ops_benchmark: OpsBenchmark, drain: Drain) -> None:
+    buf = RingBuffer(maxsize=OPS)
+    sd = _span_data()
+
+    def run() -> None:
+        for _ in range(OPS):
+            buf.enqueue(sd)
+
+    ops_benchmark(run, ops=OPS, setup=drain(buf))
+
+
+def test_enqueue_full_buffer(ops_benchmark: OpsBenchmark) -> None:
+    """Overflow path: every enqueue evicts the oldest span (``drop_oldest``)."""
+    buf = RingBuffer(maxsize=64)
+    sd = _span_data()
+    for _ in range(64):
+        buf.enqueue(sd)
+
+    def run() -> None:
+        for _ in range(OPS):
+            buf.enqueue(sd)
+
+    ops_benchmark(run, ops=OPS)
+
+
+THREADS = 4
+
+
+def test_enqueue_threads(
+    sdk: sdk_mod._AxonizeSDK, ops_benchmark: OpsBenchmark, drain: Drain,
+) -> None:
+    """Four threads finishing spans into one buffer; an op is one span on any thread."""
+    start = threading.Barrier(THREADS + 1)
+    done = threading.Barrier(THREADS + 1)
+    stop = threading.Event()
+
+    def worker() -> None:
+        while True:
+            start.wait()
+            if stop.is_set():
+                return
+            for _ in range(OPS // THREADS):
+                with axonize.span("bench"):
+                    pass
+            done.wait()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(THREADS)]
+    for t in threads:
+        t.start()
+
+    def run() -> None:
+        start.wait()
+        done.wait()
+
+    try:
+        ops_benchmark(run, ops=OPS, setup=drain(sdk._buffer), rounds=100)
+    finally:
+        stop.set()
+        start.wait()
+        for t in threads:
+            t.join()
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from axonize._config import AdaptiveSamplingPolicy, TailSamplingPolicy
 from axonize._llm import LLMSpan
-from axonize._sdk import _get_sdk, init, shutdown
+from axonize._sdk import _get_sdk, init, shutdown, shutdown_async
 from axonize._span import Span
+from axonize._template import SpanTemplate, prepare_llm_span, prepare_span
 from axonize._trace import trace
 from axonize._types import GPUAttribution, SpanData, SpanKind, SpanStatus
 
@@ -16,17 +18,24 @@ if TYPE_CHECKING:
 __version__ = "0.1.0"
 
 __all__ = [
+    "AdaptiveSamplingPolicy",
     "GPUAttribution",
     "LLMSpan",
     "Span",
     "SpanData",
     "SpanKind",
     "SpanStatus",
+    "SpanTemplate",
+    "TailSamplingPolicy",
     "__version__",
     "init",
     "llm_span",
+    "prepare_llm_span",
+    "prepare_span",
     "shutdown",
+    "shutdown_async",
     "span",
+    "stats",
     "trace",
 ]
 
@@ -35,16 +44,21 @@ def span(
     name: str,
     *,
     kind: SpanKind = SpanKind.INTERNAL,
+    device_timing: bool = False,
 ) -> Span:
     """Create a span context manager.
 
+    With ``device_timing=True``, CUDA events recorded when the span is
+    entered and exited add the GPU execution time as ``gpu.device_time_ms``,
+    without synchronizing the host. Ignored when no GPU is available.
+
     Usage::
 
         with axonize.span("process-batch") as s:
             s.set_attribute("batch_size", 32)
     """
     sdk = _get_sdk()
-    return sdk.create_span(name, kind=kind)
+    return sdk.create_span(name, kind=kind, device_timing=device_timing)
 
 
 def llm_span(
@@ -54,9 +68,12 @@ def llm_span(
     model_version: str | None = None,
     inference_type: str = "llm",
     kind: SpanKind = SpanKind.SERVER,
+    device_timing: bool = False,
 ) -> LLMSpan:
     """Create an LLM-specialized span with token tracking and TTFT/TPOT.
 
+    ``device_timing`` works as for :func:`span`.
+
     Usage::
 
         with axonize.llm_span("generate", model="llama-3-70b") as s:
@@ -72,4 +89,18 @@ def llm_span(
         model_version=model_version,
         inference_type=inference_type,
         kind=kind,
+        device_timing=device_timing,
     )
+
+
+def stats() -> dict[str, Any]:
+    """Snapshot of the SDK's own health: drops, queue depth, exports and CPU.
+
+    Usage::
+
+        s = axonize.stats()
+        s["spans"]["dropped"], s["export"]["failed_spans"], s["buffer"]["high_water"]
+
+    Returns an empty dict when the SDK is not initialized.
+    """
+    return _get_sdk().stats()
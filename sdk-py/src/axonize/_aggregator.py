@@ -0,0 +1,123 @@
+"""Node-local aggregator — drains a shared-memory span ring into OTLP requests."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from axonize._exporter import OTLPExporter, _build_encoded_request
+from axonize._http import OTLPHTTPExporter
+from axonize._shm import SharedSpanRing, decode_resource_prefix, split_record
+
+logger = logging.getLogger("axonize.aggregator")
+
+
+class SpanAggregator:
+    """Daemon thread that batches spans from every ring lane into one exporter.
+
+    Records are polled every ``poll_interval_ms`` and shipped once
+    ``batch_size`` spans are pending or ``flush_interval_ms`` has passed since
+    the oldest pending one. Span bytes produced by the workers are framed into
+    the request without being decoded.
+    """
+
+    def __init__(
+        self,
+        ring: SharedSpanRing,
+        exporter: OTLPExporter | OTLPHTTPExporter,
+        *,
+        batch_size: int = 8192,
+        flush_interval_ms: int = 1000,
+        poll_interval_ms: int = 5,
+    ) -> None:
+        self._ring = ring
+        self._exporter = exporter
+        self._batch_size = batch_size
+        self._flush_interval_s = flush_interval_ms / 1000.0
+        self._poll_interval_s = poll_interval_ms / 1000.0
+        self._positions = ring.consumer_positions()
+        self._next_lane = 0
+        self._pending: list[bytes] = []
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.exported_spans = 0
+        self.export_requests = 0
+
+    def start(self) -> None:
+        """Start the drain loop."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Signal stop, then drain whatever the workers have already written."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+        while self._poll():
+            if len(self._pending) >= self._batch_size:
+                self._flush()
+        self._flush()
+
+    def _run(self) -> None:
+        oldest = 0.0
+        while not self._stop_event.is_set():
+            got = self._poll()
+            if self._pending:
+                now = time.monotonic()
+                if oldest == 0.0:
+                    oldest = now
+                if (
+                    len(self._pending) >= self._batch_size
+                    or now - oldest >= self._flush_interval_s
+                ):
+                    self._flush()
+                    oldest = 0.0
+                    continue
+            if not got:
+                self._stop_event.wait(self._poll_interval_s)
+
+    def _poll(self) -> int:
+        """Read ready records from all lanes, round-robin. Returns the count read."""
+        ring = self._ring
+        pending = self._pending
+        before = len(pending)
+        lanes = ring.lanes
+        # Bound each lane's share so one busy worker cannot starve the others
+        share = max(1, (self._batch_size - before) // lanes)
+        for i in range(lanes):
+            lane = (self._next_lane + i) % lanes
+            self._positions[lane] = ring.read_lane(lane, self._positions[lane], pending, share)
+        self._next_lane = (self._next_lane + 1) % lanes
+        return len(pending) - before
+
+    def _flush(self) -> None:
+        records = self._pending
+        if not records:
+            return
+        self._pending = []
+        groups: dict[bytes, list[memoryview]] = {}
+        for record in records:
+            prefix, span = split_record(record)
+            spans = groups.get(prefix)
+            if spans is None:
+                spans = groups[prefix] = []
+            spans.append(span)
+        try:
+            request = _build_encoded_request(
+                {decode_resource_prefix(p): spans for p, spans in groups.items()}
+            )
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to assemble %d spans", len(records), exc_info=True)
+            return
+        if self._exporter.export_encoded(request, len(records)):
+            self.exported_spans += len(records)
+            self.export_requests += 1
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
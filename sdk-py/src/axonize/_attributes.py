@@ -0,0 +1,169 @@
+"""Copy-on-write span attributes with interned keys.
+
+Attribute keys are interned process-wide into a small integer id table.
+Spans store per-span overrides keyed by id, layered on top of an optional
+shared, immutable ``BaseAttributes`` (e.g. model name/inference type), so
+the common keys are never copied per span. The exporter maps key ids
+straight to pre-encoded protobuf key bytes.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Iterator, Mapping
+
+AttributeValue = str | int | float | bool
+
+# Interned key table. Attribute keys are expected to be low-cardinality
+# (semantic-convention style names), so the table is never pruned.
+_key_ids: dict[str, int] = {}
+_keys: list[str] = []
+_intern_lock = threading.Lock()
+
+
+def _reset_intern_lock() -> None:
+    # A thread interning a key at fork time would leave the child's copy held.
+    global _intern_lock  # noqa: PLW0603
+    _intern_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_intern_lock)
+
+
+def intern_key(key: str) -> int:
+    """Return the stable integer id for an attribute key, assigning one if new."""
+    kid = _key_ids.get(key)
+    if kid is not None:
+        return kid
+    with _intern_lock:
+        kid = _key_ids.get(key)
+        if kid is None:
+            # Append before publishing the id so readers never see a dangling id.
+            _keys.append(key)
+            kid = len(_keys) - 1
+            _key_ids[key] = kid
+    return kid
+
+
+def key_name(kid: int) -> str:
+    """Return the attribute key for an interned id."""
+    return _keys[kid]
+
+
+class BaseAttributes:
+    """Immutable attribute layer shared by many spans.
+
+    ``encoded`` is an exporter-side cache of the layer's serialized OTLP
+    attributes, filled on first export and reused for every span after.
+    """
+
+    __slots__ = ("_values", "encoded")
+
+    def __init__(self, values: Mapping[str, AttributeValue]) -> None:
+        self._values: dict[int, AttributeValue] = {
+            intern_key(k): v for k, v in values.items()
+        }
+        self.encoded: bytes | None = None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        items = {_keys[k]: v for k, v in self._values.items()}
+        return f"BaseAttributes({items!r})"
+
+
+class SpanAttributes(Mapping[str, AttributeValue]):
+    """Per-span attribute store: lazily allocated overrides over a shared base.
+
+    Ownership moves to the exported ``SpanData`` when the span ends instead of
+    being copied; ``seal()`` marks that hand-off, after which writes are ignored
+    (an ended span is immutable) so the exporter never sees a concurrent edit.
+    """
+
+    __slots__ = ("_base", "_own", "_sealed")
+
+    def __init__(self, base: BaseAttributes | None = None) -> None:
+        self._base = base
+        self._own: dict[int, AttributeValue] | None = None
+        self._sealed = False
+
+    def __setitem__(self, key: str, value: AttributeValue) -> None:
+        if self._sealed:
+            return
+        kid = _key_ids.get(key)
+        if kid is None:
+            kid = intern_key(key)
+        own = self._own
+        if own is None:
+            own = self._own = {}
+        own[kid] = value
+
+    def __getitem__(self, key: str) -> AttributeValue:
+        kid = _key_ids.get(key)
+        if kid is not None:
+            if self._own is not None and kid in self._own:
+                return self._own[kid]
+            if self._base is not None and kid in self._base._values:
+                return self._base._values[kid]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for kid, _ in self.items_by_id():
+            yield _keys[kid]
+
+    def __len__(self) -> int:
+        own = self._own
+        base = self._base
+        if base is None:
+            return 0 if own is None else len(own)
+        if own is None:
+            return len(base._values)
+        return len(base._values) + sum(1 for k in own if k not in base._values)
+
+    def __repr__(self) -> str:
+        return f"SpanAttributes({dict(self)!r})"
+
+    def items_by_id(self) -> Iterator[tuple[int, AttributeValue]]:
+        """Yield ``(key_id, value)`` pairs, overrides taking precedence over the base."""
+        own = self._own
+        if self._base is not None:
+            for kid, value in self._base._values.items():
+                if own is None or kid not in own:
+                    yield kid, value
+        if own is not None:
+            yield from own.items()
+
+    def get_by_id(self, kid: int) -> AttributeValue | None:
+        """Look up a value by interned key id, or None if unset."""
+        own = self._own
+        if own is not None:
+            value = own.get(kid)
+            if value is not None:
+                return value
+        if self._base is not None:
+            return self._base._values.get(kid)
+        return None
+
+    def with_value(self, key: str, value: AttributeValue) -> SpanAttributes:
+        """A sealed copy with one more value, for amending an exported snapshot."""
+        copy = SpanAttributes(self._base)
+        copy._own = dict(self._own) if self._own is not None else {}
+        copy._own[intern_key(key)] = value
+        copy._sealed = True
+        return copy
+
+    def seal(self) -> None:
+        """Freeze the store once ownership has moved to the exported snapshot."""
+        self._sealed = True
+
+    @property
+    def base(self) -> BaseAttributes | None:
+        return self._base
+
+    @property
+    def overrides(self) -> dict[int, AttributeValue] | None:
+        """Per-span values keyed by interned id, or None if none were set."""
+        return self._own
@@ -1,44 +1,194 @@
-"""Lock-free ring buffer for span data."""
+"""Bounded ring buffer for span data."""
 
 from __future__ import annotations
 
+import threading
+import time
 from collections import deque
 
-from axonize._types import SpanData
+from axonize._types import SpanData, SpanStatus
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block", "sample_down")
+
+# "sample_down": the sampling scale halves after this many consecutive drains
+# that saw drops, and recovers by _SCALE_STEP per drain without drops.
+_SUSTAINED_DRAINS = 2
+_MIN_SCALE = 1 / 64
+_SCALE_STEP = 0.125
+_BLOCK_POLL_S = 0.0005
 
 
 class RingBuffer:
     """Thread-safe ring buffer backed by collections.deque.
 
-    CPython's GIL guarantees that deque.append and deque.popleft are atomic,
-    so no explicit locking is needed for single-producer/single-consumer usage.
+    Producers hold a lock across the depth check, any eviction and the
+    append, so concurrent producers never push the depth past ``maxsize``.
+    ``drain()`` only removes spans, which cannot break the bound, and relies
+    on deque.popleft being atomic under the GIL instead of taking the lock.
+
+    Root and error spans are held apart from other spans and are never
+    dropped while a child span could be dropped instead. When full, the
+    ``overflow`` policy decides what goes:
+
+    - ``"drop_oldest"``: evict the oldest span (the default).
+    - ``"drop_newest"``: drop the incoming span.
+    - ``"block"``: wait up to ``block_timeout_s`` for the processor to make
+      room, then drop the incoming span. For batch jobs, not request paths.
+    - ``"sample_down"``: drop the incoming span, and lower ``sample_scale``
+      (which scales head sampling) while overflow persists.
+
+    Enqueued totals and the high-water mark are derived on the drain side:
+    between drains the depth only grows, so its peak is the depth seen just
+    before a drain.
     """
 
-    def __init__(self, maxsize: int) -> None:
-        self._buffer: deque[SpanData] = deque(maxlen=maxsize)
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        overflow: str = "drop_oldest",
+        block_timeout_s: float = 0.1,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}, got {overflow!r}"
+            )
+        self._priority: deque[SpanData] = deque()
+        self._normal: deque[SpanData] = deque()
         self._drop_count: int = 0
         self._maxsize = maxsize
+        self._overflow = overflow
+        self._block_timeout_s = block_timeout_s
+        self._drained: int = 0
+        self._high_water: int = 0
+        self._unsampled: int = 0
+        # Multiplies the head-sampling rate of new root spans
+        self.sample_scale = 1.0
+        self._drops_seen = 0
+        self._overflowing = 0
+        self._lock = threading.Lock()
 
     def enqueue(self, span: SpanData) -> None:
-        """Add a span to the buffer. Oldest item is dropped if full."""
-        if len(self._buffer) == self._maxsize:
+        """Add a span to the buffer, applying the overflow policy if full."""
+        priority = span.parent_span_id is None or span.status is SpanStatus.ERROR
+        if self._overflow == "block" and len(self) >= self._maxsize:
+            # Wait without the lock; the check below decides under it.
+            self._wait_for_room()
+        with self._lock:
+            if len(self._priority) + len(self._normal) >= self._maxsize:
+                if not self._make_room(priority):
+                    self._drop_count += 1
+                    return
+            if priority:
+                self._priority.append(span)
+            else:
+                self._normal.append(span)
+
+    def _wait_for_room(self) -> None:
+        deadline = time.monotonic() + self._block_timeout_s
+        while len(self) >= self._maxsize and time.monotonic() < deadline:
+            time.sleep(_BLOCK_POLL_S)
+
+    def _make_room(self, priority: bool) -> bool:
+        """Free a slot for an incoming span. False means drop the incoming span.
+
+        Called with the lock held, so only ``drain()`` can remove spans meanwhile.
+        """
+        if self._overflow == "drop_oldest":
+            if self._normal:
+                victim = self._normal
+            elif priority:
+                victim = self._priority
+            else:
+                return False
+            try:
+                victim.popleft()
+            except IndexError:  # drained meanwhile
+                return True
+            self._drop_count += 1
+            return True
+
+        # Drop the newest span, making room for a priority span at the
+        # expense of the newest child if there is one.
+        if priority and self._normal:
+            try:
+                self._normal.pop()
+            except IndexError:
+                return True
             self._drop_count += 1
-        self._buffer.append(span)
+            return True
+        return False
 
     def drain(self, max_items: int) -> list[SpanData]:
-        """Remove and return up to max_items spans from the buffer."""
+        """Remove and return up to max_items spans, in the order they finished."""
+        depth = len(self)
+        if depth > self._high_water:
+            self._high_water = depth
         items: list[SpanData] = []
-        for _ in range(max_items):
+        priority = self._priority
+        normal = self._normal
+        # Each queue is in finish order; merge them so children still
+        # precede their root (the tail sampler decides at the root).
+        while len(items) < max_items:
+            if priority and (not normal or priority[0].end_time_ns < normal[0].end_time_ns):
+                queue = priority
+            elif normal:
+                queue = normal
+            else:
+                break
             try:
-                items.append(self._buffer.popleft())
-            except IndexError:
+                items.append(queue.popleft())
+            except IndexError:  # emptied by an evicting producer
                 break
+        self._drained += len(items)
         return items
 
+    def update_sampling(self) -> None:
+        """Adjust ``sample_scale`` from the drops since the last call.
+
+        Called by the processor after each drain; only ``"sample_down"``
+        changes the scale.
+        """
+        drops = self._drop_count - self._drops_seen
+        self._drops_seen += drops
+        if self._overflow != "sample_down":
+            return
+        if drops:
+            self._overflowing += 1
+            if self._overflowing >= _SUSTAINED_DRAINS:
+                self.sample_scale = max(_MIN_SCALE, self.sample_scale / 2)
+        else:
+            self._overflowing = 0
+            if len(self) < self._maxsize // 2:
+                self.sample_scale = min(1.0, self.sample_scale + _SCALE_STEP)
+
+    def count_unsampled(self) -> None:
+        """Count a finished span that sampling kept out of the buffer."""
+        self._unsampled += 1
+
+    @property
+    def overflow(self) -> str:
+        return self._overflow
+
     @property
     def drop_count(self) -> int:
         """Number of spans dropped due to buffer overflow."""
         return self._drop_count
 
+    @property
+    def enqueued_count(self) -> int:
+        """Number of spans ever enqueued, including those later dropped."""
+        return self._drained + len(self) + self._drop_count
+
+    @property
+    def high_water(self) -> int:
+        """Deepest the buffer has been, as seen by ``drain()``."""
+        return max(self._high_water, len(self))
+
+    @property
+    def unsampled_count(self) -> int:
+        """Number of finished spans not enqueued because they were not sampled."""
+        return self._unsampled
+
     def __len__(self) -> int:
-        return len(self._buffer)
+        return len(self._priority) + len(self._normal)
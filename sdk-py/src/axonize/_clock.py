@@ -0,0 +1,38 @@
+"""Span clock — monotonic timestamps with a per-process wall-clock anchor.
+
+Spans read only ``monotonic_ns()`` (``time.perf_counter_ns``), so durations,
+TTFT and TPOT are immune to NTP slews and clock steps. Wall time is derived
+by adding an offset that is sampled once per span at start; the background
+processor refreshes the offset periodically via ``recalibrate()`` so long-
+running processes follow wall-clock adjustments between spans.
+"""
+
+from __future__ import annotations
+
+import time
+
+monotonic_ns = time.perf_counter_ns
+
+
+def _measure_offset_ns() -> int:
+    """Sample wall minus monotonic time, bracketing the wall read to halve the error."""
+    before = time.perf_counter_ns()
+    wall = time.time_ns()
+    after = time.perf_counter_ns()
+    return wall - (before + after) // 2
+
+
+# Read by every span at start; rebound (atomically) by recalibrate().
+_wall_offset_ns: int = _measure_offset_ns()
+
+
+def wall_offset_ns() -> int:
+    """Return the current offset to add to ``monotonic_ns()`` values for epoch time."""
+    return _wall_offset_ns
+
+
+def recalibrate() -> int:
+    """Re-anchor monotonic time to the wall clock and return the new offset."""
+    global _wall_offset_ns  # noqa: PLW0603
+    _wall_offset_ns = _measure_offset_ns()
+    return _wall_offset_ns
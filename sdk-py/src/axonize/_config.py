@@ -2,7 +2,69 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class AdaptiveSamplingPolicy:
+    """Head sampling that adjusts its rate to a traces-per-second target.
+
+    Root spans are grouped by ``key`` — the span name, or with
+    ``key="model"`` the model name (span name for spans without one). Keys
+    listed in ``budgets`` get their own traces/sec; the rest share
+    ``traces_per_second`` fairly, so keys with little traffic keep every
+    trace while busy keys are thinned. Rates are recomputed every
+    ``interval_ms`` from the observed traffic.
+    """
+
+    traces_per_second: float
+    key: str = "name"
+    budgets: Mapping[str, float] = field(default_factory=dict)
+    interval_ms: int = 1000
+
+    def __post_init__(self) -> None:
+        if self.traces_per_second < 0 or any(b < 0 for b in self.budgets.values()):
+            raise ValueError("traces_per_second and budgets must not be negative")
+        if self.key not in ("name", "model"):
+            raise ValueError(f"key must be 'name' or 'model', got {self.key!r}")
+        if self.interval_ms <= 0:
+            raise ValueError("interval_ms must be positive")
+
+
+@dataclass(frozen=True)
+class TailSamplingPolicy:
+    """Which traces to keep, decided after they finish.
+
+    A trace is kept if any policy matches: it contains an error span
+    (``keep_errors``), its root is slower than the ``latency_percentile`` of
+    recent roots with the same name or than ``latency_threshold_ms``, or one
+    of its spans ran a model in ``models``. Otherwise it is kept with
+    probability ``sample_rate``, derived from the trace ID so every service
+    makes the same choice.
+
+    Spans are held until the root span finishes or ``decision_wait_ms``
+    after the trace was first seen; at most ``max_buffered_spans`` are held,
+    beyond which the oldest traces are decided early.
+    """
+
+    keep_errors: bool = True
+    latency_percentile: float | None = 0.99
+    latency_threshold_ms: float | None = None
+    models: tuple[str, ...] = ()
+    sample_rate: float = 0.05
+    decision_wait_ms: int = 1000
+    max_buffered_spans: int = 50_000
+
+    def __post_init__(self) -> None:
+        if self.latency_percentile is not None and not 0.0 < self.latency_percentile < 1.0:
+            raise ValueError(
+                f"latency_percentile must be in (0, 1), got {self.latency_percentile!r}"
+            )
+        if not 0.0 <= self.sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be in [0, 1], got {self.sample_rate!r}")
+        if self.decision_wait_ms <= 0 or self.max_buffered_spans <= 0:
+            raise ValueError("decision_wait_ms and max_buffered_spans must be positive")
 
 
 @dataclass(frozen=True)
@@ -15,7 +77,15 @@ class AxonizeConfig:
     batch_size: int = 512
     flush_interval_ms: int = 5000
     buffer_size: int = 8192
+    overflow: str = "drop_oldest"
+    overflow_block_ms: int = 100
     sampling_rate: float = 1.0
     gpu_profiling: bool = False
     gpu_snapshot_interval_ms: int = 100
     api_key: str | None = None
+    shm_ring: str | None = None
+    mode: str = "thread"
+    tail_sampling: TailSamplingPolicy | None = None
+    adaptive_sampling: AdaptiveSamplingPolicy | None = None
+    metrics: bool = False
+    metrics_interval_ms: int = 10_000
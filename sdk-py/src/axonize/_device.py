@@ -0,0 +1,147 @@
+"""Device timing — GPU execution time of a span from CUDA events.
+
+Kernels launch asynchronously, so a span's wall-clock duration measures the
+launches, not the GPU work. A span created with ``device_timing=True``
+records an event on the current stream when it is entered and another when
+it exits. Neither call blocks. The processor thread holds the finished span
+back until the end event has completed, then sets ``gpu.device_time_ms`` to
+the elapsed time between the two events.
+
+Events come from an event factory: ``torch.cuda.Event(enable_timing=True)``
+by default, or any object with the same ``record()`` / ``query()`` /
+``synchronize()`` / ``elapsed_time()`` methods (see ``set_event_factory``).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable, Mapping
+from typing import Protocol
+
+from axonize._attributes import AttributeValue, SpanAttributes
+from axonize._types import SpanData
+
+DEVICE_TIME_KEY = "gpu.device_time_ms"
+
+
+class DeviceEvent(Protocol):
+    """The subset of ``torch.cuda.Event`` used for device timing."""
+
+    def record(self) -> None: ...
+
+    def query(self) -> bool: ...
+
+    def synchronize(self) -> None: ...
+
+    def elapsed_time(self, end_event: DeviceEvent) -> float: ...
+
+
+EventFactory = Callable[[], DeviceEvent]
+
+_factory: EventFactory | None = None
+_factory_resolved = False
+
+
+def set_event_factory(factory: EventFactory | None) -> None:
+    """Use ``factory`` to create device events, e.g. a fake on CPU-only machines.
+
+    ``None`` restores the default: CUDA events when torch sees a GPU.
+    """
+    global _factory, _factory_resolved
+    _factory = factory
+    _factory_resolved = factory is not None
+
+
+def event_factory() -> EventFactory | None:
+    """The configured event factory, or None when device timing is unavailable."""
+    global _factory, _factory_resolved
+    if not _factory_resolved:
+        _factory = _cuda_event_factory()
+        _factory_resolved = True
+    return _factory
+
+
+def _cuda_event_factory() -> EventFactory | None:
+    try:
+        import torch
+    except ImportError:
+        return None
+    try:
+        if not torch.cuda.is_available():
+            return None
+    except Exception:  # noqa: BLE001
+        return None  # Graceful degradation — a broken CUDA setup disables device timing
+
+    def cuda_event() -> DeviceEvent:
+        event: DeviceEvent = torch.cuda.Event(enable_timing=True)
+        return event
+
+    return cuda_event
+
+
+class DeviceTimeResolver:
+    """Holds device-timed spans back until their end event has completed.
+
+    Not thread-safe: owned by the processor that drains the ring buffer. Spans
+    without events pass straight through; held spans are released, in drain
+    order, by a later ``resolve()`` once the GPU has caught up.
+    """
+
+    def __init__(self) -> None:
+        self._held: list[SpanData] = []
+        self.resolved_spans = 0
+        self.failed_spans = 0
+
+    def resolve(self, spans: list[SpanData], *, wait: bool = False) -> list[SpanData]:
+        """Return the spans ready for export, with device times filled in.
+
+        With ``wait``, block on unfinished events instead of holding spans
+        back; used when the SDK shuts down.
+        """
+        held = self._held
+        if not held and not any(sd.device_events is not None for sd in spans):
+            return spans
+        pending = held + spans if held else spans
+        ready: list[SpanData] = []
+        self._held = []
+        for sd in pending:
+            events = sd.device_events
+            if events is None:
+                ready.append(sd)
+                continue
+            resolved = self._try_resolve(sd, events, wait)
+            if resolved is None:
+                self._held.append(sd)
+            else:
+                ready.append(resolved)
+        return ready
+
+    @property
+    def held_spans(self) -> int:
+        return len(self._held)
+
+    def _try_resolve(
+        self, sd: SpanData, events: tuple[DeviceEvent, DeviceEvent], wait: bool
+    ) -> SpanData | None:
+        start, end = events
+        try:
+            if wait:
+                end.synchronize()
+            elif not end.query():
+                return None
+            elapsed_ms = start.elapsed_time(end)
+        except Exception:  # noqa: BLE001
+            # Graceful degradation — a failed device never blocks export
+            self.failed_spans += 1
+            return dataclasses.replace(sd, device_events=None)
+        self.resolved_spans += 1
+        attributes = _with_value(sd.attributes, DEVICE_TIME_KEY, round(elapsed_ms, 3))
+        return dataclasses.replace(sd, attributes=attributes, device_events=None)
+
+
+def _with_value(
+    attributes: Mapping[str, AttributeValue], key: str, value: AttributeValue
+) -> Mapping[str, AttributeValue]:
+    if isinstance(attributes, SpanAttributes):
+        return attributes.with_value(key, value)
+    return {**attributes, key: value}
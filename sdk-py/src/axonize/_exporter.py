@@ -1,22 +1,44 @@
-"""OTLP gRPC exporter — converts SpanData batches to protobuf and ships them."""
+"""OTLP gRPC exporter — converts SpanData batches to protobuf and ships them.
+
+Also encodes the SDK's span metrics as OTLP metrics. The encoding helpers
+here are shared with the OTLP/HTTP exporter; ``grpc`` itself is imported
+only when a gRPC exporter is constructed.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-from typing import TYPE_CHECKING
+import struct
+import time
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
 
-import grpc
+from opentelemetry.proto.collector.metrics.v1.metrics_service_pb2 import (
+    ExportMetricsServiceRequest,
+    ExportMetricsServiceResponse,
+)
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
-)
-from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
-    TraceServiceStub,
+    ExportTraceServiceResponse,
 )
 from opentelemetry.proto.common.v1.common_pb2 import (
     AnyValue,
     InstrumentationScope,
     KeyValue,
 )
+from opentelemetry.proto.metrics.v1.metrics_pb2 import (
+    AggregationTemporality,
+    Gauge,
+    Histogram,
+    HistogramDataPoint,
+    Metric,
+    NumberDataPoint,
+    ResourceMetrics,
+    ScopeMetrics,
+    Sum,
+)
 from opentelemetry.proto.resource.v1.resource_pb2 import Resource
 from opentelemetry.proto.trace.v1.trace_pb2 import (
     ResourceSpans,
@@ -29,13 +51,21 @@ from opentelemetry.proto.trace.v1.trace_pb2 import (
     Status as OtlpStatus,
 )
 
+from axonize._attributes import AttributeValue, SpanAttributes, intern_key, key_name
+from axonize._metrics import OVERFLOW_KEY, TIME_BOUNDS_US, TOKEN_BOUNDS, bucket_counts
+from axonize._stats import ExportStats
 from axonize._types import SpanKind, SpanStatus
 
 if TYPE_CHECKING:
-    from axonize._types import SpanData
+    from axonize._histogram import LogLinearHistogram
+    from axonize._metrics import Series, SeriesKey
+    from axonize._types import GPUAttribution, SpanData
 
 logger = logging.getLogger("axonize.exporter")
 
+_EXPORT_METHOD = "/opentelemetry.proto.collector.trace.v1.TraceService/Export"
+_EXPORT_METRICS_METHOD = "/opentelemetry.proto.collector.metrics.v1.MetricsService/Export"
+
 _KIND_MAP: dict[SpanKind, int] = {
     SpanKind.INTERNAL: OtlpSpan.SPAN_KIND_INTERNAL,
     SpanKind.SERVER: OtlpSpan.SPAN_KIND_SERVER,
@@ -49,7 +79,7 @@ _STATUS_MAP: dict[SpanStatus, int] = {
 }
 
 
-def _make_attribute(key: str, value: str | int | float | bool) -> KeyValue:
+def _make_attribute(key: str, value: AttributeValue) -> KeyValue:
     """Convert a Python key-value pair to an OTLP KeyValue protobuf."""
     if isinstance(value, bool):
         av = AnyValue(bool_value=value)
@@ -62,29 +92,133 @@ def _make_attribute(key: str, value: str | int | float | bool) -> KeyValue:
     return KeyValue(key=key, value=av)
 
 
+# ---------------------------------------------------------------------------
+# Attribute wire encoding
+#
+# Span attributes are serialized straight to protobuf wire format and merged
+# into the OtlpSpan, skipping per-attribute KeyValue/AnyValue construction.
+# Keys are encoded once per interned key id; shared BaseAttributes layers are
+# encoded once per layer.
+# ---------------------------------------------------------------------------
+
+_SPAN_ATTRIBUTES_TAG = b"\x4a"  # Span.attributes (field 9, length-delimited)
+_KV_VALUE_TAG = b"\x12"  # KeyValue.value (field 2, length-delimited)
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+_pack_double = struct.Struct("<d").pack
+
+# key id -> encoded KeyValue.key field (tag + length + utf-8)
+_key_bytes: dict[int, bytes] = {}
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _len_prefixed(tag: bytes, payload: bytes) -> bytes:
+    return tag + _varint(len(payload)) + payload
+
+
+def _encoded_key(kid: int) -> bytes:
+    encoded = _key_bytes.get(kid)
+    if encoded is None:
+        encoded = _len_prefixed(b"\x0a", key_name(kid).encode("utf-8"))
+        _key_bytes[kid] = encoded
+    return encoded
+
+
+def _encode_any_value(value: AttributeValue) -> bytes:
+    if value is True:
+        return b"\x10\x01"
+    if value is False:
+        return b"\x10\x00"
+    if isinstance(value, int) and _INT64_MIN <= value <= _INT64_MAX:
+        return b"\x18" + _varint(value & 0xFFFFFFFFFFFFFFFF)
+    if isinstance(value, float):
+        return b"\x21" + _pack_double(value)
+    return _len_prefixed(b"\x0a", str(value).encode("utf-8"))
+
+
+def _encode_attribute(kid: int, value: AttributeValue) -> bytes:
+    """Encode one attribute as a Span.attributes field entry."""
+    kv = _encoded_key(kid) + _len_prefixed(_KV_VALUE_TAG, _encode_any_value(value))
+    return _len_prefixed(_SPAN_ATTRIBUTES_TAG, kv)
+
+
+def _encode_attributes(attributes: Mapping[str, AttributeValue]) -> bytes:
+    """Encode a span's attributes, reusing the cached encoding of its base layer."""
+    if not isinstance(attributes, SpanAttributes):
+        return b"".join(_encode_attribute(intern_key(k), v) for k, v in attributes.items())
+
+    base = attributes.base
+    own = attributes.overrides
+    if base is None or (own is not None and not own.keys().isdisjoint(base._values)):
+        return b"".join(_encode_attribute(k, v) for k, v in attributes.items_by_id())
+
+    if base.encoded is None:
+        base.encoded = b"".join(_encode_attribute(k, v) for k, v in base._values.items())
+    if own is None:
+        return base.encoded
+    return base.encoded + b"".join(_encode_attribute(k, v) for k, v in own.items())
+
+
+_GPU_FIELDS = (
+    "resource_uuid",
+    "physical_uuid",
+    "model",
+    "vendor",
+    "node_id",
+    "resource_type",
+    "user_label",
+    "utilization",
+    "memory_used_gb",
+    "memory_total_gb",
+    "temperature_celsius",
+    "power_watts",
+    "clock_mhz",
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _gpu_key_ids(idx: int) -> tuple[int, ...]:
+    return tuple(intern_key(f"gpu.{idx}.{field}") for field in _GPU_FIELDS)
+
+
+def _encode_gpu_attribution(idx: int, ga: GPUAttribution) -> bytes:
+    values: tuple[AttributeValue, ...] = (
+        ga.resource_uuid,
+        ga.physical_gpu_uuid,
+        ga.gpu_model,
+        ga.vendor,
+        ga.node_id,
+        ga.resource_type,
+        ga.user_label,
+        ga.utilization,
+        ga.memory_used_gb,
+        ga.memory_total_gb,
+        ga.temperature_celsius,
+        ga.power_watts,
+        ga.clock_mhz,
+    )
+    return b"".join(
+        _encode_attribute(kid, v) for kid, v in zip(_gpu_key_ids(idx), values, strict=True)
+    )
+
+
+_DURATION_KEY_ID = intern_key("axonize.duration_ms")
+
+
 def _span_data_to_otlp(sd: SpanData) -> OtlpSpan:
     """Convert a single SpanData to an OTLP Span protobuf."""
-    attrs = [_make_attribute(k, v) for k, v in sd.attributes.items()]
-
+    encoded = [_encode_attributes(sd.attributes)]
     for idx, ga in enumerate(sd.gpu_attributions):
-        p = f"gpu.{idx}"
-        attrs.extend([
-            _make_attribute(f"{p}.resource_uuid", ga.resource_uuid),
-            _make_attribute(f"{p}.physical_uuid", ga.physical_gpu_uuid),
-            _make_attribute(f"{p}.model", ga.gpu_model),
-            _make_attribute(f"{p}.vendor", ga.vendor),
-            _make_attribute(f"{p}.node_id", ga.node_id),
-            _make_attribute(f"{p}.resource_type", ga.resource_type),
-            _make_attribute(f"{p}.user_label", ga.user_label),
-            _make_attribute(f"{p}.utilization", ga.utilization),
-            _make_attribute(f"{p}.memory_used_gb", ga.memory_used_gb),
-            _make_attribute(f"{p}.memory_total_gb", ga.memory_total_gb),
-            _make_attribute(f"{p}.temperature_celsius", ga.temperature_celsius),
-            _make_attribute(f"{p}.power_watts", ga.power_watts),
-            _make_attribute(f"{p}.clock_mhz", ga.clock_mhz),
-        ])
-
-    attrs.append(_make_attribute("axonize.duration_ms", sd.duration_ms))
+        encoded.append(_encode_gpu_attribution(idx, ga))
+    encoded.append(_encode_attribute(_DURATION_KEY_ID, sd.duration_ms))
 
     status = OtlpStatus(code=_STATUS_MAP[sd.status])  # type: ignore[arg-type]
     if sd.status == SpanStatus.ERROR and sd.error_message:
@@ -92,7 +226,7 @@ def _span_data_to_otlp(sd: SpanData) -> OtlpSpan:
 
     parent = bytes.fromhex(sd.parent_span_id) if sd.parent_span_id else b""
 
-    return OtlpSpan(
+    otlp_span = OtlpSpan(
         trace_id=bytes.fromhex(sd.trace_id),
         span_id=bytes.fromhex(sd.span_id),
         parent_span_id=parent,
@@ -100,9 +234,24 @@ def _span_data_to_otlp(sd: SpanData) -> OtlpSpan:
         kind=_KIND_MAP.get(sd.kind, OtlpSpan.SPAN_KIND_INTERNAL),  # type: ignore[arg-type]
         start_time_unix_nano=sd.start_time_ns,
         end_time_unix_nano=sd.end_time_ns,
-        attributes=attrs,
         status=status,
     )
+    otlp_span.MergeFromString(b"".join(encoded))
+    return otlp_span
+
+
+def _encode_span(sd: SpanData) -> bytes:
+    """Serialize a single SpanData as OTLP Span protobuf bytes."""
+    return _span_data_to_otlp(sd).SerializeToString()
+
+
+def _make_resource(service_name: str, environment: str) -> Resource:
+    return Resource(attributes=[
+        _make_attribute("service.name", service_name),
+        _make_attribute("deployment.environment", environment),
+        _make_attribute("telemetry.sdk.name", "axonize"),
+        _make_attribute("telemetry.sdk.version", "0.1.0"),
+    ])
 
 
 def _build_export_request(
@@ -111,14 +260,7 @@ def _build_export_request(
     environment: str,
 ) -> ExportTraceServiceRequest:
     """Build an ExportTraceServiceRequest from a batch of SpanData."""
-    resource_attrs = [
-        _make_attribute("service.name", service_name),
-        _make_attribute("deployment.environment", environment),
-        _make_attribute("telemetry.sdk.name", "axonize"),
-        _make_attribute("telemetry.sdk.version", "0.1.0"),
-    ]
-
-    resource = Resource(attributes=resource_attrs)
+    resource = _make_resource(service_name, environment)
     scope = InstrumentationScope(name="axonize", version="0.1.0")
 
     otlp_spans = [_span_data_to_otlp(sd) for sd in spans]
@@ -129,6 +271,230 @@ def _build_export_request(
     return ExportTraceServiceRequest(resource_spans=[resource_spans])
 
 
+@functools.lru_cache(maxsize=64)
+def _encoded_resource_header(service_name: str, environment: str) -> tuple[bytes, bytes]:
+    """Encoded ResourceSpans.resource and ScopeSpans.scope fields for a resource."""
+    resource = _make_resource(service_name, environment).SerializeToString()
+    scope = InstrumentationScope(name="axonize", version="0.1.0").SerializeToString()
+    return _len_prefixed(b"\x0a", resource), _len_prefixed(b"\x0a", scope)
+
+
+def _build_encoded_request(groups: Mapping[tuple[str, str], Sequence[bytes | memoryview]]) -> bytes:
+    """Assemble a serialized ExportTraceServiceRequest from pre-encoded spans.
+
+    ``groups`` maps ``(service_name, environment)`` to OTLP Span bytes. The
+    span bytes are framed as-is, without being parsed or re-serialized.
+    """
+    out: list[bytes] = []
+    for (service_name, environment), spans in groups.items():
+        resource_field, scope_field = _encoded_resource_header(service_name, environment)
+        scope_spans = scope_field + b"".join(
+            b"\x12" + _varint(len(s)) + s for s in spans
+        )
+        resource_spans = resource_field + _len_prefixed(b"\x12", scope_spans)
+        out.append(_len_prefixed(b"\x0a", resource_spans))
+    return b"".join(out)
+
+
+_CUMULATIVE = AggregationTemporality.AGGREGATION_TEMPORALITY_CUMULATIVE
+_TIME_BOUNDS_MS = [b / 1000.0 for b in TIME_BOUNDS_US]
+_TOKEN_BOUNDS = [float(b) for b in TOKEN_BOUNDS]
+
+
+def _series_attributes(key: SeriesKey) -> list[KeyValue]:
+    if key == OVERFLOW_KEY:
+        return [_make_attribute("otel.metric.overflow", True)]
+    name, model, status, gpu = key
+    attrs = [_make_attribute("span.name", name), _make_attribute("status.code", status)]
+    if model:
+        attrs.append(_make_attribute("ai.model.name", model))
+    if gpu:
+        attrs.append(_make_attribute("gpu.resource_uuid", gpu))
+    return attrs
+
+
+def _histogram_point(
+    attrs: list[KeyValue],
+    start_ns: int,
+    time_ns: int,
+    hist: LogLinearHistogram,
+    total: float,
+    bounds: tuple[int, ...],
+    explicit_bounds: list[float],
+) -> HistogramDataPoint:
+    return HistogramDataPoint(
+        attributes=attrs,
+        start_time_unix_nano=start_ns,
+        time_unix_nano=time_ns,
+        count=hist.count,
+        sum=total,
+        bucket_counts=bucket_counts(hist, bounds),
+        explicit_bounds=explicit_bounds,
+    )
+
+
+def _sum(
+    name: str, unit: str, description: str, start_ns: int, time_ns: int,
+    values: Mapping[str, float], attribute: str,
+) -> Metric:
+    points: list[NumberDataPoint] = []
+    for label, value in values.items():
+        point = NumberDataPoint(
+            attributes=[_make_attribute(attribute, label)],
+            start_time_unix_nano=start_ns, time_unix_nano=time_ns,
+        )
+        if isinstance(value, int):
+            point.as_int = value
+        else:
+            point.as_double = value
+        points.append(point)
+    return Metric(
+        name=name, unit=unit, description=description,
+        sum=Sum(data_points=points, aggregation_temporality=_CUMULATIVE, is_monotonic=True),
+    )
+
+
+def _sdk_metrics(
+    sdk_stats: Mapping[str, Any],
+    export_stats: ExportStats | None,
+    start_ns: int,
+    time_ns: int,
+) -> list[Metric]:
+    """The SDK's self-telemetry (see ``axonize.stats()``) as OTLP metrics."""
+    metrics: list[Metric] = []
+    spans = dict(sdk_stats.get("spans", {}))
+    if export_stats is not None:
+        spans["exported"] = export_stats.spans
+        spans["export_failed"] = export_stats.failed_spans
+    if spans:
+        metrics.append(_sum(
+            "axonize.sdk.spans", "{span}", "Spans by outcome", start_ns, time_ns,
+            spans, "outcome",
+        ))
+    buffer = sdk_stats.get("buffer")
+    if buffer is not None:
+        for key in ("size", "high_water"):
+            metrics.append(Metric(
+                name=f"axonize.sdk.buffer.{key}", unit="{span}",
+                gauge=Gauge(data_points=[
+                    NumberDataPoint(time_unix_nano=time_ns, as_int=buffer[key]),
+                ]),
+            ))
+    if export_stats is not None:
+        metrics.append(_sum(
+            "axonize.sdk.export.batches", "{batch}", "Export batches by outcome",
+            start_ns, time_ns,
+            {"ok": export_stats.batches, "failed": export_stats.failed_batches}, "outcome",
+        ))
+        for name, unit, hist, total, bounds, explicit in (
+            ("encode.duration", "ms", export_stats.encode_us,
+             export_stats.encode_us_sum / 1000.0, TIME_BOUNDS_US, _TIME_BOUNDS_MS),
+            ("send.duration", "ms", export_stats.send_us,
+             export_stats.send_us_sum / 1000.0, TIME_BOUNDS_US, _TIME_BOUNDS_MS),
+            ("batch.size", "{span}", export_stats.batch_size,
+             float(export_stats.batch_size_sum), TOKEN_BOUNDS, _TOKEN_BOUNDS),
+        ):
+            if hist.count:
+                metrics.append(Metric(
+                    name=f"axonize.sdk.export.{name}", unit=unit,
+                    histogram=Histogram(
+                        data_points=[_histogram_point(
+                            [], start_ns, time_ns, hist, total, bounds, explicit,
+                        )],
+                        aggregation_temporality=_CUMULATIVE,
+                    ),
+                ))
+    tail = sdk_stats.get("tail_sampling")
+    if tail is not None:
+        metrics.append(_sum(
+            "axonize.sdk.tail_sampling.traces", "{trace}", "Tail-sampled traces by decision",
+            start_ns, time_ns,
+            {"kept": tail["kept_traces"], "dropped": tail["dropped_traces"]}, "decision",
+        ))
+    cpu = sdk_stats.get("cpu_seconds")
+    if cpu:
+        metrics.append(_sum(
+            "axonize.sdk.cpu_time", "s", "CPU time of SDK background threads",
+            start_ns, time_ns, {k: float(v) for k, v in cpu.items()}, "thread",
+        ))
+    return metrics
+
+
+def _build_metrics_request(
+    series: Mapping[SeriesKey, Series],
+    service_name: str,
+    environment: str,
+    start_ns: int,
+    time_ns: int,
+    *,
+    sdk_stats: Mapping[str, Any] | None = None,
+    export_stats: ExportStats | None = None,
+) -> bytes:
+    """Encode cumulative span metrics as a serialized ExportMetricsServiceRequest.
+
+    With ``sdk_stats`` (the ``axonize.stats()`` dict), the SDK's
+    self-telemetry is appended as ``axonize.sdk.*`` metrics.
+    """
+    calls: list[NumberDataPoint] = []
+    duration: list[HistogramDataPoint] = []
+    ttft: list[HistogramDataPoint] = []
+    tokens_in: list[HistogramDataPoint] = []
+    tokens_out: list[HistogramDataPoint] = []
+    for key, s in series.items():
+        attrs = _series_attributes(key)
+        calls.append(NumberDataPoint(
+            attributes=attrs, start_time_unix_nano=start_ns, time_unix_nano=time_ns,
+            as_int=s.count,
+        ))
+        duration.append(_histogram_point(
+            attrs, start_ns, time_ns, s.duration, s.duration_sum / 1000.0,
+            TIME_BOUNDS_US, _TIME_BOUNDS_MS,
+        ))
+        if s.ttft is not None and s.tokens_in is not None and s.tokens_out is not None:
+            if s.ttft.count:
+                ttft.append(_histogram_point(
+                    attrs, start_ns, time_ns, s.ttft, s.ttft_sum / 1000.0,
+                    TIME_BOUNDS_US, _TIME_BOUNDS_MS,
+                ))
+            tokens_in.append(_histogram_point(
+                attrs, start_ns, time_ns, s.tokens_in, s.tokens_in_sum,
+                TOKEN_BOUNDS, _TOKEN_BOUNDS,
+            ))
+            tokens_out.append(_histogram_point(
+                attrs, start_ns, time_ns, s.tokens_out, s.tokens_out_sum,
+                TOKEN_BOUNDS, _TOKEN_BOUNDS,
+            ))
+
+    metrics: list[Metric] = []
+    if series:
+        metrics.append(Metric(
+            name="axonize.span.calls", unit="{span}", description="Finished spans",
+            sum=Sum(data_points=calls, aggregation_temporality=_CUMULATIVE, is_monotonic=True),
+        ))
+        metrics.append(Metric(
+            name="axonize.span.duration", unit="ms", description="Span duration",
+            histogram=Histogram(data_points=duration, aggregation_temporality=_CUMULATIVE),
+        ))
+    for name, unit, description, points in (
+        ("axonize.llm.ttft", "ms", "Time to first token", ttft),
+        ("axonize.llm.tokens.input", "{token}", "Input tokens per LLM span", tokens_in),
+        ("axonize.llm.tokens.output", "{token}", "Output tokens per LLM span", tokens_out),
+    ):
+        if points:
+            metrics.append(Metric(
+                name=name, unit=unit, description=description,
+                histogram=Histogram(data_points=points, aggregation_temporality=_CUMULATIVE),
+            ))
+    if sdk_stats is not None:
+        metrics.extend(_sdk_metrics(sdk_stats, export_stats, start_ns, time_ns))
+
+    scope = InstrumentationScope(name="axonize", version="0.1.0")
+    return ExportMetricsServiceRequest(resource_metrics=[ResourceMetrics(
+        resource=_make_resource(service_name, environment),
+        scope_metrics=[ScopeMetrics(scope=scope, metrics=metrics)],
+    )]).SerializeToString()
+
+
 class OTLPExporter:
     """Exports SpanData batches over gRPC using the OTLP trace protocol.
 
@@ -152,25 +518,64 @@ class OTLPExporter:
         self._metadata: list[tuple[str, str]] | None = None
         if api_key is not None:
             self._metadata = [("authorization", f"Bearer {api_key}")]
+        self.stats = ExportStats()
+
+        import grpc
 
         if insecure:
             self._channel = grpc.insecure_channel(endpoint)
         else:
             self._channel = grpc.secure_channel(endpoint, grpc.ssl_channel_credentials())
 
-        self._stub = TraceServiceStub(self._channel)  # type: ignore[no-untyped-call]
+        # Requests are serialized here (timed separately from the RPC), so
+        # the RPC takes bytes as they are.
+        self._export_raw = self._channel.unary_unary(
+            _EXPORT_METHOD,
+            request_serializer=None,
+            response_deserializer=ExportTraceServiceResponse.FromString,
+        )
+        self._export_metrics_raw = self._channel.unary_unary(
+            _EXPORT_METRICS_METHOD,
+            request_serializer=None,
+            response_deserializer=ExportMetricsServiceResponse.FromString,
+        )
 
     def export(self, spans: list[SpanData]) -> None:
         """Export a batch of spans. Logs and swallows all errors."""
         if not spans:
             return
+        start = time.perf_counter_ns()
         try:
             request = _build_export_request(
                 spans, self._service_name, self._environment
-            )
-            self._stub.Export(request, timeout=self._timeout_s, metadata=self._metadata)
+            ).SerializeToString()
         except Exception:  # noqa: BLE001
-            logger.debug("Failed to export %d spans", len(spans), exc_info=True)
+            logger.debug("Failed to encode %d spans", len(spans), exc_info=True)
+            self.stats.record_failure(len(spans))
+            return
+        self.stats.record_encode(time.perf_counter_ns() - start)
+        self.export_encoded(request, len(spans))
+
+    def export_encoded(self, request: bytes, span_count: int) -> bool:
+        """Send a pre-serialized ExportTraceServiceRequest. Logs and swallows all errors."""
+        start = time.perf_counter_ns()
+        try:
+            self._export_raw(request, timeout=self._timeout_s, metadata=self._metadata)
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to export %d spans", span_count, exc_info=True)
+            self.stats.record_send(span_count, time.perf_counter_ns() - start, ok=False)
+            return False
+        self.stats.record_send(span_count, time.perf_counter_ns() - start, ok=True)
+        return True
+
+    def export_metrics(self, request: bytes) -> bool:
+        """Send a pre-serialized ExportMetricsServiceRequest. Logs and swallows all errors."""
+        try:
+            self._export_metrics_raw(request, timeout=self._timeout_s, metadata=self._metadata)
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to export metrics", exc_info=True)
+            return False
+        return True
 
     def shutdown(self) -> None:
         """Close the gRPC channel."""
@@ -178,3 +583,85 @@ class OTLPExporter:
             self._channel.close()
         except Exception:  # noqa: BLE001
             pass
+
+
+# Spans encoded between cooperative yields in AsyncOTLPExporter
+_ENCODE_CHUNK = 64
+
+
+class AsyncOTLPExporter:
+    """Exports SpanData batches with ``grpc.aio`` on the running event loop.
+
+    Counterpart of ``OTLPExporter`` for ``AsyncBackgroundProcessor``. Large
+    batches are encoded in chunks with a yield to the loop between them, so
+    serialization never blocks other coroutines for long. Must be created
+    and used on the loop that runs the processor.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str,
+        environment: str,
+        *,
+        insecure: bool = True,
+        timeout_s: float = 10.0,
+        api_key: str | None = None,
+    ) -> None:
+        self._service_name = service_name
+        self._environment = environment
+        self._timeout_s = timeout_s
+        self._metadata: tuple[tuple[str, str], ...] | None = None
+        if api_key is not None:
+            self._metadata = (("authorization", f"Bearer {api_key}"),)
+        self.stats = ExportStats()
+
+        import grpc
+        import grpc.aio
+
+        if insecure:
+            self._channel = grpc.aio.insecure_channel(endpoint)
+        else:
+            self._channel = grpc.aio.secure_channel(endpoint, grpc.ssl_channel_credentials())
+        self._export_raw = self._channel.unary_unary(
+            _EXPORT_METHOD,
+            request_serializer=None,
+            response_deserializer=ExportTraceServiceResponse.FromString,
+        )
+
+    async def export(self, spans: list[SpanData]) -> None:
+        """Export a batch of spans. Logs and swallows all errors."""
+        if not spans:
+            return
+        encode_ns = 0
+        try:
+            encoded: list[bytes] = []
+            for start in range(0, len(spans), _ENCODE_CHUNK):
+                if start:
+                    await asyncio.sleep(0)
+                t0 = time.perf_counter_ns()
+                encoded.extend(_encode_span(sd) for sd in spans[start:start + _ENCODE_CHUNK])
+                encode_ns += time.perf_counter_ns() - t0
+            t0 = time.perf_counter_ns()
+            request = _build_encoded_request({(self._service_name, self._environment): encoded})
+            encode_ns += time.perf_counter_ns() - t0
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to encode %d spans", len(spans), exc_info=True)
+            self.stats.record_failure(len(spans))
+            return
+        self.stats.record_encode(encode_ns)
+        start_ns = time.perf_counter_ns()
+        try:
+            await self._export_raw(request, timeout=self._timeout_s, metadata=self._metadata)
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to export %d spans", len(spans), exc_info=True)
+            self.stats.record_send(len(spans), time.perf_counter_ns() - start_ns, ok=False)
+            return
+        self.stats.record_send(len(spans), time.perf_counter_ns() - start_ns, ok=True)
+
+    async def shutdown(self) -> None:
+        """Close the gRPC channel."""
+        try:
+            await self._channel.close()
+        except Exception:  # noqa: BLE001
+            pass
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import logging
 import sys
-import threading
 from dataclasses import dataclass
 
 from axonize._gpu_backend import GPUBackend, _GPUSnapshot
+from axonize._stats import ThreadCPU
 from axonize._types import GPUAttribution
+from axonize._worker import PeriodicWorker
 
 logger = logging.getLogger("axonize.gpu")
 
@@ -25,24 +26,53 @@ class _GPUStaticInfo:
     memory_total_gb: float
 
 
+# (user_label, resource_uuid, static info) per resolvable label
+_GPUPlan = tuple[tuple[str, str, _GPUStaticInfo], ...]
+
+
 class _GPUResolverMixin:
     """Shared resolve_labels() logic for GPUProfiler and MockGPUProfiler."""
 
     _label_to_resource: dict[str, str]
     _snapshots: dict[str, _GPUSnapshot]
     _gpu_info: dict[str, _GPUStaticInfo]
+    # (label, resource_uuid) -> (snapshot, attribution built from it)
+    _attribution_cache: dict[tuple[str, str], tuple[_GPUSnapshot, GPUAttribution]]
 
     def resolve_labels(self, labels: list[str]) -> list[GPUAttribution]:
-        result: list[GPUAttribution] = []
+        return self.resolve_prepared(self.prepare_labels(labels))
+
+    def prepare_labels(self, labels: list[str] | tuple[str, ...]) -> _GPUPlan:
+        """Resolve labels to static GPU identity once, for repeated resolve_prepared()."""
+        plan: list[tuple[str, str, _GPUStaticInfo]] = []
         for label in labels:
             resource_uuid = self._label_to_resource.get(label)
             if resource_uuid is None:
                 continue
-            snapshot = self._snapshots.get(resource_uuid)
             info = self._gpu_info.get(resource_uuid)
-            if snapshot is None or info is None:
+            if info is None:
+                continue
+            plan.append((label, resource_uuid, info))
+        return tuple(plan)
+
+    def resolve_prepared(self, plan: _GPUPlan) -> list[GPUAttribution]:
+        """Attach the latest metric snapshots to a plan from prepare_labels().
+
+        Snapshots are replaced, never mutated, by the collection thread, so an
+        attribution built from a snapshot is reused until the next collection.
+        """
+        result: list[GPUAttribution] = []
+        snapshots = self._snapshots
+        cache = self._attribution_cache
+        for label, resource_uuid, info in plan:
+            snapshot = snapshots.get(resource_uuid)
+            if snapshot is None:
+                continue
+            cached = cache.get((label, resource_uuid))
+            if cached is not None and cached[0] is snapshot:
+                result.append(cached[1])
                 continue
-            result.append(GPUAttribution(
+            attribution = GPUAttribution(
                 resource_uuid=resource_uuid,
                 physical_gpu_uuid=info.physical_gpu_uuid,
                 gpu_model=info.model,
@@ -56,7 +86,9 @@ class _GPUResolverMixin:
                 temperature_celsius=snapshot.temperature_celsius,
                 power_watts=snapshot.power_watts,
                 clock_mhz=snapshot.clock_mhz,
-            ))
+            )
+            cache[(label, resource_uuid)] = (snapshot, attribution)
+            result.append(attribution)
         return result
 
 
@@ -69,14 +101,19 @@ class GPUProfiler(_GPUResolverMixin):
     def __init__(self, *, backend: GPUBackend, snapshot_interval_ms: int = 100) -> None:
         self._backend = backend
         self._interval_s = snapshot_interval_ms / 1000.0
-        self._stop_event = threading.Event()
-        self._thread: threading.Thread | None = None
+        self.cpu = ThreadCPU()
+        self._worker = PeriodicWorker(
+            self._collect, self._interval_s, cpu=self.cpu, join_timeout_s=2.0,
+        )
 
         self._label_to_resource: dict[str, str] = {}
         self._resource_to_physical: dict[str, str] = {}
         self._snapshots: dict[str, _GPUSnapshot] = {}
         self._gpu_info: dict[str, _GPUStaticInfo] = {}
         self._handles: dict[str, object] = {}
+        self._attribution_cache: dict[
+            tuple[str, str], tuple[_GPUSnapshot, GPUAttribution]
+        ] = {}
 
         self._discover_gpus()
 
@@ -102,30 +139,26 @@ class GPUProfiler(_GPUResolverMixin):
             )
 
     def start(self) -> None:
-        if self._thread is not None:
-            return
-        self._stop_event.clear()
-        self._thread = threading.Thread(target=self._collection_loop, daemon=True)
-        self._thread.start()
+        self._worker.start()
 
     def stop(self) -> None:
-        self._stop_event.set()
-        if self._thread is not None:
-            self._thread.join(timeout=2.0)
-            self._thread = None
+        self.pause()
         self._backend.shutdown()
 
-    def _collection_loop(self) -> None:
-        while not self._stop_event.wait(self._interval_s):
-            for resource_uuid, handle in self._handles.items():
-                try:
-                    # CPython GIL guarantees dict.__setitem__ is atomic for
-                    # reader threads calling resolve_labels() concurrently.
-                    self._snapshots[resource_uuid] = self._backend.collect(handle)
-                except Exception as exc:  # noqa: BLE001
-                    logger.debug(
-                        "GPU collect failed for %s: %s", resource_uuid, exc, exc_info=True,
-                    )
+    def pause(self) -> None:
+        """Stop the collection thread but keep the backend open. ``start()`` resumes it."""
+        self._worker.pause()
+
+    def _collect(self) -> None:
+        for resource_uuid, handle in self._handles.items():
+            try:
+                # CPython GIL guarantees dict.__setitem__ is atomic for
+                # reader threads calling resolve_labels() concurrently.
+                self._snapshots[resource_uuid] = self._backend.collect(handle)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug(
+                    "GPU collect failed for %s: %s", resource_uuid, exc, exc_info=True,
+                )
 
 
 class MockGPUProfiler(_GPUResolverMixin):
@@ -138,10 +171,14 @@ class MockGPUProfiler(_GPUResolverMixin):
         mig_enabled: bool = False,
         vendor: str = "NVIDIA",
     ) -> None:
+        self.cpu = ThreadCPU()  # no collection thread
         self._label_to_resource: dict[str, str] = {}
         self._resource_to_physical: dict[str, str] = {}
         self._snapshots: dict[str, _GPUSnapshot] = {}
         self._gpu_info: dict[str, _GPUStaticInfo] = {}
+        self._attribution_cache: dict[
+            tuple[str, str], tuple[_GPUSnapshot, GPUAttribution]
+        ] = {}
 
         node_id = "test-node"
         cuda_idx = 0
@@ -199,6 +236,9 @@ class MockGPUProfiler(_GPUResolverMixin):
     def stop(self) -> None:
         pass
 
+    def pause(self) -> None:
+        pass
+
 
 def create_gpu_profiler(
     *, snapshot_interval_ms: int = 100
@@ -8,7 +8,10 @@ from typing import Any, Protocol, runtime_checkable
 
 @dataclass
 class _GPUSnapshot:
-    """Mutable metric snapshot updated by the collection thread.
+    """Metric snapshot produced by the collection thread.
+
+    Each collection publishes a new instance; a published snapshot is never
+    modified, which lets resolvers reuse attributions built from it.
 
     A value of 0 means the metric is not available for the current backend
     (e.g. Apple Silicon cannot report memory_used_gb, temperature, or clock).
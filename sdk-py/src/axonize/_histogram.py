@@ -0,0 +1,108 @@
+"""Fixed-memory log-linear histogram for latency distributions.
+
+Values are non-negative integers in caller-chosen units. Values below 16 get
+exact buckets; above that each power of two is split into 8 linear
+sub-buckets, so a bucket is at most 12.5% wide. Counts live in a flat
+``array('Q')`` sized once at construction — recording never allocates.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+
+_SUB_BITS = 3
+_SUB_COUNT = 1 << _SUB_BITS  # linear sub-buckets per power of two
+_LINEAR_LIMIT = _SUB_COUNT << 1  # values below this map to themselves
+
+
+def bucket_index(value: int) -> int:
+    """Return the bucket index for a non-negative integer value."""
+    if value < _LINEAR_LIMIT:
+        return value if value > 0 else 0
+    shift = value.bit_length() - _SUB_BITS - 1
+    return (shift << _SUB_BITS) + (value >> shift)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """Return the ``[low, high)`` value range covered by a bucket."""
+    if index < _LINEAR_LIMIT:
+        return index, index + 1
+    shift = (index >> _SUB_BITS) - 1
+    mantissa = index - (shift << _SUB_BITS)
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class LogLinearHistogram:
+    """Array-backed log-linear histogram with O(1) recording.
+
+    Values above ``max_value`` are clamped into the last bucket.
+    """
+
+    __slots__ = ("_counts", "_last")
+
+    def __init__(self, max_value: int = 1 << 27) -> None:
+        buckets = bucket_index(max_value) + 1
+        self._counts = array("Q", bytes(8 * buckets))
+        self._last = buckets - 1
+
+    def record(self, value: int, n: int = 1) -> None:
+        """Add ``n`` observations of ``value``."""
+        # bucket_index() inlined: this sits on per-token paths.
+        if value < _LINEAR_LIMIT:
+            idx = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - _SUB_BITS - 1
+            idx = (shift << _SUB_BITS) + (value >> shift)
+            if idx > self._last:
+                idx = self._last
+        self._counts[idx] += n
+
+    def record_count(self, count: int) -> None:
+        """Add an exact integer count (tokens, spans per batch), stored as ``count - 1``.
+
+        Explicit bucket bounds are upper-inclusive, so a count equal to a
+        bound belongs in the bucket below it. Shifted by one, every bound is
+        a bucket's lower edge and folding into bounds stays exact. Quantiles
+        read back one lower.
+        """
+        self.record(count - 1 if count > 0 else 0)
+
+    @property
+    def count(self) -> int:
+        """Total number of observations."""
+        return sum(self._counts)
+
+    def merge(self, other: LogLinearHistogram) -> None:
+        """Add another histogram's counts into this one (same ``max_value``)."""
+        counts = self._counts
+        for idx, c in enumerate(other._counts):
+            if c:
+                counts[idx] += c
+
+    def quantiles(self, qs: Sequence[float]) -> list[int]:
+        """Return the value at each quantile in ``qs`` (ascending, 0..1).
+
+        Each value is the midpoint of the bucket holding that rank. Returns
+        zeros if the histogram is empty.
+        """
+        total = self.count
+        if total == 0:
+            return [0] * len(qs)
+        targets = [max(1, int(q * total + 0.5)) for q in qs]
+        result: list[int] = []
+        seen = 0
+        for idx, c in enumerate(self._counts):
+            if not c:
+                continue
+            seen += c
+            while len(result) < len(targets) and seen >= targets[len(result)]:
+                low, high = bucket_bounds(idx)
+                result.append((low + high - 1) // 2)
+            if len(result) == len(targets):
+                break
+        return result
+
+    def clear(self) -> None:
+        """Reset all counts to zero."""
+        self._counts[:] = array("Q", bytes(8 * len(self._counts)))
@@ -0,0 +1,337 @@
+"""OTLP/HTTP exporter — stdlib ``http.client`` with a keep-alive connection pool.
+
+Selected by an ``http://`` or ``https://`` endpoint. Requests are POSTed to
+``/v1/traces`` (unless the URL has its own path), and span metrics to the
+sibling ``/v1/metrics``, as binary protobuf or OTLP JSON, optionally
+gzip-compressed. Sending happens on a small pool of sender threads, each
+reusing a persistent connection, so the processor thread can encode the
+next batch while earlier ones are on the wire.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import http.client
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from axonize._exporter import _build_encoded_request, _encode_span
+from axonize._stats import ExportStats
+
+if TYPE_CHECKING:
+    from axonize._types import SpanData
+
+logger = logging.getLogger("axonize.exporter.http")
+
+# OTLP/HTTP: these responses mean "try again later"; any other 4xx/5xx is final.
+_RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+_MAX_ATTEMPTS = 4
+_BACKOFF_BASE_S = 0.5
+_BACKOFF_MAX_S = 8.0
+_GZIP_LEVEL = 6
+
+_CONTENT_TYPES = {
+    "protobuf": "application/x-protobuf",
+    "json": "application/json",
+}
+
+
+class _RetryableError(Exception):
+    def __init__(self, reason: str, retry_after_s: float | None = None) -> None:
+        super().__init__(reason)
+        self.retry_after_s = retry_after_s
+
+
+class _ConnectionPool:
+    """LIFO pool of persistent HTTP/1.1 connections to one host."""
+
+    def __init__(self, host: str, port: int | None, *, tls: bool, timeout_s: float) -> None:
+        self._host = host
+        self._port = port
+        self._tls = tls
+        self._timeout_s = timeout_s
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, *, fresh: bool = False) -> tuple[http.client.HTTPConnection, bool]:
+        """Return a connection and whether it was reused from the pool."""
+        if not fresh:
+            with self._lock:
+                if self._idle:
+                    return self._idle.pop(), True
+        if self._tls:
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                self._host, self._port, timeout=self._timeout_s,
+            )
+        else:
+            conn = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout_s)
+        return conn, False
+
+    def release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def _retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None  # HTTP-date form: fall back to exponential backoff
+
+
+def _to_otlp_json(request: bytes) -> bytes:
+    """Convert a serialized ExportTraceServiceRequest to OTLP/JSON.
+
+    OTLP/JSON differs from the protobuf JSON mapping in two ways: trace and
+    span IDs are hex (not base64) and enums are integers.
+    """
+    from google.protobuf import json_format
+    from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+        ExportTraceServiceRequest,
+    )
+
+    message = ExportTraceServiceRequest.FromString(request)
+    data: dict[str, Any] = json_format.MessageToDict(message, use_integers_for_enums=True)
+    for rs in data.get("resourceSpans", ()):
+        for ss in rs.get("scopeSpans", ()):
+            for span in ss.get("spans", ()):
+                for key in ("traceId", "spanId", "parentSpanId"):
+                    if key in span:
+                        span[key] = base64.b64decode(span[key]).hex()
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _metrics_to_otlp_json(request: bytes) -> bytes:
+    """Convert a serialized ExportMetricsServiceRequest to OTLP/JSON."""
+    from google.protobuf import json_format
+    from opentelemetry.proto.collector.metrics.v1.metrics_service_pb2 import (
+        ExportMetricsServiceRequest,
+    )
+
+    message = ExportMetricsServiceRequest.FromString(request)
+    data = json_format.MessageToDict(message, use_integers_for_enums=True)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _metrics_path(traces_path: str) -> str:
+    if traces_path.endswith("/v1/traces"):
+        return traces_path[: -len("traces")] + "metrics"
+    return "/v1/metrics"
+
+
+class OTLPHTTPExporter:
+    """Exports SpanData batches with OTLP/HTTP.
+
+    Same handler interface as ``OTLPExporter``. ``export()`` encodes the
+    batch and hands it to one of ``max_in_flight`` sender threads, blocking
+    only when all of them are busy. Retryable failures (connection errors,
+    429/502/503/504) are retried with exponential backoff and jitter,
+    honouring ``Retry-After``, within ``timeout_s`` per batch.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str,
+        environment: str,
+        *,
+        timeout_s: float = 10.0,
+        api_key: str | None = None,
+        encoding: str = "protobuf",
+        compression: str | None = "gzip",
+        max_in_flight: int = 2,
+    ) -> None:
+        if encoding not in _CONTENT_TYPES:
+            raise ValueError(f"encoding must be 'protobuf' or 'json', got {encoding!r}")
+        if compression not in (None, "gzip"):
+            raise ValueError(f"compression must be 'gzip' or None, got {compression!r}")
+        url = urlsplit(endpoint)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"not an http(s) endpoint: {endpoint!r}")
+
+        self._service_name = service_name
+        self._environment = environment
+        self._timeout_s = timeout_s
+        self._encoding = encoding
+        self._compression = compression
+        self._path = url.path if url.path not in ("", "/") else "/v1/traces"
+        self._metrics_path = _metrics_path(self._path)
+        self._headers = {
+            "Content-Type": _CONTENT_TYPES[encoding],
+            "User-Agent": "axonize-python/0.1.0",
+        }
+        if compression == "gzip":
+            self._headers["Content-Encoding"] = "gzip"
+        if api_key is not None:
+            self._headers["Authorization"] = f"Bearer {api_key}"
+        self.stats = ExportStats()
+
+        self._pool = _ConnectionPool(
+            url.hostname, url.port, tls=url.scheme == "https", timeout_s=timeout_s,
+        )
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._senders = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="axonize-http",
+        )
+        self._in_flight: set[Future[bool]] = set()
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[SpanData]) -> None:
+        """Encode a batch and queue it for sending. Logs and swallows all errors."""
+        if not spans:
+            return
+        start = time.perf_counter_ns()
+        try:
+            request = _build_encoded_request(
+                {(self._service_name, self._environment): [_encode_span(sd) for sd in spans]}
+            )
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to encode %d spans", len(spans), exc_info=True)
+            self.stats.record_failure(len(spans))
+            return
+        self.stats.record_encode(time.perf_counter_ns() - start)
+        self._submit(request, len(spans))
+
+    def export_encoded(self, request: bytes, span_count: int) -> bool:
+        """Queue a pre-serialized ExportTraceServiceRequest for sending."""
+        return self._submit(request, span_count)
+
+    def export_metrics(self, request: bytes) -> bool:
+        """Queue a pre-serialized ExportMetricsServiceRequest for sending."""
+        return self._submit(request, 0, metrics=True)
+
+    def _submit(self, request: bytes, span_count: int, *, metrics: bool = False) -> bool:
+        self._slots.acquire()
+        try:
+            future = self._senders.submit(self._send, request, span_count, metrics)
+        except RuntimeError:  # shut down
+            self._slots.release()
+            if not metrics:
+                self.stats.record_failure(span_count)
+            return False
+        with self._lock:
+            self._in_flight.add(future)
+        future.add_done_callback(self._done)
+        return True
+
+    def _done(self, future: Future[bool]) -> None:
+        with self._lock:
+            self._in_flight.discard(future)
+        self._slots.release()
+
+    def flush(self, timeout_s: float | None = None) -> None:
+        """Wait until every queued batch has been sent (or given up on)."""
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        while True:
+            with self._lock:
+                pending = list(self._in_flight)
+            if not pending:
+                return
+            for future in pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return
+                try:
+                    future.result(timeout=remaining)
+                except Exception:  # noqa: BLE001
+                    pass
+
+    def _send(self, request: bytes, span_count: int, metrics: bool = False) -> bool:
+        cpu_start = time.thread_time()
+        start = time.perf_counter_ns()
+        ok = self._send_with_retries(request, span_count, metrics)
+        if not metrics:
+            self.stats.record_send(span_count, time.perf_counter_ns() - start, ok=ok)
+        self.stats.record_sender_cpu(time.thread_time() - cpu_start)
+        return ok
+
+    def _send_with_retries(self, request: bytes, span_count: int, metrics: bool) -> bool:
+        what = "metrics" if metrics else f"{span_count} spans"
+        path = self._metrics_path if metrics else self._path
+        try:
+            body = request
+            if self._encoding == "json":
+                body = _metrics_to_otlp_json(request) if metrics else _to_otlp_json(request)
+            if self._compression == "gzip":
+                body = gzip.compress(body, compresslevel=_GZIP_LEVEL)
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to encode request for %s", what, exc_info=True)
+            return False
+
+        deadline = time.monotonic() + self._timeout_s
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                self._post(body, path)
+                return True
+            except _RetryableError as exc:
+                delay = exc.retry_after_s
+                if delay is None:
+                    delay = min(_BACKOFF_MAX_S, _BACKOFF_BASE_S * (2 ** attempt))
+                    delay *= random.uniform(0.5, 1.0)
+                if attempt + 1 == _MAX_ATTEMPTS or time.monotonic() + delay > deadline:
+                    logger.debug("Giving up on %s: %s", what, exc)
+                    return False
+                time.sleep(delay)
+            except Exception:  # noqa: BLE001
+                logger.debug("Failed to export %s", what, exc_info=True)
+                return False
+        return False
+
+    def _post(self, body: bytes, path: str) -> None:
+        conn, reused = self._pool.acquire()
+        try:
+            response = self._roundtrip(conn, body, path)
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            if not reused:
+                raise _RetryableError(f"connection error: {exc!r}") from exc
+            # The server may have closed an idle keep-alive connection;
+            # retry once right away on a new one.
+            conn, _ = self._pool.acquire(fresh=True)
+            try:
+                response = self._roundtrip(conn, body, path)
+            except (OSError, http.client.HTTPException) as exc2:
+                conn.close()
+                raise _RetryableError(f"connection error: {exc2!r}") from exc2
+        if response.will_close:
+            conn.close()
+        else:
+            self._pool.release(conn)
+
+        status = response.status
+        if 200 <= status < 300:
+            return
+        if status in _RETRYABLE_STATUS:
+            raise _RetryableError(
+                f"HTTP {status}", _retry_after(response.getheader("Retry-After")),
+            )
+        raise RuntimeError(f"HTTP {status} from collector")
+
+    def _roundtrip(
+        self, conn: http.client.HTTPConnection, body: bytes, path: str,
+    ) -> http.client.HTTPResponse:
+        conn.request("POST", path, body=body, headers=self._headers)
+        response = conn.getresponse()
+        response.read()  # drain so the connection can be reused
+        return response
+
+    def shutdown(self) -> None:
+        """Send what is queued, then close all connections."""
+        self.flush(self._timeout_s)
+        self._senders.shutdown(wait=False)
+        self._pool.close()
@@ -0,0 +1,33 @@
+"""Trace and span ID generation.
+
+IDs come from a dedicated ``random.Random`` seeded from ``os.urandom``, which
+is several times cheaper than ``uuid.uuid4()`` on the span-creation path. The
+generator is reseeded in forked children so processes never share IDs.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+
+_rng = random.Random(os.urandom(32))
+_getrandbits = _rng.getrandbits
+
+
+def new_span_id() -> str:
+    """Return a random, non-zero 64-bit span ID as 16 hex chars."""
+    return f"{_getrandbits(64) or 1:016x}"
+
+
+def new_trace_id() -> str:
+    """Return a random, non-zero 128-bit trace ID as 32 hex chars."""
+    return f"{_getrandbits(128) or 1:032x}"
+
+
+def reseed() -> None:
+    """Reseed the generator from the OS entropy pool."""
+    _rng.seed(os.urandom(32))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reseed)
@@ -2,24 +2,54 @@
 
 from __future__ import annotations
 
-import time
-from types import TracebackType
+import functools
 from typing import TYPE_CHECKING
 
+from axonize._attributes import BaseAttributes
+from axonize._clock import monotonic_ns
+from axonize._histogram import LogLinearHistogram
 from axonize._span import Span
 from axonize._types import SpanKind
 
 if TYPE_CHECKING:
     from axonize._buffer import RingBuffer
+    from axonize._device import EventFactory
+    from axonize._metrics import SpanMetrics
+    from axonize._sampling import AdaptiveSampler
+
+# Inter-token gaps are histogrammed in units of 2**10 ns (~1μs), up to ~137s.
+_ITL_UNIT_SHIFT = 10
+_ITL_MAX_UNITS = 1 << 27
+_ITL_QUANTILES = (0.5, 0.9, 0.99)
+
+
+@functools.lru_cache(maxsize=256)
+def _model_base_attributes(
+    model: str | None,
+    model_version: str | None,
+    inference_type: str,
+) -> BaseAttributes:
+    """Shared model attribute layer, built once per (model, version, type)."""
+    values: dict[str, str] = {}
+    if model is not None:
+        values["ai.model.name"] = model
+    if model_version is not None:
+        values["ai.model.version"] = model_version
+    values["ai.inference.type"] = inference_type
+    return BaseAttributes(values)
 
 
 class LLMSpan(Span):
     """Span specialized for LLM inference with streaming token support.
 
     Extends Span with:
-      - ``record_token()`` for tracking output tokens during streaming
+      - ``record_token()`` / ``record_tokens(n)`` for tracking output tokens
       - Automatic TTFT (Time To First Token) calculation
-      - Automatic TPOT (Time Per Output Token) calculation
+      - TPOT (Time Per Output Token): mean, plus p50/p90/p99 and max stall
+        from a fixed-bucket inter-token latency histogram
+      - Phase markers (``mark_queued()``, ``mark_prefill_start()``,
+        ``mark_first_token()``, ``mark_decode_end()``) resolved into queue,
+        prefill and decode durations when the span ends
       - ``tokens_per_second`` derivation
       - Model name/version convenience setters
 
@@ -44,7 +74,12 @@ class LLMSpan(Span):
         model_version: str | None = None,
         inference_type: str = "llm",
         sampling_rate: float = 1.0,
+        base_attributes: BaseAttributes | None = None,
+        sampler: AdaptiveSampler | None = None,
+        device_events: EventFactory | None = None,
     ) -> None:
+        if base_attributes is None:
+            base_attributes = _model_base_attributes(model, model_version, inference_type)
         super().__init__(
             name,
             buffer=buffer,
@@ -52,17 +87,20 @@ class LLMSpan(Span):
             service_name=service_name,
             environment=environment,
             sampling_rate=sampling_rate,
+            base_attributes=base_attributes,
+            sampler=sampler,
+            device_events=device_events,
         )
         self._tokens_input: int = 0
         self._tokens_output: int = 0
         self._first_token_ns: int = 0
         self._last_token_ns: int = 0
-
-        if model is not None:
-            self._attributes["ai.model.name"] = model
-        if model_version is not None:
-            self._attributes["ai.model.version"] = model_version
-        self._attributes["ai.inference.type"] = inference_type
+        self._max_stall_ns: int = 0
+        self._itl: LogLinearHistogram | None = None  # allocated at the second emission
+        # Phase markers (monotonic ns, 0 = not marked)
+        self._queued_ns: int = 0
+        self._prefill_start_ns: int = 0
+        self._decode_end_ns: int = 0
 
     def set_tokens_input(self, count: int) -> None:
         """Set the number of input (prompt) tokens."""
@@ -78,13 +116,72 @@ class LLMSpan(Span):
         """Record a single output token emission.
 
         Call this once per generated token during streaming. Automatically
-        tracks TTFT (from span start to first token) and token count.
+        tracks TTFT (from span start to first token), token count and the
+        inter-token latency distribution.
         """
-        now = time.time_ns()
+        now = monotonic_ns()
         self._tokens_output += 1
-        if self._first_token_ns == 0:
-            self._first_token_ns = now
+        last = self._last_token_ns
+        self._last_token_ns = now
+        if last == 0:
+            if self._first_token_ns == 0:
+                self._first_token_ns = now
+            return
+        gap = now - last
+        if gap > self._max_stall_ns:
+            self._max_stall_ns = gap
+        itl = self._itl
+        if itl is None:
+            itl = self._itl = LogLinearHistogram(_ITL_MAX_UNITS)
+        itl.record(gap >> _ITL_UNIT_SHIFT)
+
+    def record_tokens(self, count: int) -> None:
+        """Record ``count`` output tokens emitted together by one decode step.
+
+        For batched or speculative decoders that produce several tokens per
+        step. The step's latency is spread evenly over its tokens in the TPOT
+        histogram; the max stall is the longest gap between steps.
+        """
+        if count <= 0:
+            return
+        now = monotonic_ns()
+        self._tokens_output += count
+        last = self._last_token_ns
         self._last_token_ns = now
+        if last == 0:
+            if self._first_token_ns == 0:
+                self._first_token_ns = now
+            return
+        gap = now - last
+        if gap > self._max_stall_ns:
+            self._max_stall_ns = gap
+        itl = self._itl
+        if itl is None:
+            itl = self._itl = LogLinearHistogram(_ITL_MAX_UNITS)
+        itl.record((gap // count) >> _ITL_UNIT_SHIFT, count)
+
+    # -- Phase markers ------------------------------------------------------
+    #
+    # Timeline: queued -> prefill start -> first token -> decode end.
+    # Each marker takes an optional ``at_ns`` from time.perf_counter_ns() for
+    # callers that observed the event earlier (e.g. request arrival before the
+    # span was opened); otherwise the current time is used.
+
+    def mark_queued(self, at_ns: int | None = None) -> None:
+        """Mark when the request entered the scheduler queue."""
+        self._queued_ns = monotonic_ns() if at_ns is None else at_ns
+
+    def mark_prefill_start(self, at_ns: int | None = None) -> None:
+        """Mark when the request was scheduled and prefill began (ends queue wait)."""
+        self._prefill_start_ns = monotonic_ns() if at_ns is None else at_ns
+
+    def mark_first_token(self, at_ns: int | None = None) -> None:
+        """Mark the first output token without counting it (ends prefill)."""
+        self._first_token_ns = monotonic_ns() if at_ns is None else at_ns
+
+    def mark_decode_end(self, at_ns: int | None = None) -> None:
+        """Mark the end of decoding. Defaults to the last recorded token."""
+        self._decode_end_ns = monotonic_ns() if at_ns is None else at_ns
 
     def set_model(self, name: str, version: str | None = None) -> None:
         """Set model name and optional version."""
@@ -92,28 +189,67 @@ class LLMSpan(Span):
         if version is not None:
             self._attributes["ai.model.version"] = version
 
-    def __exit__(
-        self,
-        exc_type: type[BaseException] | None,
-        exc_val: BaseException | None,
-        exc_tb: TracebackType | None,
-    ) -> None:
-        # Finalize token metrics before parent __exit__ builds SpanData
+    def _finalize(self) -> None:
+        # Derive token metrics before the snapshot is taken
         self._attributes["ai.llm.tokens.output"] = self._tokens_output
         if self._tokens_input > 0:
             self._attributes["ai.llm.tokens.input"] = self._tokens_input
 
         # TTFT: time from span start to first token (ms)
         if self._first_token_ns > 0 and self._start_time_ns > 0:
-            ttft_ms = (self._first_token_ns - self._start_time_ns) / 1_000_000
-            self._attributes["ai.llm.ttft_ms"] = round(ttft_ms, 3)
+            ttft_ns = self._first_token_ns - self._start_time_ns
+            self._attributes["ai.llm.ttft_ms"] = _ns_to_ms(ttft_ns)
 
         # Tokens per second: output tokens / generation duration
-        end_ns = time.time_ns()
         if self._tokens_output > 0 and self._first_token_ns > 0:
-            gen_duration_s = (end_ns - self._first_token_ns) / 1_000_000_000
+            gen_duration_s = (self._end_time_ns - self._first_token_ns) / 1_000_000_000
             if gen_duration_s > 0:
                 tps = self._tokens_output / gen_duration_s
                 self._attributes["ai.llm.tokens_per_second"] = round(tps, 2)
 
-        super().__exit__(exc_type, exc_val, exc_tb)
+        self._finalize_phases()
+
+        # Inter-token latency distribution
+        if self._itl is not None:
+            p50, p90, p99 = self._itl.quantiles(_ITL_QUANTILES)
+            self._attributes["ai.llm.tpot_p50_ms"] = _units_to_ms(p50)
+            self._attributes["ai.llm.tpot_p90_ms"] = _units_to_ms(p90)
+            self._attributes["ai.llm.tpot_p99_ms"] = _units_to_ms(p99)
+            self._attributes["ai.llm.max_stall_ms"] = _ns_to_ms(self._max_stall_ns)
+
+    def _record_metrics(self, metrics: SpanMetrics) -> None:
+        first = self._first_token_ns
+        metrics.record_llm(
+            self._metrics_key(),
+            self._end_time_ns - self._start_time_ns,
+            first - self._start_time_ns if first > 0 else -1,
+            self._tokens_input,
+            self._tokens_output,
+        )
+
+    def _finalize_phases(self) -> None:
+        attrs = self._attributes
+        first = self._first_token_ns
+        # Prefill starts at the span start unless marked explicitly
+        prefill_start = self._prefill_start_ns or self._start_time_ns
+
+        if self._queued_ns > 0 and prefill_start >= self._queued_ns:
+            attrs["ai.llm.queue_ms"] = _ns_to_ms(prefill_start - self._queued_ns)
+
+        if first > 0 and prefill_start > 0 and first >= prefill_start:
+            attrs["ai.llm.prefill_ms"] = _ns_to_ms(first - prefill_start)
+
+        decode_end = self._decode_end_ns or self._last_token_ns
+        if first > 0 and decode_end >= first:
+            decode_ns = decode_end - first
+            attrs["ai.llm.decode_ms"] = _ns_to_ms(decode_ns)
+            if self._tokens_output > 1:
+                attrs["ai.llm.tpot_ms"] = _ns_to_ms(decode_ns // (self._tokens_output - 1))
+
+
+def _ns_to_ms(ns: int) -> float:
+    return round(ns / 1_000_000, 3)
+
+
+def _units_to_ms(units: int) -> float:
+    return round((units << _ITL_UNIT_SHIFT) / 1_000_000, 3)
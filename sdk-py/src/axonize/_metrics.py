@@ -0,0 +1,226 @@
+"""Pre-aggregated RED metrics — exact rates, errors and latencies for every span.
+
+Every span that ends under an initialized SDK, sampled or not, updates one
+series keyed by (span name, model, status, GPU resource): a call counter and
+a log-linear duration histogram, plus TTFT and token histograms for LLM
+spans. Each thread updates its own shard of series, so recording takes no
+lock; a reporting thread merges the shards and exports cumulative totals.
+Shards of threads that have exited are folded into one shared shard when
+totals are collected, so thread churn does not grow memory.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from axonize._histogram import LogLinearHistogram, bucket_bounds
+from axonize._stats import ThreadCPU
+from axonize._worker import PeriodicWorker
+
+logger = logging.getLogger("axonize.metrics")
+
+# (span name, model, status, GPU resource); "" when absent
+SeriesKey = tuple[str, str, str, str]
+MetricsHandler = Callable[[dict[SeriesKey, "Series"], int, int], None]
+
+# Series per thread shard; further keys are folded into OVERFLOW_KEY
+_MAX_SERIES = 1024
+OVERFLOW_KEY: SeriesKey = ("", "", "", "")
+
+_TIME_MAX_US = 1 << 32  # ~71 minutes
+_TOKENS_MAX = 1 << 20
+
+# Exported bucket bounds: two per power of two. Each is also a bucket edge of
+# the log-linear histograms, so folding into them loses nothing.
+TIME_BOUNDS_US: tuple[int, ...] = (1, 2, 4, 8) + tuple(
+    m << (k - 3) for k in range(4, _TIME_MAX_US.bit_length()) for m in (8, 12)
+)
+TOKEN_BOUNDS: tuple[int, ...] = tuple(b for b in TIME_BOUNDS_US if b <= _TOKENS_MAX)
+
+# Set by the SDK while metrics are enabled; read by Span.__exit__.
+active: SpanMetrics | None = None
+
+
+class Series:
+    """Cumulative aggregates for one series key. Durations in microseconds."""
+
+    __slots__ = (
+        "count", "duration", "duration_sum",
+        "ttft", "ttft_sum", "tokens_in", "tokens_in_sum", "tokens_out", "tokens_out_sum",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = LogLinearHistogram(_TIME_MAX_US)
+        self.duration_sum = 0
+        # LLM aggregates, allocated with the first LLM span of the series
+        self.ttft: LogLinearHistogram | None = None
+        self.ttft_sum = 0
+        self.tokens_in: LogLinearHistogram | None = None
+        self.tokens_in_sum = 0
+        self.tokens_out: LogLinearHistogram | None = None
+        self.tokens_out_sum = 0
+
+    def _init_llm(self) -> None:
+        self.ttft = LogLinearHistogram(_TIME_MAX_US)
+        self.tokens_in = LogLinearHistogram(_TOKENS_MAX)
+        self.tokens_out = LogLinearHistogram(_TOKENS_MAX)
+
+    def merge(self, other: Series) -> None:
+        self.count += other.count
+        self.duration.merge(other.duration)
+        self.duration_sum += other.duration_sum
+        if other.ttft is not None and other.tokens_in is not None and other.tokens_out is not None:
+            if self.ttft is None:
+                self._init_llm()
+            assert self.ttft is not None and self.tokens_in is not None
+            assert self.tokens_out is not None
+            self.ttft.merge(other.ttft)
+            self.ttft_sum += other.ttft_sum
+            self.tokens_in.merge(other.tokens_in)
+            self.tokens_in_sum += other.tokens_in_sum
+            self.tokens_out.merge(other.tokens_out)
+            self.tokens_out_sum += other.tokens_out_sum
+
+
+def bucket_counts(hist: LogLinearHistogram, bounds: tuple[int, ...]) -> list[int]:
+    """Fold a log-linear histogram into ``len(bounds) + 1`` explicit buckets.
+
+    Each log-linear bucket goes where its lower edge falls, so a value equal
+    to a bound counts above it: right for durations floored to whole
+    microseconds (16 stands for 16.0-16.999µs). Exact counts belong at or
+    below an upper-inclusive bound and are recorded with ``record_count()``,
+    which shifts them into line.
+    """
+    counts = [0] * (len(bounds) + 1)
+    for idx, c in enumerate(hist._counts):
+        if c:
+            counts[bisect.bisect_right(bounds, bucket_bounds(idx)[0])] += c
+    return counts
+
+
+def _merge_shard(
+    into: dict[SeriesKey, Series], shard: dict[SeriesKey, Series], *, limit: int | None = None,
+) -> None:
+    for key, series in list(shard.items()):
+        total = into.get(key)
+        if total is None:
+            if limit is not None and len(into) >= limit:
+                key = OVERFLOW_KEY
+                total = into.get(key)
+            if total is None:
+                total = into[key] = Series()
+        total.merge(series)
+
+
+class SpanMetrics:
+    """Per-thread series shards plus a daemon thread that reports them.
+
+    ``handler(series, start_time_ns, time_ns)`` receives the merged series
+    every ``interval_ms`` and once more on ``stop()``.
+    """
+
+    def __init__(self, handler: MetricsHandler, *, interval_ms: int = 10_000) -> None:
+        self._handler = handler
+        self._interval_s = interval_ms / 1000.0
+        self.start_time_ns = time.time_ns()
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, dict[SeriesKey, Series]]] = []
+        self._shards_lock = threading.Lock()
+        # Merged shards of exited threads, capped at _MAX_SERIES like any shard
+        self._retired: dict[SeriesKey, Series] = {}
+        self.cpu = ThreadCPU()
+        self._worker = PeriodicWorker(
+            self.report, self._interval_s, cpu=self.cpu, join_timeout_s=5.0,
+        )
+
+    def _series(self, key: SeriesKey) -> Series:
+        try:
+            shard: dict[SeriesKey, Series] = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append((threading.current_thread(), shard))
+        series = shard.get(key)
+        if series is None:
+            if len(shard) >= _MAX_SERIES:
+                key = OVERFLOW_KEY
+                series = shard.get(key)
+            if series is None:
+                series = shard[key] = Series()
+        return series
+
+    def record(self, key: SeriesKey, duration_ns: int) -> None:
+        """Count one finished span."""
+        series = self._series(key)
+        duration_us = duration_ns // 1000
+        series.count += 1
+        series.duration.record(duration_us)
+        series.duration_sum += duration_us
+
+    def record_llm(
+        self,
+        key: SeriesKey,
+        duration_ns: int,
+        ttft_ns: int,
+        tokens_in: int,
+        tokens_out: int,
+    ) -> None:
+        """Count one finished LLM span. ``ttft_ns`` is negative if no token arrived."""
+        series = self._series(key)
+        duration_us = duration_ns // 1000
+        series.count += 1
+        series.duration.record(duration_us)
+        series.duration_sum += duration_us
+        if series.ttft is None:
+            series._init_llm()
+        assert series.ttft is not None and series.tokens_in is not None
+        assert series.tokens_out is not None
+        if ttft_ns >= 0:
+            ttft_us = ttft_ns // 1000
+            series.ttft.record(ttft_us)
+            series.ttft_sum += ttft_us
+        series.tokens_in.record_count(tokens_in)
+        series.tokens_in_sum += tokens_in
+        series.tokens_out.record_count(tokens_out)
+        series.tokens_out_sum += tokens_out
+
+    def collect(self) -> dict[SeriesKey, Series]:
+        """Merge all thread shards into one cumulative view."""
+        merged: dict[SeriesKey, Series] = {}
+        with self._shards_lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    # No longer written to: fold it in for good
+                    _merge_shard(self._retired, shard, limit=_MAX_SERIES)
+            self._shards = live
+            _merge_shard(merged, self._retired)
+        for _, shard in live:
+            _merge_shard(merged, shard)
+        return merged
+
+    def report(self) -> None:
+        """Hand the current totals to the handler. Logs and swallows all errors."""
+        try:
+            self._handler(self.collect(), self.start_time_ns, time.time_ns())
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to report span metrics", exc_info=True)
+
+    def start(self) -> None:
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the reporting thread and report the final totals."""
+        self.pause()
+        self.report()
+
+    def pause(self) -> None:
+        """Stop the reporting thread. ``start()`` resumes it."""
+        self._worker.pause()
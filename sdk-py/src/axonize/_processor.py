@@ -2,11 +2,23 @@
 
 from __future__ import annotations
 
-import threading
+import asyncio
+import logging
 from collections.abc import Callable
+from typing import TYPE_CHECKING
 
+from axonize import _clock
 from axonize._buffer import RingBuffer
+from axonize._device import DeviceTimeResolver
+from axonize._stats import ThreadCPU
 from axonize._types import SpanData
+from axonize._worker import PeriodicWorker
+
+if TYPE_CHECKING:
+    from axonize._exporter import AsyncOTLPExporter
+    from axonize._sampling import TailSampler
+
+logger = logging.getLogger("axonize.processor")
 
 SpanHandler = Callable[[list[SpanData]], None]
 
@@ -16,7 +28,11 @@ def _noop_handler(spans: list[SpanData]) -> None:
 
 
 class BackgroundProcessor:
-    """Daemon thread that periodically drains spans from the buffer."""
+    """Daemon thread that periodically drains spans from the buffer.
+
+    With a ``sampler``, drained spans are held per trace and only the spans
+    of kept traces reach the handler.
+    """
 
     def __init__(
         self,
@@ -25,42 +41,194 @@ class BackgroundProcessor:
         batch_size: int = 512,
         flush_interval_ms: int = 5000,
         handler: SpanHandler = _noop_handler,
+        sampler: TailSampler | None = None,
     ) -> None:
         self._buffer = buffer
         self._batch_size = batch_size
         self._flush_interval_s = flush_interval_ms / 1000.0
         self._handler = handler
-        self._stop_event = threading.Event()
-        self._thread: threading.Thread | None = None
+        self._sampler = sampler
+        self.device_times = DeviceTimeResolver()
+        self.cpu = ThreadCPU()
+        self._worker = PeriodicWorker(
+            self._tick, self._flush_interval_s, cpu=self.cpu, join_timeout_s=5.0,
+        )
 
     def start(self) -> None:
         """Start the background drain loop."""
-        if self._thread is not None:
-            return
-        self._stop_event.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
+        self._worker.start()
 
     def stop(self) -> None:
-        """Signal stop and perform a final drain."""
-        self._stop_event.set()
-        if self._thread is not None:
-            self._thread.join(timeout=5.0)
-            self._thread = None
+        """Signal stop and drain everything left in the buffer."""
+        if not self.pause():
+            # The drain thread is stuck in an export; flushing alongside it
+            # would share the sampler, so leave what is buffered.
+            logger.debug("Drain thread still exporting at shutdown; final flush skipped")
+            return
+        while self._flush(final=True):
+            pass
+        if self._sampler is not None:
+            self._deliver(self._sampler.flush())
+
+    def pause(self) -> bool:
+        """Stop the drain thread without flushing. ``start()`` resumes it.
+
+        Returns whether the thread has exited; if it is still exporting, a
+        ``start()`` takes effect once that export returns.
+        """
+        return self._worker.pause()
+
+    def _tick(self) -> None:
+        # Follow wall-clock adjustments for spans started after this point.
+        _clock.recalibrate()
         self._flush()
 
-    def _run(self) -> None:
-        while not self._stop_event.wait(timeout=self._flush_interval_s):
-            self._flush()
+    def _flush(self, final: bool = False) -> int:
+        drained = self._buffer.drain(self._batch_size)
+        self._buffer.update_sampling()
+        # Device-timed spans wait here for their GPU work; at shutdown, block on it.
+        spans = self.device_times.resolve(drained, wait=final)
+        if self._sampler is not None:
+            # Called even with nothing drained, to decide timed-out traces.
+            self._deliver(self._sampler.process(spans))
+        elif spans:
+            self._deliver(spans)
+        return len(drained)
 
-    def _flush(self) -> None:
-        spans = self._buffer.drain(self._batch_size)
-        if spans:
+    def _deliver(self, spans: list[SpanData]) -> None:
+        size = self._batch_size
+        # Kept traces can add up to more than one batch.
+        for i in range(0, len(spans), size):
             try:
-                self._handler(spans)
+                self._handler(spans if len(spans) <= size else spans[i:i + size])
             except Exception:  # noqa: BLE001
                 pass  # Graceful degradation — never crash the drain loop
 
     @property
     def is_running(self) -> bool:
-        return self._thread is not None and self._thread.is_alive()
+        return self._worker.is_running
+
+
+class AsyncBackgroundProcessor:
+    """Event-loop task that periodically drains spans from the buffer.
+
+    The asyncio counterpart of ``BackgroundProcessor``: no extra thread, the
+    drain loop and exports run as tasks on ``loop``. Up to ``max_in_flight``
+    exports run concurrently; when all are busy the drain loop waits for one
+    to finish, leaving spans in the ring buffer.
+    """
+
+    def __init__(
+        self,
+        buffer: RingBuffer,
+        exporter: AsyncOTLPExporter,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        batch_size: int = 512,
+        flush_interval_ms: int = 5000,
+        max_in_flight: int = 4,
+        sampler: TailSampler | None = None,
+    ) -> None:
+        self._buffer = buffer
+        self._exporter = exporter
+        self._sampler = sampler
+        self.device_times = DeviceTimeResolver()
+        self._loop = loop
+        self._batch_size = batch_size
+        self._flush_interval_s = flush_interval_ms / 1000.0
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._in_flight: set[asyncio.Task[None]] = set()
+        self._stop_event = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closing: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Schedule the drain loop on the event loop."""
+        if self._task is not None or self._closing is not None:
+            return
+        self._task = self._loop.create_task(self._run())
+
+    def pause(self) -> None:
+        """No thread to park; exports in flight are owned by the loop."""
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), self._flush_interval_s)
+                return
+            except asyncio.TimeoutError:
+                pass
+            _clock.recalibrate()
+            await self._flush()
+
+    async def _flush(self, final: bool = False) -> int:
+        drained = self._buffer.drain(self._batch_size)
+        self._buffer.update_sampling()
+        spans = self.device_times.resolve(drained, wait=final)
+        if self._sampler is not None:
+            await self._deliver(self._sampler.process(spans))
+        elif spans:
+            await self._deliver(spans)
+        return len(drained)
+
+    async def _deliver(self, spans: list[SpanData]) -> None:
+        size = self._batch_size
+        for i in range(0, len(spans), size):
+            await self._slots.acquire()
+            batch = spans if len(spans) <= size else spans[i:i + size]
+            task = self._loop.create_task(self._export(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _export(self, spans: list[SpanData]) -> None:
+        try:
+            await self._exporter.export(spans)
+        finally:
+            self._slots.release()
+
+    async def aclose(self) -> None:
+        """Stop the drain loop, export everything left and close the exporter."""
+        self._stop_event.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        while await self._flush(final=True):
+            pass
+        if self._sampler is not None:
+            await self._deliver(self._sampler.flush())
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        await self._exporter.shutdown()
+
+    def stop(self) -> bool:
+        """Stop from synchronous code.
+
+        Blocks until flushed when called off the loop thread or while the
+        loop is stopped; on the loop thread it can only schedule the flush
+        (use ``await axonize.shutdown_async()`` there). Returns False if the
+        loop is already closed and nothing could be flushed.
+        """
+        loop = self._loop
+        if loop.is_closed():
+            return False
+        if self._closing is None:
+            if not loop.is_running():
+                loop.run_until_complete(self.aclose())
+                return True
+            try:
+                on_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop = False
+            if on_loop:
+                self._closing = loop.create_task(self.aclose())
+                return True
+            future = asyncio.run_coroutine_threadsafe(self.aclose(), loop)
+            try:
+                future.result(timeout=10.0)
+            except Exception:  # noqa: BLE001
+                pass
+        return True
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
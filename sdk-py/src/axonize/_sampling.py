@@ -0,0 +1,336 @@
+"""Trace sampling beyond a fixed rate.
+
+``AdaptiveSampler`` decides at the root span, adjusting per-key rates to a
+traces-per-second target; ``TailSampler`` keeps or drops whole traces after
+their spans finish.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+from axonize._attributes import intern_key
+from axonize._histogram import LogLinearHistogram
+from axonize._stats import ThreadCPU
+from axonize._types import SpanStatus
+from axonize._worker import PeriodicWorker
+
+if TYPE_CHECKING:
+    from axonize._attributes import BaseAttributes
+    from axonize._config import AdaptiveSamplingPolicy, TailSamplingPolicy
+    from axonize._types import SpanData
+
+# Decisions remembered for spans that finish after their trace was decided
+_DECIDED_CAPACITY = 16_384
+# Root names tracked separately for the latency policy; the rest share one
+_MAX_LATENCY_NAMES = 256
+_LATENCY_MIN_SAMPLES = 100
+_LATENCY_REFRESH = 64  # recompute the percentile every N roots
+_LATENCY_WINDOW = 10_000  # then start a new window, keeping the last threshold
+_MODEL_KEY = "ai.model.name"
+_MODEL_KID = intern_key(_MODEL_KEY)
+
+# Keys with their own adaptive budget; later keys share one
+_MAX_RATE_KEYS = 256
+# Traces a key may sample per interval, as a multiple of its budget, before
+# later ones are refused until the next update
+_BURST = 2.0
+
+
+class _KeyRate:
+    __slots__ = ("arrivals", "arrival_rate", "rate", "allowance")
+
+    def __init__(self, allowance: float) -> None:
+        self.arrivals = 0
+        self.arrival_rate = 0.0
+        self.rate = 1.0
+        self.allowance = allowance
+
+
+class AdaptiveSampler:
+    """Head sampler targeting a traces-per-second budget per process.
+
+    ``sample()`` runs for every root span and only reads the key's current
+    rate and remaining allowance. A daemon thread recomputes both every
+    ``interval_ms``: the shared budget is split by water-filling over the
+    arrival rates seen in the last interval, so a key below its fair share keeps rate 1.0.
+    The allowance caps what a sudden spike can sample before the next
+    update. Counters are updated without a lock; a lost increment under
+    contention only skews the next rate slightly.
+    """
+
+    def __init__(self, policy: AdaptiveSamplingPolicy) -> None:
+        self._target = policy.traces_per_second
+        self._budgets = dict(policy.budgets)
+        self._by_model = policy.key == "model"
+        self._interval_s = policy.interval_ms / 1000.0
+        self._keys: dict[str, _KeyRate] = {}
+        self._random = random.random
+        self._last_update = time.monotonic()
+        self.cpu = ThreadCPU()
+        self._worker = PeriodicWorker(
+            self.update, self._interval_s, cpu=self.cpu, join_timeout_s=2.0,
+            on_start=self._reset_clock,
+        )
+
+    def sample(self, name: str, base: BaseAttributes | None) -> float:
+        """Decide a root span. Returns the sampling rate if sampled, else 0.0."""
+        key = name
+        if self._by_model and base is not None:
+            model = base._values.get(_MODEL_KID)
+            if model is not None:
+                key = str(model)
+        state = self._keys.get(key)
+        if state is None:
+            state = self._add_key(key)
+        state.arrivals += 1
+        if state.allowance < 1.0 or self._random() >= state.rate:
+            return 0.0
+        state.allowance -= 1.0
+        return state.rate
+
+    def _add_key(self, key: str) -> _KeyRate:
+        if len(self._keys) >= _MAX_RATE_KEYS and key not in self._budgets:
+            key = ""
+            state = self._keys.get(key)
+            if state is not None:
+                return state
+        budget = self._budgets.get(key, self._target)
+        return self._keys.setdefault(key, _KeyRate(budget * self._interval_s * _BURST))
+
+    def update(self, now: float | None = None) -> None:
+        """Recompute per-key rates from the traffic since the last update."""
+        if now is None:
+            now = time.monotonic()
+        elapsed = now - self._last_update
+        if elapsed <= 0:
+            return
+        self._last_update = now
+
+        shared: list[tuple[float, _KeyRate]] = []
+        own: list[tuple[float, _KeyRate]] = []
+        for key, state in list(self._keys.items()):
+            arrivals = state.arrivals
+            state.arrivals -= arrivals
+            # Last interval only: reacts within one interval both ways, and
+            # the allowance bounds what a spike samples until then.
+            state.arrival_rate = arrivals / elapsed
+            budget = self._budgets.get(key)
+            if budget is None:
+                shared.append((state.arrival_rate, state))
+            else:
+                own.append((budget, state))
+
+        # Water-filling: keys below the fair share keep everything, the
+        # remaining budget is split evenly among the busier keys.
+        level = remaining = self._target
+        shared.sort(key=_first)
+        for i, (arrival_rate, _) in enumerate(shared):
+            share = remaining / (len(shared) - i)
+            if arrival_rate > share:
+                level = share
+                break
+            remaining -= arrival_rate
+        for arrival_rate, state in shared:
+            self._set_rate(state, arrival_rate, min(arrival_rate, level), level)
+        for budget, state in own:
+            self._set_rate(state, state.arrival_rate, budget, budget)
+
+    def _set_rate(self, state: _KeyRate, arrival_rate: float, budget: float, cap: float) -> None:
+        state.rate = 1.0 if arrival_rate <= budget else budget / arrival_rate
+        state.allowance = cap * self._interval_s * _BURST
+
+    def rates(self) -> dict[str, float]:
+        """Current sampling rate per key."""
+        return {key: state.rate for key, state in list(self._keys.items())}
+
+    def start(self) -> None:
+        self._worker.start()
+
+    def _reset_clock(self) -> None:
+        self._last_update = time.monotonic()
+
+    def stop(self) -> None:
+        self.pause()
+
+    def pause(self) -> None:
+        """Stop the update thread. ``start()`` resumes it."""
+        self._worker.pause()
+
+
+def _first(item: tuple[float, _KeyRate]) -> float:
+    return item[0]
+
+
+class _LatencyTracker:
+    """Recent root-span durations for one span name, in microseconds."""
+
+    __slots__ = ("_hist", "_count", "_quantile", "threshold_us")
+
+    def __init__(self, quantile: float) -> None:
+        self._hist = LogLinearHistogram()
+        self._count = 0
+        self._quantile = quantile
+        self.threshold_us: int | None = None
+
+    def record(self, duration_us: int) -> None:
+        self._hist.record(duration_us)
+        self._count += 1
+        if self._count % _LATENCY_REFRESH == 0 and self._count >= _LATENCY_MIN_SAMPLES:
+            self.threshold_us = self._hist.quantiles((self._quantile,))[0]
+            if self._count >= _LATENCY_WINDOW:
+                self._hist.clear()
+                self._count = 0
+
+
+class _Trace:
+    __slots__ = ("trace_id", "spans", "first_seen")
+
+    def __init__(self, trace_id: str, first_seen: float) -> None:
+        self.trace_id = trace_id
+        self.spans: list[SpanData] = []
+        self.first_seen = first_seen
+
+
+class TailSampler:
+    """Groups finished spans by trace and decides each trace as a whole.
+
+    Not thread-safe: owned by the processor that drains the ring buffer.
+    A trace is decided when its root span (no parent) arrives, when
+    ``decision_wait_ms`` has passed since its first span arrived, or early
+    when more than ``max_buffered_spans`` spans are held. Spans arriving
+    after the decision follow it.
+    """
+
+    def __init__(self, policy: TailSamplingPolicy) -> None:
+        self._policy = policy
+        self._wait_s = policy.decision_wait_ms / 1000.0
+        self._max_spans = policy.max_buffered_spans
+        self._models = frozenset(policy.models)
+        self._rate_bound = int(policy.sample_rate * (1 << 32))
+        self._traces: dict[str, _Trace] = {}
+        self._arrivals: deque[_Trace] = deque()
+        self._decided: dict[str, bool] = {}
+        self._decided_order: deque[str] = deque()
+        self._latency: dict[str, _LatencyTracker] = {}
+        self.buffered_spans = 0
+        self.kept_traces = 0
+        self.dropped_traces = 0
+        self.forced_decisions = 0
+
+    def process(self, spans: list[SpanData], now: float | None = None) -> list[SpanData]:
+        """Add finished spans; return the spans of traces decided to be kept."""
+        if now is None:
+            now = time.monotonic()
+        kept: list[SpanData] = []
+        traces = self._traces
+        decided = self._decided
+        for sd in spans:
+            trace_id = sd.trace_id
+            trace = traces.get(trace_id)
+            if trace is None:
+                verdict = decided.get(trace_id)
+                if verdict is not None:
+                    if verdict:
+                        kept.append(sd)
+                    continue
+                trace = traces[trace_id] = _Trace(trace_id, now)
+                self._arrivals.append(trace)
+            trace.spans.append(sd)
+            self.buffered_spans += 1
+            if sd.parent_span_id is None:
+                self._decide(trace, kept, sd)
+
+        # Traces arrive in first-seen order, so only the front can have expired.
+        deadline = now - self._wait_s
+        arrivals = self._arrivals
+        while arrivals:
+            trace = arrivals[0]
+            if traces.get(trace.trace_id) is not trace:
+                arrivals.popleft()  # already decided by its root
+                continue
+            if trace.first_seen > deadline:
+                if self.buffered_spans <= self._max_spans:
+                    break
+                self.forced_decisions += 1
+            arrivals.popleft()
+            self._decide(trace, kept, None)
+        return kept
+
+    def flush(self) -> list[SpanData]:
+        """Decide every pending trace now and return the kept spans."""
+        kept: list[SpanData] = []
+        while self._arrivals:
+            trace = self._arrivals.popleft()
+            if self._traces.get(trace.trace_id) is trace:
+                self._decide(trace, kept, None)
+        return kept
+
+    def _decide(self, trace: _Trace, kept: list[SpanData], root: SpanData | None) -> None:
+        trace_id = trace.trace_id
+        del self._traces[trace_id]
+        self.buffered_spans -= len(trace.spans)
+        keep = self._should_keep(trace_id, trace.spans, root)
+
+        decided = self._decided
+        decided[trace_id] = keep
+        self._decided_order.append(trace_id)
+        if len(self._decided_order) > _DECIDED_CAPACITY:
+            del decided[self._decided_order.popleft()]
+
+        if keep:
+            kept.extend(trace.spans)
+            self.kept_traces += 1
+        else:
+            self.dropped_traces += 1
+
+    def _should_keep(self, trace_id: str, spans: list[SpanData], root: SpanData | None) -> bool:
+        policy = self._policy
+        keep = False
+        if policy.keep_errors:
+            keep = any(sd.status is SpanStatus.ERROR for sd in spans)
+
+        # Without its root (timed out or evicted) the slowest span stands in,
+        # but only real roots feed the latency distribution.
+        slowest = root if root is not None else max(spans, key=_duration)
+        if policy.latency_threshold_ms is not None:
+            keep = keep or slowest.duration_ms > policy.latency_threshold_ms
+        if policy.latency_percentile is not None:
+            duration_us = int(slowest.duration_ms * 1000)
+            if root is not None:
+                tracker: _LatencyTracker | None = self._tracker(root.name)
+            else:
+                tracker = self._latency.get(slowest.name)
+            if tracker is not None:
+                threshold = tracker.threshold_us
+                keep = keep or (threshold is not None and duration_us > threshold)
+                if root is not None:
+                    tracker.record(duration_us)
+
+        if not keep and self._models:
+            models = self._models
+            keep = any(sd.attributes.get(_MODEL_KEY) in models for sd in spans)
+        if not keep:
+            # Low 32 bits of the (random) trace ID: the same traces are kept
+            # in every process sampling at the same rate.
+            keep = int(trace_id[-8:], 16) < self._rate_bound
+        return keep
+
+    def _tracker(self, name: str) -> _LatencyTracker:
+        tracker = self._latency.get(name)
+        if tracker is None:
+            if len(self._latency) >= _MAX_LATENCY_NAMES:
+                name = ""
+                tracker = self._latency.get(name)
+            if tracker is None:
+                quantile = self._policy.latency_percentile
+                assert quantile is not None
+                tracker = self._latency[name] = _LatencyTracker(quantile)
+        return tracker
+
+
+def _duration(sd: SpanData) -> float:
+    return sd.duration_ms
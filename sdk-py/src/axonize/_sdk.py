@@ -3,16 +3,35 @@
 from __future__ import annotations
 
 import atexit
+import dataclasses
+import logging
+import os
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any
 
-from axonize._buffer import RingBuffer
-from axonize._config import AxonizeConfig
-from axonize._exporter import OTLPExporter
-from axonize._gpu import GPUProfiler, MockGPUProfiler, create_gpu_profiler
+from axonize import _device, _metrics
+from axonize._buffer import OVERFLOW_POLICIES, RingBuffer
+from axonize._config import AdaptiveSamplingPolicy, AxonizeConfig, TailSamplingPolicy
 from axonize._llm import LLMSpan
-from axonize._processor import BackgroundProcessor
 from axonize._span import Span
 from axonize._types import SpanKind
 
+# Exporters (protobuf, grpc), the processor (asyncio), shared memory and GPU
+# backends are imported on first use, so ``import axonize`` and span creation
+# stay stdlib-only until init() needs them.
+if TYPE_CHECKING:
+    from axonize._exporter import OTLPExporter
+    from axonize._gpu import GPUProfiler, MockGPUProfiler
+    from axonize._http import OTLPHTTPExporter
+    from axonize._metrics import Series, SeriesKey, SpanMetrics
+    from axonize._processor import AsyncBackgroundProcessor, BackgroundProcessor
+    from axonize._sampling import AdaptiveSampler, TailSampler
+    from axonize._shm import SharedMemoryExporter
+    from axonize._stats import ExportStats
+    from axonize.files import FileExporter
+
+logger = logging.getLogger("axonize")
+
 _sdk_instance: _AxonizeSDK | None = None
 
 
@@ -21,54 +40,304 @@ class _AxonizeSDK:
 
     def __init__(self, config: AxonizeConfig) -> None:
         self.config = config
-        self._buffer: RingBuffer | None = RingBuffer(config.buffer_size)
-        self._processor: BackgroundProcessor | None = None
-        self._exporter: OTLPExporter | None = None
+        self._buffer: RingBuffer | None = RingBuffer(
+            config.buffer_size,
+            overflow=config.overflow,
+            block_timeout_s=config.overflow_block_ms / 1000.0,
+        )
+        self._processor: BackgroundProcessor | AsyncBackgroundProcessor | None = None
+        self._exporter: (
+            OTLPExporter | OTLPHTTPExporter | SharedMemoryExporter | FileExporter | None
+        ) = None
         self._gpu_profiler: GPUProfiler | MockGPUProfiler | None = None
+        self._head_sampler: AdaptiveSampler | None = None
+        self._metrics: SpanMetrics | None = None
+        self._metrics_exporter: OTLPExporter | OTLPHTTPExporter | None = None
+        self._export_metrics: Callable[[bytes], bool] | None = None
 
     def start(self) -> None:
         """Start the background processor with the OTLP exporter."""
         if self._buffer is None:
             return
-        self._exporter = OTLPExporter(
+        from axonize._processor import BackgroundProcessor
+
+        if self.config.adaptive_sampling is not None:
+            from axonize._sampling import AdaptiveSampler
+
+            self._head_sampler = AdaptiveSampler(self.config.adaptive_sampling)
+            self._head_sampler.start()
+
+        if not self._start_async_processor():
+            self._exporter = self._create_exporter()
+            self._processor = BackgroundProcessor(
+                self._buffer,
+                batch_size=self.config.batch_size,
+                flush_interval_ms=self.config.flush_interval_ms,
+                handler=self._exporter.export,
+                sampler=self._create_tail_sampler(),
+            )
+        assert self._processor is not None
+        self._processor.start()
+
+        if self.config.metrics:
+            self._start_metrics()
+
+        if self.config.gpu_profiling:
+            from axonize._gpu import create_gpu_profiler
+
+            self._gpu_profiler = create_gpu_profiler(
+                snapshot_interval_ms=self.config.gpu_snapshot_interval_ms,
+            )
+            if self._gpu_profiler is not None:
+                self._gpu_profiler.start()
+
+    def _start_async_processor(self) -> bool:
+        """Set up the event-loop processor for ``mode="asyncio"``, if possible."""
+        if self.config.mode != "asyncio" or self.config.shm_ring is not None:
+            return False
+        if _is_http_endpoint(self.config.endpoint) or _is_file_endpoint(self.config.endpoint):
+            # No asyncio HTTP client in the stdlib; OTLP/HTTP keeps its
+            # sender threads, which do not touch the loop. File writes
+            # would block it.
+            return False
+        import asyncio
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning(
+                "mode='asyncio' needs init() to run inside the event loop; "
+                "using the background thread instead",
+            )
+            return False
+        from axonize._exporter import AsyncOTLPExporter
+        from axonize._processor import AsyncBackgroundProcessor
+
+        assert self._buffer is not None
+        exporter = AsyncOTLPExporter(
             endpoint=self.config.endpoint,
             service_name=self.config.service_name,
             environment=self.config.environment,
             api_key=self.config.api_key,
         )
-        self._processor = BackgroundProcessor(
+        # The processor owns and closes the async exporter
+        self._processor = AsyncBackgroundProcessor(
             self._buffer,
+            exporter,
+            loop,
             batch_size=self.config.batch_size,
             flush_interval_ms=self.config.flush_interval_ms,
-            handler=self._exporter.export,
+            sampler=self._create_tail_sampler(),
         )
-        self._processor.start()
+        return True
 
-        if self.config.gpu_profiling:
-            self._gpu_profiler = create_gpu_profiler(
-                snapshot_interval_ms=self.config.gpu_snapshot_interval_ms,
+    def _start_metrics(self) -> None:
+        # Metrics go out through the span exporter when it speaks OTLP;
+        # shared-memory and asyncio modes get a synchronous one of their own.
+        export: Callable[[bytes], bool] | None = getattr(self._exporter, "export_metrics", None)
+        if export is None and _is_file_endpoint(self.config.endpoint):
+            logger.warning("metrics=True needs an OTLP endpoint; not exporting metrics to files")
+            return
+        if export is None:
+            self._metrics_exporter = create_otlp_exporter(
+                self.config.endpoint,
+                service_name=self.config.service_name,
+                environment=self.config.environment,
+                api_key=self.config.api_key,
             )
-            if self._gpu_profiler is not None:
-                self._gpu_profiler.start()
+            export = self._metrics_exporter.export_metrics
+        self._export_metrics = export
+        self._metrics = _metrics.SpanMetrics(
+            self._report_metrics, interval_ms=self.config.metrics_interval_ms,
+        )
+        _metrics.active = self._metrics
+        self._metrics.start()
+
+    def _report_metrics(
+        self, series: Mapping[SeriesKey, Series], start_time_ns: int, time_ns: int,
+    ) -> None:
+        from axonize._exporter import _build_metrics_request
+
+        assert self._export_metrics is not None
+        self._export_metrics(_build_metrics_request(
+            series, self.config.service_name, self.config.environment, start_time_ns, time_ns,
+            sdk_stats=self.stats(), export_stats=self._export_stats(),
+        ))
+
+    def _export_stats(self) -> ExportStats | None:
+        from axonize._processor import AsyncBackgroundProcessor
+
+        if isinstance(self._processor, AsyncBackgroundProcessor):
+            return self._processor._exporter.stats
+        if self._exporter is not None:
+            return self._exporter.stats
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        """Self-telemetry snapshot; see ``axonize.stats()``."""
+        out: dict[str, Any] = {}
+        buf = self._buffer
+        if buf is not None:
+            out["spans"] = {
+                "enqueued": buf.enqueued_count,
+                "dropped": buf.drop_count,
+                "unsampled": buf.unsampled_count,
+            }
+            out["buffer"] = {
+                "size": len(buf),
+                "capacity": buf._maxsize,
+                "high_water": buf.high_water,
+                "overflow": buf.overflow,
+                "sample_scale": buf.sample_scale,
+            }
+        export_stats = self._export_stats()
+        if export_stats is not None:
+            out["export"] = export_stats.snapshot()
+
+        cpu: dict[str, float] = {}
+        processor = self._processor
+        if processor is not None:
+            sampler = processor._sampler
+            if sampler is not None:
+                out["tail_sampling"] = {
+                    "buffered_spans": sampler.buffered_spans,
+                    "kept_traces": sampler.kept_traces,
+                    "dropped_traces": sampler.dropped_traces,
+                    "forced_decisions": sampler.forced_decisions,
+                }
+            device = processor.device_times
+            if device.resolved_spans or device.failed_spans or device.held_spans:
+                out["device_timing"] = {
+                    "resolved_spans": device.resolved_spans,
+                    "failed_spans": device.failed_spans,
+                    "held_spans": device.held_spans,
+                }
+            from axonize._processor import BackgroundProcessor
+
+            # The asyncio processor shares the event loop's thread
+            if isinstance(processor, BackgroundProcessor):
+                cpu["processor"] = processor.cpu.seconds
+        if self._head_sampler is not None:
+            out["adaptive_sampling"] = {"rates": self._head_sampler.rates()}
+            cpu["adaptive_sampler"] = self._head_sampler.cpu.seconds
+        if self._gpu_profiler is not None:
+            cpu["gpu_profiler"] = self._gpu_profiler.cpu.seconds
+        if self._metrics is not None:
+            cpu["metrics"] = self._metrics.cpu.seconds
+        if export_stats is not None and export_stats.sender_cpu.seconds:
+            cpu["exporter_senders"] = export_stats.sender_cpu.seconds
+        out["cpu_seconds"] = cpu
+        return out
+
+    def _create_tail_sampler(self) -> TailSampler | None:
+        if self.config.tail_sampling is None:
+            return None
+        from axonize._sampling import TailSampler
+
+        return TailSampler(self.config.tail_sampling)
+
+    def _create_exporter(
+        self,
+    ) -> OTLPExporter | OTLPHTTPExporter | SharedMemoryExporter | FileExporter:
+        if self.config.shm_ring is not None:
+            from axonize._shm import SharedMemoryExporter
+
+            try:
+                return SharedMemoryExporter(
+                    self.config.shm_ring,
+                    service_name=self.config.service_name,
+                    environment=self.config.environment,
+                )
+            except (OSError, RuntimeError, ValueError):
+                logger.warning(
+                    "Cannot write to span ring %r, exporting directly to %s",
+                    self.config.shm_ring, self.config.endpoint, exc_info=True,
+                )
+        if _is_file_endpoint(self.config.endpoint):
+            return create_file_exporter(self.config.endpoint)
+        return create_otlp_exporter(
+            self.config.endpoint,
+            service_name=self.config.service_name,
+            environment=self.config.environment,
+            api_key=self.config.api_key,
+        )
 
     def shutdown(self) -> None:
         """Stop processor and release resources."""
+        if self._head_sampler is not None:
+            self._head_sampler.stop()
+        if self._metrics is not None:
+            if _metrics.active is self._metrics:
+                _metrics.active = None
+            self._metrics.stop()
+            self._metrics = None
+        if self._metrics_exporter is not None:
+            self._metrics_exporter.shutdown()
+            self._metrics_exporter = None
         if self._gpu_profiler is not None:
             self._gpu_profiler.stop()
             self._gpu_profiler = None
         if self._processor is not None:
-            self._processor.stop()
+            if self._processor.stop() is False:
+                self._flush_without_loop()
             self._processor = None
         if self._exporter is not None:
             self._exporter.shutdown()
             self._exporter = None
         self._buffer = None
 
+    async def shutdown_async(self) -> None:
+        """Like ``shutdown()``, awaiting the final export on the running loop."""
+        from axonize._processor import AsyncBackgroundProcessor
+
+        if isinstance(self._processor, AsyncBackgroundProcessor):
+            await self._processor.aclose()
+            self._processor = None
+        self.shutdown()
+
+    def _flush_without_loop(self) -> None:
+        # The asyncio processor's loop is gone (e.g. asyncio.run() returned
+        # before shutdown); export what is left from this thread instead.
+        if self._buffer is None or len(self._buffer) == 0:
+            return
+        from axonize._processor import BackgroundProcessor
+
+        exporter = self._create_exporter()
+        BackgroundProcessor(
+            self._buffer,
+            batch_size=self.config.batch_size,
+            handler=exporter.export,
+            sampler=self._create_tail_sampler(),
+        ).stop()
+        exporter.shutdown()
+
+    def _pause_threads(self) -> None:
+        """Park background threads so no lock is held mid-operation across fork()."""
+        if self._head_sampler is not None:
+            self._head_sampler.pause()
+        if self._metrics is not None:
+            self._metrics.pause()
+        if self._gpu_profiler is not None:
+            self._gpu_profiler.pause()
+        if self._processor is not None:
+            self._processor.pause()
+
+    def _resume_threads(self) -> None:
+        if self._processor is not None:
+            self._processor.start()
+        if self._gpu_profiler is not None:
+            self._gpu_profiler.start()
+        if self._metrics is not None:
+            self._metrics.start()
+        if self._head_sampler is not None:
+            self._head_sampler.start()
+
     def create_span(
         self,
         name: str,
         *,
         kind: SpanKind = SpanKind.INTERNAL,
+        device_timing: bool = False,
     ) -> Span:
         """Create a new span wired to the internal buffer."""
         return Span(
@@ -78,6 +347,8 @@ class _AxonizeSDK:
             service_name=self.config.service_name,
             environment=self.config.environment,
             sampling_rate=self.config.sampling_rate,
+            sampler=self._head_sampler,
+            device_events=_device.event_factory() if device_timing else None,
         )
 
     def create_llm_span(
@@ -88,6 +359,7 @@ class _AxonizeSDK:
         model_version: str | None = None,
         inference_type: str = "llm",
         kind: SpanKind = SpanKind.SERVER,
+        device_timing: bool = False,
     ) -> LLMSpan:
         """Create an LLM-specialized span wired to the internal buffer."""
         return LLMSpan(
@@ -100,7 +372,62 @@ class _AxonizeSDK:
             model_version=model_version,
             inference_type=inference_type,
             sampling_rate=self.config.sampling_rate,
+            sampler=self._head_sampler,
+            device_events=_device.event_factory() if device_timing else None,
+        )
+
+
+def _is_http_endpoint(endpoint: str) -> bool:
+    return endpoint.startswith(("http://", "https://"))
+
+
+def _is_file_endpoint(endpoint: str) -> bool:
+    return endpoint.startswith("file://")
+
+
+def create_file_exporter(endpoint: str) -> FileExporter:
+    """``FileExporter`` for ``file:///dir?format=parquet&rotate_spans=100000``.
+
+    The query string takes the ``FileExporter`` options ``format``,
+    ``compression``, ``rotate_spans`` and ``rotate_seconds``.
+    """
+    from urllib.parse import parse_qsl, unquote, urlsplit
+
+    from axonize.files import FileExporter
+
+    url = urlsplit(endpoint)
+    options: dict[str, Any] = {}
+    for key, value in parse_qsl(url.query):
+        if key in ("format", "compression"):
+            options[key] = value
+        elif key == "rotate_spans":
+            options[key] = int(value)
+        elif key == "rotate_seconds":
+            options[key] = float(value)
+        else:
+            raise ValueError(f"Unknown file endpoint option {key!r} in {endpoint!r}")
+    return FileExporter(unquote(url.netloc + url.path), **options)
+
+
+def create_otlp_exporter(
+    endpoint: str,
+    *,
+    service_name: str,
+    environment: str,
+    api_key: str | None = None,
+) -> OTLPExporter | OTLPHTTPExporter:
+    """OTLP/HTTP for ``http://`` and ``https://`` endpoints, gRPC otherwise."""
+    if _is_http_endpoint(endpoint):
+        from axonize._http import OTLPHTTPExporter
+
+        return OTLPHTTPExporter(
+            endpoint, service_name=service_name, environment=environment, api_key=api_key,
         )
+    from axonize._exporter import OTLPExporter
+
+    return OTLPExporter(
+        endpoint, service_name=service_name, environment=environment, api_key=api_key,
+    )
 
 
 class _NoopSDK:
@@ -111,6 +438,7 @@ class _NoopSDK:
         name: str,
         *,
         kind: SpanKind = SpanKind.INTERNAL,
+        device_timing: bool = False,
     ) -> Span:
         return Span(name, buffer=None, kind=kind)
 
@@ -122,10 +450,14 @@ class _NoopSDK:
         model_version: str | None = None,
         inference_type: str = "llm",
         kind: SpanKind = SpanKind.SERVER,
+        device_timing: bool = False,
     ) -> LLMSpan:
         return LLMSpan(name, buffer=None, kind=kind, model=model,
                        model_version=model_version, inference_type=inference_type)
 
+    def stats(self) -> dict[str, Any]:
+        return {}
+
 
 _noop = _NoopSDK()
 
@@ -145,19 +477,72 @@ def init(
     batch_size: int = 512,
     flush_interval_ms: int = 5000,
     buffer_size: int = 8192,
+    overflow: str = "drop_oldest",
+    overflow_block_ms: int = 100,
     sampling_rate: float = 1.0,
     gpu_profiling: bool = False,
     api_key: str | None = None,
+    shm_ring: str | None = None,
+    mode: str = "thread",
+    tail_sampling: TailSamplingPolicy | None = None,
+    adaptive_sampling: AdaptiveSamplingPolicy | None = None,
+    metrics: bool = False,
+    metrics_interval_ms: int = 10_000,
 ) -> None:
     """Initialize the Axonize SDK.
 
     Must be called before creating any spans or traces.
+
+    ``overflow`` chooses what happens when the span buffer is full:
+    ``"drop_oldest"`` (default), ``"drop_newest"``, ``"block"`` (wait up to
+    ``overflow_block_ms`` for room; for batch jobs) or ``"sample_down"``
+    (drop new spans and lower head sampling while overflow persists). Root
+    and error spans are dropped only when no child span is left to drop.
+
+    An ``endpoint`` of ``file:///path/to/dir`` writes spans to rotating
+    local files instead (see ``axonize.files``), e.g. for load tests or
+    nodes without a collector; ``?format=parquet`` or ``?format=arrow``
+    select a columnar format.
+
+    ``shm_ring`` names a node-local shared-memory span ring (see
+    ``axonize-launch``); spans are then handed to the node aggregator instead
+    of being exported from this process. Defaults to the ``AXONIZE_SHM_RING``
+    environment variable.
+
+    ``mode="asyncio"`` exports from a task on the running event loop with
+    ``grpc.aio`` instead of a background thread; call ``init()`` from inside
+    the loop and ``await axonize.shutdown_async()`` before it exits.
+
+    ``tail_sampling`` holds finished spans per trace in the processor and
+    exports only traces its policy keeps (errors, slow roots, chosen models
+    and a probabilistic share of the rest). It applies after head sampling,
+    so leave ``sampling_rate`` at 1.0 to let it see every trace.
+
+    ``adaptive_sampling`` replaces the fixed ``sampling_rate`` with per-key
+    rates adjusted to a traces-per-second budget. Sampled spans carry the
+    rate they were sampled at as ``sampling.rate``.
+
+    ``metrics`` counts every finished span, sampled or not, into RED metrics
+    per span name, model, status and GPU (calls, duration, TTFT and token
+    histograms) and exports them as cumulative OTLP metrics every
+    ``metrics_interval_ms``. They need an OTLP metrics receiver, such as an
+    OpenTelemetry Collector, at ``endpoint``.
     """
     global _sdk_instance  # noqa: PLW0603
 
+    if mode not in ("thread", "asyncio"):
+        raise ValueError(f"mode must be 'thread' or 'asyncio', got {mode!r}")
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(
+            f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}, got {overflow!r}"
+        )
+
     if _sdk_instance is not None:
         _sdk_instance.shutdown()
 
+    if shm_ring is None:
+        shm_ring = os.environ.get("AXONIZE_SHM_RING") or None
+
     config = AxonizeConfig(
         endpoint=endpoint,
         service_name=service_name,
@@ -165,9 +550,17 @@ def init(
         batch_size=batch_size,
         flush_interval_ms=flush_interval_ms,
         buffer_size=buffer_size,
+        overflow=overflow,
+        overflow_block_ms=overflow_block_ms,
         sampling_rate=sampling_rate,
         gpu_profiling=gpu_profiling,
         api_key=api_key,
+        shm_ring=shm_ring,
+        mode=mode,
+        tail_sampling=tail_sampling,
+        adaptive_sampling=adaptive_sampling,
+        metrics=metrics,
+        metrics_interval_ms=metrics_interval_ms,
     )
     _sdk_instance = _AxonizeSDK(config)
     _sdk_instance.start()
@@ -180,3 +573,56 @@ def shutdown() -> None:
     if _sdk_instance is not None:
         _sdk_instance.shutdown()
         _sdk_instance = None
+
+
+async def shutdown_async() -> None:
+    """Shut down the SDK from a coroutine, awaiting the final export.
+
+    Needed with ``mode="asyncio"``, where the exports run on the event loop
+    that calls this; works in thread mode too.
+    """
+    global _sdk_instance  # noqa: PLW0603
+    sdk = _sdk_instance
+    if sdk is not None:
+        _sdk_instance = None
+        await sdk.shutdown_async()
+
+
+# ---------------------------------------------------------------------------
+# Fork safety
+#
+# A forked child inherits the SDK object but not its threads; the gRPC channel
+# is unusable and the buffer holds spans the parent will export. The parent's
+# threads are parked around fork(), and the child gets a fresh SDK built from
+# the same config (new buffer, processor, exporter and GPU profiler).
+# ---------------------------------------------------------------------------
+
+
+def _before_fork() -> None:
+    if _sdk_instance is not None:
+        _sdk_instance._pause_threads()
+
+
+def _after_fork_in_parent() -> None:
+    if _sdk_instance is not None:
+        _sdk_instance._resume_threads()
+
+
+def _after_fork_in_child() -> None:
+    global _sdk_instance  # noqa: PLW0603
+    if _sdk_instance is None:
+        return
+    # The inherited instance is abandoned, not shut down: its threads do not
+    # exist here and closing the parent's channel could block. The parent's
+    # event loop does not run in the child, so asyncio mode falls back to
+    # the background thread.
+    _sdk_instance = _AxonizeSDK(dataclasses.replace(_sdk_instance.config, mode="thread"))
+    _sdk_instance.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_before_fork,
+        after_in_parent=_after_fork_in_parent,
+        after_in_child=_after_fork_in_child,
+    )
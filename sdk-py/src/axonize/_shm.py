@@ -0,0 +1,485 @@
+"""Shared-memory span ring for node-local multi-process aggregation.
+
+Worker processes encode finished spans as OTLP ``Span`` protobuf bytes and
+write them into a ``multiprocessing.shared_memory`` segment. A single
+node-local aggregator (``axonize._aggregator``) drains every lane and ships
+the records in large OTLP requests over one connection.
+
+Segment layout (little-endian)::
+
+    header    64 B   magic, version, lanes, slots, slot_size
+    lane[i]   64 B   head, tail, drops      (one per lane)
+    slots            lanes x slots x slot_size
+                     slot = seq u64 | length u32 | pad u32 | record
+
+Each lane is single-producer/single-consumer. The slot for position ``p`` is
+free for the producer while ``seq == p`` and ready for the consumer once
+``seq == p + 1``; the consumer hands it back by setting ``seq = p + slots``.
+
+Python has no memory fences, and on weakly ordered CPUs (ARM) another
+process may see a ``seq`` store before the record bytes written ahead of
+it. Both sides therefore pass a fence between record bytes and ``seq``:
+the producer after writing a batch of records and before publishing them,
+the consumer after seeing them published and before copying them, and
+again before handing the slots back. A fence re-applies a shared lock on
+the lock file's fence byte; the kernel serializes it with every other
+process's fence on the same lock list, which orders the memory accesses on
+either side. It costs one system call per batch, not per record.
+
+Workers claim a lane with a POSIX byte-range lock on a companion lock file.
+The kernel releases it when the worker exits, so lanes of dead workers are
+reused.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Sized
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING
+
+from axonize._exporter import _encode_span
+from axonize._stats import ExportStats
+
+if TYPE_CHECKING:
+    from axonize._types import SpanData
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger("axonize.shm")
+
+DEFAULT_LANES = 16
+DEFAULT_SLOTS = 1024
+DEFAULT_SLOT_SIZE = 2048
+
+_MAGIC = b"AXSR"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIIII")  # magic, version, lanes, slots, slot_size
+_HEADER_SIZE = 64
+_LANE_SIZE = 64
+_LANE_HEAD = 0
+_LANE_TAIL = 8
+_LANE_DROPS = 16
+_SLOT_HEADER_SIZE = 16
+_U64 = struct.Struct("<Q")
+_U32 = struct.Struct("<I")
+
+# Resource prefix of every record: service_name and environment lengths
+_RESOURCE = struct.Struct("<HH")
+
+
+_attach_lock = threading.Lock()
+_attaching = threading.local()
+
+
+def lock_path(name: str) -> str:
+    """Return the lane lock file used by the ring ``name``."""
+    return os.path.join(tempfile.gettempdir(), f"{name}.lanes")
+
+
+class SharedSpanRing:
+    """Fixed-size multi-lane span ring in a named shared memory segment.
+
+    Use ``create()`` in the aggregator process and ``attach()`` in workers.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool) -> None:
+        magic, version, lanes, slots, slot_size = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            shm.close()
+            raise ValueError(f"shared memory segment {shm.name!r} is not an axonize span ring")
+        self._shm = shm
+        self._owner = owner
+        self.name = shm.name
+        self.lanes: int = lanes
+        self.slots: int = slots
+        self.slot_size: int = slot_size
+        self._lane_bytes: int = slots * slot_size
+        self._data_offset: int = _HEADER_SIZE + lanes * _LANE_SIZE
+
+    @classmethod
+    def create(
+        cls,
+        name: str | None = None,
+        *,
+        lanes: int = DEFAULT_LANES,
+        slots: int = DEFAULT_SLOTS,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+    ) -> SharedSpanRing:
+        """Create and initialize a new ring segment."""
+        if lanes < 1 or slots < 1:
+            raise ValueError("lanes and slots must be positive")
+        if slot_size <= _SLOT_HEADER_SIZE or slot_size % 8:
+            raise ValueError("slot_size must be a multiple of 8 larger than 16")
+        size = _HEADER_SIZE + lanes * _LANE_SIZE + lanes * slots * slot_size
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        buf = shm.buf
+        _HEADER.pack_into(buf, 0, _MAGIC, _VERSION, lanes, slots, slot_size)
+        data = _HEADER_SIZE + lanes * _LANE_SIZE
+        for lane in range(lanes):
+            base = data + lane * slots * slot_size
+            for pos in range(slots):
+                _U64.pack_into(buf, base + pos * slot_size, pos)
+        # Created up front so workers never race on creating it.
+        os.close(os.open(lock_path(shm.name), os.O_RDWR | os.O_CREAT, 0o600))
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedSpanRing:
+        """Attach to an existing ring created by another process."""
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # Before 3.13 attaching registers the segment with the resource
+            # tracker, which unlinks it when the worker exits. Unregistering
+            # afterwards is not enough: forked workers share the creator's
+            # tracker and would drop its registration instead. The stand-in
+            # only skips this thread's registration; shared memory opened by
+            # other threads meanwhile is registered as usual.
+            with _attach_lock:
+                register = resource_tracker.register
+
+                def register_others(name: Sized, rtype: str) -> None:
+                    if not getattr(_attaching, "active", False):
+                        register(name, rtype)
+
+                resource_tracker.register = register_others
+                _attaching.active = True
+                try:
+                    shm = shared_memory.SharedMemory(name=name)
+                finally:
+                    _attaching.active = False
+                    resource_tracker.register = register
+        return cls(shm, owner=False)
+
+    # -- Lane headers ----------------------------------------------------------
+
+    def _lane_field(self, lane: int, field: int) -> int:
+        value: int = _U64.unpack_from(self._shm.buf, _HEADER_SIZE + lane * _LANE_SIZE + field)[0]
+        return value
+
+    def _set_lane_field(self, lane: int, field: int, value: int) -> None:
+        _U64.pack_into(self._shm.buf, _HEADER_SIZE + lane * _LANE_SIZE + field, value)
+
+    def _slot_offset(self, lane: int, pos: int) -> int:
+        return self._data_offset + lane * self._lane_bytes + (pos % self.slots) * self.slot_size
+
+    def backlog(self, lane: int) -> int:
+        """Records written to ``lane`` but not yet consumed."""
+        return self._lane_field(lane, _LANE_HEAD) - self._lane_field(lane, _LANE_TAIL)
+
+    def drops(self, lane: int) -> int:
+        """Records the producer of ``lane`` dropped because it was full or too large."""
+        return self._lane_field(lane, _LANE_DROPS)
+
+    # -- Producer side ---------------------------------------------------------
+
+    def claim_lane(self) -> int:
+        """Claim a free lane for this process and return its index.
+
+        Raises ``RuntimeError`` when every lane is held by a live process.
+        """
+        return _lane_locks.claim(self)
+
+    def stage(self, lane: int, pos: int, record: bytes) -> bool:
+        """Copy ``record`` into the slot for ``pos`` without publishing it.
+
+        False if the slot is busy. Staged records reach the consumer with
+        ``publish()``.
+        """
+        buf = self._shm.buf
+        off = self._slot_offset(lane, pos)
+        if _U64.unpack_from(buf, off)[0] != pos:
+            return False
+        start = off + _SLOT_HEADER_SIZE
+        buf[start:start + len(record)] = record
+        _U32.pack_into(buf, off + 8, len(record))
+        return True
+
+    def publish(self, lane: int, start: int, end: int) -> None:
+        """Make the records staged at positions ``start`` to ``end - 1`` visible."""
+        if start >= end:
+            return
+        _lane_locks.fence(self)
+        buf = self._shm.buf
+        for pos in range(start, end):
+            _U64.pack_into(buf, self._slot_offset(lane, pos), pos + 1)
+
+    def write(self, lane: int, pos: int, record: bytes) -> bool:
+        """Stage and publish one record. False if the slot is busy."""
+        if not self.stage(lane, pos, record):
+            return False
+        self.publish(lane, pos, pos + 1)
+        return True
+
+    def _resume_position(self, lane: int) -> int:
+        """Producer position for a newly claimed lane.
+
+        A previous owner may have published a record but died before updating
+        ``head``; skip slots that were already written after it.
+        """
+        buf = self._shm.buf
+        pos = self._lane_field(lane, _LANE_HEAD)
+        for _ in range(self.slots):
+            seq = _U64.unpack_from(buf, self._slot_offset(lane, pos))[0]
+            if seq != pos + 1 and seq != pos + self.slots:
+                break
+            pos += 1
+        self._set_lane_field(lane, _LANE_HEAD, pos)
+        return pos
+
+    # -- Consumer side ---------------------------------------------------------
+
+    def read_lane(self, lane: int, pos: int, out: list[bytes], limit: int) -> int:
+        """Append up to ``limit`` ready records from ``lane`` to ``out``.
+
+        ``pos`` is the consumer position; returns the new position.
+        """
+        buf = self._shm.buf
+        slots = self.slots
+        ready = pos
+        end = pos + limit
+        while ready < end and _U64.unpack_from(buf, self._slot_offset(lane, ready))[0] == ready + 1:
+            ready += 1
+        if ready == pos:
+            return pos
+        _lane_locks.fence(self)  # record bytes published with these seqs
+        for p in range(pos, ready):
+            off = self._slot_offset(lane, p)
+            length = _U32.unpack_from(buf, off + 8)[0]
+            start = off + _SLOT_HEADER_SIZE
+            out.append(bytes(buf[start:start + length]))
+        _lane_locks.fence(self)  # copies done before the producer may reuse the slots
+        for p in range(pos, ready):
+            _U64.pack_into(buf, self._slot_offset(lane, p), p + slots)
+        self._set_lane_field(lane, _LANE_TAIL, ready)
+        return ready
+
+    def consumer_positions(self) -> list[int]:
+        """Per-lane consumer positions to resume from (e.g. after a restart)."""
+        return [self._lane_field(lane, _LANE_TAIL) for lane in range(self.lanes)]
+
+    # -- Lifecycle -------------------------------------------------------------
+
+    def close(self) -> None:
+        """Unmap the segment from this process."""
+        try:
+            self._shm.close()
+        except BufferError:
+            pass  # a caller still holds a view; the mapping goes with the process
+
+    def unlink(self) -> None:
+        """Remove the segment and its lock file (creator only)."""
+        if not self._owner:
+            return
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            os.unlink(lock_path(self.name))
+        except FileNotFoundError:
+            pass
+
+
+class _LaneLocks:
+    """Per-process lane ownership via byte-range locks on the ring lock file.
+
+    POSIX record locks belong to the process and are released when *any*
+    descriptor of the file is closed, so each ring's lock file is opened once
+    per process and never closed; claims within the process are tracked here
+    because the kernel would not stop two claims of the same byte.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._fds: dict[str, int] = {}
+        self._claimed: dict[str, set[int]] = {}
+
+    def _fd(self, ring: SharedSpanRing) -> int:
+        # Called with self._lock held
+        fd = self._fds.get(ring.name)
+        if fd is None:
+            fd = self._fds[ring.name] = os.open(lock_path(ring.name), os.O_RDWR)
+        return fd
+
+    def claim(self, ring: SharedSpanRing) -> int:
+        if fcntl is None:  # pragma: no cover - Windows
+            raise RuntimeError("shared-memory span rings require POSIX file locks")
+        with self._lock:
+            fd = self._fd(ring)
+            claimed = self._claimed.setdefault(ring.name, set())
+            for lane in range(ring.lanes):
+                if lane in claimed:
+                    continue
+                try:
+                    fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, lane)
+                except OSError:
+                    continue
+                claimed.add(lane)
+                return lane
+        raise RuntimeError(f"no free lane in span ring {ring.name!r} ({ring.lanes} lanes)")
+
+    def fence(self, ring: SharedSpanRing) -> None:
+        """Order this process's ring accesses against other processes' fences.
+
+        Takes (or re-takes) a shared lock on the byte after the lanes. Every
+        process may hold it, so this never blocks; the kernel applies it
+        under the lock file's lock-list spinlock.
+        """
+        if fcntl is None:  # pragma: no cover - Windows
+            return
+        fd = self._fds.get(ring.name)
+        if fd is None:
+            with self._lock:
+                fd = self._fd(ring)
+        fcntl.lockf(fd, fcntl.LOCK_SH | fcntl.LOCK_NB, 1, ring.lanes)
+
+    def release(self, ring: SharedSpanRing, lane: int) -> None:
+        if fcntl is None:  # pragma: no cover - Windows
+            return
+        with self._lock:
+            fd = self._fds.get(ring.name)
+            claimed = self._claimed.get(ring.name)
+            if fd is None or claimed is None or lane not in claimed:
+                return
+            fcntl.lockf(fd, fcntl.LOCK_UN, 1, lane)
+            claimed.discard(lane)
+
+    def _reset_in_child(self) -> None:
+        # Record locks are not inherited across fork(). Inherited descriptors
+        # stay open (closing one is harmless but pointless) and are replaced.
+        self._lock = threading.Lock()
+        self._fds = {}
+        self._claimed = {}
+
+
+_lane_locks = _LaneLocks()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_lane_locks._reset_in_child)
+
+
+def encode_resource_prefix(service_name: str, environment: str) -> bytes:
+    """Record prefix identifying the resource a span belongs to."""
+    svc = service_name.encode("utf-8")[:0xFFFF]
+    env = environment.encode("utf-8")[:0xFFFF]
+    return _RESOURCE.pack(len(svc), len(env)) + svc + env
+
+
+def split_record(record: bytes) -> tuple[bytes, memoryview]:
+    """Split a record into its resource prefix and OTLP span bytes."""
+    svc_len, env_len = _RESOURCE.unpack_from(record, 0)
+    end = _RESOURCE.size + svc_len + env_len
+    return record[:end], memoryview(record)[end:]
+
+
+def decode_resource_prefix(prefix: bytes) -> tuple[str, str]:
+    """Inverse of ``encode_resource_prefix``."""
+    svc_len, env_len = _RESOURCE.unpack_from(prefix, 0)
+    start = _RESOURCE.size
+    service = prefix[start:start + svc_len].decode("utf-8", "replace")
+    env = prefix[start + svc_len:start + svc_len + env_len].decode("utf-8", "replace")
+    return service, env
+
+
+class SharedMemoryExporter:
+    """Worker-side exporter that writes spans into a node-local span ring.
+
+    Drop-in replacement for ``OTLPExporter`` as a ``BackgroundProcessor``
+    handler: spans are encoded on the processor thread and handed to the
+    aggregator through shared memory, so the worker holds no gRPC channel.
+    When the lane is full the writer waits up to ``block_timeout_s`` for the
+    aggregator before dropping the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        ring_name: str,
+        service_name: str,
+        environment: str,
+        *,
+        block_timeout_s: float = 0.5,
+    ) -> None:
+        self._ring = SharedSpanRing.attach(ring_name)
+        try:
+            self._lane = self._ring.claim_lane()
+        except RuntimeError:
+            self._ring.close()
+            raise
+        self._pos = self._ring._resume_position(self._lane)
+        self._prefix = encode_resource_prefix(service_name, environment)
+        self._max_record = self._ring.slot_size - _SLOT_HEADER_SIZE
+        self._block_timeout_s = block_timeout_s
+        self._drops = self._ring.drops(self._lane)
+        self.stats = ExportStats()
+
+    @property
+    def lane(self) -> int:
+        return self._lane
+
+    def export(self, spans: list[SpanData]) -> None:
+        """Write a batch of spans into this worker's lane. Never raises."""
+        if not spans:
+            return
+        ring = self._ring
+        lane = self._lane
+        deadline = 0.0
+        start = time.perf_counter_ns()
+        encode_ns = 0
+        written = 0
+        published = self._pos
+        for i, sd in enumerate(spans):
+            t0 = time.perf_counter_ns()
+            try:
+                record = self._prefix + _encode_span(sd)
+            except Exception:  # noqa: BLE001
+                logger.debug("Failed to encode span %s", sd.name, exc_info=True)
+                continue
+            finally:
+                encode_ns += time.perf_counter_ns() - t0
+            if len(record) > self._max_record:
+                self._drop(1)
+                continue
+            while not ring.stage(lane, self._pos, record):
+                # Lane full: let the aggregator have what is staged so far
+                ring.publish(lane, published, self._pos)
+                published = self._pos
+                now = time.monotonic()
+                if deadline == 0.0:
+                    deadline = now + self._block_timeout_s
+                elif now >= deadline:
+                    self._drop(len(spans) - i)
+                    ring._set_lane_field(lane, _LANE_HEAD, self._pos)
+                    self._record_stats(len(spans), written, start, encode_ns)
+                    return
+                time.sleep(0.001)
+            self._pos += 1
+            written += 1
+        ring.publish(lane, published, self._pos)
+        ring._set_lane_field(lane, _LANE_HEAD, self._pos)
+        self._record_stats(len(spans), written, start, encode_ns)
+
+    def _record_stats(self, span_count: int, written: int, start: int, encode_ns: int) -> None:
+        self.stats.record_encode(encode_ns)
+        self.stats.record_send(written, time.perf_counter_ns() - start - encode_ns, ok=True)
+        if written < span_count:
+            self.stats.record_failure(span_count - written)
+
+    def _drop(self, count: int) -> None:
+        self._drops += count
+        self._ring._set_lane_field(self._lane, _LANE_DROPS, self._drops)
+
+    def shutdown(self) -> None:
+        """Release the lane and unmap the ring."""
+        _lane_locks.release(self._ring, self._lane)
+        self._ring.close()
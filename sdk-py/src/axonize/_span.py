@@ -3,17 +3,23 @@
 from __future__ import annotations
 
 import random
-import time
-import uuid
 from contextvars import Token
 from types import TracebackType
 from typing import TYPE_CHECKING
 
+from axonize import _clock, _metrics
+from axonize._attributes import AttributeValue, BaseAttributes, SpanAttributes, intern_key
+from axonize._clock import monotonic_ns
 from axonize._context import get_current_span, set_current_span
+from axonize._ids import new_span_id, new_trace_id
 from axonize._types import GPUAttribution, SpanData, SpanKind, SpanStatus
 
 if TYPE_CHECKING:
     from axonize._buffer import RingBuffer
+    from axonize._device import DeviceEvent, EventFactory
+    from axonize._sampling import AdaptiveSampler
+
+_MODEL_KID = intern_key("ai.model.name")
 
 
 class Span:
@@ -34,6 +40,9 @@ class Span:
         service_name: str = "",
         environment: str = "development",
         sampling_rate: float = 1.0,
+        base_attributes: BaseAttributes | None = None,
+        sampler: AdaptiveSampler | None = None,
+        device_events: EventFactory | None = None,
     ) -> None:
         self.name = name
         self.kind = kind
@@ -41,10 +50,10 @@ class Span:
         self._environment = environment
         self._buffer = buffer
 
-        self.span_id: str = uuid.uuid4().hex[:16]
+        self.span_id: str = new_span_id()
         self._status: SpanStatus = SpanStatus.UNSET
         self._error_message: str | None = None
-        self._attributes: dict[str, str | int | float | bool] = {}
+        self._attributes = SpanAttributes(base_attributes)
         self._gpu_labels: list[str] = []
         self._gpu_attributions: list[GPUAttribution] = []
 
@@ -54,17 +63,41 @@ class Span:
             self.trace_id: str = parent.trace_id
             self.parent_span_id: str | None = parent.span_id
             self._sampled: bool = parent._sampled
+            self._sample_rate: float = parent._sample_rate
         else:
-            self.trace_id = uuid.uuid4().hex
+            self.trace_id = new_trace_id()
             self.parent_span_id = None
-            self._sampled = random.random() < sampling_rate  # noqa: S311
-
+            # Below 1.0 while the buffer's "sample_down" policy sheds load
+            scale = buffer.sample_scale if buffer is not None else 1.0
+            if sampler is not None:
+                rate = sampler.sample(name, base_attributes)
+                if rate > 0.0 and scale < 1.0:
+                    rate = rate * scale if random.random() < scale else 0.0  # noqa: S311
+                self._sample_rate = rate
+                self._sampled = rate > 0.0
+            else:
+                self._sample_rate = sampling_rate * scale
+                self._sampled = random.random() < self._sample_rate  # noqa: S311
+        if self._sampled and self._sample_rate < 1.0:
+            # Each exported span stands for 1/rate spans, for count extrapolation
+            self._attributes["sampling.rate"] = self._sample_rate
+
+        # Monotonic timestamps; converted to wall time with the offset sampled at start.
         self._start_time_ns: int = 0
         self._end_time_ns: int = 0
+        self._wall_offset_ns: int = 0
         self._token: Token[Span | None] | None = None
+        # Device timing: events recorded on the current stream, only for sampled spans
+        self._event_factory = device_events if self._sampled else None
+        self._device_events: tuple[DeviceEvent, DeviceEvent] | None = None
+        self._device_start: DeviceEvent | None = None
 
     def __enter__(self) -> Span:
-        self._start_time_ns = time.time_ns()
+        self._wall_offset_ns = _clock._wall_offset_ns
+        if self._event_factory is not None:
+            self._device_start = self._event_factory()
+            self._device_start.record()
+        self._start_time_ns = monotonic_ns()
         self._token = set_current_span(self)
         return self
 
@@ -74,7 +107,11 @@ class Span:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        self._end_time_ns = time.time_ns()
+        self._end_time_ns = monotonic_ns()
+        if self._device_start is not None and self._event_factory is not None:
+            end = self._event_factory()
+            end.record()
+            self._device_events = (self._device_start, end)
 
         if exc_type is not None:
             self._status = SpanStatus.ERROR
@@ -88,12 +125,62 @@ class Span:
 
             _current_span.reset(self._token)
 
+        # RED metrics count every span, sampled or not
+        metrics = _metrics.active
+        if metrics is not None and self._buffer is not None:
+            self._record_metrics(metrics)
+
         # Enqueue immutable snapshot (skip if not sampled)
         if self._sampled and self._buffer is not None:
+            self._finalize()
+            self._buffer.enqueue(self._to_span_data())
+        elif self._buffer is not None:
+            self._buffer.count_unsampled()
+
+    def _emit(self, start_ns: int, end_ns: int) -> None:
+        """Finish a span that was never entered, with times measured elsewhere.
+
+        For integrations that build spans after the fact from an engine's own
+        timestamps (``monotonic_ns()`` values). Mirrors ``__exit__`` without
+        the context handling.
+        """
+        self._wall_offset_ns = _clock._wall_offset_ns
+        self._start_time_ns = start_ns
+        self._end_time_ns = end_ns
+        if self._status == SpanStatus.UNSET:
+            self._status = SpanStatus.OK
+
+        metrics = _metrics.active
+        if metrics is not None and self._buffer is not None:
+            self._record_metrics(metrics)
+
+        if self._sampled and self._buffer is not None:
+            self._finalize()
             self._buffer.enqueue(self._to_span_data())
+        elif self._buffer is not None:
+            self._buffer.count_unsampled()
+
+    def _finalize(self) -> None:
+        """Hook for subclasses to derive attributes before the snapshot is taken."""
+
+    def _record_metrics(self, metrics: _metrics.SpanMetrics) -> None:
+        metrics.record(self._metrics_key(), self._end_time_ns - self._start_time_ns)
+
+    def _metrics_key(self) -> _metrics.SeriesKey:
+        model = self._attributes.get_by_id(_MODEL_KID)
+        if self._gpu_attributions:
+            gpu = ",".join(a.resource_uuid for a in self._gpu_attributions)
+        else:
+            gpu = ",".join(self._gpu_labels)
+        return (
+            self.name,
+            "" if model is None else str(model),
+            self._status.value,
+            gpu,
+        )
 
-    def set_attribute(self, key: str, value: str | int | float | bool) -> None:
-        """Attach a key-value attribute to this span."""
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """Attach a key-value attribute to this span. Ignored once the span has ended."""
         self._attributes[key] = value
 
     def set_gpus(self, labels: list[str]) -> None:
@@ -117,20 +204,24 @@ class Span:
         self._error_message = message
 
     def _to_span_data(self) -> SpanData:
+        # Hand the attribute store to the snapshot instead of copying it.
+        self._attributes.seal()
         duration_ms = (self._end_time_ns - self._start_time_ns) / 1_000_000
+        offset = self._wall_offset_ns
         return SpanData(
             span_id=self.span_id,
             trace_id=self.trace_id,
             name=self.name,
             kind=self.kind,
             status=self._status,
-            start_time_ns=self._start_time_ns,
-            end_time_ns=self._end_time_ns,
+            start_time_ns=self._start_time_ns + offset,
+            end_time_ns=self._end_time_ns + offset,
             duration_ms=duration_ms,
             service_name=self._service_name,
-            attributes=dict(self._attributes),
+            attributes=self._attributes,
             parent_span_id=self.parent_span_id,
-            gpu_attributions=list(self._gpu_attributions),
+            gpu_attributions=self._gpu_attributions,
             error_message=self._error_message,
             environment=self._environment,
+            device_events=self._device_events,
         )
@@ -0,0 +1,111 @@
+"""SDK self-telemetry — what the SDK itself drops, exports and spends.
+
+Nothing here runs per span on the inference thread: exporters record per
+batch, background threads record their own CPU time, and the ring buffer
+derives its counts on the drain side.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from axonize._histogram import LogLinearHistogram
+
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class ThreadCPU:
+    """CPU time spent by a background thread, across restarts (e.g. fork)."""
+
+    __slots__ = ("_done", "_current")
+
+    def __init__(self) -> None:
+        self._done = 0.0
+        self._current = 0.0
+
+    def begin(self) -> None:
+        """Call on the thread when it starts."""
+        self._done += self._current
+        self._current = 0.0
+
+    def update(self) -> None:
+        """Call on the thread after each unit of work."""
+        self._current = time.thread_time()
+
+    def add(self, seconds: float) -> None:
+        """Add CPU time measured around work on a shared thread."""
+        self._done += seconds
+
+    @property
+    def seconds(self) -> float:
+        return self._done + self._current
+
+
+class ExportStats:
+    """Per-exporter batch counters and latency histograms (microseconds).
+
+    Updated once per batch, possibly from several sender threads, so a
+    lock keeps the counts exact.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.spans = 0
+        self.failed_batches = 0
+        self.failed_spans = 0
+        self.batch_size = LogLinearHistogram(1 << 20)
+        self.batch_size_sum = 0
+        self.encode_us = LogLinearHistogram(1 << 32)
+        self.encode_us_sum = 0
+        self.send_us = LogLinearHistogram(1 << 32)
+        self.send_us_sum = 0
+        self.sender_cpu = ThreadCPU()
+
+    def record_encode(self, elapsed_ns: int) -> None:
+        with self._lock:
+            self.encode_us.record(elapsed_ns // 1000)
+            self.encode_us_sum += elapsed_ns // 1000
+
+    def record_send(self, span_count: int, elapsed_ns: int, *, ok: bool) -> None:
+        with self._lock:
+            self.send_us.record(elapsed_ns // 1000)
+            self.send_us_sum += elapsed_ns // 1000
+            self.batch_size.record_count(span_count)
+            self.batch_size_sum += span_count
+            if ok:
+                self.batches += 1
+                self.spans += span_count
+            else:
+                self.failed_batches += 1
+                self.failed_spans += span_count
+
+    def record_sender_cpu(self, seconds: float) -> None:
+        with self._lock:
+            self.sender_cpu.add(seconds)
+
+    def record_failure(self, span_count: int) -> None:
+        """Count a batch that failed before it could be sent."""
+        with self._lock:
+            self.failed_batches += 1
+            self.failed_spans += span_count
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "spans": self.spans,
+                "failed_batches": self.failed_batches,
+                "failed_spans": self.failed_spans,
+                "batch_size": _summary(self.batch_size, 1, offset=1),
+                "encode_ms": _summary(self.encode_us, 1000),
+                "send_ms": _summary(self.send_us, 1000),
+            }
+
+
+def _summary(hist: LogLinearHistogram, per_unit: int, offset: int = 0) -> dict[str, float]:
+    p50, p90, p99 = (q + offset for q in hist.quantiles(_QUANTILES))
+    return {"count": hist.count, "p50": p50 / per_unit, "p90": p90 / per_unit,
+            "p99": p99 / per_unit}
@@ -0,0 +1,182 @@
+"""Span templates — prepared factories for repeated inference operations."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from axonize import _device
+from axonize._attributes import AttributeValue, BaseAttributes
+from axonize._llm import LLMSpan
+from axonize._sdk import _AxonizeSDK, _get_sdk, _NoopSDK
+from axonize._span import Span
+from axonize._types import SpanKind
+
+if TYPE_CHECKING:
+    from axonize._buffer import RingBuffer
+    from axonize._device import EventFactory
+    from axonize._gpu import GPUProfiler, MockGPUProfiler, _GPUPlan
+    from axonize._sampling import AdaptiveSampler
+
+S = TypeVar("S", bound=Span)
+
+
+class _Binding:
+    """Per-SDK state resolved once and reused until the SDK is re-initialized."""
+
+    __slots__ = (
+        "sdk", "buffer", "service_name", "environment", "sampling_rate", "sampler", "profiler",
+        "gpu_plan", "device_events",
+    )
+
+    def __init__(
+        self,
+        sdk: _AxonizeSDK | _NoopSDK,
+        gpu_labels: tuple[str, ...],
+        device_timing: bool,
+    ) -> None:
+        self.sdk = sdk
+        self.buffer: RingBuffer | None = None
+        self.service_name = ""
+        self.environment = "development"
+        self.sampling_rate = 1.0
+        self.sampler: AdaptiveSampler | None = None
+        self.profiler: GPUProfiler | MockGPUProfiler | None = None
+        self.gpu_plan: _GPUPlan = ()
+        self.device_events: EventFactory | None = None
+        if isinstance(sdk, _AxonizeSDK):
+            self.buffer = sdk._buffer
+            self.service_name = sdk.config.service_name
+            self.environment = sdk.config.environment
+            self.sampling_rate = sdk.config.sampling_rate
+            self.sampler = sdk._head_sampler
+            self.profiler = sdk._gpu_profiler
+            if self.profiler is not None and gpu_labels:
+                self.gpu_plan = self.profiler.prepare_labels(gpu_labels)
+            if device_timing:
+                self.device_events = _device.event_factory()
+
+
+class SpanTemplate(Generic[S]):
+    """Prepared span factory: static setup is computed once, not per call.
+
+    Name, kind, base attributes (shared by every span and encoded once by the
+    exporter) and GPU label resolution are fixed at preparation time; SDK
+    settings are bound on first use and re-bound after ``init()``, as is the
+    event factory when ``device_timing`` is set. Calling the template only
+    allocates per-span state::
+
+        generate = axonize.prepare_llm_span("generate", model="llama-3-70b",
+                                            gpus=["cuda:0"])
+
+        with generate() as s:
+            for token in stream:
+                s.record_token()
+    """
+
+    __slots__ = (
+        "name", "kind", "_span_class", "_base", "_gpu_labels", "_device_timing", "_binding",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        span_class: type[S],
+        kind: SpanKind,
+        base_attributes: BaseAttributes | None = None,
+        gpus: list[str] | tuple[str, ...] | None = None,
+        device_timing: bool = False,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self._span_class = span_class
+        self._base = base_attributes
+        self._gpu_labels: tuple[str, ...] = tuple(gpus) if gpus else ()
+        self._device_timing = device_timing
+        self._binding: _Binding | None = None
+
+    def __call__(self) -> S:
+        sdk = _get_sdk()
+        binding = self._binding
+        if binding is None or binding.sdk is not sdk:
+            binding = self._binding = _Binding(sdk, self._gpu_labels, self._device_timing)
+
+        span = self._span_class(
+            self.name,
+            buffer=binding.buffer,
+            kind=self.kind,
+            service_name=binding.service_name,
+            environment=binding.environment,
+            sampling_rate=binding.sampling_rate,
+            base_attributes=self._base,
+            sampler=binding.sampler,
+            device_events=binding.device_events,
+        )
+        if self._gpu_labels:
+            span._gpu_labels = list(self._gpu_labels)
+            if binding.profiler is not None:
+                span._gpu_attributions = binding.profiler.resolve_prepared(binding.gpu_plan)
+        return span
+
+
+def _base_from(
+    model_attributes: dict[str, AttributeValue],
+    attributes: Mapping[str, AttributeValue] | None,
+) -> BaseAttributes | None:
+    values = dict(attributes) if attributes else {}
+    values.update(model_attributes)
+    return BaseAttributes(values) if values else None
+
+
+def prepare_span(
+    name: str,
+    *,
+    kind: SpanKind = SpanKind.INTERNAL,
+    attributes: Mapping[str, AttributeValue] | None = None,
+    gpus: list[str] | None = None,
+    device_timing: bool = False,
+) -> SpanTemplate[Span]:
+    """Prepare a reusable factory for spans with identical static setup.
+
+    ``device_timing`` works as for :func:`axonize.span`.
+    """
+    return SpanTemplate(
+        name,
+        span_class=Span,
+        kind=kind,
+        base_attributes=_base_from({}, attributes),
+        gpus=gpus,
+        device_timing=device_timing,
+    )
+
+
+def prepare_llm_span(
+    name: str,
+    *,
+    model: str | None = None,
+    model_version: str | None = None,
+    inference_type: str = "llm",
+    kind: SpanKind = SpanKind.SERVER,
+    attributes: Mapping[str, AttributeValue] | None = None,
+    gpus: list[str] | None = None,
+    device_timing: bool = False,
+) -> SpanTemplate[LLMSpan]:
+    """Prepare a reusable factory for LLM spans with identical static setup.
+
+    ``device_timing`` works as for :func:`axonize.span`.
+    """
+    model_attributes: dict[str, AttributeValue] = {}
+    if model is not None:
+        model_attributes["ai.model.name"] = model
+    if model_version is not None:
+        model_attributes["ai.model.version"] = model_version
+    model_attributes["ai.inference.type"] = inference_type
+    return SpanTemplate(
+        name,
+        span_class=LLMSpan,
+        kind=kind,
+        base_attributes=_base_from(model_attributes, attributes),
+        gpus=gpus,
+        device_timing=device_timing,
+    )
@@ -20,6 +20,7 @@ def trace(
     *,
     name: str | None = None,
     kind: SpanKind = SpanKind.SERVER,
+    device_timing: bool = False,
 ) -> Callable[[F], F]: ...
 
 
@@ -28,6 +29,7 @@ def trace(
     *,
     name: str | None = None,
     kind: SpanKind = SpanKind.SERVER,
+    device_timing: bool = False,
 ) -> F | Callable[[F], F]:
     """Decorator that wraps a function call in a span.
 
@@ -38,6 +40,8 @@ def trace(
 
         @trace(name="custom", kind=SpanKind.CLIENT)
         def call_service(): ...
+
+    ``device_timing`` works as for :func:`axonize.span`.
     """
 
     def decorator(fn: F) -> F:
@@ -48,7 +52,7 @@ def trace(
             from axonize._sdk import _get_sdk
 
             sdk = _get_sdk()
-            with sdk.create_span(span_name, kind=kind):
+            with sdk.create_span(span_name, kind=kind, device_timing=device_timing):
                 return fn(*args, **kwargs)
 
         return wrapper  # type: ignore[return-value]
@@ -3,7 +3,14 @@
 from __future__ import annotations
 
 import enum
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from axonize._attributes import AttributeValue
+
+if TYPE_CHECKING:
+    from axonize._device import DeviceEvent
 
 
 class SpanKind(enum.Enum):
@@ -41,7 +48,7 @@ class GPUAttribution:
     clock_mhz: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SpanData:
     """Immutable snapshot of a completed span for buffer storage."""
 
@@ -54,8 +61,12 @@ class SpanData:
     end_time_ns: int
     duration_ms: float
     service_name: str
-    attributes: dict[str, str | int | float | bool] = field(default_factory=dict)
+    attributes: Mapping[str, AttributeValue] = field(default_factory=dict)
     parent_span_id: str | None = None
     gpu_attributions: list[GPUAttribution] = field(default_factory=list)
     error_message: str | None = None
     environment: str = "development"
+    # (start, end) events of a device-timed span, until the processor resolves them
+    device_events: tuple[DeviceEvent, DeviceEvent] | None = field(
+        default=None, repr=False, compare=False
+    )
@@ -0,0 +1,83 @@
+"""Periodic daemon threads that can be paused around fork() and resumed."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+from axonize._stats import ThreadCPU
+
+
+class PeriodicWorker:
+    """Daemon thread that calls ``tick()`` every ``interval_s`` seconds.
+
+    At most one thread runs ``tick()`` at a time. Each run has its own stop
+    event, so a thread still inside ``tick()`` when ``pause()`` gives up
+    waiting (an export in flight) is never revived by a later ``start()``.
+    Such a ``start()`` is deferred instead: the old thread starts its
+    successor once it has finished the tick and exited its loop.
+    """
+
+    def __init__(
+        self,
+        tick: Callable[[], None],
+        interval_s: float,
+        *,
+        cpu: ThreadCPU,
+        join_timeout_s: float,
+        on_start: Callable[[], None] | None = None,
+    ) -> None:
+        self._tick = tick
+        self._interval_s = interval_s
+        self._cpu = cpu
+        self._join_timeout_s = join_timeout_s
+        self._on_start = on_start
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._resume = False
+        # Set until the thread has left its loop for good
+        self.thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        thread = self.thread
+        return thread is not None and thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.thread is not None:
+                # Running, or paused and still finishing a tick
+                self._resume = self._stop_event.is_set()
+                return
+            self._launch()
+
+    def pause(self) -> bool:
+        """Stop the thread and wait for it. Returns whether it has exited."""
+        with self._lock:
+            self._resume = False
+            self._stop_event.set()
+            thread = self.thread
+        if thread is None:
+            return True
+        thread.join(timeout=self._join_timeout_s)
+        return not thread.is_alive()
+
+    def _launch(self) -> None:
+        if self._on_start is not None:
+            self._on_start()
+        stop = self._stop_event = threading.Event()
+        self._resume = False
+        self.thread = threading.Thread(target=self._run, args=(stop,), daemon=True)
+        self.thread.start()
+
+    def _run(self, stop: threading.Event) -> None:
+        self._cpu.begin()
+        while not stop.wait(self._interval_s):
+            self._tick()
+            self._cpu.update()
+        with self._lock:
+            if self.thread is threading.current_thread():
+                if self._resume:
+                    self._launch()
+                else:
+                    self.thread = None
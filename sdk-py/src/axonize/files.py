@@ -0,0 +1,534 @@
+"""Local span files — spans on disk instead of a collector.
+
+For load tests, CI performance runs and nodes without a collector,
+:class:`FileExporter` writes finished spans to rotating files in a
+directory. Each span is one row in the column layout of the server's
+ClickHouse ``spans`` table (:data:`COLUMNS`; ``tenant_id`` is left to the
+server), so the files load into ClickHouse as they are and DuckDB, pyarrow
+or NumPy can query millions of spans without a server.
+
+Formats:
+
+- ``ndjson`` (default): gzip-compressed JSON lines, stdlib only. ClickHouse
+  reads them as ``JSONEachRow``.
+- ``parquet``: zstd-compressed Parquet, one row group per
+  ``row_group_spans`` spans.
+- ``arrow``: uncompressed Arrow IPC files, which are memory-mapped when
+  read, so columns come off the page cache without copying.
+
+Parquet and Arrow need ``pyarrow`` (``pip install axonize[files]``).
+
+Usage::
+
+    axonize.init(endpoint="file:///var/lib/axonize/spans?format=parquet",
+                 service_name="bench")
+
+    from axonize.files import read_spans, read_table
+
+    columns = read_spans("/var/lib/axonize/spans")   # one list per column
+    table = read_table("/var/lib/axonize/spans")     # pyarrow.Table
+    ttft = table["ttft_ms"].to_numpy(zero_copy_only=False)
+
+    # or: duckdb.sql("SELECT model_name, quantile_cont(ttft_ms, 0.99) "
+    #                "FROM '/var/lib/axonize/spans/*.parquet' GROUP BY 1")
+
+Files are written as ``*.partial`` and renamed when they rotate or the
+exporter shuts down, so readers only ever see complete files.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import time
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from axonize._stats import ExportStats
+from axonize._types import SpanStatus
+
+if TYPE_CHECKING:
+    from axonize._types import SpanData
+
+logger = logging.getLogger("axonize.files")
+
+FORMATS = ("ndjson", "parquet", "arrow")
+
+# Column order of the ClickHouse ``spans`` table, without ``tenant_id``
+COLUMNS: tuple[str, ...] = (
+    "trace_id",
+    "span_id",
+    "parent_span_id",
+    "name",
+    "service_name",
+    "environment",
+    "start_time",
+    "end_time",
+    "duration_ms",
+    "model_name",
+    "model_version",
+    "inference_type",
+    "tokens_input",
+    "tokens_output",
+    "tokens_per_second",
+    "ttft_ms",
+    "diffusion_steps",
+    "cfg_scale",
+    "gpu_resource_uuids",
+    "gpu_physical_uuids",
+    "gpu_models",
+    "gpu_vendors",
+    "gpu_node_ids",
+    "gpu_memory_used_gb",
+    "gpu_utilization",
+    "gpu_power_watts",
+    "cost_usd",
+    "status",
+    "error_message",
+    "attributes",
+)
+
+_EXTENSIONS = {"ndjson": ".ndjson.gz", "parquet": ".parquet", "arrow": ".arrow"}
+_DEFAULT_COMPRESSION = {"ndjson": "gzip", "parquet": "zstd", "arrow": "none"}
+_PARTIAL = ".partial"
+_WRITE_BUFFER = 1 << 20
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Attributes the server promotes to their own columns, with their types
+_PROMOTED: dict[str, tuple[int, type]] = {
+    "ai.model.name": (COLUMNS.index("model_name"), str),
+    "ai.model.version": (COLUMNS.index("model_version"), str),
+    "ai.inference.type": (COLUMNS.index("inference_type"), str),
+    "ai.llm.tokens.input": (COLUMNS.index("tokens_input"), int),
+    "ai.llm.tokens.output": (COLUMNS.index("tokens_output"), int),
+    "ai.llm.tokens_per_second": (COLUMNS.index("tokens_per_second"), float),
+    "ai.llm.ttft_ms": (COLUMNS.index("ttft_ms"), float),
+    "ai.diffusion.steps": (COLUMNS.index("diffusion_steps"), int),
+    "ai.diffusion.cfg_scale": (COLUMNS.index("cfg_scale"), float),
+    "cost.usd": (COLUMNS.index("cost_usd"), float),
+}
+_TIME_COLUMNS = (COLUMNS.index("start_time"), COLUMNS.index("end_time"))
+
+
+class FileExporter:
+    """Exporter that writes spans to rotating local files.
+
+    Drop-in replacement for ``OTLPExporter`` as a ``BackgroundProcessor``
+    handler. A new file is started after ``rotate_spans`` spans or
+    ``rotate_seconds``, whichever comes first. Writes go through a 1 MiB
+    buffer; Parquet and Arrow rows are also held until ``row_group_spans``
+    have accumulated, so a crash loses at most that many spans.
+
+    ``compression`` is ``"gzip"`` or ``"none"`` for NDJSON, any pyarrow
+    codec for Parquet, and ``"none"``, ``"lz4"`` or ``"zstd"`` for Arrow
+    (compressed Arrow files cannot be read without copying).
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        format: str = "ndjson",
+        compression: str = "default",
+        rotate_spans: int = 1_000_000,
+        rotate_seconds: float = 3600.0,
+        row_group_spans: int = 65_536,
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}, got {format!r}")
+        if compression == "default":
+            compression = _DEFAULT_COMPRESSION[format]
+        if format == "ndjson" and compression not in ("gzip", "none"):
+            raise ValueError(f"ndjson compression must be 'gzip' or 'none', got {compression!r}")
+        if format != "ndjson":
+            _require_pyarrow(f"format={format!r}")
+        self._directory = os.fspath(directory)
+        os.makedirs(self._directory, exist_ok=True)
+        self._format = format
+        self._compression = compression
+        self._rotate_spans = rotate_spans
+        self._rotate_seconds = rotate_seconds
+        self._row_group_spans = row_group_spans
+        self._file: _NDJSONFile | _ColumnarFile | None = None
+        self._file_spans = 0
+        self._opened_at = 0.0
+        self._seq = 0
+        self._failing = False
+        self.stats = ExportStats()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def export(self, spans: list[SpanData]) -> None:
+        """Append a batch of spans to the current file. Never raises."""
+        if not spans:
+            return
+        start = time.perf_counter_ns()
+        rows = []
+        for sd in spans:
+            try:
+                rows.append(_row(sd))
+            except Exception:  # noqa: BLE001
+                logger.debug("Failed to convert span %s", sd.name, exc_info=True)
+        encode_ns = time.perf_counter_ns() - start
+        self.stats.record_encode(encode_ns)
+        if len(rows) < len(spans):
+            self.stats.record_failure(len(spans) - len(rows))
+        if not rows:
+            return
+        t0 = time.perf_counter_ns()
+        try:
+            self._write(rows)
+        except Exception:  # noqa: BLE001
+            # Graceful degradation — a full or read-only disk loses this batch
+            if not self._failing:
+                logger.warning(
+                    "Failed to write spans to %s", self._directory, exc_info=True,
+                )
+            self._failing = True
+            self._abandon_file()
+            self.stats.record_send(len(rows), time.perf_counter_ns() - t0, ok=False)
+            return
+        self._failing = False
+        self.stats.record_send(len(rows), time.perf_counter_ns() - t0, ok=True)
+
+    def _write(self, rows: list[list[Any]]) -> None:
+        if self._file is not None and time.monotonic() - self._opened_at >= self._rotate_seconds:
+            self._close_file()
+        if self._file is None:
+            self._open_file()
+        assert self._file is not None
+        self._file.write(rows)
+        self._file_spans += len(rows)
+        if self._file_spans >= self._rotate_spans:
+            self._close_file()
+
+    def _open_file(self) -> None:
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        ext = _EXTENSIONS[self._format]
+        if self._format == "ndjson" and self._compression == "none":
+            ext = ".ndjson"
+        while True:
+            self._seq += 1
+            path = os.path.join(
+                self._directory, f"spans-{stamp}-{os.getpid()}-{self._seq:04d}{ext}",
+            )
+            if not os.path.exists(path):
+                break
+        # Exclusive create: another exporter never clobbers this one's file
+        out = open(path + _PARTIAL, "xb", buffering=_WRITE_BUFFER)
+        try:
+            if self._format == "ndjson":
+                self._file = _NDJSONFile(out, path, gzipped=self._compression == "gzip")
+            else:
+                self._file = _ColumnarFile(
+                    out, path, self._format, self._compression, self._row_group_spans,
+                )
+        except BaseException:
+            out.close()
+            os.unlink(path + _PARTIAL)
+            raise
+        self._file_spans = 0
+        self._opened_at = time.monotonic()
+
+    def _close_file(self) -> None:
+        file = self._file
+        if file is None:
+            return
+        self._file = None
+        file.close()
+        os.replace(file.path + _PARTIAL, file.path)
+
+    def _abandon_file(self) -> None:
+        # Leave the broken file as *.partial; the next batch starts a new one
+        file = self._file
+        self._file = None
+        if file is not None:
+            try:
+                file.out.close()
+            except Exception:  # noqa: BLE001
+                pass  # Graceful degradation — the file is already lost
+
+    def flush(self) -> None:
+        """Finish the current file so readers see every span exported so far."""
+        try:
+            self._close_file()
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to finish span file in %s", self._directory, exc_info=True)
+
+    def shutdown(self) -> None:
+        """Write buffered rows and finish the current file."""
+        self.flush()
+
+
+class _NDJSONFile:
+    """One JSON object per span, optionally gzip-compressed."""
+
+    def __init__(self, out: BinaryIO, path: str, *, gzipped: bool) -> None:
+        self.out = out
+        self.path = path
+        self._stream: gzip.GzipFile | BinaryIO = (
+            gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6, mtime=0) if gzipped else out
+        )
+
+    def write(self, rows: list[list[Any]]) -> None:
+        dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+        lines = []
+        for row in rows:
+            for i in _TIME_COLUMNS:
+                row[i] = _format_time(row[i])
+            lines.append(dumps(dict(zip(COLUMNS, row))))
+        lines.append("")
+        self._stream.write("\n".join(lines).encode())
+
+    def close(self) -> None:
+        if self._stream is not self.out:
+            self._stream.close()
+        self.out.close()
+
+
+class _ColumnarFile:
+    """Parquet or Arrow IPC file; rows are written in record batches."""
+
+    def __init__(
+        self, out: BinaryIO, path: str, format: str, compression: str,
+        row_group_spans: int,
+    ) -> None:
+        import pyarrow as pa
+
+        self.out = out
+        self.path = path
+        self._pa = pa
+        self._schema = _arrow_schema(pa)
+        self._rows: list[list[Any]] = []
+        self._row_group_spans = row_group_spans
+        self._writer: Any
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(out, self._schema, compression=compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(
+                compression=None if compression == "none" else compression,
+            )
+            self._writer = pa.ipc.new_file(out, self._schema, options=options)
+
+    def write(self, rows: list[list[Any]]) -> None:
+        self._rows.extend(rows)
+        if len(self._rows) >= self._row_group_spans:
+            self._write_batch()
+
+    def _write_batch(self) -> None:
+        if not self._rows:
+            return
+        pa = self._pa
+        columns = list(zip(*self._rows))
+        self._rows = []
+        attributes = COLUMNS.index("attributes")
+        columns[attributes] = tuple(list(m.items()) for m in columns[attributes])
+        arrays = [
+            pa.array(values, type=field.type) for values, field in zip(columns, self._schema)
+        ]
+        self._writer.write_batch(pa.record_batch(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._write_batch()
+        self._writer.close()
+        self.out.close()
+
+
+# ---------------------------------------------------------------------------
+# Rows
+# ---------------------------------------------------------------------------
+
+
+def _row(sd: SpanData) -> list[Any]:
+    """One span in :data:`COLUMNS` order; times are epoch microseconds."""
+    row: list[Any] = [
+        sd.trace_id,
+        sd.span_id,
+        sd.parent_span_id,
+        sd.name,
+        sd.service_name,
+        sd.environment,
+        sd.start_time_ns // 1000,
+        sd.end_time_ns // 1000,
+        sd.duration_ms,
+        None, None, None, None, None, None, None, None, None,  # promoted attributes
+        [g.resource_uuid for g in sd.gpu_attributions],
+        [g.physical_gpu_uuid for g in sd.gpu_attributions],
+        [g.gpu_model for g in sd.gpu_attributions],
+        [g.vendor for g in sd.gpu_attributions],
+        [g.node_id for g in sd.gpu_attributions],
+        [g.memory_used_gb for g in sd.gpu_attributions],
+        [g.utilization for g in sd.gpu_attributions],
+        [g.power_watts for g in sd.gpu_attributions],
+        None,
+        sd.status.value,
+        sd.error_message if sd.status is SpanStatus.ERROR and sd.error_message else None,
+    ]
+    attributes: dict[str, str] = {}
+    for key, value in sd.attributes.items():
+        promoted = _PROMOTED.get(key)
+        if promoted is not None:
+            index, kind = promoted
+            try:
+                row[index] = kind(value)
+                continue
+            except (TypeError, ValueError, OverflowError):
+                pass  # Not of the column's type: the column stays empty
+        attributes[key] = _stringify(value)
+    row.append(attributes)
+    return row
+
+
+def _stringify(value: object) -> str:
+    # As the server stores attribute values in the ``attributes`` map
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        text = repr(value)
+        return text[:-2] if text.endswith(".0") else text
+    return str(value)
+
+
+def _format_time(epoch_us: int) -> str:
+    # UTC, in the form both ClickHouse's DateTime64 and DuckDB's TIMESTAMP parse
+    dt = _EPOCH + timedelta(microseconds=epoch_us)
+    return dt.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _parse_time(text: str) -> datetime:
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc)
+
+
+def _arrow_schema(pa: Any) -> Any:
+    string = pa.string()
+    f32 = pa.float32()
+    timestamp = pa.timestamp("us", tz="UTC")
+    types = {
+        "start_time": timestamp,
+        "end_time": timestamp,
+        "duration_ms": pa.float64(),
+        "tokens_input": pa.uint32(),
+        "tokens_output": pa.uint32(),
+        "tokens_per_second": f32,
+        "ttft_ms": f32,
+        "diffusion_steps": pa.uint16(),
+        "cfg_scale": f32,
+        "gpu_resource_uuids": pa.list_(string),
+        "gpu_physical_uuids": pa.list_(string),
+        "gpu_models": pa.list_(string),
+        "gpu_vendors": pa.list_(string),
+        "gpu_node_ids": pa.list_(string),
+        "gpu_memory_used_gb": pa.list_(f32),
+        "gpu_utilization": pa.list_(f32),
+        "gpu_power_watts": pa.list_(pa.uint16()),
+        "cost_usd": pa.float64(),
+        "attributes": pa.map_(string, string),
+    }
+    return pa.schema([(name, types.get(name, string)) for name in COLUMNS])
+
+
+def _require_pyarrow(feature: str) -> None:
+    try:
+        import pyarrow as _  # noqa: F401
+    except ImportError:
+        msg = f"pyarrow is required for {feature}. Install it with: pip install axonize[files]"
+        raise ImportError(msg) from None
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def span_files(path: str | os.PathLike[str]) -> list[str]:
+    """Finished span files at ``path`` (a file or a directory), oldest first."""
+    path = os.fspath(path)
+    if not os.path.isdir(path):
+        return [path]
+    suffixes = (*_EXTENSIONS.values(), ".ndjson")
+    names = sorted(
+        n for n in os.listdir(path) if n.startswith("spans-") and n.endswith(suffixes)
+    )
+    return [os.path.join(path, n) for n in names]
+
+
+def read_spans(
+    path: str | os.PathLike[str], *, columns: Sequence[str] | None = None,
+) -> dict[str, list[Any]]:
+    """Load span files into one list per column.
+
+    ``path`` is a file or a directory written by :class:`FileExporter`.
+    Times are UTC ``datetime`` objects and ``attributes`` are dicts, whatever
+    the format. NDJSON files need only the stdlib.
+    """
+    names = list(COLUMNS if columns is None else columns)
+    out: dict[str, list[Any]] = {name: [] for name in names}
+    for file in span_files(path):
+        if file.endswith((".ndjson.gz", ".ndjson")):
+            _read_ndjson(file, out)
+            continue
+        data = _read_arrow_file(file, names).to_pydict()
+        if "attributes" in data:
+            data["attributes"] = [dict(m) for m in data["attributes"]]
+        for name in names:
+            out[name].extend(data[name])
+    return out
+
+
+def read_table(path: str | os.PathLike[str], *, columns: Sequence[str] | None = None) -> Any:
+    """Load span files into one ``pyarrow.Table`` (requires pyarrow).
+
+    Arrow IPC files are memory-mapped rather than read, so uncompressed
+    columns are zero-copy: ``table["duration_ms"].to_numpy()`` maps straight
+    onto the file.
+    """
+    _require_pyarrow("read_table()")
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa)
+    names = list(COLUMNS if columns is None else columns)
+    schema = pa.schema([schema.field(name) for name in names])
+    tables = []
+    for file in span_files(path):
+        if file.endswith((".ndjson.gz", ".ndjson")):
+            data: dict[str, list[Any]] = {name: [] for name in names}
+            _read_ndjson(file, data)
+            if "attributes" in data:
+                data["attributes"] = [list(m.items()) for m in data["attributes"]]
+            tables.append(pa.Table.from_pydict(data, schema=schema))
+        else:
+            tables.append(_read_arrow_file(file, names))
+    if not tables:
+        return schema.empty_table()
+    return pa.concat_tables(tables)
+
+
+def _read_arrow_file(file: str, columns: list[str]) -> Any:
+    _require_pyarrow(f"reading {os.path.basename(file)}")
+    import pyarrow as pa
+
+    if file.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return pq.read_table(file, columns=columns, memory_map=True)
+    # The table's buffers keep the mapping alive after the reader is gone
+    return pa.ipc.open_file(pa.memory_map(file)).read_all().select(columns)
+
+
+def _read_ndjson(file: str, out: dict[str, list[Any]]) -> None:
+    opener = gzip.open if file.endswith(".gz") else open
+    with opener(file, "rt", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            for name, values in out.items():
+                value = record.get(name)
+                if name in ("start_time", "end_time") and value is not None:
+                    value = _parse_time(value)
+                values.append(value)
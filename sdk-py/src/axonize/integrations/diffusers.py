@@ -0,0 +1,204 @@
+"""HuggingFace diffusers integration — one span per pipeline call.
+
+Usage::
+
+    from diffusers import StableDiffusionXLPipeline
+    from axonize.integrations.diffusers import instrument
+
+    pipe = instrument(StableDiffusionXLPipeline.from_pretrained(name).to("cuda"))
+
+    # Every pipe(...) call now produces an axonize span with the denoising
+    # step latency distribution and ai.diffusion.* attributes, plus child
+    # spans for prompt encoding and VAE decoding.
+    image = pipe("A cat wearing a spacesuit", num_inference_steps=30).images[0]
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from axonize._clock import monotonic_ns
+from axonize._histogram import LogLinearHistogram
+from axonize._types import SpanKind
+from axonize.integrations.transformers import gpu_labels
+
+if TYPE_CHECKING:
+    from axonize._span import Span
+
+# Step latencies are histogrammed in microseconds, up to ~71 minutes.
+_STEP_MAX_US = 1 << 32
+_STEP_QUANTILES = (0.5, 0.9, 0.99)
+
+_current_call: ContextVar[_Call | None] = ContextVar("_axonize_diffusers_call", default=None)
+_instrumented_classes: dict[type, type] = {}
+
+
+class _Call:
+    """Denoising-step timing for one pipeline call."""
+
+    __slots__ = ("hist", "steps", "start_ns", "last_ns", "max_ns", "callback")
+
+    def __init__(self, start_ns: int, callback: Any) -> None:
+        self.hist = LogLinearHistogram(_STEP_MAX_US)
+        self.steps = 0
+        # Denoising starts once the prompt is encoded; until then, at the call
+        self.start_ns = start_ns
+        self.last_ns = start_ns
+        self.max_ns = 0
+        self.callback = callback
+
+    def on_step_end(self, pipe: Any, step: int, timestep: Any, callback_kwargs: Any) -> Any:
+        now = monotonic_ns()
+        gap = now - self.last_ns
+        self.last_ns = now
+        self.steps += 1
+        if gap > self.max_ns:
+            self.max_ns = gap
+        self.hist.record(gap // 1000)
+        if self.callback is not None:
+            return self.callback(pipe, step, timestep, callback_kwargs)
+        return callback_kwargs
+
+
+def instrument(pipe: Any, *, span_name: str = "diffusers.pipeline") -> Any:
+    """Trace every call of a diffusers pipeline.
+
+    Returns the same pipeline object; its class is swapped for a subclass
+    whose ``__call__`` opens the span, since a call cannot be wrapped on
+    the instance. ``encode_prompt`` and ``vae.decode`` are wrapped on the
+    instance and get child spans. Each denoising step is timed through
+    ``callback_on_step_end`` into a fixed-size histogram on the pipeline
+    span rather than a span per step; a ``callback_on_step_end`` passed by
+    the caller still runs. Instrumenting a pipeline twice is a no-op.
+    """
+    cls = type(pipe)
+    if cls in _instrumented_classes.values():
+        return pipe
+    sub = _instrumented_classes.get(cls)
+    if sub is None:
+        sub = _instrumented_classes[cls] = _subclass(cls)
+    pipe._axonize_span_name = span_name
+    pipe.__class__ = sub
+
+    encode_prompt = getattr(pipe, "encode_prompt", None)
+    if encode_prompt is not None:
+        pipe.encode_prompt = _wrap_encode_prompt(encode_prompt)
+    vae = getattr(pipe, "vae", None)
+    if vae is not None and hasattr(vae, "decode"):
+        vae.decode = _wrap_phase(vae.decode, "diffusers.vae_decode")
+    return pipe
+
+
+def _subclass(cls: type) -> type:
+    original = cls.__call__
+    timed_steps = "callback_on_step_end" in inspect.signature(original).parameters
+
+    @functools.wraps(original)
+    def __call__(self: Any, *args: Any, **kwargs: Any) -> Any:  # noqa: N807
+        import axonize
+
+        span = axonize.span(self._axonize_span_name, kind=SpanKind.SERVER)
+        with span:
+            _set_call_attributes(span, self, args, kwargs)
+            call = None
+            token = None
+            if timed_steps:
+                callback = kwargs.get("callback_on_step_end")
+                tensor_inputs = getattr(callback, "tensor_inputs", None)
+                if tensor_inputs is not None and "callback_on_step_end_tensor_inputs" not in kwargs:
+                    # diffusers reads these off PipelineCallback objects itself,
+                    # but only when it is passed the callback object directly
+                    kwargs["callback_on_step_end_tensor_inputs"] = tensor_inputs
+                call = _Call(span._start_time_ns, callback)
+                kwargs["callback_on_step_end"] = call.on_step_end
+                token = _current_call.set(call)
+            try:
+                return original(self, *args, **kwargs)
+            finally:
+                if token is not None:
+                    _current_call.reset(token)
+                _set_result_attributes(span, self, kwargs, call)
+
+    return type(cls.__name__, (cls,), {"__call__": __call__})
+
+
+def _wrap_encode_prompt(original: Any) -> Any:
+    timed = _wrap_phase(original, "diffusers.encode_prompt")
+
+    @functools.wraps(original)
+    def encode_prompt(*args: Any, **kwargs: Any) -> Any:
+        result = timed(*args, **kwargs)
+        call = _current_call.get()
+        if call is not None and call.steps == 0:
+            call.start_ns = call.last_ns = monotonic_ns()
+        return result
+
+    return encode_prompt
+
+
+def _wrap_phase(original: Any, name: str) -> Any:
+    @functools.wraps(original)
+    def phase(*args: Any, **kwargs: Any) -> Any:
+        import axonize
+
+        with axonize.span(name):
+            return original(*args, **kwargs)
+
+    return phase
+
+
+def _set_call_attributes(
+    span: Span, pipe: Any, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> None:
+    name = getattr(pipe, "name_or_path", None) or type(pipe).__name__
+    span.set_attribute("ai.model.name", str(name))
+    span.set_attribute("ai.inference.type", "diffusion")
+    scheduler = getattr(pipe, "scheduler", None)
+    if scheduler is not None:
+        span.set_attribute("ai.diffusion.scheduler", type(scheduler).__name__)
+    for key in ("width", "height"):
+        if kwargs.get(key) is not None:
+            span.set_attribute(f"ai.diffusion.{key}", int(kwargs[key]))
+    prompt = kwargs.get("prompt", args[0] if args else None)
+    prompts = len(prompt) if isinstance(prompt, list) else 1
+    images = prompts * (kwargs.get("num_images_per_prompt") or 1)
+    span.set_attribute("ai.inference.batch_size", images)
+    labels = gpu_labels(pipe)
+    if labels:
+        span.set_gpus(labels)
+
+
+def _set_result_attributes(
+    span: Span, pipe: Any, kwargs: dict[str, Any], call: _Call | None
+) -> None:
+    guidance = kwargs.get("guidance_scale")
+    if guidance is None:
+        guidance = getattr(pipe, "guidance_scale", None)  # set by __call__ in diffusers
+    if isinstance(guidance, (int, float)):
+        span.set_attribute("ai.diffusion.cfg_scale", float(guidance))
+
+    if call is None or call.steps == 0:
+        steps = kwargs.get("num_inference_steps")
+        if steps is not None:
+            span.set_attribute("ai.diffusion.steps", int(steps))
+        return
+    span.set_attribute("ai.diffusion.steps", call.steps)
+    span.set_attribute("ai.diffusion.denoise_ms", _ns_to_ms(call.last_ns - call.start_ns))
+    # Bucket bounds can overshoot the exact maximum; never report past it
+    max_ms = _ns_to_ms(call.max_ns)
+    p50, p90, p99 = call.hist.quantiles(_STEP_QUANTILES)
+    span.set_attribute("ai.diffusion.step_p50_ms", min(_us_to_ms(p50), max_ms))
+    span.set_attribute("ai.diffusion.step_p90_ms", min(_us_to_ms(p90), max_ms))
+    span.set_attribute("ai.diffusion.step_p99_ms", min(_us_to_ms(p99), max_ms))
+    span.set_attribute("ai.diffusion.step_max_ms", max_ms)
+
+
+def _ns_to_ms(ns: int) -> float:
+    return round(ns / 1_000_000, 3)
+
+
+def _us_to_ms(us: int) -> float:
+    return round(us / 1000, 3)
@@ -0,0 +1,314 @@
+"""Ollama integration — LLM spans from Ollama's own timings.
+
+Ollama's final response reports the token counts and how long the server
+spent loading the model, evaluating the prompt and generating
+(``load_duration``, ``prompt_eval_duration``, ``eval_duration``, in ns).
+Spans take their token metrics and phases from those, so streamed chunks
+are neither parsed nor timed per token.
+
+Usage with the ``ollama`` package::
+
+    import ollama
+    from axonize.integrations.ollama import instrument
+
+    client = instrument(ollama.Client())     # or ollama.AsyncClient()
+    for part in client.chat(model="llama3", messages=messages, stream=True):
+        print(part["message"]["content"], end="")
+
+Or with any HTTP client, around the NDJSON stream::
+
+    from axonize.integrations.ollama import trace_lines
+
+    with axonize.llm_span("ollama.generate", model="llama3") as s:
+        response = requests.post(url, json=body, stream=True)
+        for line in trace_lines(s, response.iter_lines()):
+            ...
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator, Mapping
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from axonize._clock import monotonic_ns
+from axonize._context import _current_span
+
+if TYPE_CHECKING:
+    from axonize._llm import LLMSpan
+
+_Line = TypeVar("_Line", str, bytes)
+
+# (client method, span name, ai.inference.type)
+_METHODS: tuple[tuple[str, str, str], ...] = (
+    ("chat", "ollama.chat", "llm"),
+    ("generate", "ollama.generate", "llm"),
+    ("embed", "ollama.embed", "embedding"),
+)
+
+
+def instrument(client: Any) -> Any:
+    """Wrap an ``ollama.Client`` or ``ollama.AsyncClient`` so every call produces a span.
+
+    Returns the same client with ``chat``, ``generate`` and ``embed``
+    wrapped. Each call gets an :class:`~axonize.LLMSpan` named
+    ``ollama.<method>``, filled by :func:`record_response` from the final
+    response. With ``stream=True`` the span lasts until the stream is
+    exhausted or closed; chunks pass through untouched. Instrumenting a
+    client twice is a no-op.
+    """
+    for method, span_name, inference_type in _METHODS:
+        original = getattr(client, method, None)
+        if original is None or getattr(original, "_axonize_instrumented", False):
+            continue
+        if inspect.iscoroutinefunction(original):
+            wrapped = _wrap_async(original, span_name, inference_type)
+        else:
+            wrapped = _wrap(original, span_name, inference_type)
+        wrapped._axonize_instrumented = True
+        setattr(client, method, wrapped)
+    return client
+
+
+def record_response(span: LLMSpan, response: Any, *, end_ns: int | None = None) -> None:
+    """Fill ``span`` from an Ollama response with ``done`` set.
+
+    Sets input and output tokens from ``prompt_eval_count`` and
+    ``eval_count``, and lays the server's phases back from ``end_ns`` (the
+    time the response arrived; defaults to now): generation for
+    ``eval_duration``, prompt evaluation for ``prompt_eval_duration``
+    before it, and model loading before that as ``ai.llm.load_ms``.
+    Accepts a parsed JSON dict or an ``ollama`` response object.
+    """
+    end = monotonic_ns() if end_ns is None else end_ns
+    prompt_tokens = _field(response, "prompt_eval_count")
+    if prompt_tokens is not None:
+        span.set_tokens_input(int(prompt_tokens))
+    output_tokens = _field(response, "eval_count")
+    if output_tokens is not None:
+        span.set_tokens_output(int(output_tokens))
+
+    # Server phases end when the response arrives; never before the span start
+    earliest = span._start_time_ns
+    prefill_end = end
+    if output_tokens:
+        prefill_end = max(earliest, end - int(_field(response, "eval_duration") or 0))
+        span.mark_first_token(prefill_end)
+        span.mark_decode_end(end)
+    prompt_ns = int(_field(response, "prompt_eval_duration") or 0)
+    if prompt_ns:
+        span.mark_prefill_start(max(earliest, prefill_end - prompt_ns))
+    load_ns = int(_field(response, "load_duration") or 0)
+    if load_ns:
+        span.set_attribute("ai.llm.load_ms", round(load_ns / 1_000_000, 3))
+    reason = _field(response, "done_reason")
+    if reason:
+        span.set_attribute("ai.llm.finish_reason", str(reason))
+
+
+def trace_lines(span: LLMSpan, lines: Iterable[_Line]) -> Iterator[_Line]:
+    """Pass an Ollama NDJSON stream through, recording its final line on ``span``.
+
+    Lines are yielded unchanged and not parsed; only the last one, which
+    carries the counts and durations, is decoded once the stream ends.
+    Works with ``requests``' ``iter_lines()``, ``httpx``'s
+    ``iter_lines()`` or a raw HTTP response.
+    """
+    last: _Line | None = None
+    try:
+        for line in lines:
+            if line:
+                last = line
+            yield line
+    finally:
+        if last is not None:
+            _record_last(span, last)
+
+
+async def atrace_lines(span: LLMSpan, lines: AsyncIterable[_Line]) -> AsyncIterator[_Line]:
+    """Async counterpart of :func:`trace_lines`, e.g. for ``httpx``'s ``aiter_lines()``."""
+    last: _Line | None = None
+    try:
+        async for line in lines:
+            if line:
+                last = line
+            yield line
+    finally:
+        if last is not None:
+            _record_last(span, last)
+
+
+def _record_last(span: LLMSpan, line: str | bytes) -> None:
+    end = monotonic_ns()
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return
+    if isinstance(response, dict) and response.get("done"):
+        record_response(span, response, end_ns=end)
+
+
+def _field(response: Any, name: str) -> Any:
+    if isinstance(response, Mapping):
+        return response.get(name)
+    return getattr(response, name, None)
+
+
+def _start(
+    span_name: str, inference_type: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> LLMSpan:
+    import axonize
+
+    model = kwargs.get("model", args[0] if args else None)
+    span = axonize.llm_span(span_name, model=model or "unknown", inference_type=inference_type)
+    span.__enter__()
+    return span
+
+
+def _wrap(original: Any, span_name: str, inference_type: str) -> Any:
+    @functools.wraps(original)
+    def call(*args: Any, **kwargs: Any) -> Any:
+        span = _start(span_name, inference_type, args, kwargs)
+        try:
+            result = original(*args, **kwargs)
+        except BaseException as exc:
+            span.__exit__(type(exc), exc, exc.__traceback__)
+            raise
+        if kwargs.get("stream"):
+            return _Stream(result, span)
+        record_response(span, result)
+        span.__exit__(None, None, None)
+        return result
+
+    return call
+
+
+def _wrap_async(original: Any, span_name: str, inference_type: str) -> Any:
+    @functools.wraps(original)
+    async def call(*args: Any, **kwargs: Any) -> Any:
+        span = _start(span_name, inference_type, args, kwargs)
+        try:
+            result = await original(*args, **kwargs)
+        except BaseException as exc:
+            span.__exit__(type(exc), exc, exc.__traceback__)
+            raise
+        if kwargs.get("stream"):
+            return _AsyncStream(result, span)
+        record_response(span, result)
+        span.__exit__(None, None, None)
+        return result
+
+    return call
+
+
+class _StreamBase:
+    """Proxies a stream of response parts and ends its span when the stream ends.
+
+    The span stops being the current span once the request returns, so
+    spans the caller opens while consuming the stream are not its children.
+    Each part costs one reference store; only the last is read. A stream
+    dropped before its end without ``close()`` (a ``break`` out of the
+    loop) ends the span when it is garbage-collected.
+    """
+
+    def __init__(self, stream: Any, span: LLMSpan) -> None:
+        self._stream = stream
+        self._span: LLMSpan | None = span
+        self._last: Any = None
+        if span._token is not None:
+            _current_span.reset(span._token)
+            span._token = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+    def __del__(self) -> None:
+        if self.__dict__.get("_span") is None:
+            return
+        try:
+            self._end(None)
+        except Exception:  # noqa: BLE001
+            pass  # Graceful degradation — never raise from a finalizer
+
+    def _end(self, exc: BaseException | None) -> None:
+        span = self._span
+        if span is None:
+            return
+        self._span = None
+        last = self._last
+        if last is not None and _field(last, "done"):
+            record_response(span, last)
+        if exc is None:
+            span.__exit__(None, None, None)
+        else:
+            span.__exit__(type(exc), exc, exc.__traceback__)
+
+
+class _Stream(_StreamBase):
+    def __init__(self, stream: Any, span: LLMSpan) -> None:
+        super().__init__(stream, span)
+        self._iterator = iter(stream)
+
+    def __iter__(self) -> _Stream:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            part = next(self._iterator)
+        except StopIteration:
+            self._end(None)
+            raise
+        except BaseException as exc:
+            self._end(exc)
+            raise
+        self._last = part
+        return part
+
+    def __enter__(self) -> _Stream:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """End the span and close the underlying stream."""
+        self._end(None)
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            close()
+
+
+class _AsyncStream(_StreamBase):
+    def __init__(self, stream: Any, span: LLMSpan) -> None:
+        super().__init__(stream, span)
+        self._iterator = stream.__aiter__()
+
+    def __aiter__(self) -> _AsyncStream:
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            part = await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._end(None)
+            raise
+        except BaseException as exc:
+            self._end(exc)
+            raise
+        self._last = part
+        return part
+
+    async def __aenter__(self) -> _AsyncStream:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """End the span and close the underlying stream."""
+        self._end(None)
+        aclose = getattr(self._stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
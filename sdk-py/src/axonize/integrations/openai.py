@@ -5,25 +5,44 @@ Usage::
     import openai
     from axonize.integrations.openai import instrument
 
-    client = openai.OpenAI()
+    client = openai.OpenAI()          # or openai.AsyncOpenAI()
     client = instrument(client)
 
-    # All chat.completions.create() calls now produce axonize spans automatically.
+    # chat.completions, completions, embeddings and responses .create() calls
+    # now produce axonize spans automatically, streamed or not.
     response = client.chat.completions.create(model="gpt-4", messages=[...])
 """
 
 from __future__ import annotations
 
+import inspect
 import sys
-from collections.abc import Iterator
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from axonize._context import _current_span
+
+if TYPE_CHECKING:
+    from axonize._llm import LLMSpan
+
+# (attribute path on the client, span name, ai.inference.type)
+_RESOURCES: tuple[tuple[tuple[str, ...], str, str], ...] = (
+    (("chat", "completions"), "openai.chat.completions.create", "llm"),
+    (("completions",), "openai.completions.create", "llm"),
+    (("embeddings",), "openai.embeddings.create", "embedding"),
+    (("responses",), "openai.responses.create", "llm"),
+)
+
+_TEXT_DELTA = "response.output_text.delta"
 
 
 def instrument(client: Any) -> Any:
     """Wrap an OpenAI client so every API call produces an axonize span.
 
-    Returns the same client object with ``chat.completions`` wrapped.
-    The original client is not modified — a thin wrapper is installed.
+    Accepts ``OpenAI`` and ``AsyncOpenAI`` clients (and their Azure
+    variants). Returns the same client object with ``chat.completions``,
+    ``completions``, ``embeddings`` and ``responses`` wrapped; resources the
+    installed ``openai`` version lacks are skipped. Instrumenting a client
+    twice is a no-op.
 
     Raises :class:`ImportError` if the ``openai`` package is not installed.
     """
@@ -37,75 +56,254 @@ def instrument(client: Any) -> Any:
             )
             raise ImportError(msg) from None
 
-    client.chat.completions = _InstrumentedCompletions(client.chat.completions)
+    wrapper = _InstrumentedAsyncResource if _is_async(client) else _InstrumentedResource
+    for path, span_name, inference_type in _RESOURCES:
+        parent = client
+        for attr in path[:-1]:
+            parent = getattr(parent, attr, None)
+        original = getattr(parent, path[-1], None)
+        if original is None or isinstance(original, _InstrumentedResource):
+            continue
+        setattr(parent, path[-1], wrapper(original, span_name, inference_type))
     return client
 
 
-class _InstrumentedCompletions:
-    """Wraps ``client.chat.completions`` to auto-create LLM spans."""
+def _is_async(client: Any) -> bool:
+    async_client = getattr(sys.modules.get("openai"), "AsyncOpenAI", None)
+    if isinstance(async_client, type):
+        return isinstance(client, async_client)
+    return inspect.iscoroutinefunction(client.chat.completions.create)
 
-    def __init__(self, original: Any) -> None:
+
+class _InstrumentedResource:
+    """Wraps a resource such as ``client.chat.completions`` to auto-create LLM spans."""
+
+    def __init__(self, original: Any, span_name: str, inference_type: str) -> None:
         self._original = original
+        self._span_name = span_name
+        self._inference_type = inference_type
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._original, name)
 
-    def create(self, **kwargs: Any) -> Any:
-        """Wrap ``chat.completions.create`` with an axonize LLM span."""
-        model: str = kwargs.get("model", "unknown")
-        stream: bool = kwargs.get("stream", False)
-
-        if stream:
-            return self._create_streaming(model=model, kwargs=kwargs)
-        return self._create_non_streaming(model=model, kwargs=kwargs)
-
-    def _create_non_streaming(self, *, model: str, kwargs: Any) -> Any:
+    def _start(self, kwargs: dict[str, Any]) -> LLMSpan:
         import axonize
 
-        span = axonize.llm_span("openai.chat.completions.create", model=model)
+        span = axonize.llm_span(
+            self._span_name,
+            model=kwargs.get("model", "unknown"),
+            inference_type=self._inference_type,
+        )
         span.__enter__()
+        return span
+
+    def create(self, **kwargs: Any) -> Any:
+        """Wrap ``create`` with an axonize LLM span."""
+        span = self._start(kwargs)
         try:
-            response = self._original.create(**kwargs)
+            result = self._original.create(**kwargs)
         except BaseException as exc:
             span.__exit__(type(exc), exc, exc.__traceback__)
             raise
+        if kwargs.get("stream"):
+            return _Stream(result, span)
+        _set_usage(span, getattr(result, "usage", None))
+        span.__exit__(None, None, None)
+        return result
 
-        # Extract token usage from response
-        usage = getattr(response, "usage", None)
-        if usage is not None:
-            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
-            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
-            span.set_tokens_input(prompt_tokens)
-            span.set_tokens_output(completion_tokens)
 
+class _InstrumentedAsyncResource(_InstrumentedResource):
+    """Async counterpart of :class:`_InstrumentedResource`."""
+
+    async def create(self, **kwargs: Any) -> Any:
+        """Wrap ``create`` with an axonize LLM span."""
+        span = self._start(kwargs)
+        try:
+            result = await self._original.create(**kwargs)
+        except BaseException as exc:
+            span.__exit__(type(exc), exc, exc.__traceback__)
+            raise
+        if kwargs.get("stream"):
+            return _AsyncStream(result, span)
+        _set_usage(span, getattr(result, "usage", None))
         span.__exit__(None, None, None)
-        return response
+        return result
 
-    def _create_streaming(self, *, model: str, kwargs: Any) -> Iterator[Any]:
-        import axonize
 
-        span = axonize.llm_span("openai.chat.completions.create", model=model)
-        span.__enter__()
+class _StreamBase:
+    """Proxies a response stream and ends its span when the stream ends.
+
+    The span stops being the current span once the request returns, so
+    spans the caller opens while consuming the stream are not its children
+    and the stream may be consumed from another task or thread.
+
+    Each chunk after the first that carries output costs one
+    ``record_token()`` — a timestamp and counter update. Responses streams
+    interleave other events with the text, so there only
+    ``response.output_text.delta`` events are recorded. Chunk contents
+    are only inspected until output starts, and on the last chunk, where
+    ``usage`` (``stream_options={"include_usage": True}``, or the
+    ``response.completed`` event) replaces the chunk count with exact
+    token counts. A stream dropped before its end without ``close()`` ends
+    the span with an error when it is garbage-collected.
+    """
+
+    def __init__(self, stream: Any, span: LLMSpan) -> None:
+        self._stream = stream
+        self._span: LLMSpan | None = span
+        self._record = span.record_token
+        self._started = False
+        self._deltas_only = False
+        self._last: Any = None
+        if span._token is not None:
+            _current_span.reset(span._token)
+            span._token = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+    def __del__(self) -> None:
+        # Abandoned before its end without close() (a ``break`` out of the
+        # loop): end the span as failed rather than never export it.
+        if self.__dict__.get("_span") is None:
+            return
         try:
-            stream = self._original.create(**kwargs)
-            yield from self._iterate_stream(stream, span)
-        except BaseException as exc:
+            self._end(GeneratorExit("stream abandoned before its end"))
+        except Exception:  # noqa: BLE001
+            pass  # Graceful degradation — never raise from a finalizer
+
+    def _starts_output(self, chunk: Any) -> bool:
+        # Chunks ahead of the first output (role, response.created, ...)
+        # are neither tokens nor the TTFT mark.
+        self._started = _carries_output(chunk)
+        self._deltas_only = self._started and getattr(chunk, "type", None) == _TEXT_DELTA
+        return self._started
+
+    def _end(self, exc: BaseException | None) -> None:
+        span = self._span
+        if span is None:
+            return
+        self._span = None
+        last = self._last
+        if not _set_usage(span, _stream_usage(last)) and self._started and not self._deltas_only:
+            # The closing chunk carries only finish_reason
+            if not _carries_output(last):
+                span.set_tokens_output(span._tokens_output - 1)
+        if exc is None:
+            span.__exit__(None, None, None)
+        else:
             span.__exit__(type(exc), exc, exc.__traceback__)
+
+
+class _Stream(_StreamBase):
+    def __init__(self, stream: Any, span: LLMSpan) -> None:
+        super().__init__(stream, span)
+        self._iterator = iter(stream)
+
+    def __iter__(self) -> _Stream:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            chunk = next(self._iterator)
+        except StopIteration:
+            self._end(None)
             raise
+        except BaseException as exc:
+            self._end(exc)
+            raise
+        if self._started:
+            if not self._deltas_only or getattr(chunk, "type", None) == _TEXT_DELTA:
+                self._record()
+        elif self._starts_output(chunk):
+            self._record()
+        self._last = chunk
+        return chunk
+
+    def __enter__(self) -> _Stream:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """End the span and close the underlying stream."""
+        self._end(None)
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            close()
+
+
+class _AsyncStream(_StreamBase):
+    def __init__(self, stream: Any, span: LLMSpan) -> None:
+        super().__init__(stream, span)
+        self._iterator = stream.__aiter__()
 
-    @staticmethod
-    def _iterate_stream(stream: Any, span: Any) -> Iterator[Any]:
+    def __aiter__(self) -> _AsyncStream:
+        return self
+
+    async def __anext__(self) -> Any:
         try:
-            for chunk in stream:
-                choices = getattr(chunk, "choices", [])
-                if choices:
-                    delta = getattr(choices[0], "delta", None)
-                    content = getattr(delta, "content", None) if delta else None
-                    if content:
-                        span.record_token()
-                yield chunk
+            chunk = await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._end(None)
+            raise
         except BaseException as exc:
-            span.__exit__(type(exc), exc, exc.__traceback__)
+            self._end(exc)
             raise
-        else:
-            span.__exit__(None, None, None)
+        if self._started:
+            if not self._deltas_only or getattr(chunk, "type", None) == _TEXT_DELTA:
+                self._record()
+        elif self._starts_output(chunk):
+            self._record()
+        self._last = chunk
+        return chunk
+
+    async def __aenter__(self) -> _AsyncStream:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """End the span and close the underlying stream."""
+        self._end(None)
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            await close()
+
+
+def _carries_output(chunk: Any) -> bool:
+    """Whether a stream chunk or event carries generated output."""
+    choices = getattr(chunk, "choices", None)
+    if choices:
+        choice = choices[0]
+        delta = getattr(choice, "delta", None)
+        if delta is None:  # completions
+            return bool(getattr(choice, "text", None))
+        return bool(getattr(delta, "content", None) or getattr(delta, "tool_calls", None))
+    return getattr(chunk, "type", None) == _TEXT_DELTA
+
+
+def _stream_usage(last: Any) -> Any:
+    usage = getattr(last, "usage", None)
+    if usage is None:  # responses: the response.completed event
+        usage = getattr(getattr(last, "response", None), "usage", None)
+    return usage
+
+
+def _set_usage(span: LLMSpan, usage: Any) -> bool:
+    """Copy token counts from a ``usage`` object. True if it had output tokens."""
+    if usage is None:
+        return False
+    tokens_in = getattr(usage, "prompt_tokens", None)
+    if tokens_in is None:
+        tokens_in = getattr(usage, "input_tokens", None)
+    tokens_out = getattr(usage, "completion_tokens", None)
+    if tokens_out is None:
+        tokens_out = getattr(usage, "output_tokens", None)
+    if tokens_in is not None:
+        span.set_tokens_input(tokens_in)
+    if tokens_out is not None:
+        span.set_tokens_output(tokens_out)
+    return tokens_out is not None
@@ -0,0 +1,279 @@
+"""PyTorch integration — CUDA caching-allocator memory and kernel profiles on spans.
+
+NVML reports device totals, which include memory the caching allocator has
+reserved but is not using. :class:`TorchMemoryTracker` reads the
+allocator's own counters when a span starts and ends and attaches what the
+span itself allocated, including its peak.
+
+Usage::
+
+    from axonize.integrations.torch import TorchMemoryTracker
+
+    tracker = TorchMemoryTracker(profile_every=100)
+
+    with axonize.span("forward") as s, tracker.track(s):
+        logits = model(input_ids)
+
+    # Every sampled span gets torch.memory.* attributes. One span in 100
+    # also runs under torch.profiler, and its top kernels are exported as
+    # child spans, summarised on a background thread.
+"""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from axonize._clock import monotonic_ns
+
+if TYPE_CHECKING:
+    from axonize._span import Span
+
+_MB = 1024 * 1024
+
+
+class _Frame:
+    """Allocator readings for one tracked span."""
+
+    __slots__ = ("start_allocated", "peak")
+
+    def __init__(self, start_allocated: int) -> None:
+        self.start_allocated = start_allocated
+        self.peak = start_allocated
+
+
+# Tracked spans currently open, per device, across all threads and trackers.
+# Entering a tracked span resets the allocator's peak counter, so the peak
+# read at every boundary is folded into all open frames first.
+_frames: dict[Any, list[_Frame]] = {}
+_frames_lock = threading.Lock()
+
+
+class TorchMemoryTracker:
+    """Attaches CUDA caching-allocator readings to spans.
+
+    For each sampled span passed to :meth:`track`:
+
+    - ``torch.memory.allocated_mb``: memory held by tensors when the span ends
+    - ``torch.memory.allocated_delta_mb``: change in that over the span
+    - ``torch.memory.peak_delta_mb``: the span's peak above its starting
+      allocation — the headroom one more request of this kind needs
+    - ``torch.memory.reserved_mb``: memory the caching allocator holds
+    - ``torch.memory.fragmentation``: reserved but unallocated share (0-1)
+
+    The peak is measured by resetting the allocator's peak counter
+    (``torch.cuda.reset_peak_memory_stats``) when a tracked span starts.
+    Nested and concurrent tracked spans on one device share the counter
+    correctly, but code reading ``max_memory_allocated()`` itself sees the
+    resets.
+
+    With ``profile_every=N``, one span in N also runs under
+    ``torch.profiler``. Its ``profile_top_k`` kernels by device time become
+    ``torch.kernel`` child spans. Stopping the profiler happens on the
+    span's thread; summarising it happens on the tracker's own thread.
+    Only one span is profiled at a time.
+    """
+
+    def __init__(
+        self,
+        device: Any = None,
+        *,
+        profile_every: int = 0,
+        profile_top_k: int = 10,
+    ) -> None:
+        self._device = device
+        self._profile_every = profile_every
+        self._top_k = profile_top_k
+        # next() on a count and a non-blocking acquire are atomic, so
+        # concurrent forward passes keep the cadence and never nest profilers.
+        self._tracked = itertools.count()
+        self._profiling = threading.Lock()
+        # (parent span, stopped profiler, profile start) waiting for the thread
+        self._profiles: deque[tuple[Span, Any, int]] = deque()
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._atexit_registered = False
+
+    @contextmanager
+    def track(self, span: Span) -> Iterator[None]:
+        """Record allocator readings on ``span`` for the duration of the block.
+
+        Enter it inside the span's ``with`` so the attributes are set before
+        the span ends. Unsampled spans are not measured.
+        """
+        if not span._sampled:
+            yield
+            return
+        import torch
+
+        cuda = torch.cuda
+        device = self._device
+        frame = _enter_frame(cuda, device)
+        profiler = self._start_profiler(torch)
+        profile_start = monotonic_ns()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                self._stop_profiler(span, profiler, profile_start)
+            peak = _exit_frame(cuda, device, frame)
+            allocated = cuda.memory_allocated(device)
+            reserved = cuda.memory_reserved(device)
+            span.set_attribute("torch.memory.allocated_mb", _mb(allocated))
+            span.set_attribute(
+                "torch.memory.allocated_delta_mb", _mb(allocated - frame.start_allocated)
+            )
+            span.set_attribute("torch.memory.peak_delta_mb", _mb(peak - frame.start_allocated))
+            span.set_attribute("torch.memory.reserved_mb", _mb(reserved))
+            fragmentation = (reserved - allocated) / reserved if reserved else 0.0
+            span.set_attribute("torch.memory.fragmentation", round(fragmentation, 4))
+
+    # -- Profiling ----------------------------------------------------------
+
+    def _start_profiler(self, torch: Any) -> Any:
+        every = self._profile_every
+        if every <= 0:
+            return None
+        if next(self._tracked) % every or not self._profiling.acquire(blocking=False):
+            return None
+        activities = [torch.profiler.ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(torch.profiler.ProfilerActivity.CUDA)
+        try:
+            profiler = torch.profiler.profile(activities=activities)
+            profiler.start()
+        except Exception:  # noqa: BLE001
+            # Graceful degradation — another profiler may already be running
+            self._profiling.release()
+            return None
+        return profiler
+
+    def _stop_profiler(self, span: Span, profiler: Any, start_ns: int) -> None:
+        try:
+            profiler.stop()
+        except Exception:  # noqa: BLE001
+            return  # Graceful degradation — a failed profile only loses its kernels
+        finally:
+            self._profiling.release()
+        self._profiles.append((span, profiler, start_ns))
+        if self._thread is None:
+            self.start()
+        self._wake.set()
+
+    # -- Lifecycle ------------------------------------------------------------
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                # Registered after axonize.init(), so it runs before its shutdown
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self) -> None:
+        """Stop the summary thread and summarise any profiles still queued."""
+        with self._start_lock:
+            self._stop_event.set()
+            self._wake.set()
+            if self._thread is not None:
+                self._thread.join(timeout=5.0)
+                self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001
+                pass  # Graceful degradation — never crash the summary thread
+
+    def flush(self) -> int:
+        """Summarise queued profiles into kernel spans now. Returns the number done."""
+        with self._lock:
+            done = 0
+            profiles = self._profiles
+            while profiles:
+                span, profiler, start_ns = profiles.popleft()
+                self._emit_kernels(span, profiler, start_ns)
+                done += 1
+            return done
+
+    def _emit_kernels(self, parent: Span, profiler: Any, start_ns: int) -> None:
+        """Export the top kernels of one profile as children of ``parent``.
+
+        Each child starts with the profile and lasts the kernel's total device
+        time, so the children's lengths compare at a glance.
+        """
+        import axonize
+        from axonize._context import _current_span
+
+        kernels = []
+        for event in profiler.key_averages():
+            device_us = _device_time_us(event)
+            if device_us > 0:
+                kernels.append((device_us, event))
+        kernels.sort(key=lambda k: k[0], reverse=True)
+
+        token = _current_span.set(parent)
+        try:
+            for device_us, event in kernels[: self._top_k]:
+                child = axonize.span("torch.kernel")
+                child.set_attribute("torch.kernel.name", str(event.key))
+                child.set_attribute("torch.kernel.calls", int(event.count))
+                child.set_attribute("torch.kernel.device_time_ms", round(device_us / 1000, 3))
+                child._emit(start_ns, start_ns + int(device_us * 1000))
+        finally:
+            _current_span.reset(token)
+
+
+def _enter_frame(cuda: Any, device: Any) -> _Frame:
+    with _frames_lock:
+        frames = _frames.setdefault(device, [])
+        if frames:
+            peak = cuda.max_memory_allocated(device)
+            for f in frames:
+                if peak > f.peak:
+                    f.peak = peak
+        cuda.reset_peak_memory_stats(device)
+        frame = _Frame(cuda.memory_allocated(device))
+        frames.append(frame)
+        return frame
+
+
+def _exit_frame(cuda: Any, device: Any, frame: _Frame) -> int:
+    """Fold the current peak into every open frame and close ``frame``."""
+    with _frames_lock:
+        frames = _frames[device]
+        peak = cuda.max_memory_allocated(device)
+        for f in frames:
+            if peak > f.peak:
+                f.peak = peak
+        frames.remove(frame)
+        return frame.peak
+
+
+def _device_time_us(event: Any) -> float:
+    # Renamed from the cuda_* attributes in torch 2.4
+    for name in ("self_device_time_total", "self_cuda_time_total"):
+        value = getattr(event, name, None)
+        if value is not None:
+            return float(value)
+    return 0.0
+
+
+def _mb(n: int) -> float:
+    return round(n / _MB, 2)
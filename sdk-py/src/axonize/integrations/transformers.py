@@ -0,0 +1,169 @@
+"""HuggingFace transformers integration — LLM spans around ``generate()``.
+
+Usage::
+
+    from transformers import AutoModelForCausalLM
+    from axonize.integrations.transformers import instrument
+
+    model = instrument(AutoModelForCausalLM.from_pretrained(name, device_map="auto"))
+
+    # Every model.generate() call now produces an axonize LLM span with
+    # TTFT, TPOT, token counts and the model's GPUs.
+    output = model.generate(**inputs, max_new_tokens=128)
+
+Or time a ``generate()`` call inside your own span with the streamer::
+
+    with axonize.llm_span("generate", model=name) as s:
+        model.generate(**inputs, streamer=AxonizeStreamer(s))
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from axonize._llm import LLMSpan
+
+
+class AxonizeStreamer:
+    """``generate()`` streamer that times decode steps on an :class:`LLMSpan`.
+
+    Implements the ``put()`` / ``end()`` streamer interface, so it can be
+    passed as ``streamer=`` and can wrap another streamer (e.g. a
+    ``TextStreamer``), which still receives every call.
+
+    ``generate()`` first puts the prompt, then one tensor per decode step
+    holding the next token of each of the B sequences. Each step costs one
+    ``record_token()`` — a single timestamp, whatever B is — so TTFT and
+    TPOT are per-sequence latencies. Output tokens are counted as
+    steps × B, including padding after a sequence has finished.
+    """
+
+    def __init__(self, span: LLMSpan, streamer: Any = None) -> None:
+        self._span = span
+        self._inner = streamer
+        self._record = span.record_token
+        self._prompt = True
+        self._batch = 1
+        self._steps = 0
+
+    def put(self, value: Any) -> None:
+        """Called by ``generate()`` with the prompt, then once per decode step."""
+        if self._prompt:
+            self._prompt = False
+            shape = getattr(value, "shape", None)
+            self._batch = shape[0] if shape is not None and len(shape) > 1 else 1
+            if self._span._tokens_input == 0:
+                self._span.set_tokens_input(_numel(value))
+        else:
+            self._record()
+            self._steps += 1
+        if self._inner is not None:
+            self._inner.put(value)
+
+    def end(self) -> None:
+        """Called by ``generate()`` when generation finishes."""
+        self._span.set_tokens_output(self._steps * self._batch)
+        if self._inner is not None:
+            self._inner.end()
+
+
+def instrument(model: Any, *, span_name: str = "transformers.generate") -> Any:
+    """Wrap ``model.generate`` so every call produces an axonize LLM span.
+
+    Returns the same model object. Each span carries the model's
+    ``_name_or_path``, the prompt's input token count (from the attention
+    mask when given), TTFT and TPOT from an :class:`AxonizeStreamer`, and
+    ``cuda:N`` GPU labels from the model's device map. A ``streamer``
+    passed by the caller keeps working. Beam search does not support
+    streamers, so it gets the span and token counts without step timing.
+    Instrumenting a model twice is a no-op.
+    """
+    original = model.generate
+    if getattr(original, "_axonize_instrumented", False):
+        return model
+
+    @functools.wraps(original)
+    def generate(*args: Any, **kwargs: Any) -> Any:
+        import axonize
+
+        config = getattr(model, "config", None)
+        name = getattr(config, "_name_or_path", None) or type(model).__name__
+        span = axonize.llm_span(span_name, model=name)
+        with span:
+            labels = gpu_labels(model)
+            if labels:
+                span.set_gpus(labels)
+            input_ids = kwargs.get("input_ids", args[0] if args else None)
+            mask = kwargs.get("attention_mask")
+            if mask is not None:
+                span.set_tokens_input(int(mask.sum()))
+            elif input_ids is not None:
+                span.set_tokens_input(_numel(input_ids))
+
+            if _num_beams(model, kwargs) > 1:
+                output = original(*args, **kwargs)
+                _set_output_tokens(span, config, input_ids, output)
+                return output
+            kwargs["streamer"] = AxonizeStreamer(span, kwargs.get("streamer"))
+            return original(*args, **kwargs)
+
+    generate._axonize_instrumented = True  # type: ignore[attr-defined]
+    model.generate = generate
+    return model
+
+
+def gpu_labels(model: Any) -> list[str]:
+    """GPU labels (``cuda:N``, ``mps:0``) of the devices holding ``model``.
+
+    Reads ``hf_device_map`` when the model was loaded with a device map,
+    otherwise ``model.device``. CPU, disk and meta devices are skipped.
+    """
+    device_map = getattr(model, "hf_device_map", None)
+    if device_map:
+        devices = list(dict.fromkeys(device_map.values()))
+    else:
+        devices = [getattr(model, "device", None)]
+    labels: list[str] = []
+    for device in devices:
+        label = _device_label(device)
+        if label is not None and label not in labels:
+            labels.append(label)
+    return labels
+
+
+def _device_label(device: Any) -> str | None:
+    if isinstance(device, int) and not isinstance(device, bool):
+        return f"cuda:{device}"  # device maps give bare CUDA indices
+    text = str(device)
+    if text in ("cuda", "mps"):
+        return f"{text}:0"
+    if text.startswith(("cuda:", "mps:")):
+        return text
+    return None
+
+
+def _num_beams(model: Any, kwargs: dict[str, Any]) -> int:
+    beams = kwargs.get("num_beams")
+    if beams is None:
+        config = kwargs.get("generation_config") or getattr(model, "generation_config", None)
+        beams = getattr(config, "num_beams", 1)
+    return beams or 1
+
+
+def _set_output_tokens(span: LLMSpan, config: Any, input_ids: Any, output: Any) -> None:
+    sequences = getattr(output, "sequences", output)
+    shape = getattr(sequences, "shape", None)
+    if shape is None or len(shape) != 2:
+        return
+    if getattr(config, "is_encoder_decoder", False):
+        prompt_len = 1  # the decoder start token
+    else:
+        prompt_len = input_ids.shape[-1] if input_ids is not None else 0
+    span.set_tokens_output(shape[0] * max(0, shape[1] - prompt_len))
+
+
+def _numel(value: Any) -> int:
+    numel = getattr(value, "numel", None)
+    return int(numel()) if numel is not None else len(value)
@@ -0,0 +1,315 @@
+"""vLLM integration — LLM spans built from vLLM's own request timing.
+
+vLLM already timestamps every request (arrival, scheduling, first token,
+finish) and every engine step. :class:`VLLMRecorder` queues those records
+as they arrive and builds one :class:`~axonize.LLMSpan` per finished
+request on a background thread, so the engine loop never calls into
+axonize per token.
+
+Usage with the V1 engine, as a stat logger::
+
+    from vllm.v1.engine.async_llm import AsyncLLM
+    from axonize.integrations.vllm import VLLMRecorder
+
+    recorder = VLLMRecorder()
+    engine = AsyncLLM.from_engine_args(args, stat_loggers=[recorder.stat_logger])
+
+Or with finished ``RequestOutput`` objects that carry ``metrics``::
+
+    outputs = llm.generate(prompts, params)
+    recorder.record_outputs(outputs)
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from axonize import _clock
+from axonize._clock import monotonic_ns
+
+if TYPE_CHECKING:
+    from axonize._llm import LLMSpan
+
+# Scheduler samples older than this are discarded; a longer request's
+# batch occupancy covers only its last _SAMPLE_WINDOW_NS.
+_SAMPLE_WINDOW_NS = 600 * 1_000_000_000
+
+
+class VLLMRecorder:
+    """Turns vLLM request records into LLM spans on a background thread.
+
+    Implements vLLM's V1 stat-logger interface (``record()``, ``log()``,
+    ``log_engine_initialized()``): each engine step hands over the
+    scheduler stats and the requests that finished in that step. Those are
+    only appended to queues on the engine thread. Every ``interval_ms`` the
+    recorder thread builds a span per finished request with:
+
+    - queue, prefill and decode phases and TTFT from vLLM's timestamps
+    - input, output and cached token counts, and the finish reason
+    - batch occupancy: mean running and waiting requests and KV-cache usage
+      over the engine steps between the request's scheduling and its end
+
+    Spans are root spans named ``span_name``, sampled and exported like any
+    other. vLLM's stats do not identify the request, so they cannot be
+    parented under the caller's span.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        span_name: str = "vllm.request",
+        interval_ms: int = 1000,
+    ) -> None:
+        self._model = model
+        self._span_name = span_name
+        self._interval_s = interval_ms / 1000.0
+        # Filled on the engine thread, drained on the recorder thread.
+        self._steps: deque[tuple[int, int, int, float]] = deque()
+        self._finished: deque[tuple[int, Any]] = deque()
+        self._outputs: deque[Any] = deque()
+        # Step samples as prefix sums, so occupancy over any window is two bisects
+        self._times: list[int] = []
+        self._running_sum: list[int] = [0]
+        self._waiting_sum: list[int] = [0]
+        self._kv_sum: list[float] = [0.0]
+        self._lock = threading.Lock()
+        # Engine threads may all start the recorder on their first record()
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._atexit_registered = False
+
+    # -- vLLM V1 stat-logger interface -------------------------------------
+
+    def stat_logger(self, vllm_config: Any = None, engine_index: int = 0) -> VLLMRecorder:
+        """Stat-logger factory for ``stat_loggers=[recorder.stat_logger]``.
+
+        Every engine shares this recorder. The model name defaults to the
+        engine's served model name.
+        """
+        if self._model is None and vllm_config is not None:
+            model_config = getattr(vllm_config, "model_config", None)
+            name = getattr(model_config, "served_model_name", None) or getattr(
+                model_config, "model", None
+            )
+            if isinstance(name, (list, tuple)):
+                name = name[0] if name else None
+            if name:
+                self._model = str(name)
+        return self
+
+    def record(
+        self, scheduler_stats: Any, iteration_stats: Any, *args: Any, **kwargs: Any
+    ) -> None:
+        """Queue one engine step's stats. Called by vLLM after each step."""
+        now = monotonic_ns()
+        if scheduler_stats is not None:
+            kv: float | None = getattr(scheduler_stats, "kv_cache_usage", None)
+            if kv is None:
+                kv = getattr(scheduler_stats, "gpu_cache_usage", 0.0)
+            self._steps.append((
+                now,
+                scheduler_stats.num_running_reqs,
+                scheduler_stats.num_waiting_reqs,
+                kv,
+            ))
+        if iteration_stats is not None:
+            for finished in iteration_stats.finished_requests:
+                self._finished.append((now, finished))
+        if self._thread is None:
+            self.start()
+
+    def log(self) -> None:
+        """Part of the stat-logger interface; spans are built on the recorder thread."""
+
+    def log_engine_initialized(self) -> None:
+        """Part of the stat-logger interface."""
+
+    # -- RequestOutput ----------------------------------------------------
+
+    def record_outputs(self, outputs: Iterable[Any]) -> None:
+        """Queue finished ``RequestOutput`` objects.
+
+        Outputs without ``metrics`` (vLLM V1 leaves it unset) or not yet
+        finished are ignored; use the stat logger with the V1 engine.
+        """
+        for output in outputs:
+            if getattr(output, "finished", True) and getattr(output, "metrics", None):
+                self._outputs.append(output)
+        if self._thread is None:
+            self.start()
+
+    # -- Lifecycle ----------------------------------------------------------
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                # Registered after axonize.init(), so it runs before its shutdown
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self) -> None:
+        """Stop the recorder thread and build spans for everything queued."""
+        with self._start_lock:
+            self._stop_event.set()
+            if self._thread is not None:
+                self._thread.join(timeout=5.0)
+                self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval_s):
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001
+                pass  # Graceful degradation — never crash the recorder thread
+
+    def flush(self) -> int:
+        """Build spans for all queued requests now. Returns the number built."""
+        with self._lock:
+            self._fold_steps()
+            built = 0
+            finished = self._finished
+            while finished:
+                now, stats = finished.popleft()
+                self._build_finished(now, stats)
+                built += 1
+            outputs = self._outputs
+            while outputs:
+                self._build_output(outputs.popleft())
+                built += 1
+            self._trim_steps()
+            return built
+
+    # -- Span building (recorder thread) -------------------------------------
+
+    def _build_finished(self, end_ns: int, stats: Any) -> None:
+        """Build a span from a V1 ``FinishedRequestStats``, which holds durations.
+
+        vLLM computes them when the request finishes, in the step recorded
+        at ``end_ns``; the phase boundaries are laid out back from there.
+        """
+        scheduled = end_ns - _ns(getattr(stats, "inference_time", 0.0))
+        first_token = scheduled + _ns(getattr(stats, "prefill_time", 0.0))
+        tokens_out = getattr(stats, "num_generation_tokens", 0)
+        self._build(
+            start_ns=end_ns - _ns(getattr(stats, "e2e_latency", 0.0)),
+            end_ns=end_ns,
+            queued_ns=scheduled - _ns(getattr(stats, "queued_time", 0.0)),
+            scheduled_ns=scheduled,
+            first_token_ns=first_token if tokens_out > 0 else 0,
+            tokens_in=getattr(stats, "num_prompt_tokens", 0),
+            tokens_out=tokens_out,
+            cached=getattr(stats, "num_cached_tokens", None),
+            finish_reason=getattr(stats, "finish_reason", None),
+        )
+
+    def _build_output(self, output: Any) -> None:
+        """Build a span from a ``RequestOutput`` whose ``metrics`` hold wall times."""
+        metrics = output.metrics
+        offset = _clock.wall_offset_ns()
+
+        def mono(wall_s: float | None) -> int:
+            return int(wall_s * 1e9) - offset if wall_s else 0
+
+        start = mono(metrics.arrival_time)
+        last_token = mono(getattr(metrics, "last_token_time", None))
+        end = mono(getattr(metrics, "finished_time", None)) or last_token or start
+        completions = getattr(output, "outputs", None) or []
+        self._build(
+            start_ns=start,
+            end_ns=end,
+            queued_ns=start,
+            scheduled_ns=mono(getattr(metrics, "first_scheduled_time", None)),
+            first_token_ns=mono(getattr(metrics, "first_token_time", None)),
+            decode_end_ns=last_token,
+            tokens_in=len(getattr(output, "prompt_token_ids", None) or ()),
+            tokens_out=sum(len(c.token_ids) for c in completions),
+            cached=getattr(output, "num_cached_tokens", None),
+            finish_reason=completions[0].finish_reason if completions else None,
+        )
+
+    def _build(
+        self,
+        *,
+        start_ns: int,
+        end_ns: int,
+        queued_ns: int,
+        scheduled_ns: int,
+        first_token_ns: int,
+        tokens_in: int,
+        tokens_out: int,
+        cached: int | None,
+        finish_reason: Any,
+        decode_end_ns: int = 0,
+    ) -> None:
+        import axonize
+
+        span = axonize.llm_span(self._span_name, model=self._model)
+        if queued_ns:
+            span.mark_queued(queued_ns)
+        if scheduled_ns:
+            span.mark_prefill_start(scheduled_ns)
+        if first_token_ns:
+            span.mark_first_token(first_token_ns)
+            span.mark_decode_end(decode_end_ns or end_ns)
+        span.set_tokens_input(tokens_in)
+        span.set_tokens_output(tokens_out)
+        if cached is not None:
+            span.set_attribute("ai.llm.tokens.cached", cached)
+        if finish_reason is not None:
+            span.set_attribute("ai.llm.finish_reason", str(finish_reason))
+        self._set_occupancy(span, scheduled_ns or start_ns, end_ns)
+        span._emit(start_ns, end_ns)
+
+    def _set_occupancy(self, span: LLMSpan, start_ns: int, end_ns: int) -> None:
+        times = self._times
+        lo = bisect_left(times, start_ns)
+        hi = bisect_right(times, end_ns)
+        steps = hi - lo
+        if steps <= 0:
+            return
+        span.set_attribute("ai.llm.batch.running",
+                           round((self._running_sum[hi] - self._running_sum[lo]) / steps, 2))
+        span.set_attribute("ai.llm.batch.waiting",
+                           round((self._waiting_sum[hi] - self._waiting_sum[lo]) / steps, 2))
+        span.set_attribute("ai.llm.kv_cache_usage",
+                           round((self._kv_sum[hi] - self._kv_sum[lo]) / steps, 4))
+
+    def _fold_steps(self) -> None:
+        steps = self._steps
+        times = self._times
+        running, waiting, kv = self._running_sum, self._waiting_sum, self._kv_sum
+        while steps:
+            t, r, w, k = steps.popleft()
+            times.append(t)
+            running.append(running[-1] + r)
+            waiting.append(waiting[-1] + w)
+            kv.append(kv[-1] + k)
+
+    def _trim_steps(self) -> None:
+        times = self._times
+        if not times:
+            return
+        cut = bisect_left(times, times[-1] - _SAMPLE_WINDOW_NS)
+        if cut:
+            # The prefix sums stay valid: only differences are ever read
+            del times[:cut]
+            del self._running_sum[:cut]
+            del self._waiting_sum[:cut]
+            del self._kv_sum[:cut]
+
+
+def _ns(seconds: float) -> int:
+    return int(seconds * 1e9)
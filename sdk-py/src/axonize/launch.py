@@ -0,0 +1,115 @@
+"""Node-local span aggregation launcher.
+
+Creates a shared-memory span ring, runs the aggregator (the only process on
+the node that talks to the collector) and starts the given command with
+``AXONIZE_SHM_RING`` set, so every process it spawns that calls
+``axonize.init()`` writes spans into the ring instead of exporting on its own::
+
+    axonize-launch --endpoint collector:4317 -- gunicorn -w 8 app:server
+    python -m axonize.launch --endpoint collector:4317 -- python serve.py
+
+Without a command the aggregator runs in the foreground until SIGINT/SIGTERM;
+point workers at it by exporting the printed ``AXONIZE_SHM_RING`` value.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+from types import FrameType
+
+from axonize._aggregator import SpanAggregator
+from axonize._sdk import create_otlp_exporter
+from axonize._shm import DEFAULT_LANES, DEFAULT_SLOT_SIZE, DEFAULT_SLOTS, SharedSpanRing
+
+RING_ENV = "AXONIZE_SHM_RING"
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="axonize-launch",
+        description="Run a node-local span aggregator and launch workers that write to it.",
+    )
+    parser.add_argument("--endpoint", required=True,
+                        help="collector: host:port for gRPC, http(s)://... for OTLP/HTTP")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--ring", default=None, help="shared memory name (default: generated)")
+    parser.add_argument("--lanes", type=int, default=DEFAULT_LANES,
+                        help="max concurrent worker processes")
+    parser.add_argument("--slots", type=int, default=DEFAULT_SLOTS,
+                        help="spans buffered per worker")
+    parser.add_argument("--slot-size", type=int, default=DEFAULT_SLOT_SIZE,
+                        help="max encoded span size in bytes")
+    parser.add_argument("--batch-size", type=int, default=8192)
+    parser.add_argument("--flush-interval-ms", type=int, default=1000)
+    parser.add_argument("command", nargs=argparse.REMAINDER,
+                        help="command to run after '--'")
+    args = parser.parse_args(argv)
+    if args.command and args.command[0] == "--":
+        args.command = args.command[1:]
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``axonize-launch``. Returns the command's exit code."""
+    args = _parse_args(argv)
+    ring = SharedSpanRing.create(
+        args.ring or f"axonize-{os.getpid()}",
+        lanes=args.lanes,
+        slots=args.slots,
+        slot_size=args.slot_size,
+    )
+    # Resource attributes come from each worker's own init(); these are unused.
+    exporter = create_otlp_exporter(args.endpoint, service_name="", environment="",
+                                    api_key=args.api_key)
+    aggregator = SpanAggregator(
+        ring,
+        exporter,
+        batch_size=args.batch_size,
+        flush_interval_ms=args.flush_interval_ms,
+    )
+    aggregator.start()
+    try:
+        if args.command:
+            return _run_command(args.command, ring.name)
+        print(f"{RING_ENV}={ring.name}", flush=True)
+        _wait_for_signal()
+        return 0
+    finally:
+        aggregator.stop()
+        exporter.shutdown()
+        ring.close()
+        ring.unlink()
+
+
+def _run_command(command: list[str], ring_name: str) -> int:
+    env = dict(os.environ)
+    env[RING_ENV] = ring_name
+    proc = subprocess.Popen(command, env=env)
+
+    def forward(signum: int, frame: FrameType | None) -> None:
+        proc.send_signal(signum)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, forward)
+    return proc.wait()
+
+
+def _wait_for_signal() -> None:
+    stop = threading.Event()
+
+    def handle(signum: int, frame: FrameType | None) -> None:
+        stop.set()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, handle)
+    while not stop.wait(1.0):
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
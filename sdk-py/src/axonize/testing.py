@@ -0,0 +1,326 @@
+"""In-process stand-in for the Axonize server, for tests and benchmarks.
+
+:class:`LocalCollector` is an OTLP/gRPC ``TraceService`` on localhost that
+keeps received spans in memory as columns, so SDK tests and throughput
+benchmarks run without the Go server, ClickHouse or Docker::
+
+    from axonize.testing import LocalCollector
+
+    with LocalCollector() as collector:
+        axonize.init(endpoint=collector.endpoint, service_name="bench")
+        run_workload()
+        axonize.shutdown()
+
+        print(len(collector))                          # spans received
+        print(collector.percentiles("ttft_ms"))        # {"llama-3-8b": {"p50": ...}}
+        durations = collector.column("duration_ms")    # array('d'); np.frombuffer() it
+
+Requests are stored undecoded when they arrive and decoded into columns on
+the first query after them, so the collector absorbs far more spans per
+second than an exporter can send and is never what a benchmark measures.
+The ``attributes`` column, the slowest to build, is only decoded when asked
+for.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from array import array
+from collections.abc import Sequence
+from concurrent import futures
+from typing import Any
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+)
+from opentelemetry.proto.common.v1.common_pb2 import AnyValue
+
+# Span attributes kept as float columns (NaN where a span lacks them),
+# named like the ClickHouse ``spans`` columns
+_NUMERIC: dict[str, str] = {
+    "ai.llm.tokens.input": "tokens_input",
+    "ai.llm.tokens.output": "tokens_output",
+    "ai.llm.tokens_per_second": "tokens_per_second",
+    "ai.llm.ttft_ms": "ttft_ms",
+    "ai.llm.tpot_ms": "tpot_ms",
+    "ai.llm.prefill_ms": "prefill_ms",
+    "ai.llm.decode_ms": "decode_ms",
+    "ai.diffusion.steps": "diffusion_steps",
+    "cost.usd": "cost_usd",
+}
+_STRINGS = (
+    "trace_id", "span_id", "parent_span_id", "name", "service_name", "environment",
+    "model_name", "status",
+)
+_STATUS = {0: "unset", 1: "ok", 2: "error"}
+
+
+class LocalCollector:
+    """OTLP/gRPC trace collector that keeps spans in memory as columns.
+
+    Columns (see :meth:`column`): ``trace_id``, ``span_id``,
+    ``parent_span_id``, ``name``, ``service_name``, ``environment``,
+    ``model_name``, ``status`` and ``attributes`` (one dict per span) are
+    lists; ``start_time_ns`` and ``end_time_ns`` are ``array('q')``;
+    ``duration_ms`` and the numeric LLM attributes (``tokens_input``,
+    ``tokens_output``, ``tokens_per_second``, ``ttft_ms``, ``tpot_ms``,
+    ``prefill_ms``, ``decode_ms``, ``diffusion_steps``, ``cost_usd``) are
+    ``array('d')`` with NaN where a span lacks the attribute or its value is
+    not a number.
+
+    OTLP metrics requests are accepted too and kept as raw bytes in
+    :attr:`metrics_requests`.
+    """
+
+    def __init__(self, port: int = 0, *, host: str = "127.0.0.1", max_workers: int = 4) -> None:
+        self._host = host
+        self._port = port
+        self._max_workers = max_workers
+        self._server: Any = None
+        self._lock = threading.Lock()
+        self._received = threading.Condition(self._lock)
+        self._pending: list[bytes] = []
+        self._decode_lock = threading.Lock()
+        self._columns = _empty_columns()
+        self._decoded_requests: list[bytes] = []
+        self._attributes: list[dict[str, Any]] = []
+        self._attributes_done = 0  # requests whose attributes are decoded
+        self.requests = 0
+        self.metrics_requests: list[bytes] = []
+
+    @property
+    def endpoint(self) -> str:
+        """``host:port`` to pass to ``axonize.init(endpoint=...)``."""
+        return f"{self._host}:{self._port}"
+
+    # -- Lifecycle ------------------------------------------------------------
+
+    def start(self) -> LocalCollector:
+        if self._server is not None:
+            return self
+        import grpc
+
+        def handler(method: Any) -> Any:
+            # Raw bytes in and out: requests are decoded only when queried
+            return grpc.unary_unary_rpc_method_handler(
+                method, request_deserializer=None, response_serializer=None,
+            )
+
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=self._max_workers))
+        server.add_generic_rpc_handlers((
+            grpc.method_handlers_generic_handler(
+                "opentelemetry.proto.collector.trace.v1.TraceService",
+                {"Export": handler(self._export)},
+            ),
+            grpc.method_handlers_generic_handler(
+                "opentelemetry.proto.collector.metrics.v1.MetricsService",
+                {"Export": handler(self._export_metrics)},
+            ),
+        ))
+        self._port = server.add_insecure_port(f"{self._host}:{self._port}")
+        server.start()
+        self._server = server
+        return self
+
+    def stop(self, grace: float | None = 1.0) -> None:
+        """Stop serving; received spans stay queryable."""
+        if self._server is not None:
+            self._server.stop(grace).wait()
+            self._server = None
+
+    def __enter__(self) -> LocalCollector:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _export(self, request: bytes, context: Any) -> bytes:
+        with self._lock:
+            self._pending.append(request)
+            self.requests += 1
+            self._received.notify_all()
+        return b""  # an empty ExportTraceServiceResponse
+
+    def _export_metrics(self, request: bytes, context: Any) -> bytes:
+        with self._lock:
+            self.metrics_requests.append(request)
+        return b""
+
+    # -- Queries --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._decoded()["span_id"])
+
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        """Wait until at least ``count`` spans have arrived. Returns whether they did."""
+        deadline = time.monotonic() + timeout
+        while len(self) < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            with self._lock:
+                if not self._pending:
+                    self._received.wait(remaining)
+        return True
+
+    def column(self, name: str) -> Any:
+        """One column, in arrival order (a list or an ``array``; see the class docs)."""
+        if name == "attributes":
+            return self._decoded_attributes()
+        return self._decoded()[name]
+
+    def spans(self) -> list[dict[str, Any]]:
+        """Every span as a dict of its column values; slow, for assertions."""
+        attributes = self._decoded_attributes()
+        columns = {**self._decoded(), "attributes": attributes}
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+    def percentiles(
+        self,
+        column: str = "duration_ms",
+        *,
+        by: str | None = "model_name",
+        q: Sequence[float] = (50, 90, 99),
+        name: str | None = None,
+    ) -> dict[Any, dict[str, float]]:
+        """Percentiles of a numeric column per value of ``by`` (``None``: all spans).
+
+        Spans without a value are skipped; ``name`` restricts to spans of one
+        name. Each group maps ``"count"`` and ``"p50"``-style keys to values,
+        interpolated linearly between ranks.
+        """
+        columns = self._decoded()
+        values = columns[column]
+        keys = columns[by] if by is not None else None
+        names = columns["name"]
+        groups: dict[Any, list[float]] = {}
+        for i, value in enumerate(values):
+            if math.isnan(value) or (name is not None and names[i] != name):
+                continue
+            groups.setdefault(keys[i] if keys is not None else None, []).append(value)
+        out: dict[Any, dict[str, float]] = {}
+        for key, group in groups.items():
+            group.sort()
+            summary: dict[str, float] = {"count": len(group)}
+            for p in q:
+                summary[f"p{p:g}"] = _percentile(group, p)
+            out[key] = summary
+        return out
+
+    def histogram(
+        self,
+        column: str = "ttft_ms",
+        bounds: Sequence[float] = (10, 25, 50, 100, 250, 500, 1000, 2500),
+    ) -> dict[float, int]:
+        """Span counts per upper bucket bound (inclusive); ``inf`` counts the rest."""
+        edges = [*sorted(bounds), math.inf]
+        counts = dict.fromkeys(edges, 0)
+        for value in self._decoded()[column]:
+            if math.isnan(value):
+                continue
+            for edge in edges:
+                if value <= edge:
+                    counts[edge] += 1
+                    break
+        return counts
+
+    def clear(self) -> None:
+        """Forget every span received so far."""
+        with self._decode_lock, self._lock:
+            self._pending.clear()
+            self._columns = _empty_columns()
+            self._decoded_requests = []
+            self._attributes = []
+            self._attributes_done = 0
+            self.requests = 0
+            self.metrics_requests.clear()
+
+    # -- Decoding -------------------------------------------------------------
+
+    def _decoded(self) -> dict[str, Any]:
+        with self._decode_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            for raw in pending:
+                _decode(raw, self._columns)
+            self._decoded_requests.extend(pending)
+            return self._columns
+
+    def _decoded_attributes(self) -> list[dict[str, Any]]:
+        self._decoded()
+        with self._decode_lock:
+            # Reparsing a request costs far less than reading its attributes
+            requests = self._decoded_requests
+            for raw in requests[self._attributes_done:]:
+                request = ExportTraceServiceRequest.FromString(raw)
+                for resource_spans in request.resource_spans:
+                    for scope_spans in resource_spans.scope_spans:
+                        for span in scope_spans.spans:
+                            self._attributes.append(
+                                {kv.key: _value(kv.value) for kv in span.attributes}
+                            )
+            self._attributes_done = len(requests)
+            return self._attributes
+
+
+def _empty_columns() -> dict[str, Any]:
+    columns: dict[str, Any] = {name: [] for name in _STRINGS}
+    columns["start_time_ns"] = array("q")
+    columns["end_time_ns"] = array("q")
+    columns["duration_ms"] = array("d")
+    for name in _NUMERIC.values():
+        columns[name] = array("d")
+    return columns
+
+
+def _decode(raw: bytes, columns: dict[str, Any]) -> None:
+    request = ExportTraceServiceRequest.FromString(raw)
+    numeric = {key: columns[name] for key, name in _NUMERIC.items()}
+    models = columns["model_name"]
+    for resource_spans in request.resource_spans:
+        resource = {kv.key: _value(kv.value) for kv in resource_spans.resource.attributes}
+        service = str(resource.get("service.name", ""))
+        environment = str(resource.get("deployment.environment", ""))
+        for scope_spans in resource_spans.scope_spans:
+            for span in scope_spans.spans:
+                columns["trace_id"].append(span.trace_id.hex())
+                columns["span_id"].append(span.span_id.hex())
+                columns["parent_span_id"].append(span.parent_span_id.hex() or None)
+                columns["name"].append(span.name)
+                columns["service_name"].append(service)
+                columns["environment"].append(environment)
+                columns["status"].append(_STATUS.get(span.status.code, "unset"))
+                start, end = span.start_time_unix_nano, span.end_time_unix_nano
+                columns["start_time_ns"].append(start)
+                columns["end_time_ns"].append(end)
+                columns["duration_ms"].append((end - start) / 1e6)
+                # Only the attributes with a column of their own are read
+                model: Any = None
+                found: dict[str, float] = {}
+                for kv in span.attributes:
+                    key = kv.key
+                    if key in numeric:
+                        try:
+                            found[key] = float(_value(kv.value))
+                        except (TypeError, ValueError):
+                            pass  # Not a number: left NaN, still in ``attributes``
+                    elif key == "ai.model.name":
+                        model = str(_value(kv.value))
+                models.append(model)
+                for key, values in numeric.items():
+                    values.append(found.get(key, math.nan))
+
+
+def _value(value: AnyValue) -> Any:
+    which = value.WhichOneof("value")
+    return None if which is None else getattr(value, which)
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    rank = (len(ordered) - 1) * p / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
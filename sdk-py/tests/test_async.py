@@ -0,0 +1,222 @@
+"""Tests for asyncio mode: AsyncOTLPExporter and AsyncBackgroundProcessor."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from concurrent import futures
+
+import grpc
+import pytest
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+    ExportTraceServiceResponse,
+)
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
+    TraceServiceServicer,
+    add_TraceServiceServicer_to_server,
+)
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize._buffer import RingBuffer
+from axonize._exporter import AsyncOTLPExporter
+from axonize._processor import AsyncBackgroundProcessor, BackgroundProcessor
+from axonize._types import SpanData, SpanKind, SpanStatus
+
+
+def _make_span(name: str = "test") -> SpanData:
+    return SpanData(
+        span_id="abcdef0123456789",
+        trace_id="0123456789abcdef0123456789abcdef",
+        name=name,
+        kind=SpanKind.INTERNAL,
+        status=SpanStatus.OK,
+        start_time_ns=1_000_000_000,
+        end_time_ns=2_000_000_000,
+        duration_ms=1000.0,
+        service_name="test-svc",
+    )
+
+
+class _CollectorServicer(TraceServiceServicer):
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self._lock = threading.Lock()
+
+    def Export(  # noqa: N802
+        self,
+        request: ExportTraceServiceRequest,
+        context: grpc.ServicerContext,
+    ) -> ExportTraceServiceResponse:
+        with self._lock:
+            for rs in request.resource_spans:
+                for ss in rs.scope_spans:
+                    self.names.extend(s.name for s in ss.spans)
+        return ExportTraceServiceResponse()
+
+
+@pytest.fixture()
+def collector() -> Iterator[tuple[_CollectorServicer, str]]:
+    servicer = _CollectorServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    add_TraceServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    sdk_mod._sdk_instance = None
+    yield servicer, f"localhost:{port}"
+    axonize.shutdown()
+    server.stop(grace=1)
+
+
+class _SlowExporter:
+    """Records the peak number of concurrent exports."""
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self.batches: list[int] = []
+        self.closed = False
+
+    async def export(self, spans: list[SpanData]) -> None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.batches.append(len(spans))
+        self.active -= 1
+
+    async def shutdown(self) -> None:
+        self.closed = True
+
+
+class TestAsyncBackgroundProcessor:
+    def test_exports_run_concurrently_up_to_limit(self) -> None:
+        exporter = _SlowExporter()
+
+        async def main() -> None:
+            buf = RingBuffer(maxsize=1000)
+            for _ in range(100):
+                buf.enqueue(_make_span())
+            proc = AsyncBackgroundProcessor(
+                buf, exporter, asyncio.get_running_loop(),  # type: ignore[arg-type]
+                batch_size=10, max_in_flight=3,
+            )
+            proc.start()
+            await proc.aclose()
+
+        asyncio.run(main())
+        assert sum(exporter.batches) == 100
+        assert exporter.peak == 3
+        assert exporter.closed
+
+    def test_periodic_flush(self) -> None:
+        exporter = _SlowExporter()
+
+        async def main() -> None:
+            buf = RingBuffer(maxsize=100)
+            proc = AsyncBackgroundProcessor(
+                buf, exporter, asyncio.get_running_loop(),  # type: ignore[arg-type]
+                flush_interval_ms=20,
+            )
+            proc.start()
+            assert proc.is_running
+            buf.enqueue(_make_span())
+            await asyncio.sleep(0.2)
+            assert exporter.batches == [1]
+            await proc.aclose()
+            assert not proc.is_running
+
+        asyncio.run(main())
+
+    def test_stop_from_stopped_loop_flushes(self) -> None:
+        exporter = _SlowExporter()
+        loop = asyncio.new_event_loop()
+        try:
+            buf = RingBuffer(maxsize=100)
+            proc = AsyncBackgroundProcessor(buf, exporter, loop)  # type: ignore[arg-type]
+            proc.start()
+            buf.enqueue(_make_span())
+            assert proc.stop() is True
+            assert exporter.batches == [1]
+        finally:
+            loop.close()
+
+    def test_stop_after_loop_closed_reports_failure(self) -> None:
+        loop = asyncio.new_event_loop()
+        proc = AsyncBackgroundProcessor(
+            RingBuffer(maxsize=10), _SlowExporter(), loop,  # type: ignore[arg-type]
+        )
+        loop.close()
+        assert proc.stop() is False
+
+
+class TestAsyncOTLPExporter:
+    def test_yields_during_large_batch(self, collector: tuple[_CollectorServicer, str]) -> None:
+        servicer, endpoint = collector
+        ticks = 0
+
+        async def ticker(stop: asyncio.Event) -> None:
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0)
+
+        async def main() -> None:
+            exporter = AsyncOTLPExporter(endpoint, "svc", "test")
+            stop = asyncio.Event()
+            task = asyncio.create_task(ticker(stop))
+            await asyncio.sleep(0)
+            before = ticks
+            await exporter.export([_make_span(f"s{i}") for i in range(1000)])
+            assert ticks - before > 10
+            stop.set()
+            await task
+            await exporter.shutdown()
+
+        asyncio.run(main())
+        assert len(servicer.names) == 1000
+
+
+class TestAsyncioMode:
+    def test_init_in_loop_uses_event_loop_processor(
+        self, collector: tuple[_CollectorServicer, str],
+    ) -> None:
+        servicer, endpoint = collector
+
+        async def main() -> None:
+            axonize.init(endpoint=endpoint, service_name="svc", mode="asyncio")
+            sdk = sdk_mod._sdk_instance
+            assert sdk is not None
+            assert isinstance(sdk._processor, AsyncBackgroundProcessor)
+            with axonize.span("async-span"):
+                await asyncio.sleep(0)
+            await axonize.shutdown_async()
+            assert sdk_mod._sdk_instance is None
+
+        asyncio.run(main())
+        assert servicer.names == ["async-span"]
+
+    def test_shutdown_after_loop_closed_still_exports(
+        self, collector: tuple[_CollectorServicer, str],
+    ) -> None:
+        servicer, endpoint = collector
+
+        async def main() -> None:
+            axonize.init(endpoint=endpoint, service_name="svc", mode="asyncio")
+            with axonize.span("late"):
+                pass
+
+        asyncio.run(main())
+        axonize.shutdown()  # e.g. from atexit
+        assert servicer.names == ["late"]
+
+    def test_init_outside_loop_falls_back_to_thread(self) -> None:
+        sdk_mod._sdk_instance = None
+        axonize.init(endpoint="localhost:4317", service_name="svc", mode="asyncio")
+        assert isinstance(sdk_mod._sdk_instance._processor, BackgroundProcessor)  # type: ignore[union-attr]
+        axonize.shutdown()
+
+    def test_invalid_mode(self) -> None:
+        with pytest.raises(ValueError, match="mode"):
+            axonize.init(endpoint="localhost:4317", service_name="svc", mode="trio")
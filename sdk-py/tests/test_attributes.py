@@ -0,0 +1,99 @@
+"""Tests for _attributes module (copy-on-write store, key interning)."""
+
+from __future__ import annotations
+
+import pytest
+
+from axonize._attributes import BaseAttributes, SpanAttributes, intern_key, key_name
+from axonize._buffer import RingBuffer
+from axonize._llm import LLMSpan
+from axonize._span import Span
+
+
+class TestInternKey:
+    def test_same_key_same_id(self) -> None:
+        assert intern_key("test.interned") == intern_key("test.interned")
+
+    def test_distinct_keys_distinct_ids(self) -> None:
+        assert intern_key("test.a") != intern_key("test.b")
+
+    def test_key_name_roundtrip(self) -> None:
+        kid = intern_key("test.roundtrip")
+        assert key_name(kid) == "test.roundtrip"
+
+
+class TestSpanAttributes:
+    def test_empty(self) -> None:
+        attrs = SpanAttributes()
+        assert len(attrs) == 0
+        assert dict(attrs) == {}
+        assert attrs.overrides is None
+
+    def test_set_and_get(self) -> None:
+        attrs = SpanAttributes()
+        attrs["k"] = "v"
+        attrs["n"] = 3
+        assert attrs["k"] == "v"
+        assert attrs["n"] == 3
+        assert dict(attrs) == {"k": "v", "n": 3}
+
+    def test_missing_key_raises(self) -> None:
+        attrs = SpanAttributes()
+        with pytest.raises(KeyError):
+            attrs["never.set.anywhere"]
+        assert "never.set.anywhere" not in attrs
+
+    def test_reads_through_to_base(self) -> None:
+        base = BaseAttributes({"ai.model.name": "llama"})
+        attrs = SpanAttributes(base)
+        assert attrs["ai.model.name"] == "llama"
+        assert len(attrs) == 1
+        # No per-span dict until something is written
+        assert attrs.overrides is None
+
+    def test_override_shadows_base_without_mutating_it(self) -> None:
+        base = BaseAttributes({"ai.model.name": "llama", "ai.inference.type": "llm"})
+        a = SpanAttributes(base)
+        b = SpanAttributes(base)
+        a["ai.model.name"] = "gpt-4"
+        assert a["ai.model.name"] == "gpt-4"
+        assert b["ai.model.name"] == "llama"
+        assert len(a) == 2
+        assert dict(a) == {"ai.model.name": "gpt-4", "ai.inference.type": "llm"}
+
+    def test_equals_plain_dict(self) -> None:
+        attrs = SpanAttributes(BaseAttributes({"a": 1}))
+        attrs["b"] = True
+        assert attrs == {"a": 1, "b": True}
+
+    def test_sealed_ignores_writes(self) -> None:
+        attrs = SpanAttributes()
+        attrs["k"] = "v"
+        attrs.seal()
+        attrs["k"] = "changed"
+        attrs["new"] = 1
+        assert dict(attrs) == {"k": "v"}
+
+
+class TestOwnershipTransfer:
+    def test_span_data_takes_store_without_copy(self) -> None:
+        buf = RingBuffer(maxsize=10)
+        with Span("s", buffer=buf) as s:
+            s.set_attribute("k", "v")
+            store = s._attributes
+        data = buf.drain(1)[0]
+        assert data.attributes is store
+
+    def test_set_attribute_after_exit_does_not_leak(self) -> None:
+        buf = RingBuffer(maxsize=10)
+        with Span("s", buffer=buf) as s:
+            s.set_attribute("k", "v")
+        s.set_attribute("late", 1)
+        data = buf.drain(1)[0]
+        assert dict(data.attributes) == {"k": "v"}
+
+    def test_llm_spans_share_model_base(self) -> None:
+        a = LLMSpan("gen", buffer=None, model="shared-model")
+        b = LLMSpan("gen", buffer=None, model="shared-model")
+        assert a._attributes.base is not None
+        assert a._attributes.base is b._attributes.base
@@ -1,22 +1,35 @@
 """Tests for _buffer module."""
 
 import threading
+import time
+from collections import deque
 
+import pytest
+
+import axonize
 from axonize._buffer import RingBuffer
+from axonize._span import Span
 from axonize._types import SpanData, SpanKind, SpanStatus
 
 
-def _make_span(name: str = "test") -> SpanData:
+def _make_span(
+    name: str = "test",
+    *,
+    child: bool = False,
+    status: SpanStatus = SpanStatus.OK,
+    end_time_ns: int = 1000,
+) -> SpanData:
     return SpanData(
         span_id="s1",
         trace_id="t1",
         name=name,
         kind=SpanKind.INTERNAL,
-        status=SpanStatus.OK,
+        status=status,
         start_time_ns=0,
-        end_time_ns=1000,
+        end_time_ns=end_time_ns,
         duration_ms=0.001,
         service_name="svc",
+        parent_span_id="p1" if child else None,
     )
 
 
@@ -89,3 +102,133 @@ def test_concurrent_enqueue() -> None:
 
     total = len(buf.drain(n_threads * n_per_thread + 1))
     assert total == n_threads * n_per_thread
+
+
+class _YieldingDeque(deque[SpanData]):
+    """Lets other threads run just before each append, as a free-threaded build might."""
+
+    def append(self, item: SpanData) -> None:
+        time.sleep(0)
+        super().append(item)
+
+
+@pytest.mark.parametrize("overflow", ["drop_oldest", "drop_newest", "block", "sample_down"])
+def test_concurrent_enqueue_stays_bounded(overflow: str) -> None:
+    maxsize = 64
+    buf = RingBuffer(maxsize=maxsize, overflow=overflow, block_timeout_s=0.0)
+    buf._priority = _YieldingDeque()
+    buf._normal = _YieldingDeque()
+    depths: list[int] = []
+
+    def writer(n: int) -> None:
+        deepest = 0
+        for i in range(200):
+            buf.enqueue(_make_span(child=(i + n) % 3 != 0))
+            deepest = max(deepest, len(buf))
+        depths.append(deepest)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(depths) <= maxsize
+    assert buf.enqueued_count == 8 * 200
+
+
+def test_drain_keeps_finish_order_across_priorities() -> None:
+    buf = RingBuffer(maxsize=10)
+    buf.enqueue(_make_span("c1", child=True, end_time_ns=1))
+    buf.enqueue(_make_span("c2", child=True, end_time_ns=2))
+    buf.enqueue(_make_span("root", end_time_ns=3))
+    buf.enqueue(_make_span("c3", child=True, end_time_ns=4))
+    assert [s.name for s in buf.drain(10)] == ["c1", "c2", "root", "c3"]
+
+
+def test_drop_oldest_evicts_children_first() -> None:
+    buf = RingBuffer(maxsize=3)
+    buf.enqueue(_make_span("root"))
+    buf.enqueue(_make_span("c1", child=True))
+    buf.enqueue(_make_span("c2", child=True))
+    buf.enqueue(_make_span("err", status=SpanStatus.ERROR))
+    buf.enqueue(_make_span("c3", child=True))
+    assert buf.drop_count == 2
+    assert sorted(s.name for s in buf.drain(10)) == ["c3", "err", "root"]
+
+
+def test_drop_oldest_child_into_priority_only_buffer_is_dropped() -> None:
+    buf = RingBuffer(maxsize=2)
+    buf.enqueue(_make_span("r1"))
+    buf.enqueue(_make_span("r2"))
+    buf.enqueue(_make_span("c", child=True))
+    assert [s.name for s in buf.drain(10)] == ["r1", "r2"]
+
+
+def test_drop_newest() -> None:
+    buf = RingBuffer(maxsize=2, overflow="drop_newest")
+    buf.enqueue(_make_span("c1", child=True))
+    buf.enqueue(_make_span("c2", child=True))
+    buf.enqueue(_make_span("c3", child=True))
+    # A root displaces the newest child
+    buf.enqueue(_make_span("root"))
+    assert buf.drop_count == 2
+    assert sorted(s.name for s in buf.drain(10)) == ["c1", "root"]
+
+
+def test_block_waits_for_room() -> None:
+    buf = RingBuffer(maxsize=1, overflow="block", block_timeout_s=2.0)
+    buf.enqueue(_make_span("a"))
+    threading.Timer(0.05, buf.drain, args=(1,)).start()
+    start = time.monotonic()
+    buf.enqueue(_make_span("b"))
+    assert 0.03 < time.monotonic() - start < 1.0
+    assert buf.drop_count == 0
+    assert [s.name for s in buf.drain(10)] == ["b"]
+
+
+def test_block_times_out_and_drops_newest() -> None:
+    buf = RingBuffer(maxsize=1, overflow="block", block_timeout_s=0.01)
+    buf.enqueue(_make_span("a"))
+    buf.enqueue(_make_span("b"))
+    assert buf.drop_count == 1
+    assert [s.name for s in buf.drain(10)] == ["a"]
+
+
+def test_sample_down_on_sustained_overflow() -> None:
+    buf = RingBuffer(maxsize=2, overflow="sample_down")
+    for _ in range(3):
+        for _ in range(4):
+            buf.enqueue(_make_span(child=True))
+        buf.drain(2)
+        buf.update_sampling()
+    assert buf.sample_scale == 0.25  # halved after the 2nd and 3rd drains
+    for _ in range(20):
+        buf.update_sampling()
+    assert buf.sample_scale == 1.0
+
+
+def test_other_policies_keep_sampling_scale() -> None:
+    buf = RingBuffer(maxsize=1)
+    for _ in range(3):
+        buf.enqueue(_make_span())
+        buf.enqueue(_make_span())
+        buf.update_sampling()
+    assert buf.sample_scale == 1.0
+
+
+def test_sample_scale_applies_to_root_spans() -> None:
+    buf = RingBuffer(maxsize=100_000, overflow="sample_down")
+    buf.sample_scale = 0.25
+    for _ in range(4000):
+        with Span("op", buffer=buf):
+            pass
+    sampled = buf.drain(100_000)
+    assert 800 < len(sampled) < 1200
+    assert sampled[0].attributes["sampling.rate"] == 0.25
+
+
+def test_unknown_policy() -> None:
+    with pytest.raises(ValueError, match="overflow"):
+        RingBuffer(maxsize=1, overflow="drop_random")
+    with pytest.raises(ValueError, match="overflow"):
+        axonize.init(endpoint="localhost:1", service_name="s", overflow="drop_random")
@@ -0,0 +1,81 @@
+"""Tests for _clock module — monotonic span timing under wall-clock steps."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+
+from axonize import _clock
+from axonize._buffer import RingBuffer
+from axonize._llm import LLMSpan
+from axonize._span import Span
+
+_HOUR_NS = 3600 * 1_000_000_000
+
+
+@pytest.fixture(autouse=True)
+def _restore_anchor(monkeypatch: Any) -> Any:
+    """Re-anchor to the real wall clock after each simulated step."""
+    yield
+    monkeypatch.undo()
+    _clock.recalibrate()
+
+
+def _step_wall_clock(monkeypatch: Any, delta_ns: int) -> None:
+    """Simulate an NTP step: wall time jumps, monotonic time does not."""
+    real_time_ns = time.time_ns
+    monkeypatch.setattr(time, "time_ns", lambda: real_time_ns() + delta_ns)
+
+
+def test_offset_maps_monotonic_to_wall() -> None:
+    offset = _clock.recalibrate()
+    wall = _clock.monotonic_ns() + offset
+    assert abs(wall - time.time_ns()) < 50_000_000  # within 50ms
+
+
+def test_recalibrate_follows_clock_step(monkeypatch: Any) -> None:
+    before = _clock.recalibrate()
+    _step_wall_clock(monkeypatch, _HOUR_NS)
+    after = _clock.recalibrate()
+    assert abs((after - before) - _HOUR_NS) < 50_000_000
+    assert _clock.wall_offset_ns() == after
+
+
+def test_backward_step_mid_span_keeps_durations_positive(monkeypatch: Any) -> None:
+    _clock.recalibrate()
+    buf = RingBuffer(maxsize=10)
+    wall_at_start = time.time_ns()
+
+    with LLMSpan("generate", buffer=buf, model="m") as s:
+        time.sleep(0.005)
+        # Clock steps back an hour; the background thread re-anchors.
+        _step_wall_clock(monkeypatch, -_HOUR_NS)
+        _clock.recalibrate()
+        s.record_token()
+        time.sleep(0.005)
+        s.record_token()
+
+    data = buf.drain(1)[0]
+    assert data.end_time_ns > data.start_time_ns
+    assert data.duration_ms >= 10.0
+    assert data.duration_ms < 1000.0
+    ttft = data.attributes["ai.llm.ttft_ms"]
+    assert isinstance(ttft, float)
+    assert 5.0 <= ttft < 1000.0
+    tps = data.attributes["ai.llm.tokens_per_second"]
+    assert isinstance(tps, float)
+    assert tps > 0
+    # The span keeps the anchor sampled at its start
+    assert abs(data.start_time_ns - wall_at_start) < 50_000_000
+
+
+def test_span_after_step_uses_new_anchor(monkeypatch: Any) -> None:
+    _step_wall_clock(monkeypatch, _HOUR_NS)
+    _clock.recalibrate()
+    buf = RingBuffer(maxsize=10)
+    with Span("after-step", buffer=buf):
+        pass
+    data = buf.drain(1)[0]
+    assert abs(data.start_time_ns - time.time_ns()) < 50_000_000
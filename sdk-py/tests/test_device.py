@@ -0,0 +1,193 @@
+"""Tests for device timing, with fake events standing in for CUDA events."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize import _device
+from axonize._buffer import RingBuffer
+from axonize._device import DeviceTimeResolver
+from axonize._processor import BackgroundProcessor
+from axonize._span import Span
+from axonize._types import SpanData
+
+
+class _FakeEvent:
+    """A CUDA event on a fake stream: completes when ``done`` is set."""
+
+    clock_ms = 0.0
+    created: list[_FakeEvent] = []
+
+    def __init__(self) -> None:
+        self.recorded_at: float | None = None
+        self.done = False
+        self.synchronized = False
+        _FakeEvent.created.append(self)
+
+    def record(self) -> None:
+        self.recorded_at = _FakeEvent.clock_ms
+
+    def query(self) -> bool:
+        return self.done
+
+    def synchronize(self) -> None:
+        self.synchronized = True
+        self.done = True
+
+    def elapsed_time(self, end_event: Any) -> float:
+        assert self.recorded_at is not None and end_event.recorded_at is not None
+        return float(end_event.recorded_at - self.recorded_at)
+
+
+@pytest.fixture(autouse=True)
+def _fake_events() -> Iterator[None]:
+    _FakeEvent.clock_ms = 0.0
+    _FakeEvent.created = []
+    _device.set_event_factory(_FakeEvent)
+    yield
+    _device.set_event_factory(None)
+
+
+def _timed_span(buf: RingBuffer, name: str = "forward", gpu_ms: float = 12.5) -> None:
+    with Span(name, buffer=buf, device_events=_FakeEvent):
+        _FakeEvent.clock_ms += gpu_ms
+
+
+def test_span_records_events_without_blocking() -> None:
+    buf = RingBuffer(maxsize=10)
+    _timed_span(buf)
+    (sd,) = buf.drain(10)
+    assert sd.device_events is not None
+    start, end = _FakeEvent.created
+    assert sd.device_events == (start, end)
+    assert (start.recorded_at, end.recorded_at) == (0.0, 12.5)
+    assert not end.synchronized
+    assert "gpu.device_time_ms" not in sd.attributes
+
+
+def test_resolver_holds_span_until_event_completes() -> None:
+    buf = RingBuffer(maxsize=10)
+    _timed_span(buf, "timed")
+    with Span("host-only", buffer=buf):
+        pass
+    resolver = DeviceTimeResolver()
+
+    ready = resolver.resolve(buf.drain(10))
+    assert [sd.name for sd in ready] == ["host-only"]
+    assert resolver.held_spans == 1
+
+    for event in _FakeEvent.created:
+        event.done = True
+    (sd,) = resolver.resolve([])
+    assert sd.name == "timed"
+    assert sd.attributes["gpu.device_time_ms"] == 12.5
+    assert sd.device_events is None
+    assert resolver.held_spans == 0 and resolver.resolved_spans == 1
+
+
+def test_resolver_passes_spans_through_without_device_events() -> None:
+    buf = RingBuffer(maxsize=10)
+    with Span("a", buffer=buf):
+        pass
+    spans = buf.drain(10)
+    assert DeviceTimeResolver().resolve(spans) is spans
+
+
+def test_failed_event_still_exports_span() -> None:
+    class _Broken(_FakeEvent):
+        def query(self) -> bool:
+            raise RuntimeError("CUDA error: an illegal memory access was encountered")
+
+    buf = RingBuffer(maxsize=10)
+    with Span("forward", buffer=buf, device_events=_Broken):
+        pass
+    resolver = DeviceTimeResolver()
+    (sd,) = resolver.resolve(buf.drain(10))
+    assert "gpu.device_time_ms" not in sd.attributes
+    assert resolver.failed_spans == 1
+
+
+def test_unsampled_span_records_no_events() -> None:
+    buf = RingBuffer(maxsize=10)
+    with Span("forward", buffer=buf, sampling_rate=0.0, device_events=_FakeEvent):
+        pass
+    assert _FakeEvent.created == []
+
+
+def test_processor_waits_for_events_on_stop() -> None:
+    buf = RingBuffer(maxsize=10)
+    received: list[SpanData] = []
+    proc = BackgroundProcessor(buf, flush_interval_ms=10_000, handler=received.extend)
+    _timed_span(buf, gpu_ms=3.0)
+    assert proc._flush() == 1
+    assert received == []
+    proc.stop()
+    (sd,) = received
+    assert sd.attributes["gpu.device_time_ms"] == 3.0
+    assert _FakeEvent.created[1].synchronized
+
+
+def test_public_api_and_stats() -> None:
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint="localhost:1", service_name="device-test")
+    try:
+        with axonize.llm_span("generate", model="m", device_timing=True):
+            _FakeEvent.clock_ms += 7.0
+        with axonize.span("host"):
+            pass
+        assert len(_FakeEvent.created) == 2
+        sdk = sdk_mod._sdk_instance
+        assert sdk is not None and sdk._processor is not None
+        sdk._processor._flush()
+        assert axonize.stats()["device_timing"]["held_spans"] == 1
+    finally:
+        axonize.shutdown()
+
+
+def test_templates_and_trace_record_device_events() -> None:
+    span_template = axonize.prepare_span("forward", device_timing=True)
+    llm_template = axonize.prepare_llm_span("generate", model="m", device_timing=True)
+    host_template = axonize.prepare_span("host")
+
+    @axonize.trace(name="step", device_timing=True)
+    def step() -> None:
+        _FakeEvent.clock_ms += 2.0
+
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint="localhost:1", service_name="device-test")
+    try:
+        with span_template():
+            _FakeEvent.clock_ms += 1.0
+        with llm_template():
+            pass
+        with host_template():
+            pass
+        step()
+        assert len(_FakeEvent.created) == 6
+        sdk = sdk_mod._sdk_instance
+        assert sdk is not None and sdk._buffer is not None
+        spans = {sd.name: sd for sd in sdk._buffer.drain(10)}
+        assert spans["forward"].device_events is not None
+        assert spans["generate"].device_events is not None
+        assert spans["host"].device_events is None
+        events = spans["step"].device_events
+        assert events is not None and events[0].elapsed_time(events[1]) == 2.0
+    finally:
+        axonize.shutdown()
+
+
+def test_device_timing_ignored_without_gpu(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_device, "_cuda_event_factory", lambda: None)
+    _device.set_event_factory(None)
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint="localhost:1", service_name="device-test")
+    try:
+        with axonize.span("forward", device_timing=True) as s:
+            assert s._device_start is None
+    finally:
+        axonize.shutdown()
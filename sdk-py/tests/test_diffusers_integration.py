@@ -0,0 +1,154 @@
+"""Tests for the diffusers integration, with a stub pipeline (diffusers is not required)."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize.integrations.diffusers import instrument
+
+
+@pytest.fixture(autouse=True)
+def _sdk_lifecycle() -> Iterator[None]:
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint="localhost:1", service_name="diffusers-test")
+    yield
+    axonize.shutdown()
+
+
+class EulerDiscreteScheduler:
+    pass
+
+
+class _VAE:
+    def decode(self, latents: Any) -> Any:
+        time.sleep(0.002)
+        return latents
+
+
+class _Pipeline:
+    """Mimics a diffusers pipeline's call structure."""
+
+    name_or_path = "stabilityai/sdxl-tiny"
+    device = "cuda:0"
+    hf_device_map = None
+
+    def __init__(self) -> None:
+        self.vae = _VAE()
+        self.scheduler = EulerDiscreteScheduler()
+        self._guidance_scale = 5.0
+        self.seen_tensor_inputs: Any = None
+
+    @property
+    def guidance_scale(self) -> float:
+        return self._guidance_scale
+
+    def encode_prompt(self, prompt: Any) -> Any:
+        time.sleep(0.002)
+        return prompt
+
+    def __call__(
+        self,
+        prompt: Any = None,
+        num_inference_steps: int = 50,
+        guidance_scale: float = 5.0,
+        num_images_per_prompt: int = 1,
+        width: int | None = None,
+        callback_on_step_end: Any = None,
+        callback_on_step_end_tensor_inputs: Any = None,
+    ) -> Any:
+        self._guidance_scale = guidance_scale
+        self.seen_tensor_inputs = callback_on_step_end_tensor_inputs
+        self.encode_prompt(prompt)
+        latents = 0
+        for i in range(num_inference_steps):
+            time.sleep(0.001)
+            latents += 1
+            if callback_on_step_end is not None:
+                out = callback_on_step_end(self, i, 1000 - i, {"latents": latents})
+                latents = out.pop("latents", latents)
+        return self.vae.decode(latents)
+
+
+def _drain_spans() -> dict[str, Any]:
+    assert sdk_mod._sdk_instance is not None
+    buf = sdk_mod._sdk_instance._buffer
+    assert buf is not None
+    return {sd.name: sd for sd in buf.drain(100)}
+
+
+def test_pipeline_call_records_one_span_with_step_histogram() -> None:
+    pipe = instrument(_Pipeline())
+    assert pipe(["a cat", "a dog"], num_inference_steps=8, guidance_scale=7.5, width=512) == 8
+    spans = _drain_spans()
+    assert set(spans) == {"diffusers.pipeline", "diffusers.encode_prompt", "diffusers.vae_decode"}
+    root = spans["diffusers.pipeline"]
+    attrs = root.attributes
+    assert attrs["ai.model.name"] == "stabilityai/sdxl-tiny"
+    assert attrs["ai.inference.type"] == "diffusion"
+    assert attrs["ai.diffusion.steps"] == 8
+    assert attrs["ai.diffusion.cfg_scale"] == 7.5
+    assert attrs["ai.diffusion.scheduler"] == "EulerDiscreteScheduler"
+    assert attrs["ai.diffusion.width"] == 512
+    assert attrs["ai.inference.batch_size"] == 2
+    assert 1.0 <= attrs["ai.diffusion.step_p50_ms"] <= attrs["ai.diffusion.step_max_ms"]
+    # The denoising loop excludes prompt encoding and VAE decoding
+    assert attrs["ai.diffusion.denoise_ms"] < root.duration_ms - 3.0
+    for phase in ("diffusers.encode_prompt", "diffusers.vae_decode"):
+        assert spans[phase].parent_span_id == root.span_id
+
+
+def test_cfg_scale_from_pipeline_default() -> None:
+    pipe = instrument(_Pipeline())
+    pipe("a cat", num_inference_steps=2)
+    attrs = _drain_spans()["diffusers.pipeline"].attributes
+    assert attrs["ai.diffusion.cfg_scale"] == 5.0
+    assert isinstance(attrs["ai.diffusion.cfg_scale"], float)
+
+
+def test_caller_callback_still_runs() -> None:
+    class _Callback:
+        tensor_inputs = ["latents"]
+
+        def __init__(self) -> None:
+            self.steps: list[int] = []
+
+        def __call__(self, pipe: Any, step: int, timestep: Any, kwargs: Any) -> Any:
+            self.steps.append(step)
+            return {"latents": kwargs["latents"] * 10}
+
+    callback = _Callback()
+    pipe = instrument(_Pipeline())
+    assert pipe("a cat", num_inference_steps=3, callback_on_step_end=callback) == 1110
+    assert callback.steps == [0, 1, 2]
+    assert pipe.seen_tensor_inputs == ["latents"]
+
+
+def test_error_marks_span() -> None:
+    pipe = instrument(_Pipeline())
+
+    def boom(pipe: Any, step: int, timestep: Any, kwargs: Any) -> Any:
+        if step == 2:
+            raise RuntimeError("nan latents")
+        return kwargs
+
+    with pytest.raises(RuntimeError):
+        pipe("a cat", num_inference_steps=5, callback_on_step_end=boom)
+    root = _drain_spans()["diffusers.pipeline"]
+    assert root.error_message == "nan latents"
+    assert root.attributes["ai.diffusion.steps"] == 3
+
+
+def test_instrument_keeps_object_and_is_idempotent() -> None:
+    pipe = _Pipeline()
+    assert instrument(pipe) is pipe
+    assert isinstance(pipe, _Pipeline)
+    instrument(pipe)
+    pipe("a cat", num_inference_steps=1)
+    assert sdk_mod._sdk_instance is not None
+    assert len(sdk_mod._sdk_instance._buffer.drain(100)) == 3  # type: ignore[union-attr]
@@ -18,9 +18,12 @@ from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
 from opentelemetry.proto.trace.v1.trace_pb2 import Span as OtlpSpan
 from opentelemetry.proto.trace.v1.trace_pb2 import Status as OtlpStatus
 
+from axonize._attributes import BaseAttributes, SpanAttributes
 from axonize._exporter import (
     OTLPExporter,
+    _build_encoded_request,
     _build_export_request,
+    _encode_span,
     _make_attribute,
     _span_data_to_otlp,
 )
@@ -173,6 +176,36 @@ class TestSpanDataToOtlp:
         assert attr_dict["model"].string_value == "gpt-4"
         assert attr_dict["tokens"].int_value == 100
 
+    def test_attribute_value_types(self) -> None:
+        sd = _make_span_data(attributes={
+            "neg": -5, "big": 1 << 62, "f": -0.25, "b": False, "s": "héllo",
+        })
+        otlp = _span_data_to_otlp(sd)
+        attr_dict = {a.key: a.value for a in otlp.attributes}
+        assert attr_dict["neg"].int_value == -5
+        assert attr_dict["big"].int_value == 1 << 62
+        assert attr_dict["f"].double_value == -0.25
+        assert attr_dict["b"].HasField("bool_value")
+        assert attr_dict["b"].bool_value is False
+        assert attr_dict["s"].string_value == "héllo"
+
+    def test_layered_attributes(self) -> None:
+        attrs = SpanAttributes(BaseAttributes({"ai.model.name": "llama", "shared": 1}))
+        attrs["own"] = "x"
+        otlp = _span_data_to_otlp(_make_span_data(attributes=attrs))
+        attr_dict = {a.key: a.value for a in otlp.attributes}
+        assert attr_dict["ai.model.name"].string_value == "llama"
+        assert attr_dict["shared"].int_value == 1
+        assert attr_dict["own"].string_value == "x"
+
+    def test_layered_override_emits_single_key(self) -> None:
+        base = BaseAttributes({"ai.model.name": "llama"})
+        attrs = SpanAttributes(base)
+        attrs["ai.model.name"] = "gpt-4"
+        otlp = _span_data_to_otlp(_make_span_data(attributes=attrs))
+        values = [a.value.string_value for a in otlp.attributes if a.key == "ai.model.name"]
+        assert values == ["gpt-4"]
+
     def test_gpu_attributions_single(self) -> None:
         ga = _make_gpu_attribution()
         sd = _make_span_data(gpu_attributions=[ga])
@@ -252,6 +285,26 @@ class TestBuildExportRequest:
         assert names == {f"span-{i}" for i in range(5)}
 
 
+class TestBuildEncodedRequest:
+    def test_matches_protobuf_request(self) -> None:
+        spans = [_make_span_data(name=f"span-{i}", attributes={"k": i}) for i in range(3)]
+        raw = _build_encoded_request({("svc", "dev"): [_encode_span(sd) for sd in spans]})
+        assert ExportTraceServiceRequest.FromString(raw) == _build_export_request(
+            spans, "svc", "dev"
+        )
+
+    def test_one_resource_per_group(self) -> None:
+        raw = _build_encoded_request({
+            ("svc-a", "dev"): [_encode_span(_make_span_data(name="a"))],
+            ("svc-b", "dev"): [_encode_span(_make_span_data(name="b"))],
+        })
+        req = ExportTraceServiceRequest.FromString(raw)
+        assert [rs.resource.attributes[0].value.string_value for rs in req.resource_spans] == [
+            "svc-a", "svc-b",
+        ]
+        assert [rs.scope_spans[0].spans[0].name for rs in req.resource_spans] == ["a", "b"]
+
+
 class TestOTLPExporter:
     def test_export_empty_batch(self) -> None:
         """Exporting an empty list should be a no-op."""
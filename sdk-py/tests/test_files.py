@@ -0,0 +1,164 @@
+"""Tests for the local span file exporter and its reader."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize._sdk import create_file_exporter
+from axonize._types import GPUAttribution, SpanData, SpanKind, SpanStatus
+from axonize.files import COLUMNS, FileExporter, read_spans, read_table, span_files
+
+_START_NS = 1_717_243_200_123_456_789  # 2024-06-01 12:00:00.123456789 UTC
+
+
+def _span(name: str = "generate", *, error: str | None = None) -> SpanData:
+    return SpanData(
+        span_id="00f067aa0ba902b7",
+        trace_id="4bf92f3577b34da6a3ce929d0e0e4736",
+        name=name,
+        kind=SpanKind.SERVER,
+        status=SpanStatus.OK if error is None else SpanStatus.ERROR,
+        start_time_ns=_START_NS,
+        end_time_ns=_START_NS + 250_000_000,
+        duration_ms=250.0,
+        service_name="bench",
+        environment="ci",
+        attributes={
+            "ai.model.name": "llama-3-8b",
+            "ai.llm.tokens.input": 128,
+            "ai.llm.ttft_ms": 41.5,
+            "cost.usd": 0.002,
+            "batch_size": 8,
+            "temperature": 0.7,
+            "streaming": True,
+        },
+        parent_span_id="b7ad6b7169203331",
+        gpu_attributions=[
+            GPUAttribution(
+                resource_uuid="GPU-0", physical_gpu_uuid="GPU-0", gpu_model="H100",
+                vendor="NVIDIA", node_id="node-1", resource_type="full_gpu", user_label="",
+                memory_used_gb=40.5, memory_total_gb=80.0, utilization=93.0,
+                temperature_celsius=61, power_watts=520, clock_mhz=1980,
+            ),
+        ],
+        error_message=error,
+    )
+
+
+def _assert_row(columns: dict[str, list[object]], i: int = 0) -> None:
+    assert list(columns) == list(COLUMNS)
+    row = {name: values[i] for name, values in columns.items()}
+    assert row["trace_id"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert row["parent_span_id"] == "b7ad6b7169203331"
+    assert row["start_time"] == datetime(2024, 6, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    assert row["duration_ms"] == 250.0
+    assert row["model_name"] == "llama-3-8b"
+    assert row["model_version"] is None
+    assert row["tokens_input"] == 128
+    assert row["ttft_ms"] == 41.5
+    assert row["cost_usd"] == 0.002
+    assert row["gpu_models"] == ["H100"]
+    assert row["gpu_power_watts"] == [520]
+    assert row["status"] == "ok"
+    assert row["error_message"] is None
+    assert row["attributes"] == {"batch_size": "8", "temperature": "0.7", "streaming": "true"}
+
+
+def test_ndjson_round_trip(tmp_path: Path) -> None:
+    exporter = FileExporter(tmp_path)
+    exporter.export([_span(), _span("failed", error="CUDA out of memory")])
+    exporter.shutdown()
+    (file,) = span_files(tmp_path)
+    assert file.endswith(".ndjson.gz")
+    columns = read_spans(tmp_path)
+    _assert_row(columns)
+    assert columns["status"][1] == "error"
+    assert columns["error_message"][1] == "CUDA out of memory"
+    assert exporter.stats.spans == 2
+
+
+def test_non_numeric_promoted_value_stays_in_attributes(tmp_path: Path) -> None:
+    sd = _span()
+    sd.attributes.update({"cost.usd": "n/a", "ai.llm.tokens.input": "128.5"})
+    exporter = FileExporter(tmp_path)
+    exporter.export([sd, _span("ok")])
+    exporter.shutdown()
+    columns = read_spans(tmp_path)
+    assert columns["name"] == ["generate", "ok"]
+    assert columns["cost_usd"] == [None, 0.002]
+    assert columns["tokens_input"] == [None, 128]
+    assert columns["ttft_ms"] == [41.5, 41.5]
+    assert columns["attributes"][0]["cost.usd"] == "n/a"
+    assert columns["attributes"][0]["ai.llm.tokens.input"] == "128.5"
+    assert exporter.stats.failed_spans == 0
+
+
+def test_rotation_and_partial_files(tmp_path: Path) -> None:
+    exporter = FileExporter(tmp_path, compression="none", rotate_spans=2)
+    exporter.export([_span("a"), _span("b")])
+    exporter.export([_span("c")])
+    assert len(span_files(tmp_path)) == 1  # the open file is still *.partial
+    assert len(os.listdir(tmp_path)) == 2
+    exporter.shutdown()
+    assert [Path(f).suffix for f in span_files(tmp_path)] == [".ndjson", ".ndjson"]
+    assert read_spans(tmp_path, columns=["name"]) == {"name": ["a", "b", "c"]}
+
+
+def test_write_failure_is_counted_not_raised(tmp_path: Path) -> None:
+    directory = tmp_path / "spans"
+    exporter = FileExporter(directory)
+    shutil.rmtree(directory)
+    exporter.export([_span()])
+    assert exporter.stats.failed_spans == 1
+    directory.mkdir()
+    exporter.export([_span()])
+    exporter.shutdown()
+    assert read_spans(directory, columns=["name"]) == {"name": ["generate"]}
+
+
+def test_file_endpoint(tmp_path: Path) -> None:
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint=f"file://{tmp_path}?rotate_spans=10", service_name="bench")
+    try:
+        with axonize.llm_span("generate", model="llama-3-8b") as s:
+            s.set_tokens_input(12)
+    finally:
+        axonize.shutdown()
+    columns = read_spans(tmp_path)
+    assert columns["name"] == ["generate"]
+    assert columns["tokens_input"] == [12]
+    assert columns["service_name"] == ["bench"]
+    with pytest.raises(ValueError, match="rotate_bytes"):
+        create_file_exporter(f"file://{tmp_path}?rotate_bytes=1")
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_round_trip(tmp_path: Path, fmt: str) -> None:
+    pa = pytest.importorskip("pyarrow")
+    exporter = FileExporter(tmp_path, format=fmt, row_group_spans=2)
+    exporter.export([_span(), _span()])
+    exporter.export([_span("failed", error="timeout")])
+    exporter.shutdown()
+    (file,) = span_files(tmp_path)
+    assert file.endswith("." + fmt)
+    _assert_row(read_spans(tmp_path))
+    table = read_table(tmp_path, columns=["tokens_input", "start_time", "attributes"])
+    assert table.num_rows == 3
+    assert table.schema.field("tokens_input").type == pa.uint32()
+    assert table.schema.field("start_time").type == pa.timestamp("us", tz="UTC")
+
+
+def test_columnar_formats_need_pyarrow(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match=r"axonize\[files\]"):
+        FileExporter(tmp_path, format="parquet")
@@ -0,0 +1,179 @@
+"""Fork-safety tests: the SDK rebuilds per-process state in forked children."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent import futures
+from typing import Any
+
+import grpc
+import pytest
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+    ExportTraceServiceResponse,
+)
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
+    TraceServiceServicer,
+    add_TraceServiceServicer_to_server,
+)
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize._types import SpanData
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "register_at_fork") or sys.platform == "darwin",
+    reason="fork start method required",
+)
+
+
+class _CollectorServicer(TraceServiceServicer):
+    def __init__(self) -> None:
+        self.spans: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def Export(  # noqa: N802
+        self,
+        request: ExportTraceServiceRequest,
+        context: grpc.ServicerContext,
+    ) -> ExportTraceServiceResponse:
+        with self._lock:
+            for rs in request.resource_spans:
+                for ss in rs.scope_spans:
+                    self.spans.extend((s.name, s.span_id.hex()) for s in ss.spans)
+        return ExportTraceServiceResponse()
+
+
+@pytest.fixture()
+def collector() -> Any:
+    servicer = _CollectorServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    add_TraceServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    sdk_mod._sdk_instance = None
+    yield servicer, f"localhost:{port}"
+    axonize.shutdown()
+    server.stop(grace=1)
+
+
+def _child(results: Any) -> None:
+    sdk = sdk_mod._sdk_instance
+    assert sdk is not None
+    assert sdk._buffer is not None
+    inherited = len(sdk._buffer)
+    processor_running = sdk._processor is not None and sdk._processor.is_running
+    with axonize.span("child") as s:
+        span_id = s.span_id
+    axonize.shutdown()
+    results.put((inherited, processor_running, span_id))
+
+
+def test_forked_children_export_their_own_spans(collector: Any) -> None:
+    servicer, endpoint = collector
+    axonize.init(endpoint=endpoint, service_name="fork-test", flush_interval_ms=60_000)
+
+    # Buffered in the parent at fork time; must be exported exactly once.
+    with axonize.span("parent-before-fork"):
+        pass
+
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_child, args=(results,)) for _ in range(2)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=30)
+    assert [p.exitcode for p in procs] == [0, 0]
+    child_results = [results.get(timeout=5) for _ in procs]
+
+    # Parent threads resumed and keep exporting
+    assert sdk_mod._sdk_instance is not None
+    assert sdk_mod._sdk_instance._processor is not None
+    assert sdk_mod._sdk_instance._processor.is_running
+    with axonize.span("parent-after-fork"):
+        pass
+    axonize.shutdown()
+
+    for inherited, processor_running, _ in child_results:
+        assert inherited == 0  # inherited buffer discarded
+        assert processor_running
+
+    # Fresh ID seed per child: the two children must not generate the same IDs
+    child_ids = {span_id for _, _, span_id in child_results}
+    assert len(child_ids) == 2
+
+    names = [name for name, _ in servicer.spans]
+    assert names.count("child") == 2
+    assert names.count("parent-before-fork") == 1
+    assert names.count("parent-after-fork") == 1
+    assert {sid for name, sid in servicer.spans if name == "child"} == child_ids
+
+
+def test_fork_without_sdk_is_noop() -> None:
+    sdk_mod._sdk_instance = None
+    ctx = multiprocessing.get_context("fork")
+    p = ctx.Process(target=os.getpid)
+    p.start()
+    p.join(timeout=10)
+    assert p.exitcode == 0
+    assert sdk_mod._sdk_instance is None
+
+
+def test_slow_export_across_fork_keeps_one_drain_thread() -> None:
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint="localhost:1", service_name="fork-test", flush_interval_ms=10)
+    sdk = sdk_mod._sdk_instance
+    assert sdk is not None and sdk._processor is not None
+    processor = sdk._processor
+    processor._worker._join_timeout_s = 0.05
+    exporting = threading.Event()
+    release = threading.Event()
+    draining: set[threading.Thread] = set()
+    overlap: list[int] = []
+    lock = threading.Lock()
+
+    def blocking_handler(spans: list[SpanData]) -> None:
+        with lock:
+            draining.add(threading.current_thread())
+            overlap.append(len(draining))
+        exporting.set()
+        release.wait(10)
+        with lock:
+            draining.discard(threading.current_thread())
+
+    processor._handler = blocking_handler
+    try:
+        with axonize.span("slow"):
+            pass
+        assert exporting.wait(5)
+        stuck = processor._worker.thread
+
+        pid = os.fork()  # the drain thread outlives the 50ms pause
+        if pid == 0:
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        # No second drain thread while the first is still exporting
+        assert stuck is not None and stuck.is_alive()
+        assert processor._worker.thread is stuck
+
+        release.set()
+        stuck.join(5)
+        deadline = time.monotonic() + 5
+        while processor._worker.thread in (None, stuck) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Its successor takes over once the export returns
+        assert processor.is_running
+        assert processor._worker.thread is not stuck
+        with axonize.span("after"):
+            pass
+        time.sleep(0.1)
+        assert max(overlap) == 1
+    finally:
+        release.set()
+        axonize.shutdown()
@@ -0,0 +1,68 @@
+"""Tests for _histogram module (log-linear latency histogram)."""
+
+from __future__ import annotations
+
+from axonize._histogram import LogLinearHistogram, bucket_bounds, bucket_index
+
+
+class TestBuckets:
+    def test_small_values_exact(self) -> None:
+        for v in range(16):
+            assert bucket_index(v) == v
+            assert bucket_bounds(v) == (v, v + 1)
+
+    def test_bounds_contain_value(self) -> None:
+        for v in [16, 17, 31, 32, 100, 1000, 123_456, 10**9]:
+            low, high = bucket_bounds(bucket_index(v))
+            assert low <= v < high
+
+    def test_indices_contiguous(self) -> None:
+        prev_high = 0
+        for idx in range(200):
+            low, high = bucket_bounds(idx)
+            assert low == prev_high
+            prev_high = high
+
+    def test_relative_width_bounded(self) -> None:
+        for v in [100, 5000, 10**6, 10**8]:
+            low, high = bucket_bounds(bucket_index(v))
+            assert (high - low) / low <= 0.125
+
+
+class TestLogLinearHistogram:
+    def test_empty_quantiles(self) -> None:
+        h = LogLinearHistogram()
+        assert h.quantiles((0.5, 0.99)) == [0, 0]
+
+    def test_quantiles_approximate(self) -> None:
+        h = LogLinearHistogram()
+        for v in range(1, 1001):
+            h.record(v)
+        p50, p90, p99 = h.quantiles((0.5, 0.9, 0.99))
+        assert abs(p50 - 500) / 500 < 0.07
+        assert abs(p90 - 900) / 900 < 0.07
+        assert abs(p99 - 990) / 990 < 0.07
+
+    def test_weighted_record(self) -> None:
+        h = LogLinearHistogram()
+        h.record(10, 99)
+        h.record(5000)
+        assert h.count == 100
+        assert h.quantiles((0.5, 0.99, 1.0))[:2] == [10, 10]
+        assert h.quantiles((1.0,))[0] > 4000
+
+    def test_clamps_overflow(self) -> None:
+        h = LogLinearHistogram(max_value=1000)
+        h.record(10**12)
+        assert h.count == 1
+        assert h.quantiles((1.0,))[0] <= 1100
+
+    def test_merge_and_clear(self) -> None:
+        a, b = LogLinearHistogram(), LogLinearHistogram()
+        a.record(3)
+        b.record(3, 2)
+        a.merge(b)
+        assert a.count == 3
+        a.clear()
+        assert a.count == 0
+        assert a.quantiles((0.5,)) == [0]
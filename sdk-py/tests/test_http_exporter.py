@@ -0,0 +1,233 @@
+"""Tests for the OTLP/HTTP exporter against a local stand-in collector."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+
+from axonize._exporter import OTLPExporter, _build_metrics_request
+from axonize._http import OTLPHTTPExporter
+from axonize._sdk import create_otlp_exporter
+from axonize._types import SpanData, SpanKind, SpanStatus
+
+
+def _make_span(name: str = "test", parent: str | None = None) -> SpanData:
+    return SpanData(
+        span_id="abcdef0123456789",
+        trace_id="0123456789abcdef0123456789abcdef",
+        name=name,
+        kind=SpanKind.SERVER,
+        status=SpanStatus.OK,
+        start_time_ns=1_000_000_000,
+        end_time_ns=2_000_000_000,
+        duration_ms=1000.0,
+        service_name="svc",
+        parent_span_id=parent,
+    )
+
+
+class _StandIn:
+    """Scriptable OTLP/HTTP collector: records requests, replies from a queue."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict[str, Any]] = []
+        self.responses: list[tuple[int, dict[str, str]]] = []
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+        self.delay_s = 0.0
+        self.close_after_response = False
+        self._lock = threading.Lock()
+
+    def next_response(self) -> tuple[int, dict[str, str]]:
+        with self._lock:
+            return self.responses.pop(0) if self.responses else (200, {})
+
+
+def _handler(state: _StandIn) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            with state._lock:
+                state.connections += 1
+
+        def do_POST(self) -> None:  # noqa: N802
+            with state._lock:
+                state.active += 1
+                state.peak = max(state.peak, state.active)
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            time.sleep(state.delay_s)
+            status, headers = state.next_response()
+            with state._lock:
+                state.requests.append(
+                    {"path": self.path, "headers": dict(self.headers), "body": body,
+                     "status": status}
+                )
+                state.active -= 1
+            self.send_response(status)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", "0")
+            if state.close_after_response:
+                self.send_header("Connection", "close")
+            self.end_headers()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+@pytest.fixture()
+def stand_in() -> Iterator[tuple[_StandIn, str]]:
+    state = _StandIn()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(state))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield state, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _span_names(body: bytes) -> list[str]:
+    req = ExportTraceServiceRequest.FromString(body)
+    return [s.name for rs in req.resource_spans for ss in rs.scope_spans for s in ss.spans]
+
+
+class TestRequests:
+    def test_protobuf_gzip(self, stand_in: tuple[_StandIn, str]) -> None:
+        state, url = stand_in
+        exporter = OTLPHTTPExporter(url, "svc", "test", api_key="k")
+        exporter.export([_make_span("a"), _make_span("b")])
+        exporter.shutdown()
+
+        (req,) = state.requests
+        assert req["path"] == "/v1/traces"
+        assert req["headers"]["Content-Type"] == "application/x-protobuf"
+        assert req["headers"]["Content-Encoding"] == "gzip"
+        assert req["headers"]["Authorization"] == "Bearer k"
+        assert _span_names(req["body"]) == ["a", "b"]
+        assert exporter.stats.snapshot()["spans"] == 2
+
+    def test_uncompressed_custom_path(self, stand_in: tuple[_StandIn, str]) -> None:
+        state, url = stand_in
+        exporter = OTLPHTTPExporter(f"{url}/otlp/traces", "svc", "test", compression=None)
+        exporter.export([_make_span()])
+        exporter.shutdown()
+
+        (req,) = state.requests
+        assert req["path"] == "/otlp/traces"
+        assert "Content-Encoding" not in req["headers"]
+        assert _span_names(req["body"]) == ["test"]
+
+    def test_json_uses_hex_ids_and_integer_enums(self, stand_in: tuple[_StandIn, str]) -> None:
+        state, url = stand_in
+        exporter = OTLPHTTPExporter(url, "svc", "test", encoding="json")
+        exporter.export([_make_span(parent="1111222233334444")])
+        exporter.shutdown()
+
+        (req,) = state.requests
+        assert req["headers"]["Content-Type"] == "application/json"
+        span = json.loads(req["body"])["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        assert span["traceId"] == "0123456789abcdef0123456789abcdef"
+        assert span["spanId"] == "abcdef0123456789"
+        assert span["parentSpanId"] == "1111222233334444"
+        assert span["kind"] == 2
+
+    def test_metrics_go_to_sibling_path(self, stand_in: tuple[_StandIn, str]) -> None:
+        state, url = stand_in
+        exporter = OTLPHTTPExporter(f"{url}/otlp/v1/traces", "svc", "test", encoding="json")
+        exporter.export_metrics(_build_metrics_request({}, "svc", "test", 1, 2))
+        exporter.shutdown()
+
+        (req,) = state.requests
+        assert req["path"] == "/otlp/v1/metrics"
+        assert "resourceMetrics" in json.loads(req["body"])
+
+    def test_invalid_options(self) -> None:
+        with pytest.raises(ValueError, match="encoding"):
+            OTLPHTTPExporter("http://x", "svc", "test", encoding="xml")
+        with pytest.raises(ValueError, match="compression"):
+            OTLPHTTPExporter("http://x", "svc", "test", compression="br")
+        with pytest.raises(ValueError, match="http"):
+            OTLPHTTPExporter("localhost:4318", "svc", "test")
+
+
+class TestConnections:
+    def test_keep_alive_reuses_connection(self, stand_in: tuple[_StandIn, str]) -> None:
+        state, url = stand_in
+        exporter = OTLPHTTPExporter(url, "svc", "test", max_in_flight=1)
+        for _ in range(5):
+            exporter.export([_make_span()])
+        exporter.shutdown()
+        assert len(state.requests) == 5
+        assert state.connections == 1
+
+    def test_server_closing_connection_reconnects(self, stand_in: tuple[_StandIn, str]) -> None:
+        state, url = stand_in
+        state.close_after_response = True
+        exporter = OTLPHTTPExporter(url, "svc", "test", max_in_flight=1)
+        for _ in range(3):
+            exporter.export([_make_span()])
+        exporter.shutdown()
+        assert len(state.requests) == 3
+        assert state.connections == 3
+
+    def test_batches_in_flight_concurrently(self, stand_in: tuple[_StandIn, str]) -> None:
+        state, url = stand_in
+        state.delay_s = 0.1
+        exporter = OTLPHTTPExporter(url, "svc", "test", max_in_flight=2)
+        start = time.monotonic()
+        for _ in range(2):
+            exporter.export([_make_span()])
+        assert time.monotonic() - start < 0.1  # export() did not wait for the server
+        exporter.shutdown()
+        assert state.peak == 2
+
+
+class TestRetries:
+    def test_retryable_status_honours_retry_after(self, stand_in: tuple[_StandIn, str]) -> None:
+        state, url = stand_in
+        state.responses = [(503, {"Retry-After": "0"}), (429, {"Retry-After": "0"})]
+        exporter = OTLPHTTPExporter(url, "svc", "test")
+        exporter.export([_make_span()])
+        exporter.shutdown()
+        assert [r["status"] for r in state.requests] == [503, 429, 200]
+
+    def test_non_retryable_status_is_dropped(self, stand_in: tuple[_StandIn, str]) -> None:
+        state, url = stand_in
+        state.responses = [(400, {})]
+        exporter = OTLPHTTPExporter(url, "svc", "test")
+        exporter.export([_make_span()])
+        exporter.shutdown()
+        assert [r["status"] for r in state.requests] == [400]
+
+    def test_unreachable_collector_gives_up_quietly(self) -> None:
+        exporter = OTLPHTTPExporter("http://127.0.0.1:1", "svc", "test", timeout_s=0.5)
+        exporter.export([_make_span()])
+        exporter.shutdown()  # no exception
+
+
+class TestSchemeSelection:
+    def test_http_endpoint_selects_http_exporter(self) -> None:
+        exporter = create_otlp_exporter("https://collector:4318", service_name="s",
+                                        environment="e")
+        assert isinstance(exporter, OTLPHTTPExporter)
+        exporter.shutdown()
+
+    def test_host_port_selects_grpc(self) -> None:
+        exporter = create_otlp_exporter("collector:4317", service_name="s", environment="e")
+        assert isinstance(exporter, OTLPExporter)
+        exporter.shutdown()
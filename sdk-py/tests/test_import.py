@@ -0,0 +1,63 @@
+"""Tests that exporter, protobuf and GPU dependencies are imported lazily."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+_LAZY = (
+    "asyncio",
+    "google.protobuf",
+    "grpc",
+    "opentelemetry",
+    "axonize._exporter",
+    "axonize._gpu",
+    "axonize._http",
+    "axonize._processor",
+    "axonize._shm",
+    "axonize.files",
+)
+
+
+def _loaded_after(code: str) -> list[str]:
+    script = (
+        code
+        + "\nimport json, sys\n"
+        + f"print(json.dumps(sorted(m for m in {_LAZY!r} if m in sys.modules)))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+    ).stdout
+    loaded: list[str] = json.loads(out.strip().splitlines()[-1])
+    return loaded
+
+
+def test_import_is_stdlib_only() -> None:
+    assert _loaded_after("import axonize") == []
+
+
+def test_spans_without_init_are_stdlib_only() -> None:
+    code = (
+        "import axonize\n"
+        "from axonize import LLMSpan, Span\n"
+        "with Span('a', buffer=None):\n"
+        "    pass\n"
+        "with axonize.llm_span('b', model='m') as s:\n"
+        "    s.record_tokens(1)\n"
+        "with axonize.prepare_span('c')():\n"
+        "    pass\n"
+    )
+    assert _loaded_after(code) == []
+
+
+def test_init_loads_only_the_selected_exporter() -> None:
+    code = (
+        "import axonize\n"
+        "axonize.init(endpoint='http://127.0.0.1:1', service_name='t')\n"
+        "axonize.shutdown()\n"
+    )
+    loaded = _loaded_after(code)
+    assert "axonize._http" in loaded
+    assert "grpc" not in loaded
+    assert "axonize._gpu" not in loaded
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import time
 
+import pytest
+
 from axonize._buffer import RingBuffer
 from axonize._llm import LLMSpan
 from axonize._types import SpanKind, SpanStatus
@@ -122,6 +124,132 @@ class TestTokensPerSecond:
         assert "ai.llm.tokens_per_second" not in data.attributes
 
 
+class TestInterTokenLatency:
+    def test_tpot_percentiles_and_max_stall(self) -> None:
+        span, buf = _make_llm_span()
+        with span as s:
+            s.record_token()
+            for _ in range(10):
+                time.sleep(0.002)
+                s.record_token()
+            time.sleep(0.03)  # one stall
+            s.record_token()
+        data = buf.drain(1)[0]
+        p50 = data.attributes["ai.llm.tpot_p50_ms"]
+        p99 = data.attributes["ai.llm.tpot_p99_ms"]
+        stall = data.attributes["ai.llm.max_stall_ms"]
+        assert isinstance(p50, float)
+        assert isinstance(p99, float)
+        assert isinstance(stall, float)
+        assert 1.5 <= p50 < 30.0
+        assert p99 >= p50
+        assert stall >= 30.0
+
+    def test_single_token_has_no_tpot(self) -> None:
+        span, buf = _make_llm_span()
+        with span as s:
+            s.record_token()
+        data = buf.drain(1)[0]
+        assert "ai.llm.tpot_p50_ms" not in data.attributes
+        assert "ai.llm.max_stall_ms" not in data.attributes
+
+    def test_record_tokens_counts_batch(self) -> None:
+        span, buf = _make_llm_span()
+        with span as s:
+            s.record_tokens(4)
+            time.sleep(0.008)
+            s.record_tokens(4)
+            s.record_tokens(0)
+        data = buf.drain(1)[0]
+        assert data.attributes["ai.llm.tokens.output"] == 8
+        assert "ai.llm.ttft_ms" in data.attributes
+        # 8ms step spread over 4 tokens => ~2ms per token
+        p50 = data.attributes["ai.llm.tpot_p50_ms"]
+        assert isinstance(p50, float)
+        assert 1.5 <= p50 < 8.0
+        stall = data.attributes["ai.llm.max_stall_ms"]
+        assert isinstance(stall, float)
+        assert stall >= 8.0
+
+    def test_mixed_single_and_batched(self) -> None:
+        span, buf = _make_llm_span()
+        with span as s:
+            s.record_token()
+            s.record_tokens(3)
+            s.record_token()
+        data = buf.drain(1)[0]
+        assert data.attributes["ai.llm.tokens.output"] == 5
+
+
+class TestPhaseBreakdown:
+    def test_queue_prefill_decode(self) -> None:
+        span, buf = _make_llm_span()
+        with span as s:
+            s.mark_queued()
+            time.sleep(0.01)
+            s.mark_prefill_start()
+            time.sleep(0.01)
+            s.record_token()
+            for _ in range(4):
+                time.sleep(0.002)
+                s.record_token()
+        attrs = buf.drain(1)[0].attributes
+        queue = attrs["ai.llm.queue_ms"]
+        prefill = attrs["ai.llm.prefill_ms"]
+        decode = attrs["ai.llm.decode_ms"]
+        tpot = attrs["ai.llm.tpot_ms"]
+        assert isinstance(queue, float) and queue >= 10.0
+        assert isinstance(prefill, float) and 10.0 <= prefill < queue + 100
+        assert isinstance(decode, float) and decode >= 8.0
+        assert isinstance(tpot, float)
+        assert tpot == pytest.approx(decode / 4, abs=0.01)
+
+    def test_queued_before_span_start(self) -> None:
+        arrival = time.perf_counter_ns()
+        time.sleep(0.01)
+        span, buf = _make_llm_span()
+        with span as s:
+            s.mark_queued(at_ns=arrival)
+            s.record_token()
+        attrs = buf.drain(1)[0].attributes
+        # Prefill defaults to span start, so queue covers arrival -> start
+        queue = attrs["ai.llm.queue_ms"]
+        assert isinstance(queue, float) and queue >= 10.0
+        assert "ai.llm.prefill_ms" in attrs
+
+    def test_markers_without_record_token(self) -> None:
+        span, buf = _make_llm_span()
+        with span as s:
+            time.sleep(0.005)
+            s.mark_first_token()
+            time.sleep(0.01)
+            s.mark_decode_end()
+            s.set_tokens_output(11)
+        attrs = buf.drain(1)[0].attributes
+        decode = attrs["ai.llm.decode_ms"]
+        assert isinstance(decode, float) and decode >= 10.0
+        assert attrs["ai.llm.tpot_ms"] == pytest.approx(decode / 10, abs=0.01)
+        assert attrs["ai.llm.tokens.output"] == 11
+
+    def test_mark_first_token_not_overridden_by_record_token(self) -> None:
+        span, buf = _make_llm_span()
+        with span as s:
+            s.mark_first_token()
+            time.sleep(0.01)
+            s.record_token()
+        attrs = buf.drain(1)[0].attributes
+        ttft = attrs["ai.llm.ttft_ms"]
+        assert isinstance(ttft, float) and ttft < 10.0
+
+    def test_no_phase_attributes_without_markers_or_tokens(self) -> None:
+        span, buf = _make_llm_span()
+        with span:
+            pass
+        attrs = buf.drain(1)[0].attributes
+        for key in ("ai.llm.queue_ms", "ai.llm.prefill_ms", "ai.llm.decode_ms", "ai.llm.tpot_ms"):
+            assert key not in attrs
+
+
 class TestLLMSpanStatus:
     def test_error_captured(self) -> None:
         span, buf = _make_llm_span()
@@ -0,0 +1,193 @@
+"""Tests for pre-aggregated span metrics."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+
+import pytest
+from opentelemetry.proto.collector.metrics.v1.metrics_service_pb2 import (
+    ExportMetricsServiceRequest,
+)
+
+import axonize
+from axonize import _metrics
+from axonize._buffer import RingBuffer
+from axonize._exporter import _build_metrics_request
+from axonize._histogram import LogLinearHistogram
+from axonize._llm import LLMSpan
+from axonize._metrics import (
+    OVERFLOW_KEY,
+    TIME_BOUNDS_US,
+    TOKEN_BOUNDS,
+    SpanMetrics,
+    bucket_counts,
+)
+from axonize._sdk import _get_sdk
+from axonize._span import Span
+
+
+@pytest.fixture()
+def metrics() -> Iterator[SpanMetrics]:
+    m = SpanMetrics(lambda series, start, now: None)
+    _metrics.active = m
+    yield m
+    _metrics.active = None
+
+
+def test_unsampled_spans_are_counted(metrics: SpanMetrics) -> None:
+    buf = RingBuffer(maxsize=100)
+    for _ in range(5):
+        with Span("op", buffer=buf, sampling_rate=0.0):
+            pass
+    assert len(buf) == 0
+    series = metrics.collect()[("op", "", "ok", "")]
+    assert series.count == 5
+    assert series.duration.count == 5
+
+
+def test_spans_without_buffer_are_not_counted(metrics: SpanMetrics) -> None:
+    with Span("op", buffer=None):
+        pass
+    assert metrics.collect() == {}
+
+
+def test_key_includes_status_and_gpus(metrics: SpanMetrics) -> None:
+    buf = RingBuffer(maxsize=100)
+    with pytest.raises(RuntimeError), Span("op", buffer=buf) as s:
+        s.set_gpus(["cuda:0", "cuda:1"])
+        raise RuntimeError("boom")
+    assert list(metrics.collect()) == [("op", "", "error", "cuda:0,cuda:1")]
+
+
+def test_llm_span_records_ttft_and_tokens(metrics: SpanMetrics) -> None:
+    buf = RingBuffer(maxsize=100)
+    with LLMSpan("generate", buffer=buf, model="llama-3-8b") as s:
+        s.set_tokens_input(128)
+        s.mark_first_token(at_ns=s._start_time_ns + 25_000_000)
+        s.set_tokens_output(64)
+    with LLMSpan("generate", buffer=buf, model="llama-3-8b") as s:
+        pass  # no token: duration and tokens only
+    series = metrics.collect()[("generate", "llama-3-8b", "ok", "")]
+    assert series.count == 2
+    assert series.ttft is not None and series.tokens_in is not None
+    assert series.tokens_out is not None
+    assert series.ttft.count == 1
+    assert series.ttft_sum == 25_000
+    assert series.tokens_in_sum == 128
+    assert series.tokens_out_sum == 64
+    assert series.tokens_out.count == 2
+
+
+def test_thread_shards_are_merged(metrics: SpanMetrics) -> None:
+    def work() -> None:
+        for _ in range(1000):
+            metrics.record(("op", "", "ok", ""), 1_000_000)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    series = metrics.collect()[("op", "", "ok", "")]
+    assert series.count == 4000
+    assert series.duration_sum == 4_000_000
+
+
+def test_exited_thread_shards_are_retired(metrics: SpanMetrics) -> None:
+    def work() -> None:
+        metrics.record(("op", "", "ok", ""), 1_000_000)
+
+    for _ in range(5):
+        threads = [threading.Thread(target=work) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        series = metrics.collect()[("op", "", "ok", "")]
+        assert len(metrics._shards) == 0
+    assert series.count == 100
+    assert series.duration.count == 100
+
+
+def test_series_cap_folds_into_overflow(metrics: SpanMetrics) -> None:
+    for i in range(_metrics._MAX_SERIES + 10):
+        metrics.record((f"op-{i}", "", "ok", ""), 1000)
+    collected = metrics.collect()
+    assert len(collected) == _metrics._MAX_SERIES + 1
+    assert collected[OVERFLOW_KEY].count == 10
+
+
+def test_bucket_counts_are_exact_at_bounds() -> None:
+    hist = LogLinearHistogram(1 << 32)
+    values = [0, 1, 7, 15, 16, 23, 24, 31, 32, 999, 1000, 123_456]
+    for v in values:
+        hist.record(v)
+    counts = bucket_counts(hist, TIME_BOUNDS_US)
+    expected = [0] * (len(TIME_BOUNDS_US) + 1)
+    for v in values:
+        expected[sum(1 for b in TIME_BOUNDS_US if b <= v)] += 1
+    assert counts == expected
+
+
+def test_token_counts_at_bounds_are_upper_inclusive(metrics: SpanMetrics) -> None:
+    key = ("generate", "m", "ok", "")
+    for tokens in (0, 1, 2, 16, 17, 512):
+        metrics.record_llm(key, 1_000_000, -1, tokens, tokens)
+    series = metrics.collect()[key]
+    assert series.tokens_out is not None
+    counts = bucket_counts(series.tokens_out, TOKEN_BOUNDS)
+    expected = [0] * (len(TOKEN_BOUNDS) + 1)
+    for tokens in (0, 1, 2, 16, 17, 512):
+        expected[sum(1 for b in TOKEN_BOUNDS if b < tokens)] += 1
+    assert counts == expected
+    assert counts[TOKEN_BOUNDS.index(16)] == 1  # (12, 16]
+
+
+def test_request_encoding(metrics: SpanMetrics) -> None:
+    metrics.record(("op", "", "ok", ""), 2_000_000)
+    metrics.record_llm(("generate", "m", "error", "gpu-1"), 50_000_000, 10_000_000, 10, 5)
+    request = ExportMetricsServiceRequest.FromString(
+        _build_metrics_request(metrics.collect(), "svc", "test", 1, 2)
+    )
+    (rm,) = request.resource_metrics
+    by_name = {m.name: m for m in rm.scope_metrics[0].metrics}
+    assert set(by_name) == {
+        "axonize.span.calls", "axonize.span.duration",
+        "axonize.llm.ttft", "axonize.llm.tokens.input", "axonize.llm.tokens.output",
+    }
+    calls = by_name["axonize.span.calls"].sum
+    assert calls.is_monotonic
+    assert sorted(p.as_int for p in calls.data_points) == [1, 1]
+
+    (ttft,) = by_name["axonize.llm.ttft"].histogram.data_points
+    attrs = {kv.key: kv.value.string_value for kv in ttft.attributes}
+    assert attrs == {
+        "span.name": "generate", "status.code": "error",
+        "ai.model.name": "m", "gpu.resource_uuid": "gpu-1",
+    }
+    assert ttft.count == 1
+    assert ttft.sum == pytest.approx(10.0)
+    assert sum(ttft.bucket_counts) == 1
+    assert len(ttft.bucket_counts) == len(ttft.explicit_bounds) + 1
+    assert ttft.start_time_unix_nano == 1
+    assert ttft.time_unix_nano == 2
+
+
+def test_init_wires_metrics() -> None:
+    axonize.init(endpoint="localhost:1", service_name="metrics", metrics=True)
+    try:
+        sdk = _get_sdk()
+        assert sdk._metrics is not None  # type: ignore[union-attr]
+        assert _metrics.active is sdk._metrics  # type: ignore[union-attr]
+    finally:
+        axonize.shutdown()
+    assert _metrics.active is None
+
+
+def test_metrics_disabled_by_default() -> None:
+    axonize.init(endpoint="localhost:1", service_name="metrics")
+    try:
+        assert _metrics.active is None
+    finally:
+        axonize.shutdown()
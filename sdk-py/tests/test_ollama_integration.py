@@ -0,0 +1,233 @@
+"""Tests for the Ollama integration against a local fake Ollama server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+import urllib.request
+from collections.abc import AsyncIterator, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize._llm import LLMSpan
+from axonize.integrations.ollama import atrace_lines, instrument, record_response, trace_lines
+
+_MS = 1_000_000
+_FINAL = {
+    "done": True,
+    "done_reason": "stop",
+    "total_duration": 9 * _MS,
+    "load_duration": 2 * _MS,
+    "prompt_eval_count": 26,
+    "prompt_eval_duration": 3 * _MS,
+    "eval_count": 5,
+    "eval_duration": 4 * _MS,
+}
+
+
+class _FakeOllama(BaseHTTPRequestHandler):
+    """Serves /api/generate and /api/chat like ``ollama serve``, with canned timings."""
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        chat = self.path == "/api/chat"
+        parts = []
+        for word in ["Paris", " is", " the", " capital", "."]:
+            text = {"message": {"role": "assistant", "content": word}} if chat else {
+                "response": word
+            }
+            parts.append({"model": body["model"], "done": False, **text})
+        final = {"model": body["model"], **_FINAL}
+        if not body.get("stream", True):
+            text = "".join(p.get("response", "") for p in parts)
+            self._send([{**final, "response": text}])
+            return
+        self._send([*parts, final])
+
+    def _send(self, lines: list[dict[str, Any]]) -> None:
+        time.sleep(_FINAL["total_duration"] / 1e9)  # the reported server work
+        payload = b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def _sdk_lifecycle() -> Iterator[None]:
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint="localhost:1", service_name="ollama-test")
+    yield
+    axonize.shutdown()
+
+
+def _post(url: str, body: dict[str, Any]) -> Any:
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}
+    )
+    return urllib.request.urlopen(request, timeout=5)  # noqa: S310
+
+
+class _Client:
+    """The subset of ``ollama.Client`` the integration wraps, over stdlib HTTP."""
+
+    def __init__(self, host: str) -> None:
+        self._host = host
+
+    def _request(self, path: str, body: dict[str, Any]) -> Any:
+        response = _post(self._host + path, body)
+        if body.get("stream"):
+            return (json.loads(line) for line in response)
+        return json.loads(response.read())
+
+    def chat(self, model: str = "", messages: Any = None, *, stream: bool = False) -> Any:
+        return self._request("/api/chat", {"model": model, "messages": messages, "stream": stream})
+
+    def generate(self, model: str = "", prompt: str = "", *, stream: bool = False) -> Any:
+        return self._request("/api/generate", {"model": model, "prompt": prompt, "stream": stream})
+
+
+class _AsyncClient(_Client):
+    async def chat(self, model: str = "", messages: Any = None, *, stream: bool = False) -> Any:
+        result = super().chat(model, messages, stream=stream)
+        if not stream:
+            return result
+
+        async def parts() -> AsyncIterator[Any]:
+            for part in result:
+                yield part
+
+        return parts()
+
+
+def _drain_spans() -> list[Any]:
+    assert sdk_mod._sdk_instance is not None
+    buf = sdk_mod._sdk_instance._buffer
+    assert buf is not None
+    return buf.drain(100)
+
+
+def _assert_server_timings(attrs: Any) -> None:
+    assert attrs["ai.llm.tokens.input"] == 26
+    assert attrs["ai.llm.tokens.output"] == 5
+    assert attrs["ai.llm.prefill_ms"] == 3.0
+    assert attrs["ai.llm.decode_ms"] == 4.0
+    assert attrs["ai.llm.tpot_ms"] == 1.0
+    assert attrs["ai.llm.load_ms"] == 2.0
+    assert attrs["ai.llm.finish_reason"] == "stop"
+
+
+def test_record_response_lays_out_server_phases() -> None:
+    span = axonize.llm_span("gen", model="llama3")
+    assert isinstance(span, LLMSpan)
+    with span:
+        span._start_time_ns -= 20 * _MS  # the request went out 20 ms ago
+        record_response(span, _FINAL)
+    (sd,) = _drain_spans()
+    _assert_server_timings(sd.attributes)
+    assert 16.0 <= sd.attributes["ai.llm.ttft_ms"] <= 17.0
+
+
+def test_trace_lines_over_http(base_url: str) -> None:
+    body = {"model": "llama3", "prompt": "Capital of France?", "stream": True}
+    text = []
+    with axonize.llm_span("ollama.generate", model="llama3") as s:
+        assert isinstance(s, LLMSpan)
+        for line in trace_lines(s, _post(base_url + "/api/generate", body)):
+            text.append(json.loads(line).get("response", ""))
+    assert "".join(text) == "Paris is the capital."
+    (sd,) = _drain_spans()
+    _assert_server_timings(sd.attributes)
+
+
+def test_instrumented_client_stream(base_url: str) -> None:
+    client = instrument(_Client(base_url))
+    with axonize.span("handler") as parent:
+        stream = client.chat(model="llama3", messages=[{"role": "user", "content": "hi"}],
+                             stream=True)
+        words = [part["message"]["content"] for part in stream if not part["done"]]
+    assert "".join(words) == "Paris is the capital."
+    spans = {sd.name: sd for sd in _drain_spans()}
+    sd = spans["ollama.chat"]
+    assert sd.parent_span_id == parent.span_id
+    assert sd.attributes["ai.model.name"] == "llama3"
+    _assert_server_timings(sd.attributes)
+
+
+def test_abandoned_stream_ends_span(base_url: str) -> None:
+    client = instrument(_Client(base_url))
+    for i, _ in enumerate(client.chat(model="llama3", messages=[], stream=True)):
+        if i == 1:
+            break
+    (sd,) = _drain_spans()
+    assert sd.name == "ollama.chat"
+    assert sd.attributes["ai.model.name"] == "llama3"
+    with client.chat(model="llama3", messages=[], stream=True) as stream:
+        next(stream)
+    (sd,) = _drain_spans()
+    assert sd.name == "ollama.chat"
+
+
+def test_instrumented_client_blocking_and_idempotent(base_url: str) -> None:
+    client = instrument(_Client(base_url))
+    generate = client.generate
+    assert instrument(client).generate is generate
+    result = client.generate("llama3", "Capital of France?")
+    assert result["response"] == "Paris is the capital."
+    (sd,) = _drain_spans()
+    assert sd.name == "ollama.generate"
+    _assert_server_timings(sd.attributes)
+
+
+def test_async_client_and_lines(base_url: str) -> None:
+    client = instrument(_AsyncClient(base_url))
+
+    async def run() -> None:
+        stream = await client.chat(model="llama3", messages=[], stream=True)
+        async for _ in stream:
+            pass
+        with axonize.llm_span("raw", model="llama3") as s:
+            assert isinstance(s, LLMSpan)
+
+            async def lines() -> AsyncIterator[bytes]:
+                for line in _post(base_url + "/api/generate", {"model": "llama3"}):
+                    yield line
+
+            async for _ in atrace_lines(s, lines()):
+                pass
+
+    asyncio.run(run())
+    spans = {sd.name: sd for sd in _drain_spans()}
+    _assert_server_timings(spans["ollama.chat"].attributes)
+    _assert_server_timings(spans["raw"].attributes)
+
+
+def test_error_marks_span() -> None:
+    class _Down:
+        def chat(self, **kwargs: Any) -> Any:
+            raise ConnectionError("ollama is not running")
+
+    client = instrument(_Down())
+    with pytest.raises(ConnectionError):
+        client.chat(model="llama3", messages=[])
+    (sd,) = _drain_spans()
+    assert sd.error_message == "ollama is not running"
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import sys
-from dataclasses import dataclass
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 from typing import Any
 from unittest.mock import MagicMock
 
@@ -11,6 +13,8 @@ import pytest
 
 import axonize
 import axonize._sdk as sdk_mod
+from axonize._context import get_current_span
+from axonize._types import SpanStatus
 from axonize.integrations.openai import instrument
 
 
@@ -51,17 +55,63 @@ class _MockResponse:
 @dataclass
 class _MockDelta:
     content: str | None = None
+    role: str | None = None
 
 
 @dataclass
 class _MockChoice:
     delta: _MockDelta
     index: int = 0
+    finish_reason: str | None = None
 
 
 @dataclass
 class _MockChunk:
     choices: list[_MockChoice]
+    usage: _MockUsage | None = None
+
+
+@dataclass
+class _MockEvent:
+    type: str
+    response: Any = None
+
+
+@dataclass
+class _MockResponsesUsage:
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass
+class _MockResponsesResult:
+    usage: _MockResponsesUsage
+
+
+@dataclass
+class _MockEmbeddingUsage:
+    prompt_tokens: int
+    total_tokens: int
+
+
+@dataclass
+class _MockEmbeddingResponse:
+    usage: _MockEmbeddingUsage
+    data: list[Any] = field(default_factory=list)
+
+
+def _content(text: str) -> _MockChunk:
+    return _MockChunk(choices=[_MockChoice(delta=_MockDelta(content=text))])
+
+
+def _chat_stream(*texts: str, usage: _MockUsage | None = None) -> list[Any]:
+    """Chunks as the API streams them: role, content, finish_reason, usage."""
+    chunks: list[Any] = [_MockChunk(choices=[_MockChoice(delta=_MockDelta(role="assistant"))])]
+    chunks += [_content(t) for t in texts]
+    chunks.append(_MockChunk(choices=[_MockChoice(delta=_MockDelta(), finish_reason="stop")]))
+    if usage is not None:
+        chunks.append(_MockChunk(choices=[], usage=usage))
+    return chunks
 
 
 def _make_mock_client(response: Any = None, stream_chunks: list[Any] | None = None) -> Any:
@@ -79,6 +129,49 @@ def _make_mock_client(response: Any = None, stream_chunks: list[Any] | None = No
     return client
 
 
+class _AsyncChunks:
+    def __init__(self, chunks: list[Any]) -> None:
+        self._chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        for chunk in self._chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _AsyncResource:
+    def __init__(self, response: Any = None, stream_chunks: list[Any] | None = None) -> None:
+        self._response = response
+        self._stream_chunks = stream_chunks or []
+
+    async def create(self, **kwargs: Any) -> Any:
+        if kwargs.get("stream"):
+            return _AsyncChunks(self._stream_chunks)
+        return self._response
+
+
+class _AsyncChat:
+    def __init__(self, completions: _AsyncResource) -> None:
+        self.completions = completions
+
+
+class _AsyncClient:
+    def __init__(self, response: Any = None, stream_chunks: list[Any] | None = None) -> None:
+        self.chat = _AsyncChat(_AsyncResource(response, stream_chunks))
+        self.embeddings = _AsyncResource(response)
+
+
+def _drain_spans() -> list[Any]:
+    assert sdk_mod._sdk_instance is not None
+    buf = sdk_mod._sdk_instance._buffer
+    assert buf is not None
+    return buf.drain(10)
+
+
 # --- Tests ---
 
 
@@ -192,3 +285,170 @@ def test_instrument_passthrough_attributes() -> None:
     # Access a non-create attribute — should delegate to original
     original_completions.some_method = lambda: "pass"
     assert client.chat.completions.some_method() == "pass"
+
+
+def test_streaming_skips_role_and_finish_chunks() -> None:
+    client = instrument(_make_mock_client(stream_chunks=_chat_stream("a", "b")))
+    assert len(list(client.chat.completions.create(model="gpt-4", stream=True))) == 4
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.tokens.output"] == 2
+    assert "ai.llm.ttft_ms" in sd.attributes
+
+
+def test_streaming_uses_usage_chunk() -> None:
+    usage = _MockUsage(prompt_tokens=12, completion_tokens=7, total_tokens=19)
+    client = instrument(_make_mock_client(stream_chunks=_chat_stream("ab", "cd", usage=usage)))
+    for _ in client.chat.completions.create(
+        model="gpt-4", stream=True, stream_options={"include_usage": True},
+    ):
+        pass
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.tokens.input"] == 12
+    assert sd.attributes["ai.llm.tokens.output"] == 7
+
+
+def test_stream_span_is_not_current_while_consumed() -> None:
+    client = instrument(_make_mock_client(stream_chunks=_chat_stream("a")))
+    with axonize.span("request") as parent:
+        stream = client.chat.completions.create(model="gpt-4", stream=True)
+        assert get_current_span() is parent
+        for _ in stream:
+            with axonize.span("handle-chunk"):
+                pass
+    by_name = {sd.name: sd for sd in _drain_spans()}
+    parent_id = by_name["request"].span_id
+    assert by_name["openai.chat.completions.create"].parent_span_id == parent_id
+    assert by_name["handle-chunk"].parent_span_id == parent_id
+
+
+def test_closing_stream_early_ends_span() -> None:
+    client = instrument(_make_mock_client(stream_chunks=_chat_stream("a", "b", "c")))
+    with client.chat.completions.create(model="gpt-4", stream=True) as stream:
+        next(stream)
+        next(stream)
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.tokens.output"] == 1
+
+
+def test_abandoned_stream_ends_span() -> None:
+    client = instrument(_make_mock_client(stream_chunks=_chat_stream("a", "b", "c")))
+    for i, _ in enumerate(client.chat.completions.create(model="gpt-4", stream=True)):
+        if i == 2:  # role chunk, "a", "b"
+            break
+    (sd,) = _drain_spans()
+    assert sd.status == SpanStatus.ERROR
+    assert sd.error_message == "stream abandoned before its end"
+    assert sd.attributes["ai.llm.tokens.output"] == 2
+
+
+def test_stream_error_marks_span() -> None:
+    def _broken() -> Any:
+        yield _content("a")
+        raise ConnectionError("reset")
+
+    client = MagicMock()
+    client.chat.completions.create = lambda **kwargs: _broken()
+    client = instrument(client)
+    with pytest.raises(ConnectionError):
+        list(client.chat.completions.create(model="gpt-4", stream=True))
+    (sd,) = _drain_spans()
+    assert sd.error_message == "reset"
+
+
+def test_embeddings_and_responses() -> None:
+    client = MagicMock()
+    client.embeddings.create = lambda **kwargs: _MockEmbeddingResponse(
+        usage=_MockEmbeddingUsage(prompt_tokens=9, total_tokens=9),
+    )
+    events = [
+        _MockEvent("response.created"),
+        _MockEvent("response.output_text.delta"),
+        _MockEvent("response.output_text.delta"),
+        _MockEvent("response.output_text.done"),
+        _MockEvent("response.completed", _MockResponsesResult(_MockResponsesUsage(5, 2))),
+    ]
+    client.responses.create = lambda **kwargs: iter(events)
+    client = instrument(client)
+
+    client.embeddings.create(model="text-embedding-3-small", input="hi")
+    list(client.responses.create(model="gpt-4o", input="hi", stream=True))
+
+    by_name = {sd.name: sd for sd in _drain_spans()}
+    embed = by_name["openai.embeddings.create"]
+    assert embed.attributes["ai.inference.type"] == "embedding"
+    assert embed.attributes["ai.llm.tokens.input"] == 9
+    responses = by_name["openai.responses.create"]
+    assert responses.attributes["ai.llm.tokens.input"] == 5
+    assert responses.attributes["ai.llm.tokens.output"] == 2
+    assert "ai.llm.ttft_ms" in responses.attributes
+
+
+def test_responses_stream_counts_only_text_deltas() -> None:
+    events = [
+        _MockEvent("response.created"),
+        _MockEvent("response.output_item.added"),
+        _MockEvent("response.output_text.delta"),
+        _MockEvent("response.output_text.delta"),
+        _MockEvent("response.output_text.delta"),
+        _MockEvent("response.output_text.done"),
+        _MockEvent("response.output_item.done"),
+        _MockEvent("response.completed"),
+    ]
+    client = MagicMock()
+    client.responses.create = lambda **kwargs: iter(events)
+    client = instrument(client)
+    list(client.responses.create(model="gpt-4o", input="hi", stream=True))
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.tokens.output"] == 3
+
+
+def test_instrument_twice_wraps_once() -> None:
+    client = instrument(_make_mock_client(response=_MockResponse()))
+    completions = client.chat.completions
+    assert instrument(client).chat.completions is completions
+
+
+def test_async_non_streaming() -> None:
+    resp = _MockResponse(usage=_MockUsage(prompt_tokens=3, completion_tokens=4, total_tokens=7))
+    client = instrument(_AsyncClient(response=resp))
+
+    async def main() -> Any:
+        return await client.chat.completions.create(model="gpt-4", messages=[])
+
+    assert asyncio.run(main()) is resp
+    (sd,) = _drain_spans()
+    assert sd.name == "openai.chat.completions.create"
+    assert sd.attributes["ai.llm.tokens.input"] == 3
+    assert sd.attributes["ai.llm.tokens.output"] == 4
+
+
+def test_async_streaming() -> None:
+    usage = _MockUsage(prompt_tokens=2, completion_tokens=3, total_tokens=5)
+    client = instrument(_AsyncClient(stream_chunks=_chat_stream("a", "b", "c", usage=usage)))
+
+    async def main() -> int:
+        stream = await client.chat.completions.create(model="gpt-4", stream=True)
+        return len([chunk async for chunk in stream])
+
+    assert asyncio.run(main()) == 6
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.tokens.output"] == 3
+    assert "ai.llm.ttft_ms" in sd.attributes
+
+
+def test_async_stream_consumed_in_other_task() -> None:
+    client = instrument(_AsyncClient(stream_chunks=_chat_stream("a", "b")))
+
+    async def main() -> None:
+        stream = await client.chat.completions.create(model="gpt-4", stream=True)
+
+        async def consume() -> None:
+            async with stream:
+                async for _ in stream:
+                    pass
+
+        await asyncio.create_task(consume())
+
+    asyncio.run(main())
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.tokens.output"] == 2
@@ -71,6 +71,23 @@ def test_final_drain_on_stop() -> None:
     assert "late" in names
 
 
+def test_final_drain_covers_more_than_one_batch() -> None:
+    buf = RingBuffer(maxsize=100)
+    batches: list[int] = []
+
+    def handler(spans: list[SpanData]) -> None:
+        batches.append(len(spans))
+
+    proc = BackgroundProcessor(buf, batch_size=10, flush_interval_ms=10000, handler=handler)
+    proc.start()
+    for _ in range(25):
+        buf.enqueue(_make_span())
+    proc.stop()
+
+    assert batches == [10, 10, 5]
+    assert len(buf) == 0
+
+
 def test_handler_exception_does_not_crash() -> None:
     buf = RingBuffer(maxsize=100)
 
@@ -89,8 +106,8 @@ def test_thread_is_daemon() -> None:
     buf = RingBuffer(maxsize=100)
     proc = BackgroundProcessor(buf, flush_interval_ms=50)
     proc.start()
-    assert proc._thread is not None
-    assert proc._thread.daemon is True
+    assert proc._worker.thread is not None
+    assert proc._worker.thread.daemon is True
     proc.stop()
 
 
@@ -98,7 +115,7 @@ def test_double_start_is_idempotent() -> None:
     buf = RingBuffer(maxsize=100)
     proc = BackgroundProcessor(buf, flush_interval_ms=50)
     proc.start()
-    thread1 = proc._thread
+    thread1 = proc._worker.thread
     proc.start()  # Should not create a second thread
-    assert proc._thread is thread1
+    assert proc._worker.thread is thread1
     proc.stop()
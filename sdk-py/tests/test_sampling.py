@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
+import pytest
+
+import axonize
 from axonize._buffer import RingBuffer
+from axonize._config import AdaptiveSamplingPolicy
+from axonize._llm import LLMSpan
+from axonize._sampling import AdaptiveSampler
+from axonize._sdk import _get_sdk
 from axonize._span import Span
 
 
@@ -57,3 +64,125 @@ def test_sampling_rate_approximate() -> None:
     kept = len(buf)
     # Should be ~500, allow 350-650
     assert 350 <= kept <= 650, f"Expected ~500, got {kept}"
+
+
+def test_fixed_rate_recorded_on_sampled_spans() -> None:
+    """Sampled spans carry the rate, inherited by children, for extrapolation."""
+    buf = RingBuffer(maxsize=100)
+    exported = []
+    while not exported:
+        with Span("root", buffer=buf, sampling_rate=0.5) as root:
+            with Span("child", buffer=buf):
+                pass
+        if root._sampled:
+            exported = buf.drain(10)
+    assert [sd.attributes["sampling.rate"] for sd in exported] == [0.5, 0.5]
+
+
+def test_rate_not_recorded_at_full_sampling() -> None:
+    buf = RingBuffer(maxsize=10)
+    with Span("root", buffer=buf):
+        pass
+    assert "sampling.rate" not in buf.drain(1)[0].attributes
+
+
+# --- adaptive sampling ---
+
+
+def _roots(sampler: AdaptiveSampler, name: str, n: int, buf: RingBuffer) -> int:
+    before = len(buf)
+    for _ in range(n):
+        with Span(name, buffer=buf, sampler=sampler):
+            pass
+    return len(buf) - before
+
+
+def test_adaptive_keeps_everything_under_budget() -> None:
+    sampler = AdaptiveSampler(AdaptiveSamplingPolicy(traces_per_second=100))
+    buf = RingBuffer(maxsize=1000)
+    sampler.update(now=sampler._last_update + 1.0)
+    assert _roots(sampler, "op", 50, buf) == 50
+    sampler.update(now=sampler._last_update + 1.0)
+    assert sampler.rates() == {"op": 1.0}
+    assert "sampling.rate" not in buf.drain(1)[0].attributes
+
+
+def test_adaptive_thins_busy_key_to_budget() -> None:
+    sampler = AdaptiveSampler(AdaptiveSamplingPolicy(traces_per_second=100))
+    buf = RingBuffer(maxsize=10_000)
+    start = sampler._last_update
+    _roots(sampler, "op", 1000, buf)
+    sampler.update(now=start + 1.0)
+    assert sampler.rates()["op"] == pytest.approx(0.1)
+
+    buf.drain(10_000)
+    kept = _roots(sampler, "op", 1000, buf)
+    assert 60 <= kept <= 140
+    spans = buf.drain(10_000)
+    assert all(sd.attributes["sampling.rate"] == pytest.approx(0.1) for sd in spans)
+
+
+def test_adaptive_fair_share_protects_rare_keys() -> None:
+    sampler = AdaptiveSampler(AdaptiveSamplingPolicy(traces_per_second=100))
+    buf = RingBuffer(maxsize=10_000)
+    start = sampler._last_update
+    _roots(sampler, "busy", 2000, buf)
+    _roots(sampler, "rare", 10, buf)
+    sampler.update(now=start + 1.0)
+    rates = sampler.rates()
+    assert rates["rare"] == 1.0
+    # The rare key's unused share goes to the busy one: 90 of 2000/s
+    assert rates["busy"] == pytest.approx(90 / 2000)
+
+
+def test_adaptive_explicit_budgets_by_model() -> None:
+    policy = AdaptiveSamplingPolicy(
+        traces_per_second=10, key="model", budgets={"llama-3-70b": 500},
+    )
+    sampler = AdaptiveSampler(policy)
+    buf = RingBuffer(maxsize=10_000)
+    start = sampler._last_update
+    for model in ("llama-3-70b", "llama-3-8b"):
+        for _ in range(1000):
+            with LLMSpan("generate", buffer=buf, model=model, sampler=sampler):
+                pass
+    sampler.update(now=start + 1.0)
+    rates = sampler.rates()
+    assert rates["llama-3-70b"] == pytest.approx(0.5)
+    assert rates["llama-3-8b"] == pytest.approx(0.01)
+
+
+def test_adaptive_allowance_caps_spike_between_updates() -> None:
+    sampler = AdaptiveSampler(
+        AdaptiveSamplingPolicy(traces_per_second=100, interval_ms=1000),
+    )
+    buf = RingBuffer(maxsize=10_000)
+    sampler.update(now=sampler._last_update + 1.0)
+    # Idle key starts at rate 1.0: a burst is cut off at 2x the interval budget
+    assert _roots(sampler, "op", 5000, buf) == 200
+
+
+def test_adaptive_policy_validation() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveSamplingPolicy(traces_per_second=-1)
+    with pytest.raises(ValueError):
+        AdaptiveSamplingPolicy(traces_per_second=10, key="route")
+
+
+def test_init_starts_adaptive_sampler() -> None:
+    axonize.init(
+        endpoint="localhost:1",
+        service_name="adaptive",
+        adaptive_sampling=AdaptiveSamplingPolicy(traces_per_second=50, interval_ms=10),
+    )
+    try:
+        sampler = _get_sdk()._head_sampler  # type: ignore[union-attr]
+        assert sampler is not None and sampler._worker.thread is not None
+        with axonize.span("op"):
+            pass
+        with axonize.prepare_span("prepared")():
+            pass
+        assert set(sampler.rates()) == {"op", "prepared"}
+    finally:
+        axonize.shutdown()
+    assert sampler._worker.thread is None
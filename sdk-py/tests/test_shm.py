@@ -0,0 +1,301 @@
+"""Tests for the shared-memory span ring, its exporter and the node aggregator."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import threading
+from collections.abc import Iterator
+from concurrent import futures
+from typing import Any
+
+import grpc
+import pytest
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+    ExportTraceServiceResponse,
+)
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
+    TraceServiceServicer,
+    add_TraceServiceServicer_to_server,
+)
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize._aggregator import SpanAggregator
+from axonize._exporter import OTLPExporter
+from axonize._shm import (
+    SharedMemoryExporter,
+    SharedSpanRing,
+    decode_resource_prefix,
+    encode_resource_prefix,
+    split_record,
+)
+from axonize.launch import _parse_args
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX lane locks")
+
+
+@pytest.fixture()
+def ring() -> Iterator[SharedSpanRing]:
+    r = SharedSpanRing.create(lanes=4, slots=8, slot_size=1024)
+    yield r
+    r.close()
+    r.unlink()
+
+
+class _CollectorServicer(TraceServiceServicer):
+    def __init__(self) -> None:
+        self.requests: list[ExportTraceServiceRequest] = []
+        self._lock = threading.Lock()
+
+    def Export(  # noqa: N802
+        self,
+        request: ExportTraceServiceRequest,
+        context: grpc.ServicerContext,
+    ) -> ExportTraceServiceResponse:
+        with self._lock:
+            self.requests.append(request)
+        return ExportTraceServiceResponse()
+
+    def spans_by_service(self) -> dict[str, list[str]]:
+        out: dict[str, list[str]] = {}
+        for req in self.requests:
+            for rs in req.resource_spans:
+                service = next(
+                    a.value.string_value for a in rs.resource.attributes
+                    if a.key == "service.name"
+                )
+                for ss in rs.scope_spans:
+                    out.setdefault(service, []).extend(s.name for s in ss.spans)
+        return out
+
+
+@pytest.fixture()
+def collector() -> Iterator[tuple[_CollectorServicer, str]]:
+    servicer = _CollectorServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    add_TraceServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    yield servicer, f"localhost:{port}"
+    server.stop(grace=1)
+
+
+class TestSharedSpanRing:
+    def test_roundtrip_in_order(self, ring: SharedSpanRing) -> None:
+        for pos in range(5):
+            assert ring.write(0, pos, f"rec-{pos}".encode())
+        out: list[bytes] = []
+        assert ring.read_lane(0, 0, out, 100) == 5
+        assert out == [f"rec-{i}".encode() for i in range(5)]
+
+    def test_full_lane_rejects_until_consumed(self, ring: SharedSpanRing) -> None:
+        for pos in range(ring.slots):
+            assert ring.write(1, pos, b"x")
+        assert not ring.write(1, ring.slots, b"x")
+
+        out: list[bytes] = []
+        assert ring.read_lane(1, 0, out, 1) == 1
+        assert ring.write(1, ring.slots, b"wrapped")
+
+    def test_wraparound(self, ring: SharedSpanRing) -> None:
+        out: list[bytes] = []
+        read = 0
+        for pos in range(ring.slots * 3):
+            assert ring.write(2, pos, pos.to_bytes(4, "little"))
+            read = ring.read_lane(2, read, out, 1)
+        assert [int.from_bytes(r, "little") for r in out] == list(range(ring.slots * 3))
+
+    def test_lanes_are_independent(self, ring: SharedSpanRing) -> None:
+        ring.write(0, 0, b"a")
+        ring.write(3, 0, b"b")
+        out: list[bytes] = []
+        ring.read_lane(3, 0, out, 10)
+        assert out == [b"b"]
+
+    def test_attach_sees_writes(self, ring: SharedSpanRing) -> None:
+        other = SharedSpanRing.attach(ring.name)
+        assert (other.lanes, other.slots, other.slot_size) == (4, 8, 1024)
+        other.write(0, 0, b"from-worker")
+        other.close()
+        out: list[bytes] = []
+        ring.read_lane(0, 0, out, 1)
+        assert out == [b"from-worker"]
+
+    def test_staged_records_wait_for_publish(self, ring: SharedSpanRing) -> None:
+        assert ring.stage(0, 0, b"a")
+        assert ring.stage(0, 1, b"b")
+        out: list[bytes] = []
+        assert ring.read_lane(0, 0, out, 10) == 0
+        ring.publish(0, 0, 2)
+        assert ring.read_lane(0, 0, out, 10) == 2
+        assert out == [b"a", b"b"]
+
+    @pytest.mark.skipif(sys.version_info >= (3, 13), reason="attach() uses track=False")
+    def test_attach_leaves_other_threads_registrations(
+        self, ring: SharedSpanRing, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from multiprocessing import resource_tracker, shared_memory
+
+        registered: list[str] = []
+        monkeypatch.setattr(
+            resource_tracker, "register", lambda name, rtype: registered.append(name),
+        )
+        real = shared_memory.SharedMemory
+
+        def opened_alongside_other_thread(*args: Any, **kwargs: Any) -> Any:
+            # Another thread opens shared memory while attach() is in progress
+            other = threading.Thread(
+                target=resource_tracker.register, args=("/other", "shared_memory"),
+            )
+            other.start()
+            other.join()
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(shared_memory, "SharedMemory", opened_alongside_other_thread)
+        SharedSpanRing.attach(ring.name).close()
+        assert registered == ["/other"]
+
+    def test_attach_rejects_foreign_segment(self) -> None:
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(create=True, size=128)
+        try:
+            with pytest.raises(ValueError, match="not an axonize span ring"):
+                SharedSpanRing.attach(shm.name)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_resume_skips_records_published_by_dead_owner(self, ring: SharedSpanRing) -> None:
+        # Previous owner wrote two records but died before publishing head
+        ring.write(0, 0, b"a")
+        ring.write(0, 1, b"b")
+        assert ring._resume_position(0) == 2
+
+
+class TestLaneClaims:
+    def test_claims_distinct_lanes(self, ring: SharedSpanRing) -> None:
+        lanes = [ring.claim_lane() for _ in range(ring.lanes)]
+        assert sorted(lanes) == list(range(ring.lanes))
+        with pytest.raises(RuntimeError, match="no free lane"):
+            ring.claim_lane()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="fork required")
+    def test_child_process_claims_other_lane_and_releases_on_exit(
+        self, ring: SharedSpanRing,
+    ) -> None:
+        assert ring.claim_lane() == 0
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+
+        def child() -> None:
+            results.put(SharedSpanRing.attach(ring.name).claim_lane())
+
+        for _ in range(2):
+            p = ctx.Process(target=child)
+            p.start()
+            p.join(timeout=10)
+            # The exited child's lane is free again for the next one
+            assert results.get(timeout=5) == 1
+
+
+class TestResourcePrefix:
+    def test_roundtrip(self) -> None:
+        prefix = encode_resource_prefix("svc", "prod")
+        assert decode_resource_prefix(prefix) == ("svc", "prod")
+        head, body = split_record(prefix + b"span-bytes")
+        assert head == prefix
+        assert bytes(body) == b"span-bytes"
+
+
+class TestAggregation:
+    def test_workers_batched_into_one_request(
+        self, ring: SharedSpanRing, collector: tuple[_CollectorServicer, str],
+    ) -> None:
+        servicer, endpoint = collector
+        writers = [
+            SharedMemoryExporter(ring.name, "svc-a", "test"),
+            SharedMemoryExporter(ring.name, "svc-b", "test"),
+        ]
+        assert writers[0].lane != writers[1].lane
+
+        for writer, name in zip(writers, ("a", "b"), strict=True):
+            spans = []
+            for _ in range(3):
+                with axonize.span(name) as s:
+                    s.set_attribute("k", 1)
+                spans.append(s._to_span_data())
+            writer.export(spans)
+
+        exporter = OTLPExporter(endpoint, service_name="", environment="")
+        aggregator = SpanAggregator(ring, exporter, batch_size=100)
+        aggregator.stop()  # never started: drains synchronously
+        exporter.shutdown()
+        for writer in writers:
+            writer.shutdown()
+
+        assert len(servicer.requests) == 1
+        assert servicer.spans_by_service() == {"svc-a": ["a"] * 3, "svc-b": ["b"] * 3}
+        assert aggregator.exported_spans == 6
+
+    def test_oversized_span_counted_as_drop(self, ring: SharedSpanRing) -> None:
+        writer = SharedMemoryExporter(ring.name, "svc", "test")
+        with axonize.span("big") as s:
+            s.set_attribute("payload", "x" * 2000)
+        writer.export([s._to_span_data()])
+        assert ring.drops(writer.lane) == 1
+        assert ring.backlog(writer.lane) == 0
+        writer.shutdown()
+
+    def test_full_lane_drops_rest_of_batch(self, ring: SharedSpanRing) -> None:
+        writer = SharedMemoryExporter(ring.name, "svc", "test", block_timeout_s=0.01)
+        with axonize.span("s") as s:
+            pass
+        writer.export([s._to_span_data()] * (ring.slots + 3))
+        assert ring.backlog(writer.lane) == ring.slots
+        assert ring.drops(writer.lane) == 3
+        writer.shutdown()
+
+
+class TestSDKIntegration:
+    def setup_method(self) -> None:
+        sdk_mod._sdk_instance = None
+
+    def teardown_method(self) -> None:
+        axonize.shutdown()
+
+    def test_init_with_ring_uses_shared_memory(
+        self, ring: SharedSpanRing, collector: tuple[_CollectorServicer, str],
+    ) -> None:
+        servicer, endpoint = collector
+        axonize.init(endpoint="unused:4317", service_name="worker", shm_ring=ring.name)
+        assert isinstance(sdk_mod._sdk_instance._exporter, SharedMemoryExporter)  # type: ignore[union-attr]
+        with axonize.llm_span("gen", model="m") as s:
+            s.record_token()
+        axonize.shutdown()
+
+        exporter = OTLPExporter(endpoint, service_name="", environment="")
+        SpanAggregator(ring, exporter).stop()
+        exporter.shutdown()
+        assert servicer.spans_by_service() == {"worker": ["gen"]}
+
+    def test_ring_from_environment(
+        self, ring: SharedSpanRing, monkeypatch: Any,
+    ) -> None:
+        monkeypatch.setenv("AXONIZE_SHM_RING", ring.name)
+        axonize.init(endpoint="unused:4317", service_name="worker")
+        assert sdk_mod._sdk_instance is not None
+        assert sdk_mod._sdk_instance.config.shm_ring == ring.name
+
+    def test_missing_ring_falls_back_to_otlp(self) -> None:
+        axonize.init(endpoint="localhost:4317", service_name="w", shm_ring="axonize-missing")
+        assert isinstance(sdk_mod._sdk_instance._exporter, OTLPExporter)  # type: ignore[union-attr]
+
+
+def test_launcher_args_strip_separator() -> None:
+    args = _parse_args(["--endpoint", "c:4317", "--lanes", "8", "--", "python", "-V"])
+    assert args.lanes == 8
+    assert args.command == ["python", "-V"]
@@ -0,0 +1,143 @@
+"""Tests for SDK self-telemetry."""
+
+from __future__ import annotations
+
+import time
+
+from opentelemetry.proto.collector.metrics.v1.metrics_service_pb2 import (
+    ExportMetricsServiceRequest,
+)
+
+import axonize
+from axonize._buffer import RingBuffer
+from axonize._exporter import OTLPExporter, _build_metrics_request
+from axonize._processor import BackgroundProcessor
+from axonize._span import Span
+from axonize._stats import ExportStats, ThreadCPU
+from axonize._types import SpanData, SpanKind, SpanStatus
+
+
+def _make_span_data() -> SpanData:
+    return SpanData(
+        span_id="abcdef0123456789",
+        trace_id="0123456789abcdef0123456789abcdef",
+        name="op",
+        kind=SpanKind.INTERNAL,
+        status=SpanStatus.OK,
+        start_time_ns=0,
+        end_time_ns=1_000_000,
+        duration_ms=1.0,
+        service_name="svc",
+    )
+
+
+class TestBufferCounts:
+    def test_enqueued_dropped_and_high_water(self) -> None:
+        buf = RingBuffer(maxsize=4)
+        for _ in range(6):
+            buf.enqueue(_make_span_data())
+        assert buf.drop_count == 2
+        assert buf.high_water == 4
+        buf.drain(3)
+        buf.enqueue(_make_span_data())
+        assert buf.enqueued_count == 7
+        assert buf.high_water == 4
+
+    def test_unsampled_spans_are_counted(self) -> None:
+        buf = RingBuffer(maxsize=10)
+        for _ in range(3):
+            with Span("op", buffer=buf, sampling_rate=0.0):
+                pass
+        with Span("op", buffer=buf):
+            pass
+        assert buf.unsampled_count == 3
+        assert buf.enqueued_count == 1
+
+
+class TestExportStats:
+    def test_failed_export_is_counted(self) -> None:
+        exporter = OTLPExporter("localhost:1", "svc", "dev", timeout_s=0.1)
+        exporter.export([_make_span_data(), _make_span_data()])
+        exporter.shutdown()
+        snap = exporter.stats.snapshot()
+        assert snap["failed_batches"] == 1
+        assert snap["failed_spans"] == 2
+        assert snap["batches"] == 0
+        assert snap["encode_ms"]["count"] == 1
+        assert snap["send_ms"]["count"] == 1
+
+    def test_snapshot_quantiles(self) -> None:
+        stats = ExportStats()
+        for ms in range(1, 101):
+            stats.record_send(10, ms * 1_000_000, ok=True)
+        snap = stats.snapshot()
+        assert snap["batches"] == 100
+        assert snap["spans"] == 1000
+        assert 45 <= snap["send_ms"]["p50"] <= 55
+        assert 90 <= snap["send_ms"]["p99"] <= 110
+        assert snap["batch_size"]["p50"] == 10
+
+
+def test_thread_cpu_accumulates_across_restarts() -> None:
+    cpu = ThreadCPU()
+    cpu._current = 1.5
+    cpu.begin()  # restarted thread: its own clock starts over
+    cpu.update()
+    assert cpu.seconds >= 1.5
+    cpu.add(0.5)
+    assert cpu.seconds >= 2.0
+
+
+def test_processor_thread_cpu() -> None:
+    buf = RingBuffer(maxsize=10)
+    proc = BackgroundProcessor(buf, flush_interval_ms=10)
+    proc.start()
+    time.sleep(0.1)
+    proc.stop()
+    assert proc.cpu.seconds > 0.0
+
+
+def test_stats_without_init() -> None:
+    assert axonize.stats() == {}
+
+
+def test_stats_after_init() -> None:
+    axonize.init(endpoint="localhost:1", service_name="stats", sampling_rate=0.0)
+    try:
+        with axonize.span("op"):
+            pass
+        stats = axonize.stats()
+        assert stats["spans"] == {"enqueued": 0, "dropped": 0, "unsampled": 1}
+        assert stats["buffer"]["capacity"] == 8192
+        assert stats["export"]["failed_spans"] == 0
+        assert "processor" in stats["cpu_seconds"]
+    finally:
+        axonize.shutdown()
+
+
+def test_self_metrics_encoding() -> None:
+    export_stats = ExportStats()
+    export_stats.record_encode(2_000_000)
+    export_stats.record_send(8, 5_000_000, ok=True)
+    sdk_stats = {
+        "spans": {"enqueued": 10, "dropped": 2, "unsampled": 30},
+        "buffer": {"size": 1, "capacity": 100, "high_water": 7},
+        "cpu_seconds": {"processor": 0.25},
+    }
+    request = ExportMetricsServiceRequest.FromString(_build_metrics_request(
+        {}, "svc", "test", 1, 2, sdk_stats=sdk_stats, export_stats=export_stats,
+    ))
+    by_name = {m.name: m for m in request.resource_metrics[0].scope_metrics[0].metrics}
+    spans = {
+        p.attributes[0].value.string_value: p.as_int
+        for p in by_name["axonize.sdk.spans"].sum.data_points
+    }
+    assert spans == {
+        "enqueued": 10, "dropped": 2, "unsampled": 30, "exported": 8, "export_failed": 0,
+    }
+    assert by_name["axonize.sdk.buffer.high_water"].gauge.data_points[0].as_int == 7
+    (send,) = by_name["axonize.sdk.export.send.duration"].histogram.data_points
+    assert send.sum == 5.0
+    (cpu,) = by_name["axonize.sdk.cpu_time"].sum.data_points
+    assert cpu.as_double == 0.25
+    assert "axonize.span.calls" not in by_name
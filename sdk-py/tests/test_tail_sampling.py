@@ -0,0 +1,188 @@
+"""Tests for tail-based sampling."""
+
+from __future__ import annotations
+
+import itertools
+import random
+
+import pytest
+
+import axonize
+from axonize._buffer import RingBuffer
+from axonize._config import TailSamplingPolicy
+from axonize._processor import BackgroundProcessor
+from axonize._sampling import TailSampler
+from axonize._sdk import _get_sdk
+from axonize._types import SpanData, SpanKind, SpanStatus
+
+_ids = itertools.count(1)
+
+# Trace IDs whose low 32 bits fall below / above any rate in (0, 1)
+KEEP_ID = "0" * 32
+DROP_ID = "f" * 32
+
+
+def _span(
+    trace_id: str,
+    *,
+    root: bool = True,
+    name: str = "op",
+    duration_ms: float = 1.0,
+    status: SpanStatus = SpanStatus.OK,
+    model: str | None = None,
+) -> SpanData:
+    return SpanData(
+        span_id=f"{next(_ids):016x}",
+        trace_id=trace_id,
+        name=name,
+        kind=SpanKind.INTERNAL,
+        status=status,
+        start_time_ns=0,
+        end_time_ns=int(duration_ms * 1e6),
+        duration_ms=duration_ms,
+        service_name="svc",
+        attributes={"ai.model.name": model} if model else {},
+        parent_span_id=None if root else "00000000000000aa",
+    )
+
+
+def _trace_id(n: int) -> str:
+    # High bits vary, low 32 bits stay 0xffffffff: never kept by sample_rate < 1
+    return f"{n:024x}ffffffff"
+
+
+def test_root_decides_trace() -> None:
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=0.5))
+    child = _span(KEEP_ID, root=False)
+    assert sampler.process([child], now=0.0) == []
+    assert sampler.buffered_spans == 1
+    root = _span(KEEP_ID)
+    assert sampler.process([root], now=0.1) == [child, root]
+    assert sampler.buffered_spans == 0
+    assert sampler.kept_traces == 1
+
+
+def test_probabilistic_drop() -> None:
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=0.5))
+    assert sampler.process([_span(DROP_ID, root=False), _span(DROP_ID)], now=0.0) == []
+    assert sampler.dropped_traces == 1
+
+
+def test_probabilistic_rate_is_approximate() -> None:
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=0.25, latency_percentile=None))
+    rng = random.Random(7)
+    spans = [_span(f"{rng.getrandbits(128):032x}") for _ in range(4000)]
+    kept = sampler.process(spans, now=0.0)
+    assert 800 < len(kept) < 1200
+
+
+def test_errors_are_kept() -> None:
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=0.0))
+    spans = [_span(DROP_ID, root=False, status=SpanStatus.ERROR), _span(DROP_ID)]
+    assert sampler.process(spans, now=0.0) == spans
+
+
+def test_keep_errors_disabled() -> None:
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=0.0, keep_errors=False))
+    assert sampler.process([_span(DROP_ID, status=SpanStatus.ERROR)], now=0.0) == []
+
+
+def test_models_are_kept() -> None:
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=0.0, models=("llama-3-70b",)))
+    kept = [_span(_trace_id(1), root=False, model="llama-3-70b"), _span(_trace_id(1))]
+    dropped = [_span(_trace_id(2), root=False, model="llama-3-8b"), _span(_trace_id(2))]
+    assert sampler.process(kept + dropped, now=0.0) == kept
+
+
+def test_latency_threshold() -> None:
+    policy = TailSamplingPolicy(sample_rate=0.0, latency_threshold_ms=100.0)
+    sampler = TailSampler(policy)
+    slow = _span(_trace_id(1), duration_ms=150.0)
+    fast = _span(_trace_id(2), duration_ms=50.0)
+    assert sampler.process([slow, fast], now=0.0) == [slow]
+
+
+def test_latency_percentile_per_root_name() -> None:
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=0.0, latency_percentile=0.9))
+    warmup = [
+        _span(_trace_id(i), name="generate", duration_ms=10.0 + i % 10) for i in range(500)
+    ]
+    sampler.process(warmup, now=0.0)
+    slow = _span(_trace_id(1000), name="generate", duration_ms=40.0)
+    typical = _span(_trace_id(1001), name="generate", duration_ms=12.0)
+    # No history for this name yet: not judged on latency
+    other = _span(_trace_id(1002), name="embed", duration_ms=40.0)
+    assert sampler.process([slow, typical, other], now=0.0) == [slow]
+
+
+def test_timeout_decides_rootless_trace() -> None:
+    policy = TailSamplingPolicy(sample_rate=1.0, decision_wait_ms=1000)
+    sampler = TailSampler(policy)
+    child = _span(KEEP_ID, root=False)
+    assert sampler.process([child], now=0.0) == []
+    assert sampler.process([], now=0.5) == []
+    assert sampler.process([], now=1.5) == [child]
+    assert sampler.buffered_spans == 0
+
+
+def test_late_spans_follow_decision() -> None:
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=0.5))
+    sampler.process([_span(KEEP_ID), _span(DROP_ID)], now=0.0)
+    late_kept = _span(KEEP_ID, root=False)
+    late_dropped = _span(DROP_ID, root=False)
+    assert sampler.process([late_kept, late_dropped], now=0.1) == [late_kept]
+    assert sampler.buffered_spans == 0
+
+
+def test_memory_cap_forces_decisions() -> None:
+    policy = TailSamplingPolicy(sample_rate=1.0, max_buffered_spans=10)
+    sampler = TailSampler(policy)
+    spans = [_span(f"{i:032x}", root=False) for i in range(1, 26)]
+    kept = sampler.process(spans, now=0.0)
+    assert sampler.buffered_spans == 10
+    assert sampler.forced_decisions == 15
+    # Oldest traces go first
+    assert kept == spans[:15]
+
+
+def test_flush_decides_everything() -> None:
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=1.0))
+    spans = [_span(f"{i:032x}", root=False) for i in range(1, 6)]
+    sampler.process(spans, now=0.0)
+    assert sampler.flush() == spans
+    assert sampler.buffered_spans == 0
+
+
+def test_policy_validation() -> None:
+    with pytest.raises(ValueError):
+        TailSamplingPolicy(sample_rate=1.5)
+    with pytest.raises(ValueError):
+        TailSamplingPolicy(latency_percentile=99.0)
+    with pytest.raises(ValueError):
+        TailSamplingPolicy(decision_wait_ms=0)
+
+
+def test_processor_exports_kept_traces_on_stop() -> None:
+    buf = RingBuffer(maxsize=100)
+    received: list[SpanData] = []
+    sampler = TailSampler(TailSamplingPolicy(sample_rate=0.5))
+    proc = BackgroundProcessor(buf, batch_size=2, handler=received.extend, sampler=sampler)
+    pending = _span(KEEP_ID, root=False)
+    for sd in (_span(DROP_ID, root=False), _span(DROP_ID), pending):
+        buf.enqueue(sd)
+    proc.stop()
+    assert received == [pending]
+
+
+def test_init_wires_sampler() -> None:
+    axonize.init(
+        endpoint="localhost:1",
+        service_name="tail",
+        tail_sampling=TailSamplingPolicy(sample_rate=0.1),
+    )
+    try:
+        sdk = _get_sdk()
+        assert isinstance(sdk._processor, BackgroundProcessor)  # type: ignore[union-attr]
+        assert isinstance(sdk._processor._sampler, TailSampler)  # type: ignore[union-attr]
+    finally:
+        axonize.shutdown()
@@ -0,0 +1,109 @@
+"""Tests for span templates (prepare_span / prepare_llm_span)."""
+
+from __future__ import annotations
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize._gpu import MockGPUProfiler
+from axonize._llm import LLMSpan
+from axonize._span import Span
+from axonize._types import SpanData, SpanKind
+
+
+def setup_function() -> None:
+    sdk_mod._sdk_instance = None
+
+
+def teardown_function() -> None:
+    axonize.shutdown()
+
+
+def _drain() -> list[SpanData]:
+    assert sdk_mod._sdk_instance is not None
+    buf = sdk_mod._sdk_instance._buffer
+    assert buf is not None
+    return buf.drain(100)
+
+
+def test_prepare_span_creates_spans() -> None:
+    axonize.init(endpoint="localhost:4317", service_name="tmpl", environment="prod")
+    tmpl = axonize.prepare_span("step", kind=SpanKind.CLIENT, attributes={"stage": "decode"})
+
+    with tmpl() as s:
+        assert type(s) is Span
+        s.set_attribute("dynamic", 1)
+
+    data = _drain()[0]
+    assert data.name == "step"
+    assert data.kind == SpanKind.CLIENT
+    assert data.service_name == "tmpl"
+    assert data.environment == "prod"
+    assert dict(data.attributes) == {"stage": "decode", "dynamic": 1}
+
+
+def test_prepare_llm_span_matches_adhoc_path() -> None:
+    axonize.init(endpoint="localhost:4317", service_name="tmpl")
+    tmpl = axonize.prepare_llm_span("generate", model="llama-3-70b", model_version="v1")
+
+    with tmpl() as s:
+        assert isinstance(s, LLMSpan)
+        s.set_tokens_input(8)
+        s.record_token()
+    with axonize.llm_span("generate", model="llama-3-70b", model_version="v1") as s:
+        s.set_tokens_input(8)
+        s.record_token()
+
+    from_template, adhoc = _drain()
+    assert from_template.kind == adhoc.kind == SpanKind.SERVER
+    for key in ("ai.model.name", "ai.model.version", "ai.inference.type",
+                "ai.llm.tokens.input", "ai.llm.tokens.output"):
+        assert from_template.attributes[key] == adhoc.attributes[key]
+
+
+def test_spans_share_base_layer() -> None:
+    tmpl = axonize.prepare_llm_span("generate", model="m")
+    a, b = tmpl(), tmpl()
+    assert a._attributes.base is not None
+    assert a._attributes.base is b._attributes.base
+    assert a.span_id != b.span_id
+
+
+def test_template_rebinds_after_init() -> None:
+    tmpl = axonize.prepare_span("op")
+
+    # Created before init: bound to the noop SDK, nothing buffered
+    with tmpl() as s:
+        assert s._buffer is None
+
+    axonize.init(endpoint="localhost:4317", service_name="late")
+    with tmpl():
+        pass
+    data = _drain()
+    assert len(data) == 1
+    assert data[0].service_name == "late"
+
+
+def test_template_gpu_labels_resolved_via_profiler() -> None:
+    axonize.init(endpoint="localhost:4317", service_name="gpu")
+    assert sdk_mod._sdk_instance is not None
+    sdk_mod._sdk_instance._gpu_profiler = MockGPUProfiler(num_gpus=2)
+
+    tmpl = axonize.prepare_span("forward", gpus=["cuda:0", "cuda:1", "cuda:9"])
+    with tmpl():
+        pass
+
+    data = _drain()[0]
+    labels = [ga.user_label for ga in data.gpu_attributions]
+    assert labels == ["cuda:0", "cuda:1"]
+    assert data.gpu_attributions[0].resource_uuid == "GPU-0000"
+    sdk_mod._sdk_instance._gpu_profiler = None
+
+
+def test_template_nesting_sets_parent() -> None:
+    axonize.init(endpoint="localhost:4317", service_name="nest")
+    outer = axonize.prepare_span("outer")
+    inner = axonize.prepare_span("inner")
+    with outer() as o:
+        with inner() as i:
+            assert i.parent_span_id == o.span_id
+            assert i.trace_id == o.trace_id
@@ -0,0 +1,97 @@
+"""Tests for the in-process LocalCollector."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator
+
+import pytest
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize._buffer import RingBuffer
+from axonize._exporter import OTLPExporter
+from axonize._llm import LLMSpan
+from axonize._types import SpanData
+from axonize.testing import LocalCollector
+
+
+@pytest.fixture()
+def collector() -> Iterator[LocalCollector]:
+    with LocalCollector() as c:
+        yield c
+
+
+def test_sdk_spans_arrive_as_columns(collector: LocalCollector) -> None:
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint=collector.endpoint, service_name="svc", environment="ci")
+    try:
+        with axonize.span("handler") as parent:
+            with axonize.llm_span("generate", model="llama-3-8b") as s:
+                s.set_tokens_input(128)
+                s.record_tokens(4)
+            parent.set_attribute("route", "/v1/chat")
+    finally:
+        axonize.shutdown()
+    assert collector.wait_for(2)
+    assert len(collector) == 2
+    spans = {sd["name"]: sd for sd in collector.spans()}
+    gen, handler = spans["generate"], spans["handler"]
+    assert gen["parent_span_id"] == handler["span_id"]
+    assert gen["trace_id"] == handler["trace_id"]
+    assert handler["parent_span_id"] is None
+    assert gen["service_name"] == "svc" and gen["environment"] == "ci"
+    assert gen["model_name"] == "llama-3-8b"
+    assert gen["tokens_input"] == 128.0
+    assert gen["tokens_output"] == 4.0
+    assert gen["ttft_ms"] >= 0.0
+    assert math.isnan(handler["ttft_ms"])
+    assert handler["attributes"]["route"] == "/v1/chat"
+    assert gen["status"] == "ok"
+    assert collector.column("duration_ms")[0] >= 0.0
+
+
+def _ttft_batch(model: str, ttfts_ms: list[float]) -> list[SpanData]:
+    buf = RingBuffer(maxsize=len(ttfts_ms))
+    for ttft in ttfts_ms:
+        with LLMSpan("generate", buffer=buf, model=model) as s:
+            s.set_attribute("ai.llm.ttft_ms", ttft)
+    return buf.drain(len(ttfts_ms))
+
+
+def test_percentiles_and_histogram_by_model(collector: LocalCollector) -> None:
+    exporter = OTLPExporter(collector.endpoint, "svc", "ci")
+    exporter.export(_ttft_batch("small", [float(v) for v in range(1, 101)]))
+    exporter.export(_ttft_batch("large", [200.0, 400.0]))
+    exporter.shutdown()
+    assert collector.wait_for(102)
+    stats = collector.percentiles("ttft_ms", q=(50, 99))
+    assert stats["small"] == {"count": 100, "p50": 50.5, "p99": pytest.approx(99.01)}
+    assert stats["large"]["p50"] == 300.0
+    overall = collector.percentiles("ttft_ms", by=None, q=(100,))
+    assert overall[None] == {"count": 102, "p100": 400.0}
+    hist = collector.histogram("ttft_ms", bounds=(10, 100, 250))
+    assert hist == {10: 10, 100: 90, 250: 1, math.inf: 1}
+    collector.clear()
+    assert len(collector) == 0
+
+
+def test_non_numeric_value_under_numeric_key(collector: LocalCollector) -> None:
+    buf = RingBuffer(maxsize=2)
+    with LLMSpan("generate", buffer=buf, model="small") as s:
+        s.set_attribute("ai.llm.ttft_ms", "fast")
+    with LLMSpan("generate", buffer=buf, model="small") as s:
+        s.set_attribute("ai.llm.ttft_ms", 12.5)
+    exporter = OTLPExporter(collector.endpoint, "svc", "ci")
+    exporter.export(buf.drain(2))
+    exporter.shutdown()
+    assert collector.wait_for(2)
+    first, second = collector.spans()
+    assert math.isnan(first["ttft_ms"])
+    assert first["attributes"]["ai.llm.ttft_ms"] == "fast"
+    assert second["ttft_ms"] == 12.5
+    assert collector.percentiles("ttft_ms", by=None, q=(50,))[None]["count"] == 1
+
+
+def test_wait_for_times_out(collector: LocalCollector) -> None:
+    assert not collector.wait_for(1, timeout=0.05)
@@ -0,0 +1,206 @@
+"""Tests for the PyTorch integration, with a stub torch module (torch is not required)."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import types
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize.integrations.torch import TorchMemoryTracker
+
+_MB = 1024 * 1024
+
+
+class _Allocator:
+    """``torch.cuda`` allocator counters on a pretend device."""
+
+    def __init__(self) -> None:
+        self.allocated = 100 * _MB
+        self.reserved = 400 * _MB
+        self.peak = self.allocated
+        self.resets = 0
+
+    def alloc(self, n_mb: int) -> None:
+        self.allocated += n_mb * _MB
+        self.peak = max(self.peak, self.allocated)
+        self.reserved = max(self.reserved, self.allocated)
+
+    def free(self, n_mb: int) -> None:
+        self.allocated -= n_mb * _MB
+
+    def memory_allocated(self, device: Any = None) -> int:
+        return self.allocated
+
+    def memory_reserved(self, device: Any = None) -> int:
+        return self.reserved
+
+    def max_memory_allocated(self, device: Any = None) -> int:
+        return self.peak
+
+    def reset_peak_memory_stats(self, device: Any = None) -> None:
+        self.peak = self.allocated
+        self.resets += 1
+
+    def is_available(self) -> bool:
+        return False
+
+
+class _Profile:
+    started = 0
+
+    def __init__(self, activities: list[str]) -> None:
+        self.activities = activities
+        self.running = False
+
+    def start(self) -> None:
+        _Profile.started += 1
+        self.running = True
+
+    def stop(self) -> None:
+        self.running = False
+
+    def key_averages(self) -> list[Any]:
+        return [
+            SimpleNamespace(key="aten::mm", count=4, self_device_time_total=0.0),
+            SimpleNamespace(key="sm90_gemm_bf16", count=4, self_device_time_total=1500.0),
+            SimpleNamespace(key="flash_fwd_kernel", count=2, self_device_time_total=900.0),
+            SimpleNamespace(key="elementwise_add", count=8, self_device_time_total=40.0),
+        ]
+
+
+@pytest.fixture
+def cuda(monkeypatch: pytest.MonkeyPatch) -> Iterator[_Allocator]:
+    allocator = _Allocator()
+    torch = types.ModuleType("torch")
+    torch.cuda = allocator  # type: ignore[attr-defined]
+    torch.profiler = SimpleNamespace(  # type: ignore[attr-defined]
+        profile=_Profile, ProfilerActivity=SimpleNamespace(CPU="cpu", CUDA="cuda"),
+    )
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    _Profile.started = 0
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint="localhost:1", service_name="torch-test")
+    yield allocator
+    axonize.shutdown()
+
+
+def _drain_spans() -> list[Any]:
+    assert sdk_mod._sdk_instance is not None
+    buf = sdk_mod._sdk_instance._buffer
+    assert buf is not None
+    return buf.drain(100)
+
+
+def test_span_gets_allocator_deltas(cuda: _Allocator) -> None:
+    tracker = TorchMemoryTracker()
+    with axonize.span("forward") as s, tracker.track(s):
+        cuda.alloc(300)  # activations
+        cuda.free(250)
+    (sd,) = _drain_spans()
+    attrs = sd.attributes
+    assert attrs["torch.memory.allocated_mb"] == 150.0
+    assert attrs["torch.memory.allocated_delta_mb"] == 50.0
+    assert attrs["torch.memory.peak_delta_mb"] == 300.0
+    assert attrs["torch.memory.reserved_mb"] == 400.0
+    assert attrs["torch.memory.fragmentation"] == 0.625
+
+
+def test_nested_spans_keep_outer_peak(cuda: _Allocator) -> None:
+    tracker = TorchMemoryTracker()
+    with axonize.span("request") as outer, tracker.track(outer):
+        with axonize.span("prefill") as inner, tracker.track(inner):
+            cuda.alloc(200)
+            cuda.free(200)
+        # The inner span reset the peak counter; the outer still sees its peak
+        with axonize.span("decode") as inner, tracker.track(inner):
+            cuda.alloc(50)
+            cuda.free(50)
+    spans = {sd.name: sd.attributes for sd in _drain_spans()}
+    assert spans["prefill"]["torch.memory.peak_delta_mb"] == 200.0
+    assert spans["decode"]["torch.memory.peak_delta_mb"] == 50.0
+    assert spans["request"]["torch.memory.peak_delta_mb"] == 200.0
+
+
+def test_unsampled_span_is_not_measured(cuda: _Allocator) -> None:
+    tracker = TorchMemoryTracker()
+    with axonize.span("forward") as s:
+        s._sampled = False
+        with tracker.track(s):
+            cuda.alloc(10)
+    assert cuda.resets == 0
+
+
+def test_profiled_span_gets_kernel_children(cuda: _Allocator) -> None:
+    tracker = TorchMemoryTracker(profile_every=2, profile_top_k=2)
+    for _ in range(3):
+        with axonize.span("forward") as s, tracker.track(s):
+            cuda.alloc(1)
+    tracker.stop()
+    assert _Profile.started == 2  # spans 1 and 3
+    spans = _drain_spans()
+    kernels = [sd for sd in spans if sd.name == "torch.kernel"]
+    assert [k.attributes["torch.kernel.name"] for k in kernels] == [
+        "sm90_gemm_bf16", "flash_fwd_kernel",
+    ] * 2
+    first = kernels[0]
+    assert first.attributes["torch.kernel.calls"] == 4
+    assert first.attributes["torch.kernel.device_time_ms"] == 1.5
+    parents = {sd.span_id: sd.trace_id for sd in spans if sd.name == "forward"}
+    for k in kernels:
+        assert k.parent_span_id in parents
+        assert k.trace_id == parents[k.parent_span_id]
+
+
+def test_concurrent_spans_never_nest_profilers(
+    cuda: _Allocator, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    running: list[_Profile] = []
+
+    class _Exclusive(_Profile):
+        def start(self) -> None:
+            if running:
+                raise AssertionError("profilers nested")
+            running.append(self)
+            super().start()
+
+        def stop(self) -> None:
+            running.remove(self)
+            super().stop()
+
+    monkeypatch.setattr(sys.modules["torch"].profiler, "profile", _Exclusive)
+    tracker = TorchMemoryTracker(profile_every=1)
+    barrier = threading.Barrier(4)
+
+    def forward() -> None:
+        for _ in range(20):
+            with axonize.span("forward") as s, tracker.track(s):
+                barrier.wait()
+
+    threads = [threading.Thread(target=forward) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    tracker.stop()
+    assert _Profile.started == 20  # one per round: all four spans overlap at the barrier
+    assert not running
+
+
+def test_profiler_failure_is_not_fatal(cuda: _Allocator, monkeypatch: pytest.MonkeyPatch) -> None:
+    def busy(activities: list[str]) -> Any:
+        raise RuntimeError("Can't profile: another profiler is running")
+
+    monkeypatch.setattr(sys.modules["torch"].profiler, "profile", busy)
+    tracker = TorchMemoryTracker(profile_every=1)
+    with axonize.span("forward") as s, tracker.track(s):
+        pass
+    tracker.stop()
+    (sd,) = _drain_spans()
+    assert "torch.memory.allocated_mb" in sd.attributes
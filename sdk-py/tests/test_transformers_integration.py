@@ -0,0 +1,180 @@
+"""Tests for the transformers integration, with a tiny CPU model stand-in."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize import _metrics
+from axonize._llm import LLMSpan
+from axonize._metrics import SpanMetrics
+from axonize.integrations.transformers import AxonizeStreamer, gpu_labels, instrument
+
+
+@pytest.fixture(autouse=True)
+def _sdk_lifecycle() -> Iterator[None]:
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint="localhost:1", service_name="transformers-test")
+    yield
+    axonize.shutdown()
+
+
+class _Tensor:
+    """Just enough of a torch.Tensor for the streamer protocol."""
+
+    def __init__(self, rows: list[list[int]]) -> None:
+        self.rows = rows
+        self.shape = (len(rows), len(rows[0])) if rows and rows[0] else (len(rows),)
+
+    def numel(self) -> int:
+        return sum(len(r) for r in self.rows)
+
+    def sum(self) -> int:
+        return sum(sum(r) for r in self.rows)
+
+
+class _TinyLM:
+    """Mimics ``generate()``: puts the prompt, then one token per sequence per step."""
+
+    def __init__(self, device_map: dict[str, Any] | None = None, num_beams: int = 1) -> None:
+        self.config = SimpleNamespace(_name_or_path="tiny-lm", is_encoder_decoder=False)
+        self.generation_config = SimpleNamespace(num_beams=num_beams)
+        self.device = "cpu"
+        if device_map is not None:
+            self.hf_device_map = device_map
+        self.streamers: list[Any] = []
+
+    def generate(
+        self,
+        input_ids: _Tensor,
+        attention_mask: _Tensor | None = None,
+        max_new_tokens: int = 4,
+        streamer: Any = None,
+        num_beams: int | None = None,
+    ) -> _Tensor:
+        self.streamers.append(streamer)
+        if streamer is not None:
+            streamer.put(input_ids)
+        batch = input_ids.shape[0]
+        rows = [list(r) for r in input_ids.rows]
+        for step in range(max_new_tokens):
+            time.sleep(0.001)
+            for r in rows:
+                r.append(step)
+            if streamer is not None:
+                streamer.put(_Step(batch))
+        if streamer is not None:
+            streamer.end()
+        return _Tensor(rows)
+
+
+class _Step:
+    """A decode step's next tokens: a 1-D tensor of shape (B,)."""
+
+    def __init__(self, batch: int) -> None:
+        self.shape = (batch,)
+
+    def numel(self) -> int:
+        return self.shape[0]
+
+
+def _drain_spans() -> list[Any]:
+    assert sdk_mod._sdk_instance is not None
+    buf = sdk_mod._sdk_instance._buffer
+    assert buf is not None
+    return buf.drain(100)
+
+
+def test_generate_records_span() -> None:
+    model = instrument(_TinyLM())
+    prompt = _Tensor([[1, 2, 3, 4, 5]])
+    output = model.generate(input_ids=prompt, max_new_tokens=4)
+    assert output.shape == (1, 9)
+    (sd,) = _drain_spans()
+    attrs = sd.attributes
+    assert sd.name == "transformers.generate"
+    assert attrs["ai.model.name"] == "tiny-lm"
+    assert attrs["ai.llm.tokens.input"] == 5
+    assert attrs["ai.llm.tokens.output"] == 4
+    assert "ai.llm.ttft_ms" in attrs
+    assert "ai.llm.tpot_p50_ms" in attrs
+
+
+def test_batched_generate_costs_one_record_per_step(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    real = LLMSpan.record_token
+
+    def counting(self: LLMSpan) -> None:
+        calls.append(1)
+        real(self)
+
+    monkeypatch.setattr(LLMSpan, "record_token", counting)
+    model = instrument(_TinyLM())
+    prompt = _Tensor([[1, 1, 1, 0]] * 64)  # attention-mask stand-in sums to 3 per row
+    model.generate(input_ids=prompt, attention_mask=prompt, max_new_tokens=6)
+    assert len(calls) == 6
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.tokens.input"] == 64 * 3
+    assert sd.attributes["ai.llm.tokens.output"] == 64 * 6
+
+
+def test_caller_streamer_still_receives_calls() -> None:
+    received: list[Any] = []
+    inner = SimpleNamespace(put=received.append, end=lambda: received.append("end"))
+    model = instrument(_TinyLM())
+    model.generate(_Tensor([[1, 2]]), max_new_tokens=2, streamer=inner)
+    assert len(received) == 4 and received[-1] == "end"
+    assert isinstance(model.streamers[0], AxonizeStreamer)
+
+
+def test_beam_search_skips_streamer() -> None:
+    model = instrument(_TinyLM(num_beams=4))
+    model.generate(_Tensor([[1, 2, 3]] * 2), max_new_tokens=5)
+    assert model.streamers == [None]
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.tokens.output"] == 10
+    assert "ai.llm.ttft_ms" not in sd.attributes
+
+
+def test_instrument_twice_wraps_once() -> None:
+    model = instrument(_TinyLM())
+    generate = model.generate
+    assert instrument(model).generate is generate
+
+
+def test_streamer_inside_own_span() -> None:
+    model = _TinyLM()
+    with axonize.llm_span("my-generate", model="tiny-lm") as s:
+        assert isinstance(s, LLMSpan)
+        model.generate(_Tensor([[1, 2, 3]] * 2), max_new_tokens=3, streamer=AxonizeStreamer(s))
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.tokens.input"] == 6
+    assert sd.attributes["ai.llm.tokens.output"] == 6
+
+
+def test_gpu_labels_from_device_map() -> None:
+    device_map = {"embed": 0, "layers.0": 0, "layers.1": 1, "lm_head": "cpu", "x": "disk"}
+    assert gpu_labels(_TinyLM(device_map)) == ["cuda:0", "cuda:1"]
+    assert gpu_labels(_TinyLM()) == []
+    model = _TinyLM()
+    model.device = "cuda"
+    assert gpu_labels(model) == ["cuda:0"]
+    model.device = "mps:0"
+    assert gpu_labels(model) == ["mps:0"]
+
+
+def test_gpu_labels_reach_the_span() -> None:
+    metrics = SpanMetrics(lambda series, start, now: None)
+    _metrics.active = metrics
+    try:
+        model = instrument(_TinyLM({"embed": 0, "lm_head": 1}))
+        model.generate(_Tensor([[1]]), max_new_tokens=1)
+    finally:
+        _metrics.active = None
+    assert list(metrics.collect()) == [("transformers.generate", "tiny-lm", "ok", "cuda:0,cuda:1")]
@@ -0,0 +1,181 @@
+"""Tests for the vLLM integration (stubbed vLLM objects — vLLM is not required)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import axonize
+import axonize._sdk as sdk_mod
+from axonize import _clock
+from axonize._clock import monotonic_ns
+from axonize.integrations.vllm import VLLMRecorder
+
+
+@pytest.fixture(autouse=True)
+def _sdk_lifecycle() -> Iterator[None]:
+    sdk_mod._sdk_instance = None
+    axonize.init(endpoint="localhost:1", service_name="vllm-test")
+    yield
+    axonize.shutdown()
+
+
+@pytest.fixture()
+def recorder() -> Iterator[VLLMRecorder]:
+    rec = VLLMRecorder(model="llama-3-8b", interval_ms=60_000)
+    yield rec
+    rec.stop()
+
+
+def _drain_spans() -> list[Any]:
+    assert sdk_mod._sdk_instance is not None
+    buf = sdk_mod._sdk_instance._buffer
+    assert buf is not None
+    return buf.drain(100)
+
+
+def _scheduler(running: int, waiting: int, kv: float) -> Any:
+    return SimpleNamespace(num_running_reqs=running, num_waiting_reqs=waiting, kv_cache_usage=kv)
+
+
+def _finished(**overrides: Any) -> Any:
+    fields: dict[str, Any] = {
+        "finish_reason": "stop",
+        "e2e_latency": 1.0,
+        "num_prompt_tokens": 128,
+        "num_generation_tokens": 65,
+        "queued_time": 0.1,
+        "prefill_time": 0.2,
+        "inference_time": 0.8,
+        "decode_time": 0.6,
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def _iteration(*finished: Any) -> Any:
+    return SimpleNamespace(finished_requests=list(finished))
+
+
+def test_finished_request_becomes_span(recorder: VLLMRecorder) -> None:
+    recorder.record(_scheduler(4, 0, 0.5), _iteration(_finished()))
+    assert recorder.flush() == 1
+    (sd,) = _drain_spans()
+    attrs = sd.attributes
+    assert sd.name == "vllm.request"
+    assert sd.parent_span_id is None
+    assert sd.duration_ms == pytest.approx(1000.0)
+    assert attrs["ai.model.name"] == "llama-3-8b"
+    assert attrs["ai.llm.tokens.input"] == 128
+    assert attrs["ai.llm.tokens.output"] == 65
+    assert attrs["ai.llm.queue_ms"] == pytest.approx(100.0)
+    assert attrs["ai.llm.prefill_ms"] == pytest.approx(200.0)
+    assert attrs["ai.llm.decode_ms"] == pytest.approx(600.0)
+    assert attrs["ai.llm.tpot_ms"] == pytest.approx(600.0 / 64, abs=0.001)
+    # TTFT counts from arrival: 1.0s e2e - 0.8s inference + 0.2s prefill
+    assert attrs["ai.llm.ttft_ms"] == pytest.approx(400.0)
+    assert attrs["ai.llm.finish_reason"] == "stop"
+
+
+def test_batch_occupancy_averages_steps_while_scheduled(recorder: VLLMRecorder) -> None:
+    recorder.record(_scheduler(100, 100, 1.0), None)  # before the request, ignored
+    recorder._steps[0] = (monotonic_ns() - 10_000_000_000, 100, 100, 1.0)
+    for running, waiting in ((2, 0), (4, 2), (6, 4)):
+        recorder.record(_scheduler(running, waiting, 0.25), None)
+    recorder.record(_scheduler(8, 6, 0.75), _iteration(_finished()))
+    recorder.flush()
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.llm.batch.running"] == 5.0
+    assert sd.attributes["ai.llm.batch.waiting"] == 3.0
+    assert sd.attributes["ai.llm.kv_cache_usage"] == pytest.approx(0.375)
+
+
+def test_request_without_output_tokens(recorder: VLLMRecorder) -> None:
+    recorder.record(None, _iteration(_finished(
+        finish_reason="abort", num_generation_tokens=0, prefill_time=0.0,
+        inference_time=0.0, decode_time=0.0, queued_time=0.5, e2e_latency=0.5,
+    )))
+    recorder.flush()
+    (sd,) = _drain_spans()
+    assert "ai.llm.ttft_ms" not in sd.attributes
+    assert "ai.llm.batch.running" not in sd.attributes
+    assert sd.attributes["ai.llm.finish_reason"] == "abort"
+
+
+def test_stat_logger_factory_takes_model_from_config() -> None:
+    rec = VLLMRecorder()
+    config = SimpleNamespace(model_config=SimpleNamespace(
+        served_model_name=["qwen-7b"], model="Qwen/Qwen2-7B",
+    ))
+    assert rec.stat_logger(config, 0) is rec
+    rec.record(None, _iteration(_finished()))
+    rec.stop()
+    (sd,) = _drain_spans()
+    assert sd.attributes["ai.model.name"] == "qwen-7b"
+
+
+def test_request_outputs_with_metrics(recorder: VLLMRecorder) -> None:
+    now = (monotonic_ns() + _clock.wall_offset_ns()) / 1e9
+    metrics = SimpleNamespace(
+        arrival_time=now - 2.0,
+        first_scheduled_time=now - 1.5,
+        first_token_time=now - 1.0,
+        last_token_time=now - 0.1,
+        finished_time=now,
+    )
+    completion = SimpleNamespace(token_ids=list(range(10)), finish_reason="length")
+    output = SimpleNamespace(
+        finished=True, metrics=metrics, prompt_token_ids=[1, 2, 3], outputs=[completion],
+    )
+    unfinished = SimpleNamespace(finished=False, metrics=metrics)
+    no_metrics = SimpleNamespace(finished=True, metrics=None)
+    recorder.record_outputs([output, unfinished, no_metrics])
+    assert recorder.flush() == 1
+    (sd,) = _drain_spans()
+    attrs = sd.attributes
+    assert sd.duration_ms == pytest.approx(2000.0, abs=0.01)
+    assert attrs["ai.llm.queue_ms"] == pytest.approx(500.0, abs=0.01)
+    assert attrs["ai.llm.prefill_ms"] == pytest.approx(500.0, abs=0.01)
+    assert attrs["ai.llm.decode_ms"] == pytest.approx(900.0, abs=0.01)
+    assert attrs["ai.llm.ttft_ms"] == pytest.approx(1000.0, abs=0.01)
+    assert attrs["ai.llm.tokens.input"] == 3
+    assert attrs["ai.llm.tokens.output"] == 10
+    assert attrs["ai.llm.finish_reason"] == "length"
+
+
+def test_background_thread_builds_spans() -> None:
+    rec = VLLMRecorder(interval_ms=10)
+    rec.record(_scheduler(1, 0, 0.1), _iteration(_finished(), _finished()))
+    deadline = monotonic_ns() + 2_000_000_000
+    while rec._finished and monotonic_ns() < deadline:
+        rec._stop_event.wait(0.01)
+    rec.stop()
+    assert len(_drain_spans()) == 2
+
+
+def test_concurrent_first_records_start_one_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    rec = VLLMRecorder(interval_ms=60_000)
+    created: list[threading.Thread] = []
+
+    class _SlowThread(threading.Thread):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            created.append(self)
+            time.sleep(0.01)  # between the started-check and the assignment
+            super().__init__(*args, **kwargs)
+
+    engines = [
+        threading.Thread(target=rec.record, args=(_scheduler(1, 0, 0.1), None))
+        for _ in range(4)
+    ]
+    monkeypatch.setattr(threading, "Thread", _SlowThread)
+    for engine in engines:
+        engine.start()
+    for engine in engines:
+        engine.join()
+    rec.stop()
+    assert len(created) == 1
@@ -281,7 +281,7 @@ func spanToRecord(span *tracepb.Span, serviceName, environment string) store.Spa
 			costUSD = &v
 		default:
 			// Skip gpu.N.* from generic attrs — handled by parseGPUAttributes
-			if len(key) < 4 || key[:4] != "gpu." {
+			if !isPerGPUKey(key) {
 				attrs[key] = stringifyValue(val)
 			}
 		}
@@ -318,6 +318,12 @@ func spanToRecord(span *tracepb.Span, serviceName, environment string) store.Spa
 	return record
 }
 
+// isPerGPUKey reports whether key is a per-device attribute (gpu.<N>.*).
+// Span-level keys such as gpu.device_time_ms are kept as attributes.
+func isPerGPUKey(key string) bool {
+	return len(key) > 4 && key[:4] == "gpu." && key[4] >= '0' && key[4] <= '9'
+}
+
 func parseGPUAttributes(attrs map[string]*commonpb.AnyValue, record *store.SpanRecord) {
 	for idx := 0; ; idx++ {
 		p := fmt.Sprintf("gpu.%d", idx)
@@ -11,6 +11,7 @@ Prerequisites:
 Usage:
     python tests/load_test.py
     python tests/load_test.py --total 50000 --batch 500 --workers 4
+    python tests/load_test.py --local   # in-process LocalCollector, no Docker
 """
 
 from __future__ import annotations
@@ -66,16 +67,18 @@ def send_batch(exporter: OTLPExporter, batch_size: int, batch_num: int) -> tuple
     return len(spans), elapsed
 
 
-def run_load_test(total_spans: int, batch_size: int, workers: int) -> None:
+def run_load_test(
+    total_spans: int, batch_size: int, workers: int, endpoint: str = GRPC_ENDPOINT,
+) -> None:
     print(f"Load Test Configuration:")
-    print(f"  Endpoint:    {GRPC_ENDPOINT}")
+    print(f"  Endpoint:    {endpoint}")
     print(f"  Total spans: {total_spans:,}")
     print(f"  Batch size:  {batch_size}")
     print(f"  Workers:     {workers}")
     print()
 
     exporter = OTLPExporter(
-        GRPC_ENDPOINT,
+        endpoint,
         "load-test",
         "bench",
         timeout_s=30.0,
@@ -127,9 +130,20 @@ def main() -> None:
     parser.add_argument("--total", type=int, default=50_000, help="Total spans to send")
     parser.add_argument("--batch", type=int, default=500, help="Spans per batch")
     parser.add_argument("--workers", type=int, default=4, help="Concurrent workers")
+    parser.add_argument(
+        "--local", action="store_true",
+        help="Send to an in-process LocalCollector instead of the server",
+    )
     args = parser.parse_args()
 
-    run_load_test(args.total, args.batch, args.workers)
+    if not args.local:
+        run_load_test(args.total, args.batch, args.workers)
+        return
+    from axonize.testing import LocalCollector
+
+    with LocalCollector() as collector:
+        run_load_test(args.total, args.batch, args.workers, collector.endpoint)
+        print(f"  Received: {len(collector):,} spans")
 
 
 if __name__ == "__main__":